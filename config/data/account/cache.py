@@ -0,0 +1,27 @@
+"""
+The director (see data.command.reference): the newest user with the DIRECTOR
+role, as ``CustomUser.objects.filter(role="DIRECTOR").first()`` gave.
+"""
+
+from data.account.models import CustomUser
+from data.command.reference import Reference
+
+
+def _director_id():
+    return (
+        CustomUser.objects.filter(role="DIRECTOR").values_list("id", flat=True).first()
+    )
+
+
+def _affects(instance: CustomUser, **kwargs) -> bool:
+    # users are saved all day; only a director, or the one who was, matters
+    return instance.role == "DIRECTOR" or instance.pk == director.get()
+
+
+director: Reference = Reference(
+    "account.director", _director_id, CustomUser, affects=_affects
+)
+
+
+def director_id():
+    return director.get()
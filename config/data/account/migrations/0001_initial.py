@@ -0,0 +1,75 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import data.account.managers
+import django.utils.timezone
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomUser',
+            fields=[
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('email', models.EmailField(blank=True, max_length=254, verbose_name='email address')),
+                ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
+                ('f_op_bonus_create_order', models.IntegerField(default=0, help_text='Operator buyurtma yaratgani uchun bonus.')),
+                ('f_sm_bonus_create_first_lesson', models.IntegerField(default=0, help_text='Sotuv manageri sinov darsi yaratgani uchun bonus.')),
+                ('f_sm_bonus_first_lesson_come', models.IntegerField(default=0, help_text="O'quvchi sinov darsiga kelgani uchun Sotuv manageriga bonus.")),
+                ('f_sm_bonus_new_active_student', models.IntegerField(default=0, help_text="O'quvchi aktiv holatiga o'tgani uchun sotuv manageriga bonus.")),
+                ('f_sm_fine_firstlesson_archived', models.IntegerField(default=0, help_text="Sinov darsi archivelanib ketganda, Sotuv manageriga jarima yoziladi. Sinov darsi o'quvchi sinov darsiga 3 martta kelmaganda Archivelanadi.")),
+                ('f_sm_fine_new_student_archived', models.IntegerField(default=0, help_text="Yangi o'quvchi aktivga o'tmasdan archivelanib ketsa, Sotuv manageriga jarima yoziladi.")),
+                ('f_svm_bonus_for_each_active_student', models.IntegerField(default=0, help_text="Har oyni 1 sanasida, soat 12:01 da oldingi oydagi barcha aktiv o'quvchilar uchun bonus.")),
+                ('f_svm_fine_student_archived', models.IntegerField(default=0, help_text="O'quvchi archivelanganda jarima yoziladi.")),
+                ('f_managers_bonus_for_each_active_student', models.IntegerField(default=0, help_text="Davomatchi, filial bosh manageri, monitoringchi, testolog uchun har oyni boshida, har bir aktiv o'quvchi uchun bonus.")),
+                ('f_ht_bonus_for_each_active_student', models.IntegerField(default=0, help_text="Har oyni boshida o'zi ishlidigan filiallar uchun har bitta aktiv o'quvchi uchu bonus.")),
+                ('f_t_lesson_payment_percent', models.FloatField(default=0, help_text="Har darsda o'quvchilardan yechilgan dars pulidan qanchadur qismi, o'qituvchi hisobiga tushishi kerak. Foizlarda hisoblanadi.")),
+                ('f_t_fine_failed_first_lesson', models.IntegerField(default=0, help_text="Sinov darsiga kelib, lekin aktivga o'tmasdan ketib qolsa, yoki boshqa o'qituvchiga o'tib ketib qolsa. Yoki boshqa filialga ketib qolsa. Jarima yoziladi.")),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('second_user', models.CharField(blank=True, max_length=100, null=True, unique=True)),
+                ('full_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('first_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('last_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('phone', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+                ('extra_number', models.CharField(blank=True, max_length=255, null=True)),
+                ('chat_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('calculate_penalties', models.BooleanField(default=False)),
+                ('calculate_bonus', models.BooleanField(default=False)),
+                ('date_of_birth', models.DateField(blank=True, null=True)),
+                ('is_call_center', models.BooleanField(default=False)),
+                ('is_call_operator', models.BooleanField(default=False)),
+                ('is_service_manager', models.BooleanField(default=False)),
+                ('role', models.CharField(choices=[('CALL_OPERATOR', 'Call Center'), ('ADMINISTRATOR', 'Sales Menejeri'), ('SERVICE_MANAGER', 'Service Manager'), ('CALL_SALES', 'Call Sales'), ('SERVICE_SALES', 'Service Sales'), ('ACCOUNTING', 'Accounting'), ('ATTENDANCE_MANAGER', 'Attendance Manager'), ('FILIAL_Manager', 'Filial Manager'), ('HEAD_TEACHER', 'Head Teacher'), ('MONITORING_MANAGER', 'Monitoring Manager'), ('TESTOLOG', 'Testolog'), ('TEACHER', 'Teacher'), ('ASSISTANT', 'Assistant teacher'), ('MULTIPLE_FILIAL_MANAGER', 'Multiple Filial Manager'), ('DIRECTOR', 'Director'), ('Student', 'Student'), ('Parents', 'Parents')], default='DIRECTOR', max_length=30)),
+                ('balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('salary', models.FloatField(default=0)),
+                ('ball', models.FloatField(default=0)),
+                ('monitoring', models.FloatField(default=0)),
+                ('enter', models.TimeField(blank=True, null=True)),
+                ('leave', models.TimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+            managers=[
+                ('objects', data.account.managers.UserManager()),
+            ],
+        ),
+    ]
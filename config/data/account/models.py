@@ -5,7 +5,7 @@ from decimal import Decimal
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
-from data.command.utils import capture_context_deep
+from data.command.context import record_save_context
 from data.department.filial.models import Filial
 from data.account.managers import UserManager
 from data.employee.finance import EmployeeFinanceFields
@@ -15,20 +15,6 @@ if TYPE_CHECKING:
     from data.notifications.models import Notification
 
 
-def _full_context():
-    """
-    Capture full stack with all locals, no truncation.
-    """
-    return capture_context_deep(
-        stack_max_frames=10**6,  # practically unlimited
-        locals_max_items=10**6,
-        locals_depth=10**6,
-        max_str_len=10**6,
-        include_stack_locals=True,
-        order="tail",
-    )
-
-
 class CustomUser(AbstractUser, EmployeeFinanceFields):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
@@ -146,16 +132,24 @@ class CustomUser(AbstractUser, EmployeeFinanceFields):
         """
         - On create: set create_context once (if absent).
         - On update: refresh update_context to the latest caller site.
+        - On update: never write ``balance``; data.employee.balance moves it
+          in SQL, and this copy may have been read before those moves.
         """
-        if self._state.adding:  # creating
-            if not self.create_context:
-                self.create_context = _full_context()
-            # Don't pre-fill update_context on create
-        else:  # updating
-            self.update_context = _full_context()
-        
+        record_save_context(self)
+
         # here we are updating full name each time first_name and last_name change
         full_name = f"{self.first_name} {self.last_name}"
         self.full_name = full_name
 
+        if (
+            not self._state.adding
+            and not kwargs.get("force_insert")
+            and kwargs.get("update_fields") is None
+        ):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "balance"
+            ]
+
         super().save(*args, **kwargs)
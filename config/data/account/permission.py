@@ -1,5 +1,6 @@
 from django.contrib.auth.backends import BaseBackend
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from .models import CustomUser
@@ -67,6 +68,18 @@ class PhoneAuthBackend(BaseBackend):
 #             return None
 
 
+class IsDirector(IsAuthenticated):
+    """
+    Internal views (metrics, monitoring) for directors and superusers only.
+    """
+
+    def has_permission(self, request, view):
+        user = request.user
+        return super().has_permission(request, view) and (
+            user.role == "DIRECTOR" or user.is_superuser
+        )
+
+
 class FilialRestrictedQuerySetMixin:
     """
     Mixin to filter querysets by the user's filial and enforce data restrictions.
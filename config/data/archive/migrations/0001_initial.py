@@ -0,0 +1,38 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import data.archive.methods
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Archive',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('obj_status', models.CharField(choices=[('NEW_STUDENT', "Yangi o'quvchi"), ('ACTIVE_STUDENT', "Aktiv o'quvchi"), ('NEW_LEAD', 'Yangi Lead'), ('ORDER', 'Buyurtma'), ('FIRST_LESSON', 'Sinov darsi')], max_length=255)),
+                ('reason', models.TextField()),
+                ('unarchived_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+            bases=(models.Model, data.archive.methods.ArchiveMethods),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('archive', '0002_initial'),
+        ('employee', '0001_initial'),
+        ('filial', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archive',
+            name='creator',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archives', to='employee.employee'),
+        ),
+        migrations.AddField(
+            model_name='archive',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+    ]
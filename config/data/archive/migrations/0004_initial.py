@@ -0,0 +1,46 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('archive', '0003_initial'),
+        ('employee', '0003_initial'),
+        ('new_lid', '0001_initial'),
+        ('student', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archive',
+            name='lead',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archive', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='archive',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archives', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='archive',
+            name='unarchived_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='unarchives', to='employee.employee'),
+        ),
+        migrations.AddConstraint(
+            model_name='archive',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='archive_archive_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='archive',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('lead__isnull', False), ('student__isnull', True)), models.Q(('lead__isnull', True), ('student__isnull', False)), _connector='OR'), name='archive_xor_lead_student', violation_error_message='Either lead or student must be set, but not both.'),
+        ),
+        migrations.AddConstraint(
+            model_name='archive',
+            constraint=models.UniqueConstraint(condition=models.Q(('unarchived_at__isnull', True)), fields=('lead', 'student'), name='uniq_active_archive_lead_student'),
+        ),
+    ]
@@ -34,8 +34,15 @@ class ClickUz:
 
         # Example: update balance
         if order.student and order.lid is None:
-            order.student.balance = order.student.balance + float(order.amount)
-            order.student.save()
+            from data.student.student.ledger import post_entry
+            from data.student.student.models import StudentLedgerEntry
+
+            post_entry(
+                order.student,
+                order.amount,
+                StudentLedgerEntry.PAYMENT,
+                comment=f"Click to'lovi. Buyurtma: {order.id}",
+            )
         elif order.lid and order.student is None:
             order.lid.balance = order.lid.balance + float(order.amount)
             order.lid.save()
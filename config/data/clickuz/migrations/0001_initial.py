@@ -0,0 +1,40 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Transaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('click_trans_id', models.CharField(max_length=255)),
+                ('merchant_trans_id', models.CharField(max_length=255)),
+                ('amount', models.CharField(max_length=255)),
+                ('action', models.CharField(max_length=255)),
+                ('sign_string', models.CharField(max_length=255)),
+                ('sign_datetime', models.DateTimeField(max_length=255)),
+                ('status', models.CharField(choices=[('processing', 'processing'), ('finished', 'finished'), ('canceled', 'canceled')], default='processing', max_length=25)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Order',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(blank=True, choices=[('Payme', 'Payme'), ('Click', 'Click')], max_length=255, null=True)),
+                ('amount', models.CharField(max_length=255)),
+                ('paid', models.BooleanField(default=False)),
+                ('creator', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='order_creator', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
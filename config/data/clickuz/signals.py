@@ -3,7 +3,8 @@ from django.dispatch import receiver
 
 from data.finances.finance.choices import FinanceKindTypeChoices
 from data.clickuz.models import Order
-from data.finances.finance.models import Finance, Kind
+from data.finances.finance.cache import get_kind
+from data.finances.finance.models import Finance
 
 
 @receiver(post_save, sender=Order)
@@ -13,7 +14,7 @@ def on_pre_save(sender, instance: Order, created, **kwargs):
 
         # kind = Kind.objects.filter(name="Lesson payment").first()
 
-        kind = Kind.get(FinanceKindTypeChoices.LESSON_PAYMENT)
+        kind = get_kind(FinanceKindTypeChoices.LESSON_PAYMENT)
 
         finance = Finance.objects.create(
             action="INCOME",
@@ -0,0 +1,61 @@
+"""
+DataLoader-style batching of serializer method fields.
+
+A serializer with BatchFieldsMixin names its batch loaders:
+
+    loaders = {"vouchers": vouchers}   # (ids, context) -> {pk: value}
+
+and its ``get_<field>`` methods ask for their row's value:
+
+    def get_voucher(self, obj):
+        return self.resolve("vouchers", obj)
+
+When the serializer is the child of a BatchListSerializer (set
+``list_serializer_class`` in Meta), the first ``resolve`` of a loader runs
+it once for every row of the page; the other rows are served from its
+result. A single object is a batch of one, so list and detail responses
+share the loaders. Only the loaders of the fields being rendered run.
+"""
+
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+
+
+class BatchResolver:
+    """Results of loaders over one set of rows, each loader run at most once."""
+
+    def __init__(self, loaders: dict, rows, context: dict):
+        self.loaders = loaders
+        self.context = context
+        self.keys = [row.pk for row in rows]
+        self._covered = set(self.keys)
+        self._results: dict[str, dict] = {}
+
+    def covers(self, obj) -> bool:
+        return obj.pk in self._covered
+
+    def load(self, name: str, obj, default=None):
+        if name not in self._results:
+            self._results[name] = self.loaders[name](self.keys, self.context)
+        return self._results[name].get(obj.pk, default)
+
+
+class BatchListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        rows = list(data.all() if isinstance(data, BaseManager) else data)
+        self.child.resolver = BatchResolver(self.child.loaders, rows, self.context)
+        try:
+            return super().to_representation(rows)
+        finally:
+            self.child.resolver = None
+
+
+class BatchFieldsMixin:
+    loaders: dict = {}
+    resolver: BatchResolver | None = None
+
+    def resolve(self, name: str, obj, default=None):
+        """``name``'s value for ``obj``, loaded with the rest of its batch."""
+        if self.resolver is None or not self.resolver.covers(obj):
+            self.resolver = BatchResolver(self.loaders, [obj], self.context)
+        return self.resolver.load(name, obj, default)
@@ -0,0 +1,196 @@
+"""
+Call-site capture policy for BaseModel.save().
+
+Configured through ``settings.MODEL_CONTEXT_CAPTURE``:
+
+    MODE         "off"     -> nothing is captured
+                 "sampled" -> full capture for SAMPLE_RATE percent of saves
+                 "bounded" -> nearest MAX_FRAMES frames, no locals
+                 "full"    -> full capture on every save (legacy behaviour)
+                 "listed"  -> full capture only for FULL_MODELS
+    FULL_MODELS  model labels ("student.Student") that always get a full
+                 capture unless MODE is "off"
+    STORAGE      "inline" -> create_context/update_context on the row
+                 "spool"  -> SaveContext side table, bulk-written after commit
+"""
+
+import random
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from data.command.utils import capture_context_deep
+
+MODE_OFF = "off"
+MODE_SAMPLED = "sampled"
+MODE_BOUNDED = "bounded"
+MODE_FULL = "full"
+MODE_LISTED = "listed"
+
+STORAGE_INLINE = "inline"
+STORAGE_SPOOL = "spool"
+
+DEFAULTS = {
+    "MODE": MODE_FULL,
+    "SAMPLE_RATE": 100,
+    "MAX_FRAMES": 15,
+    "FULL_MODELS": (),
+    "STORAGE": STORAGE_INLINE,
+}
+
+
+def get_policy(overrides: dict | None = None) -> dict:
+    policy = dict(DEFAULTS)
+    policy.update(getattr(settings, "MODEL_CONTEXT_CAPTURE", None) or {})
+    if overrides:
+        policy.update(overrides)
+    policy["FULL_MODELS"] = {label for label in policy["FULL_MODELS"] if label}
+    return policy
+
+
+def _full_context():
+    """
+    Capture full stack with all locals, no truncation.
+    """
+    return capture_context_deep(
+        stack_max_frames=10**6,  # practically unlimited
+        locals_max_items=10**6,
+        locals_depth=10**6,
+        max_str_len=10**6,
+        include_stack_locals=True,
+        order="tail",
+    )
+
+
+def _bounded_context(max_frames: int):
+    """
+    File/line/func for the nearest ``max_frames`` frames, no locals anywhere.
+    """
+    return capture_context_deep(
+        stack_max_frames=max_frames,
+        include_stack_locals=False,
+        include_caller_locals=False,
+        order="tail",
+    )
+
+
+def capture_for(instance, policy: dict | None = None) -> dict | None:
+    """
+    Return the context snapshot the policy wants for this save, or None.
+    """
+    policy = policy or get_policy()
+    mode = policy["MODE"]
+
+    if mode == MODE_OFF:
+        return None
+
+    if instance._meta.label in policy["FULL_MODELS"]:
+        return _full_context()
+
+    if mode == MODE_FULL:
+        return _full_context()
+
+    if mode == MODE_SAMPLED:
+        if random.random() * 100 < float(policy["SAMPLE_RATE"]):
+            return _full_context()
+        return None
+
+    if mode == MODE_BOUNDED:
+        return _bounded_context(int(policy["MAX_FRAMES"]))
+
+    # MODE_LISTED: nothing for models that are not listed
+    return None
+
+
+# ---------- spool ----------
+
+_local = threading.local()
+
+
+def _flush(batch: list):
+    from data.command.models import SaveContext
+
+    if getattr(_local, "flush", None) is not None and _local.flush.batch is batch:
+        _local.flush = None
+
+    if batch:
+        SaveContext.objects.bulk_create(batch, batch_size=500)
+
+
+class _Flush:
+    """on_commit callback holding one transaction's worth of spooled contexts."""
+
+    def __init__(self):
+        self.batch = []
+
+    def __call__(self):
+        _flush(self.batch)
+
+
+def _pending_flush() -> "_Flush":
+    """
+    One flush callback per outermost transaction. If the transaction that
+    registered it was rolled back Django drops the callback, so we check that
+    it is still queued before reusing its batch.
+    """
+    flush = getattr(_local, "flush", None)
+    if flush is not None and any(
+        entry[1] is flush for entry in connection.run_on_commit
+    ):
+        return flush
+
+    flush = _local.flush = _Flush()
+    transaction.on_commit(flush)
+    return flush
+
+
+def flush_spool():
+    """Write the contexts spooled so far in this transaction now."""
+    flush = getattr(_local, "flush", None)
+    if flush is None:
+        return
+    batch, flush.batch = flush.batch, []
+    _flush(batch)
+
+
+def spool(instance, kind: str, context: dict):
+    from data.command.models import SaveContext
+
+    row = SaveContext(
+        model=instance._meta.label,
+        object_id=str(instance.pk),
+        kind=kind,
+        context=context,
+    )
+
+    if not connection.in_atomic_block:
+        row.save()
+        return
+
+    _pending_flush().batch.append(row)
+
+
+def record_save_context(instance, policy: dict | None = None):
+    """
+    Called from save() before the row is written.
+
+    - On create: set create_context once (if absent).
+    - On update: refresh update_context to the latest caller site.
+    """
+    policy = policy or get_policy()
+    creating = instance._state.adding
+
+    if creating and instance.create_context:
+        return
+
+    context = capture_for(instance, policy)
+    if context is None:
+        return
+
+    if policy["STORAGE"] == STORAGE_SPOOL:
+        spool(instance, "CREATE" if creating else "UPDATE", context)
+    elif creating:
+        instance.create_context = context
+    else:
+        instance.update_context = context
@@ -0,0 +1,90 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from data.command.query_audit import (
+    HOT_QUERIES,
+    Samples,
+    explain,
+    explain_sql,
+    read_sql_file,
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the captured hot list/dashboard queries with EXPLAIN ANALYZE "
+        "and report sequential scans over large tables"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=1000,
+            help="Ignore sequential scans reading fewer rows than this",
+        )
+        parser.add_argument(
+            "--sql-file",
+            action="append",
+            default=[],
+            help="Extra captured SELECTs, separated by lines holding only ';'",
+        )
+        parser.add_argument(
+            "--only", help="Only run captured queries whose name contains this"
+        )
+        parser.add_argument(
+            "--fail",
+            action="store_true",
+            help="Exit with an error when a sequential scan is found (for CI)",
+        )
+        parser.add_argument("--show-sql", action="store_true")
+
+    def handle(self, *args, **options):
+        min_rows = options["min_rows"]
+        reports = {}
+
+        # EXPLAIN ANALYZE executes the statements; never keep their effects
+        try:
+            with transaction.atomic():
+                samples = Samples.pick()
+                for name, build in HOT_QUERIES.items():
+                    if options["only"] and options["only"] not in name:
+                        continue
+                    reports[name] = explain(build, samples, min_rows)
+
+                for path in options["sql_file"]:
+                    for name, sql in read_sql_file(path).items():
+                        reports[name] = explain_sql(sql, min_rows)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        flagged = 0
+        for name, report in reports.items():
+            if report is None:
+                self.stdout.write(f"  {name}: no SQL")
+                continue
+
+            line = f"{report['time_ms']:9.2f} ms  {name}"
+            if report["seq_scans"]:
+                flagged += 1
+                scans = ", ".join(
+                    f"{table} ({rows} rows)" for table, rows in report["seq_scans"]
+                )
+                self.stdout.write(self.style.WARNING(f"{line}  SEQ SCAN: {scans}"))
+            else:
+                self.stdout.write(line)
+
+            if options["show_sql"]:
+                self.stdout.write(f"    {report['sql']}")
+
+        summary = f"{len(reports)} queries, {flagged} with sequential scans"
+        if flagged and options["fail"]:
+            raise CommandError(summary)
+        self.stdout.write(
+            (self.style.WARNING if flagged else self.style.SUCCESS)(summary)
+        )
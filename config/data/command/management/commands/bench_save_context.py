@@ -0,0 +1,107 @@
+import json
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from data.command.context import flush_spool, get_policy, record_save_context
+
+POLICIES = [
+    ("off", {"MODE": "off"}),
+    ("sampled 5%", {"MODE": "sampled", "SAMPLE_RATE": 5}),
+    ("sampled 25%", {"MODE": "sampled", "SAMPLE_RATE": 25}),
+    ("bounded 15", {"MODE": "bounded", "MAX_FRAMES": 15}),
+    ("listed (not listed)", {"MODE": "listed"}),
+    ("full", {"MODE": "full"}),
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Measure BaseModel.save() call-site capture overhead for each capture policy"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", default="logs.Log")
+        parser.add_argument("--iterations", type=int, default=500)
+        parser.add_argument(
+            "--depth",
+            type=int,
+            default=40,
+            help="Extra stack frames to simulate view/serializer/signal nesting",
+        )
+        parser.add_argument(
+            "--db",
+            action="store_true",
+            help="Also time real INSERT+UPDATE saves (rolled back) per policy",
+        )
+
+    def handle(self, *args, **options):
+        model = apps.get_model(options["model"])
+        iterations = options["iterations"]
+        depth = options["depth"]
+
+        self.stdout.write(
+            f"{model._meta.label}: {iterations} saves, stack depth +{depth}\n"
+        )
+        self.stdout.write(
+            f"{'policy':<22}{'capture µs/save':>16}{'avg bytes':>12}"
+            + (f"{'db ms/save':>14}" if options["db"] else "")
+        )
+
+        for name, overrides in POLICIES:
+            policy = get_policy({**overrides, "STORAGE": "inline"})
+
+            elapsed, size = self._nested(
+                depth, self._time_capture, model, policy, iterations
+            )
+            line = (
+                f"{name:<22}{elapsed / iterations * 1e6:>16.1f}"
+                f"{size / iterations:>12.0f}"
+            )
+
+            if options["db"]:
+                spool_policy = get_policy({**overrides, "STORAGE": "spool"})
+                db_elapsed = self._nested(
+                    depth, self._time_db, model, spool_policy, iterations
+                )
+                line += f"{db_elapsed / (2 * iterations) * 1e3:>14.2f}"
+
+            self.stdout.write(line)
+
+    def _nested(self, depth, fn, *args):
+        if depth <= 0:
+            return fn(*args)
+        return self._nested(depth - 1, fn, *args)
+
+    def _time_capture(self, model, policy, iterations):
+        size = 0
+        started = time.perf_counter()
+        for _ in range(iterations):
+            instance = model()
+            instance._state.adding = False
+            record_save_context(instance, policy)
+            if instance.update_context:
+                size += len(json.dumps(instance.update_context, default=str))
+        return time.perf_counter() - started, size
+
+    def _time_db(self, model, policy, iterations):
+        from django.test.utils import override_settings
+
+        started = time.perf_counter()
+        try:
+            with override_settings(MODEL_CONTEXT_CAPTURE=policy):
+                with transaction.atomic():
+                    for _ in range(iterations):
+                        instance = model()
+                        instance.save()
+                        instance.save()
+                    # the spool writes on commit; time that write too
+                    flush_spool()
+                    raise _Rollback
+        except _Rollback:
+            pass
+        return time.perf_counter() - started
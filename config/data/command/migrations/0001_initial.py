@@ -0,0 +1,55 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('filial', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaveContext',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=128)),
+                ('object_id', models.CharField(max_length=64)),
+                ('kind', models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update')], max_length=16)),
+                ('context', models.JSONField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['model', 'object_id', '-created_at'], name='command_sav_model_6d8818_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserFilial',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='userfilial_filial', to='filial.filial')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='userfilial_user', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+                'constraints': [models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='command_userfilial_arch_ts_chk')],
+            },
+        ),
+    ]
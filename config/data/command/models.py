@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
+from django.contrib import admin
 from django.db import models
 from django.utils import timezone
 
@@ -12,24 +13,11 @@ from django.db.models import Q, CheckConstraint
 if TYPE_CHECKING:
     from data.account.models import CustomUser
 
-from data.command.utils import capture_context_deep
+from data.command.context import record_save_context
+from data.command.pipeline import apply_derived
 from data.department.filial.models import Filial
 
 
-def _full_context():
-    """
-    Capture full stack with all locals, no truncation.
-    """
-    return capture_context_deep(
-        stack_max_frames=10**6,  # practically unlimited
-        locals_max_items=10**6,
-        locals_depth=10**6,
-        max_str_len=10**6,
-        include_stack_locals=True,
-        order="tail",
-    )
-
-
 def _value_for_compare(v):
     # Normalize file fields etc. to a stable comparable value
     if isinstance(v, FieldFile):
@@ -126,39 +114,96 @@ class BaseModel(models.Model):
         # After constructing (even new objects), capture initial state.
         self._capture_initial_state_from_dict()
 
+    def _attname(self, field: str) -> str:
+        return self._meta.get_field(field).attname
+
+    def _before_and_now(self, attname: str):
+        initial = getattr(self, "__initial_state__", {}) or {}
+        before = initial.get(attname, _SENTINEL)
+        now_raw = self.__dict__.get(attname, _SENTINEL)
+        now = _value_for_compare(now_raw) if now_raw is not _SENTINEL else _SENTINEL
+        return before, now
+
+    def _differs(self, attname: str) -> bool:
+        before, now = self._before_and_now(attname)
+        if before is _SENTINEL and now is _SENTINEL:
+            return False  # both absent (still deferred)
+        if before is _SENTINEL:
+            return True  # newly populated → treat as changed
+        return before != now
+
     def changed_fields(self) -> list[str]:
         """
         Compare current raw values vs initial snapshot. Uses __dict__ to avoid
         triggering deferred loads. If a field wasn't in the initial snapshot
         (deferred at load time) but is now present, we consider it "changed".
         """
-        initial = getattr(self, "__initial_state__", {}) or {}
-        changed: list[str] = []
+        return [
+            f.name for f in self._meta.concrete_fields if self._differs(f.attname)
+        ]
+
+    def has_changed(self, field: str) -> bool:
+        """
+        Whether ``field`` (name or attname, FKs compare by id) differs from
+        the value it had when the row was loaded or last saved.
+
+        The snapshot is only replaced once save() returns, so this answers
+        the same in pre_save and post_save handlers, and in post_delete.
+        """
+        return self._differs(self._attname(field))
+
+    def old_value(self, field: str, default=None):
+        """
+        Value of ``field`` when loaded or last saved (the id for FKs);
+        ``default`` if it was not loaded.
+        """
+        before, _ = self._before_and_now(self._attname(field))
+        return default if before is _SENTINEL else before
+
+    def changes(self) -> dict[str, tuple]:
+        """``{field name: (old, new)}`` of every changed field (ids for FKs)."""
+        changes = {}
         for f in self._meta.concrete_fields:
-            att = f.attname
-            before = initial.get(att, _SENTINEL)
-            now_raw = self.__dict__.get(att, _SENTINEL)
-            # Normalize (but only if present)
-            now = _value_for_compare(now_raw) if now_raw is not _SENTINEL else _SENTINEL
-            if before is _SENTINEL and now is _SENTINEL:
-                continue  # both absent (still deferred)
-            if before is _SENTINEL and now is not _SENTINEL:
-                changed.append(f.name)  # newly populated → treat as changed
-            elif before != now:
-                changed.append(f.name)
-        return changed
+            if self._differs(f.attname):
+                before, _ = self._before_and_now(f.attname)
+                changes[f.name] = (
+                    None if before is _SENTINEL else before,
+                    self.__dict__.get(f.attname),
+                )
+        return changes
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # reloaded values are the new baseline; other pending edits stay
+        refreshed = (
+            {self._meta.get_field(name).attname for name in fields}
+            if fields
+            else {f.attname for f in self._meta.concrete_fields}
+        )
+        state = getattr(self, "__initial_state__", None)
+        if state is None:
+            state = self.__initial_state__ = {}
+        for attname in refreshed:
+            if attname in self.__dict__:
+                state[attname] = _value_for_compare(self.__dict__[attname])
 
     def save(self, *args, **kwargs):
         """
         - On create: set create_context once (if absent).
         - On update: refresh update_context to the latest caller site.
+
+        How much is captured and where it is stored is decided by
+        settings.MODEL_CONTEXT_CAPTURE (see data.command.context).
+
+        Derived field rules (see data.command.pipeline) run first, so their
+        values are part of this write.
         """
-        if self._state.adding:  # creating
-            if not self.create_context:
-                self.create_context = _full_context()
-            # Don't pre-fill update_context on create
-        else:  # updating
-            self.update_context = _full_context()
+        derived = apply_derived(self)
+        update_fields = kwargs.get("update_fields")
+        if derived and update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *derived}
+
+        record_save_context(self)
 
         super().save(*args, **kwargs)
 
@@ -180,3 +225,40 @@ class UserFilial(BaseModel):
         blank=True,
         related_name="userfilial_user",
     )
+
+
+class SaveContext(models.Model):
+    """
+    Append-only side table for BaseModel call-site snapshots when
+    MODEL_CONTEXT_CAPTURE["STORAGE"] is "spool". Deliberately not a BaseModel,
+    so writing a context never captures one of its own.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+
+    model = models.CharField(max_length=128)
+    object_id = models.CharField(max_length=64)
+
+    kind = models.CharField(
+        max_length=16,
+        choices=[
+            ("CREATE", "Create"),
+            ("UPDATE", "Update"),
+        ],
+    )
+
+    context = models.JSONField()
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["model", "object_id", "-created_at"]),
+        ]
+
+    class Admin(admin.ModelAdmin):
+
+        list_display = ["id", "model", "object_id", "kind", "created_at"]
+        list_filter = ["kind", "model"]
+        search_fields = ["object_id"]
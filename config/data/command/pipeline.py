@@ -0,0 +1,83 @@
+"""
+Save pipeline of BaseModel.
+
+Derived fields: a rule registered with ``derive`` computes some fields of an
+instance from its other fields. BaseModel.save() runs the rules of the model
+right before the write, so their values go out with the same INSERT/UPDATE
+(and are added to ``update_fields`` when the caller passed some) instead of
+a post_save handler setting them and calling save() again.
+
+    @derive(Lid, "ordered_date", on=UPDATE)
+    def ordered_date(lead):
+        if lead.lid_stage_type == "ORDERED_LID" and lead.ordered_date is None:
+            lead.ordered_date = timezone.now()
+
+``derived_fields(instance)`` tells post_save handlers which fields the rules
+changed in the save that just happened, so transitions made by a rule can
+trigger their side effects exactly once.
+
+Follow-up side effects: ``once_per_transaction`` runs a callback for an
+instance after the transaction commits, once however many times the
+instance was saved in it.
+"""
+
+from collections import defaultdict
+from functools import partial
+
+from data.command.transactions import collect_on_commit
+
+CREATE = "create"
+UPDATE = "update"
+
+_rules = defaultdict(list)
+
+
+def derive(model, *fields: str, on=(CREATE, UPDATE)):
+    """Register ``rule(instance)`` as the source of ``fields`` of ``model``."""
+    events = frozenset([on] if isinstance(on, str) else on)
+
+    def register(rule):
+        _rules[model].append((fields, events, rule))
+        return rule
+
+    return register
+
+
+def apply_derived(instance) -> set[str]:
+    """Run the rules of ``instance``; returns the fields they changed."""
+    event = CREATE if instance._state.adding else UPDATE
+    changed = set()
+    for model in type(instance).__mro__:
+        for fields, events, rule in _rules.get(model, ()):
+            if event not in events:
+                continue
+            before = [getattr(instance, field) for field in fields]
+            rule(instance)
+            changed.update(
+                field
+                for field, value in zip(fields, before)
+                if getattr(instance, field) != value
+            )
+    instance._derived_fields = changed
+    return changed
+
+
+def derived_fields(instance) -> set[str]:
+    """Fields the rules changed in the instance's latest save()."""
+    return getattr(instance, "_derived_fields", set())
+
+
+def _run_once(callback, instances):
+    latest = {}
+    for instance in instances:
+        latest[instance.pk] = instance
+    for instance in latest.values():
+        callback(instance)
+
+
+def once_per_transaction(key: str, instance, callback):
+    """
+    Run ``callback(instance)`` after the current transaction commits, once
+    per instance for ``key``; immediately outside a transaction.
+    """
+    collect_on_commit(key, instance, partial(_run_once, callback))
@@ -0,0 +1,206 @@
+"""
+EXPLAIN ANALYZE audit of the hottest list and dashboard queries.
+
+``HOT_QUERIES`` is a captured set of the filters the dashboards, lead and
+student lists, attendance journals, cashier screens and notification badge
+run all day. Each entry builds its queryset from sample ids taken from the
+database, so the plans reflect real data distribution. ``explain`` runs one
+with ``EXPLAIN (ANALYZE, FORMAT JSON)`` and returns the sequential scans in
+its plan; the ``audit_queries`` command reports them.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from data.department.filial.models import Filial
+from data.finances.finance.models import Casher, Finance
+from data.lid.new_lid.models import Lid
+from data.notifications.models import Notification
+from data.student.attendance.models import Attendance
+from data.student.groups.models import Group
+from data.student.student.models import Student
+from data.student.studentgroup.models import StudentGroup
+
+
+@dataclass
+class Samples:
+    """One id of each kind to plug into the captured filters."""
+
+    filial: object = None
+    student: object = None
+    group: object = None
+    casher: object = None
+    user: object = None
+    sales_manager: object = None
+    call_operator: object = None
+    since: object = field(default_factory=lambda: timezone.now() - timedelta(days=30))
+
+    @classmethod
+    def pick(cls):
+        def busiest(queryset, column):
+            return (
+                queryset.values(column)
+                .annotate(n=Count("pk"))
+                .order_by("-n")
+                .values_list(column, flat=True)
+                .first()
+            )
+
+        return cls(
+            filial=Filial.objects.values_list("pk", flat=True).first(),
+            student=busiest(Attendance.objects.exclude(student=None), "student"),
+            group=busiest(StudentGroup.objects.filter(is_archived=False), "group"),
+            casher=busiest(Finance.objects.exclude(casher=None), "casher"),
+            user=busiest(Notification.objects.exclude(user=None), "user"),
+            sales_manager=busiest(
+                Lid.objects.exclude(sales_manager=None), "sales_manager"
+            ),
+            call_operator=busiest(
+                Lid.objects.exclude(call_operator=None), "call_operator"
+            ),
+        )
+
+
+HOT_QUERIES = {
+    "lead list: live leads of a filial by stage": lambda s: Lid.objects.filter(
+        is_archived=False, filial=s.filial, lid_stage_type="ORDERED_LID"
+    ).order_by("-created_at")[:50],
+    "lead list: sales manager pipeline": lambda s: Lid.objects.filter(
+        is_archived=False, sales_manager=s.sales_manager
+    )
+    .values("lid_stage_type")
+    .annotate(n=Count("pk")),
+    "lead list: call operator pipeline": lambda s: Lid.objects.filter(
+        is_archived=False, call_operator=s.call_operator
+    )
+    .values("lid_stage_type")
+    .annotate(n=Count("pk")),
+    "student: attendance history": lambda s: Attendance.objects.filter(
+        student=s.student
+    ).order_by("-created_at")[:50],
+    "group: attendance journal of the month": lambda s: Attendance.objects.filter(
+        is_archived=False, group=s.group, date__gte=s.since.date()
+    ),
+    "group: live students": lambda s: StudentGroup.objects.filter(
+        is_archived=False, group=s.group
+    ),
+    "student: live groups": lambda s: StudentGroup.objects.filter(
+        is_archived=False, student=s.student
+    ),
+    "student: payments": lambda s: Finance.objects.filter(student=s.student).order_by(
+        "-created_at"
+    )[:50],
+    "cashier: recent finances": lambda s: Finance.objects.filter(
+        casher=s.casher, created_at__gte=s.since
+    ).order_by("-created_at"),
+    "dashboard: income and expense of the period": lambda s: Finance.objects.filter(
+        is_archived=False, created_at__gte=s.since
+    ).aggregate(
+        income=Sum("amount", filter=Q(action="INCOME")),
+        expense=Sum("amount", filter=Q(action="EXPENSE")),
+    ),
+    "dashboard: sums per kind": lambda s: Finance.objects.filter(
+        created_at__gte=s.since
+    ).values("kind", "action").annotate(total=Sum("amount")),
+    "dashboard: active students of a filial": lambda s: Student.objects.filter(
+        is_archived=False, filial=s.filial, student_stage_type="ACTIVE_STUDENT"
+    ).aggregate(n=Count("pk")),
+    "groups: active groups of a filial": lambda s: Group.objects.filter(
+        is_archived=False, filial=s.filial, status="ACTIVE"
+    ),
+    "notifications: unread badge": lambda s: Notification.objects.filter(
+        user=s.user, is_read=False
+    ).aggregate(n=Count("pk")),
+    "notifications: list": lambda s: Notification.objects.filter(user=s.user).order_by(
+        "-created_at"
+    )[:20],
+    "cashiers of a filial": lambda s: Casher.objects.filter(
+        filial=s.filial, is_archived=False
+    ),
+}
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _report(sql: str, params, min_rows: int) -> dict:
+    """
+    ``{"sql", "time_ms", "seq_scans"}`` of one statement, seq_scans listing
+    ``(table, rows read)`` of sequential scans over at least ``min_rows``
+    rows; small tables are scanned on purpose by the planner.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    plan = plan[0]
+
+    seq_scans = []
+    for node in _plan_nodes(plan["Plan"]):
+        if node.get("Node Type") != "Seq Scan":
+            continue
+        rows = node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)
+        if rows >= min_rows:
+            seq_scans.append((node.get("Relation Name"), rows))
+
+    return {
+        "sql": sql,
+        "time_ms": plan.get("Execution Time", 0.0),
+        "seq_scans": seq_scans,
+    }
+
+
+class _Captured(Exception):
+    pass
+
+
+def _sql_of(build, samples):
+    """
+    The first statement a captured query runs, without running it; works
+    for querysets and for ``.aggregate()`` calls alike.
+    """
+    captured = []
+
+    def capture(execute, sql, params, many, context):
+        captured.append((sql, params))
+        raise _Captured
+
+    with connection.execute_wrapper(capture):
+        try:
+            result = build(samples)
+            if hasattr(result, "query"):
+                list(result)
+        except _Captured:
+            pass
+    return captured[0] if captured else None
+
+
+def explain(build, samples: Samples, min_rows: int = 1000) -> dict | None:
+    captured = _sql_of(build, samples)
+    if captured is None:
+        return None
+    return _report(*captured, min_rows)
+
+
+def explain_sql(sql: str, min_rows: int = 1000) -> dict:
+    return _report(sql, None, min_rows)
+
+
+def read_sql_file(path: str) -> dict:
+    """Captured statements from a file, separated by lines holding only ';'."""
+    with open(path) as file:
+        chunks = [chunk.strip() for chunk in file.read().split("\n;\n")]
+    return {
+        f"{path}#{index}": chunk.rstrip(";")
+        for index, chunk in enumerate(chunks, 1)
+        if chunk.lower().startswith(("select", "with"))
+    }
@@ -0,0 +1,281 @@
+"""
+Per-request query accounting and N+1 detection.
+
+QueryBudgetMiddleware records, for every request, the number of queries, the
+time spent in the database and in DRF serializers, and how often each SQL
+template (the statement with its literals and IN lists folded) ran.
+Savepoints are counted apart: ATOMIC_REQUESTS and every nested atomic()
+add them, and they are not queries a view can save. A
+template that runs more than N_PLUS_ONE times in one request is reported as
+an N+1. Configured through ``settings.QUERY_BUDGET``:
+
+    ENABLED        record requests at all
+    N_PLUS_ONE     repeats of one template that count as an N+1
+    BUDGETS        {route: max queries}, e.g. {"dashboard/admin/": 5};
+                   requests over it are reported
+    LOG_ALL        log every request, not only the flagged ones
+    METRICS_TOKEN  bearer token of the Prometheus endpoint; unset -> 404
+
+Reports are JSON log lines of the "query_budget" logger. The per-view totals
+are also kept in the process and served in the Prometheus text format by
+``metrics_view``; every worker process serves its own totals.
+
+Tests use QueryRecorder through data.command.testing.QueryBudgetMixin.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection
+from django.http import Http404, HttpResponse
+
+logger = logging.getLogger("query_budget")
+
+DEFAULTS = {
+    "ENABLED": True,
+    "N_PLUS_ONE": 10,
+    "BUDGETS": {},
+    "LOG_ALL": False,
+    "METRICS_TOKEN": None,
+}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_SAVEPOINT = re.compile(
+    r"^\s*(?:SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE
+)
+_SPACES = re.compile(r"\s+")
+
+# the serializer-time accounting of the request being handled, if any
+_current: ContextVar["QueryRecorder | None"] = ContextVar(
+    "query_budget_recorder", default=None
+)
+
+
+def get_policy(overrides: dict | None = None) -> dict:
+    policy = dict(DEFAULTS)
+    policy.update(getattr(settings, "QUERY_BUDGET", None) or {})
+    if overrides:
+        policy.update(overrides)
+    return policy
+
+
+def fingerprint(sql: str) -> str:
+    """The SQL template: literals become ``?`` and IN lists ``(...)``."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """
+    Counts the queries run on ``connection`` while it is entered; savepoint
+    statements go to ``savepoints`` instead.
+    """
+
+    def __init__(self, using=connection):
+        self.connection = using
+        self.count = 0
+        self.savepoints = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.templates: Counter = Counter()
+        self._serializer_depth = 0
+        self._wrapper = None
+        self._token = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            if _SAVEPOINT.match(sql):
+                self.savepoints += 1
+            else:
+                self.count += 1
+                self.templates[fingerprint(sql)] += 1
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        _current.reset(self._token)
+        self._wrapper.__exit__(*exc)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Templates run more than ``threshold`` times, most repeated first."""
+        return [
+            (template, n)
+            for template, n in self.templates.most_common()
+            if n > threshold
+        ]
+
+
+def _timed(prop):
+    def data(self):
+        recorder = _current.get()
+        if recorder is None:
+            return prop.fget(self)
+        # Serializer.data calls BaseSerializer.data through super(); only the
+        # outermost call is timed
+        recorder._serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            recorder._serializer_depth -= 1
+            if not recorder._serializer_depth:
+                recorder.serializer_time += time.perf_counter() - started
+
+    data._query_budget = True
+    return property(data)
+
+
+def instrument_serializers():
+    """Time ``serializer.data`` for the recorder of the current request."""
+    from rest_framework import serializers
+
+    for cls in (
+        serializers.BaseSerializer,
+        serializers.Serializer,
+        serializers.ListSerializer,
+    ):
+        prop = cls.__dict__.get("data")
+        if prop is not None and not getattr(prop.fget, "_query_budget", False):
+            cls.data = _timed(prop)
+
+
+class Metrics:
+    """Per-view totals, rendered in the Prometheus text format."""
+
+    COUNTERS = (
+        ("requests", "Requests handled"),
+        ("queries", "SQL queries run"),
+        ("db_seconds", "Seconds spent in the database"),
+        ("serializer_seconds", "Seconds spent in serializer.data"),
+        ("n_plus_one", "Requests with a repeated SQL template"),
+        ("over_budget", "Requests over their query budget"),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views: dict[str, dict] = {}
+
+    def record(self, view: str, report: dict):
+        with self._lock:
+            totals = self._views.setdefault(
+                view, {name: 0 for name, _ in self.COUNTERS} | {"max_queries": 0}
+            )
+            totals["requests"] += 1
+            totals["queries"] += report["queries"]
+            totals["db_seconds"] += report["db_ms"] / 1000
+            totals["serializer_seconds"] += report["serializer_ms"] / 1000
+            totals["n_plus_one"] += bool(report["n_plus_one"])
+            totals["over_budget"] += bool(report.get("over_budget"))
+            totals["max_queries"] = max(totals["max_queries"], report["queries"])
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+    def render(self) -> str:
+        with self._lock:
+            views = {view: dict(totals) for view, totals in self._views.items()}
+
+        lines = []
+        for name, help_text in self.COUNTERS:
+            metric = f"django_view_{name}_total"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            for view, totals in sorted(views.items()):
+                lines.append(f'{metric}{{view="{_label(view)}"}} {totals[name]}')
+
+        metric = "django_view_max_queries"
+        lines += [
+            f"# HELP {metric} Most queries of one request",
+            f"# TYPE {metric} gauge",
+        ]
+        for view, totals in sorted(views.items()):
+            lines.append(f'{metric}{{view="{_label(view)}"}} {totals["max_queries"]}')
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+metrics = Metrics()
+
+
+def view_name(request) -> str:
+    """The URL route of the request; url names repeat across views here."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    return match.route or match._func_path
+
+
+def report(recorder: QueryRecorder, view: str, policy: dict) -> dict:
+    repeated = recorder.repeated(policy["N_PLUS_ONE"])
+    result = {
+        "view": view,
+        "queries": recorder.count,
+        "savepoints": recorder.savepoints,
+        "db_ms": round(recorder.db_time * 1000, 2),
+        "serializer_ms": round(recorder.serializer_time * 1000, 2),
+        "n_plus_one": [{"sql": sql, "count": n} for sql, n in repeated[:5]],
+    }
+    budget = policy["BUDGETS"].get(view)
+    if budget is not None:
+        result["budget"] = budget
+        result["over_budget"] = recorder.count > budget
+    return result
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.policy = get_policy()
+        if self.policy["ENABLED"]:
+            instrument_serializers()
+
+    def __call__(self, request):
+        if not self.policy["ENABLED"]:
+            return self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        view = view_name(request)
+        result = report(recorder, view, self.policy)
+        result["method"] = request.method
+        result["status"] = response.status_code
+        metrics.record(view, result)
+
+        if result["n_plus_one"] or result.get("over_budget"):
+            logger.warning(json.dumps(result))
+        elif self.policy["LOG_ALL"]:
+            logger.info(json.dumps(result))
+        return response
+
+
+def metrics_view(request):
+    token = get_policy()["METRICS_TOKEN"]
+    if not token:
+        raise Http404
+    if request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=401)
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,181 @@
+"""
+Reference data: small tables (finance kinds, cashers, payment methods, asos,
+week days, the director) that most requests read and that change a few times
+a year.
+
+A Reference is a value built from the database on first use and kept in the
+process. Its version stamp lives in the shared "reference" cache, which is
+Redis when REFERENCE_CACHE_URL is set. A post_save/post_delete of one of its
+models drops the local value at once and bumps the stamp after the commit,
+so the other web and Celery processes rebuild theirs too. A process reads
+the stamp at most every CHECK_INTERVAL seconds; lookups in between never
+leave the process.
+
+A value loaded inside the transaction that changed its rows is kept only
+while that change can still commit: once it is rolled back the next lookup
+loads the rows again, so ids of rows that never existed do not stay around.
+
+    kinds = Reference("finance.kinds", load_kinds, Kind)
+    kinds.get()[FinanceKindTypeChoices.BONUS]
+
+Without a shared cache (or when it is down) each process only sees its own
+changes, like the module-level maps this replaces.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Generic, TypeVar
+
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+
+T = TypeVar("T")
+
+CACHE_ALIAS = "reference"
+
+# seconds a process trusts its copy before looking at the shared stamp again
+CHECK_INTERVAL = 5.0
+
+_registry: dict[str, "Reference"] = {}
+
+
+def _stamps():
+    return caches[CACHE_ALIAS]
+
+
+class _Bump:
+    """The after-commit bump of one change; ``done`` once it ran."""
+
+    def __init__(self, reference: "Reference"):
+        self.reference = reference
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        self.reference.bump()
+
+
+def _queued(change: _Bump) -> bool:
+    return any(callback is change for _, callback, _ in connection.run_on_commit)
+
+
+class Reference(Generic[T]):
+    """A value derived from a few reference tables, cached per process."""
+
+    def __init__(
+        self,
+        name: str,
+        load: Callable[[], T],
+        *models,
+        affects: Callable[..., bool] | None = None,
+    ):
+        """
+        ``load()`` builds the value; a save or delete of any of ``models``
+        invalidates it, unless ``affects(instance, **signal kwargs)`` says
+        that change cannot touch it.
+        """
+        self.name = name
+        self.load = load
+        self.affects = affects
+        # (version, value, checked at, uncommitted change it saw) swapped as
+        # one, so threads never see a value with another value's version
+        self._state: tuple | None = None
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+        for model in models:
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    self._on_change,
+                    sender=model,
+                    weak=False,
+                    dispatch_uid=f"reference:{name}:{model._meta.label}",
+                )
+
+    @property
+    def version_key(self) -> str:
+        return f"reference:{self.name}:version"
+
+    def _version(self, default):
+        try:
+            return _stamps().get(self.version_key, 0)
+        except Exception:
+            logging.warning("reference cache unavailable", exc_info=True)
+            return default
+
+    def _pending(self) -> _Bump | None:
+        """This thread's newest change of the rows still waiting to commit."""
+        if not connection.in_atomic_block:
+            return None
+        for _, callback, _ in reversed(connection.run_on_commit):
+            if isinstance(callback, _Bump) and callback.reference is self:
+                return callback
+        return None
+
+    @staticmethod
+    def _visible(state) -> bool:
+        # a value that saw an uncommitted change is good once the change
+        # committed, and until then only in the transaction that made it
+        change = state[3]
+        return change is None or change.done or _queued(change)
+
+    def get(self) -> T:
+        state = self._state
+        if state is not None and not self._visible(state):
+            state = None
+        now = time.monotonic()
+        if state is not None and now - state[2] < CHECK_INTERVAL:
+            return state[1]
+
+        version = self._version(state[0] if state else 0)
+        if state is not None and state[0] == version:
+            self._state = (version, state[1], now, state[3])
+            return state[1]
+
+        with self._lock:
+            state = self._state
+            if (
+                state is not None
+                and state[0] == version
+                and state[2] >= now
+                and self._visible(state)
+            ):
+                return state[1]
+            # the stamp is read before the rows, so a change committed in
+            # between is at worst loaded twice, never missed
+            value = self.load()
+            self._state = (version, value, now, self._pending())
+            return value
+
+    def reset(self):
+        """Drop this process's copy."""
+        self._state = None
+
+    def bump(self):
+        """Make every process reload."""
+        try:
+            stamps = _stamps()
+            try:
+                stamps.incr(self.version_key)
+            except ValueError:
+                stamps.set(self.version_key, 1, None)
+        except Exception:
+            logging.warning("reference cache unavailable", exc_info=True)
+
+    def invalidate(self):
+        # now for this process, and after the commit for the others, so none
+        # of them reloads the rows before the change is visible
+        self.reset()
+        transaction.on_commit(_Bump(self))
+
+    def _on_change(self, sender, instance, **kwargs):
+        if self.affects is None or self.affects(instance, **kwargs):
+            self.invalidate()
+
+
+def reset_all():
+    """Drop every process-local copy; tests call it as rows roll back."""
+    for reference in _registry.values():
+        reference.reset()
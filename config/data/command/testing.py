@@ -0,0 +1,54 @@
+"""
+Test helpers for per-endpoint query budgets.
+
+    class DashboardQueryTest(QueryBudgetMixin, TestCase):
+        def test_dashboard(self):
+            self.assertQueryBudget(5, "/dashboard/admin/")
+"""
+
+from rest_framework.test import APIClient
+
+from data.account.models import CustomUser
+from data.command.query_budget import QueryRecorder
+
+
+class QueryBudgetMixin:
+    """assertQueryBudget() for TestCase classes; requests run as a director."""
+
+    # repeats of one SQL template in a request that fail it as an N+1
+    n_plus_one = 3
+
+    def budget_user(self):
+        user = getattr(self, "_budget_user", None)
+        if user is None:
+            user = self._budget_user = CustomUser.objects.create(
+                phone="+998900009999", role="DIRECTOR"
+            )
+        return user
+
+    def assertQueryBudget(self, budget, path, method="get", n_plus_one=None, **kwargs):
+        """
+        Request ``path`` and fail when it runs more than ``budget`` queries or
+        one SQL template more than ``n_plus_one`` times. Returns the response.
+        """
+        client = APIClient()
+        client.force_authenticate(self.budget_user())
+        threshold = self.n_plus_one if n_plus_one is None else n_plus_one
+
+        with QueryRecorder() as recorder:
+            response = getattr(client, method)(path, **kwargs)
+
+        self.assertLess(response.status_code, 400, response.content[:500])
+        templates = "\n".join(
+            f"  {n}x {sql}" for sql, n in recorder.templates.most_common(10)
+        )
+        repeated = recorder.repeated(threshold)
+        if repeated:
+            sql, n = repeated[0]
+            self.fail(f"{path}: N+1, {n} runs of\n  {sql}\n{templates}")
+        self.assertLessEqual(
+            recorder.count,
+            budget,
+            f"{path}: {recorder.count} queries, budget {budget}\n{templates}",
+        )
+        return response
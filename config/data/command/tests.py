@@ -1,3 +1,173 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from data.command.query_budget import QueryRecorder, fingerprint, metrics
+from data.command.reference import reset_all
+from data.command.testing import QueryBudgetMixin
+from data.finances.finance.cache import get_kind, kind_id
+from data.finances.finance.choices import FinanceKindTypeChoices
+from data.finances.finance.models import Kind
+from data.lid.new_lid.models import Lid
+from data.logs.models import Log
+from data.student.groups.cache import day_id, days
+from data.student.groups.models import Day
+
+
+class ChangeTrackingTest(TestCase):
+    def test_changes_against_the_loaded_row(self):
+        log = Log.objects.get(pk=Log.objects.create(comment="old").pk)
+        self.assertFalse(log.has_changed("comment"))
+        self.assertEqual(log.changes(), {})
+
+        log.comment = "new"
+        self.assertTrue(log.has_changed("comment"))
+        self.assertEqual(log.old_value("comment"), "old")
+        self.assertEqual(log.changes(), {"comment": ("old", "new")})
+
+        log.save()
+        self.assertFalse(log.has_changed("comment"))
+        self.assertEqual(log.old_value("comment"), "new")
+
+    def test_refresh_from_db_moves_the_baseline(self):
+        log = Log.objects.create(comment="old")
+        Log.objects.filter(pk=log.pk).update(comment="elsewhere")
+
+        log.refresh_from_db()
+        self.assertEqual(log.comment, "elsewhere")
+        self.assertFalse(log.has_changed("comment"))
+
+    def test_deferred_fields_count_once_loaded(self):
+        log = Log.objects.only("id").get(pk=Log.objects.create(comment="old").pk)
+        self.assertEqual(log.comment, "old")  # deferred load
+        self.assertFalse(log.has_changed("comment"))
+
+    def test_lead_update_does_not_reload_the_row(self):
+        lead = Lid.objects.create(first_name="Old")
+        lead = Lid.objects.get(pk=lead.pk)
+        lead.first_name = "New"
+
+        with CaptureQueriesContext(connection) as queries:
+            lead.save()
+
+        # Lid.objects.get(pk=...) of the row being saved
+        by_pk = f'WHERE "{Lid._meta.db_table}"."id" = '
+        reloads = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT") and by_pk in query["sql"]
+        ]
+        self.assertEqual(reloads, [])
+        log = Log.objects.filter(lead=lead, action="LEAD_UPDATED").first()
+        self.assertIn('"Old" dan "New"', log.comment)
+
+
+class ReferenceTest(TestCase):
+    def setUp(self):
+        reset_all()
+
+    def test_lookups_stay_in_the_process(self):
+        bonus = Kind.get(FinanceKindTypeChoices.BONUS)
+        self.assertEqual(kind_id(FinanceKindTypeChoices.BONUS), bonus.pk)
+
+        with self.assertNumQueries(0):
+            kind = get_kind(FinanceKindTypeChoices.BONUS)
+            self.assertEqual(kind.pk, bonus.pk)
+            self.assertEqual(kind.action, "EXPENSE")
+            self.assertFalse(kind._state.adding)
+
+        bonus.name = "Mukofot"
+        bonus.save()
+        self.assertEqual(get_kind(FinanceKindTypeChoices.BONUS).name, "Mukofot")
+
+    def test_rows_of_a_rolled_back_transaction_are_not_kept(self):
+        class Abort(Exception):
+            pass
+
+        with self.assertRaises(Abort), transaction.atomic():
+            created = kind_id(FinanceKindTypeChoices.BONUS)
+            self.assertEqual(kind_id(FinanceKindTypeChoices.BONUS), created)
+            raise Abort
+
+        self.assertFalse(Kind.objects.filter(pk=created).exists())
+        bonus = kind_id(FinanceKindTypeChoices.BONUS)
+        self.assertNotEqual(bonus, created)
+        self.assertEqual(bonus, Kind.objects.get(kind=FinanceKindTypeChoices.BONUS).pk)
+
+    def test_changes_of_other_processes_come_with_the_stamp(self):
+        monday = Day.objects.create(name="Dushanba", display_name="Du", index=1)
+        self.assertEqual(day_id("Dushanba"), monday.pk)
+
+        # renamed by another process: no signal here, just its stamp
+        Day.objects.filter(pk=monday.pk).update(name="Monday")
+        self.assertEqual(day_id("Dushanba"), monday.pk)
+
+        days.bump()
+        with mock.patch("data.command.reference.CHECK_INTERVAL", 0):
+            self.assertIsNone(day_id("Dushanba"))
+            self.assertEqual(day_id("Monday"), monday.pk)
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    def test_fingerprint_folds_literals(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s)  LIMIT 21"),
+            "SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?",
+        )
+        self.assertEqual(
+            fingerprint("SELECT 1 FROM t WHERE id IN (%s)"),
+            fingerprint("SELECT 1 FROM t WHERE id IN (%s, %s, %s)"),
+        )
+
+    def test_repeated_templates_are_reported(self):
+        logs = [Log.objects.create(comment=str(i)) for i in range(4)]
+        with QueryRecorder() as recorder:
+            for log in logs:
+                Log.objects.filter(pk=log.pk).exists()
+            Log.objects.count()
+
+        self.assertEqual(recorder.count, 5)
+        [(sql, n)] = recorder.repeated(3)
+        self.assertEqual(n, 4)
+        self.assertIn("LIMIT ?", sql)
+        self.assertEqual(recorder.repeated(4), [])
+
+    def test_savepoints_are_not_queries(self):
+        class Abort(Exception):
+            pass
+
+        with QueryRecorder() as recorder:
+            with transaction.atomic():
+                Log.objects.count()
+            with self.assertRaises(Abort), transaction.atomic():
+                raise Abort
+
+        # SAVEPOINT + RELEASE, then SAVEPOINT + ROLLBACK TO + RELEASE
+        self.assertEqual(recorder.count, 1)
+        self.assertEqual(recorder.savepoints, 5)
+        [sql] = recorder.templates
+        self.assertTrue(sql.startswith("SELECT COUNT(*)"), sql)
+
+    @override_settings(QUERY_BUDGET={"BUDGETS": {"dashboard/funnel/": 0}})
+    def test_middleware_reports_over_budget(self):
+        metrics.reset()
+        with self.assertLogs("query_budget", "WARNING") as logs:
+            self.assertQueryBudget(1, "/dashboard/funnel/")
+
+        self.assertIn('"over_budget": true', logs.output[0])
+        rendered = metrics.render()
+        for counter in ("requests", "over_budget"):
+            self.assertIn(
+                f'django_view_{counter}_total{{view="dashboard/funnel/"}} 1', rendered
+            )
+
+    @override_settings(QUERY_BUDGET={"METRICS_TOKEN": "secret"})
+    def test_metrics_need_the_token(self):
+        self.assertEqual(self.client.get("/metrics/queries").status_code, 401)
+        response = self.client.get(
+            "/metrics/queries", HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"# TYPE django_view_queries_total counter", response.content)
@@ -0,0 +1,47 @@
+import threading
+
+from django.db import connection, transaction
+
+_local = threading.local()
+
+
+class _Batch:
+    """on_commit callback that hands everything collected under one key to a callback."""
+
+    def __init__(self, key, callback):
+        self.key = key
+        self.callback = callback
+        self.items = []
+
+    def __call__(self):
+        batches = getattr(_local, "batches", {})
+        if batches.get(self.key) is self:
+            del batches[self.key]
+
+        if self.items:
+            self.callback(self.items)
+
+
+def collect_on_commit(key: str, item, callback):
+    """
+    Queue ``item`` under ``key``; ``callback(items)`` runs once, after the
+    current transaction commits, with everything queued for that key.
+
+    Outside a transaction the callback runs immediately with ``[item]``.
+    If the transaction that registered the batch was rolled back Django has
+    dropped its callback, so a new batch is started.
+    """
+    if not connection.in_atomic_block:
+        callback([item])
+        return
+
+    batches = _local.__dict__.setdefault("batches", {})
+    batch = batches.get(key)
+
+    if batch is None or not any(
+        entry[1] is batch for entry in connection.run_on_commit
+    ):
+        batch = batches[key] = _Batch(key, callback)
+        transaction.on_commit(batch)
+
+    batch.items.append(item)
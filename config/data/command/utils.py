@@ -96,6 +96,7 @@ def _frame_locals_snapshot(
 def capture_context_deep(
     *,
     include_stack_locals: bool = True,
+    include_caller_locals: bool = True,  # top-level "locals" of the call site
     stack_max_frames: int = 10,  # how many frames to keep (tail of the stack)
     locals_max_items: int = 50,  # per frame locals limit (keys/items)
     locals_depth: int = 2,  # nesting depth for complex values
@@ -142,12 +143,12 @@ def capture_context_deep(
         }
 
         # Build stack summaries
-        extracted = traceback.extract_stack(caller)
-        # Keep only the last N frames (closest to the call site)
+        # Keep only the last N frames (closest to the call site); for "tail"
+        # let traceback stop walking early instead of formatting every frame.
         if order == "tail":
-            frames_to_keep = extracted[-stack_max_frames:]
+            frames_to_keep = traceback.extract_stack(caller, limit=stack_max_frames)
         else:
-            frames_to_keep = extracted[:stack_max_frames]
+            frames_to_keep = traceback.extract_stack(caller)[:stack_max_frames]
 
         stack_summary = []
         if include_stack_locals:
@@ -196,9 +197,13 @@ def capture_context_deep(
 
         envelope["stack"] = stack_summary
         # Also include caller frame locals at top-level convenience:
-        envelope["locals"] = _frame_locals_snapshot(
-            caller, max_items=locals_max_items, max_len=max_str_len, depth=locals_depth
-        )
+        if include_caller_locals:
+            envelope["locals"] = _frame_locals_snapshot(
+                caller,
+                max_items=locals_max_items,
+                max_len=max_str_len,
+                depth=locals_depth,
+            )
         return envelope
     finally:
         # IMPORTANT: break reference cycles so GC can collect frames
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('comments', '0001_initial'),
+        ('filial', '0001_initial'),
+        ('new_lid', '0001_initial'),
+        ('student', '0001_initial'),
+        ('upload', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='lid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='stuffcomments',
+            name='creator',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments_stuff', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='stuffcomments',
+            name='file',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stuff_comments_photo', to='upload.file'),
+        ),
+        migrations.AddField(
+            model_name='stuffcomments',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='stuffcomments',
+            name='stuff',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='comments_stuff_user', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='comment',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='comments_comment_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='stuffcomments',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='comments_stuffcomments_arch_ts_chk'),
+        ),
+    ]
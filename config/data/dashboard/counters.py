@@ -0,0 +1,332 @@
+from datetime import datetime, timedelta
+
+from django.db.models import Count, F, Q, QuerySet
+from django.utils.dateparse import parse_date
+from django.utils.timezone import make_aware
+
+from data.dashboard.funnel import rollup_sums
+from data.finances.finance.choices import FinanceKindTypeChoices
+from data.finances.finance.models import Finance
+from data.lid.new_lid.models import Lid
+from data.student.attendance.models import Attendance
+from data.student.lesson.models import FirstLLesson
+from data.student.student.models import Student
+from data.student.studentgroup.models import StudentGroup
+
+FIRST_LESSON_STAGE = "BIRINCHI_DARS_BELGILANGAN"
+
+# query param -> lookup on the model the counters are computed over
+LEAD_DIMENSIONS = {
+    "marketing_channel": "marketing_channel_id",
+    "service_manager": "service_manager_id",
+    "sales_manager": "sales_manager_id",
+    "call_operator": "call_operator_id",
+    "subject": "subject_id",
+    "teacher": "groups__group__teacher_id",
+    "course": "groups__group__course_id",
+}
+
+STUDENT_DIMENSIONS = LEAD_DIMENSIONS
+
+# Params the FunnelRollup cannot answer like the raw rows: it has no
+# is_student or service_manager dimension, and it attributes a lead/student to
+# one group where the course/teacher joins count it once per matching group.
+RAW_PARAMS = ("is_student", "service_manager", "course", "teacher")
+
+# DashboardView counter -> rollup counter, narrowed by the dimension params
+DASHBOARD_ROLLUP = {
+    "lids": "leads",
+    "archived_lid": "leads_archived",
+    "order_fix_created": "orders_unstaged",
+    "orders": "orders",
+    "orders_archived": "orders_archived",
+    "first_lesson_come": "new_students",
+    "first_lesson_come_archived": "new_students_archived",
+}
+
+DASHBOARD_SECOND_ROLLUP = {
+    "lids": "leads_no_lesson",
+    "archived_lid": "leads_no_lesson_archived",
+    "orders": "orders_no_lesson",
+    "orders_archived": "orders_no_lesson_archived",
+    "first_lesson": "first_lessons",
+}
+
+FIRST_LESSON_DIMENSIONS = {
+    "marketing_channel": "lid__marketing_channel_id",
+    "service_manager": "lid__service_manager_id",
+    "sales_manager": "lid__sales_manager_id",
+    "call_operator": "lid__call_operator_id",
+    "subject": "lid__subject_id",
+    "teacher": "group__teacher_id",
+    "course": "group__course_id",
+}
+
+
+class CounterSet:
+    """
+    A group of counters over one base queryset, computed with a single
+    ``aggregate(Count(filter=Q(...)))`` query instead of one ``.count()`` each.
+
+    Every ``filter()`` call is applied to the base exactly like it used to be
+    applied to each separate queryset (one call per dimension, so multi-valued
+    joins produce the same rows and the same counts).
+    """
+
+    def __init__(self, queryset: QuerySet):
+        self.queryset = queryset
+        self.counters: dict[str, Q] = {}
+
+    def filter(self, *args, **kwargs) -> "CounterSet":
+        self.queryset = self.queryset.filter(*args, **kwargs)
+        return self
+
+    def filter_dimensions(self, params, dimensions: dict) -> "CounterSet":
+        for param, lookup in dimensions.items():
+            value = params.get(param)
+            if value:
+                self.filter(**{lookup: value})
+        return self
+
+    def add(self, name: str, *args, **kwargs) -> "CounterSet":
+        # drop empty Q() parts so an unconditional counter stays a plain COUNT
+        self.counters[name] = Q(*[q for q in args if q], **kwargs)
+        return self
+
+    def rows(self, name: str) -> QuerySet:
+        """Rows behind one counter, for responses that list them."""
+        return self.queryset.filter(self.counters[name])
+
+    def evaluate(self) -> dict[str, int]:
+        if not self.counters:
+            return {}
+
+        return self.queryset.order_by().aggregate(
+            **{
+                name: Count("pk", filter=q if q else None)
+                for name, q in self.counters.items()
+            }
+        )
+
+
+def _is_student(params):
+    is_student = params.get("is_student")
+    return is_student.capitalize() if is_student else None
+
+
+def _from_rollup(params) -> bool:
+    return not any(params.get(param) for param in RAW_PARAMS)
+
+
+def dashboard_counters(params) -> dict[str, int]:
+    """
+    Funnel counters for DashboardView: one query per base table. The Lid and
+    Student counters come from the FunnelRollup unless a param needs the raw
+    rows (RAW_PARAMS).
+    """
+    start_date = params.get("start_date")
+    end_date = params.get("end_date")
+    filial = params.get("filial")
+    is_student = _is_student(params)
+
+    filters = {}
+    # the same window in whole rollup days
+    days = (None, None)
+    if start_date and end_date:
+        start_dt = make_aware(datetime.strptime(start_date, "%Y-%m-%d"))
+        end_dt = make_aware(datetime.strptime(end_date, "%Y-%m-%d"))
+        filters["created_at__range"] = (start_dt, end_dt)
+        days = (start_dt.date(), end_dt.date() - timedelta(days=1))
+    elif start_date:
+        start_dt = make_aware(datetime.strptime(start_date, "%Y-%m-%d"))
+        filters["created_at__date"] = start_dt.date()
+        days = (start_dt.date(), start_dt.date())
+    if filial:
+        filters["filial"] = filial
+
+    # "Not archived" only narrows lids/orders when is_student is given
+    active = Q(is_archived=False) if is_student else Q()
+
+    leads = CounterSet(Lid.objects.filter(**filters))
+    if is_student:
+        leads.filter(is_student=is_student)
+    leads.filter_dimensions(params, LEAD_DIMENSIONS)
+    leads.add("lids", active)
+    leads.add("archived_lid", lid_stage_type="NEW_LID", is_archived=True)
+    leads.add(
+        "order_fix_created",
+        lid_stage_type="ORDERED_LID",
+        lid_stages__isnull=True,
+        ordered_stages__isnull=False,
+    )
+    leads.add("orders", active, lid_stage_type="ORDERED_LID")
+    leads.add("orders_archived", lid_stage_type="ORDERED_LID", is_archived=True)
+
+    # Not narrowed by any dimension
+    archived_leads = CounterSet(Lid.objects.filter(**filters))
+    archived_leads.add("first_lesson_archived", is_archived=True, is_student=False)
+
+    first_lessons = CounterSet(FirstLLesson.objects.filter(**filters))
+    if is_student:
+        first_lessons.filter(lid__is_student=is_student, is_archived=False)
+    first_lessons.filter_dimensions(params, FIRST_LESSON_DIMENSIONS)
+    first_lessons.add("first_lesson")
+
+    students = CounterSet(
+        Student.objects.filter(student_stage_type="NEW_STUDENT", **filters)
+    )
+    if is_student:
+        students.filter(is_archived=False)
+    students.filter_dimensions(params, STUDENT_DIMENSIONS)
+    students.add("first_lesson_come")
+    students.add("first_lesson_come_archived", is_archived=True)
+
+    # Not narrowed by any dimension
+    student_groups = CounterSet(StudentGroup.objects.filter(**filters))
+    student_groups.add(
+        "new_student_archived",
+        student__student_stage_type="NEW_STUDENT",
+        student__is_archived=True,
+    )
+    student_groups.add("new_student", student__student_stage_type="NEW_STUDENT")
+    student_groups.add(
+        "active_student",
+        student__student_stage_type="ACTIVE_STUDENT",
+        group__status="ACTIVE",
+    )
+    student_groups.add(
+        "active_student_archived",
+        student__student_stage_type="ACTIVE_STUDENT",
+        student__is_archived=True,
+        group__status="ACTIVE",
+    )
+    student_groups.add("course_ended", group__status="INACTIVE")
+
+    if _from_rollup(params):
+        data = rollup_sums(
+            days,
+            filial,
+            params,
+            narrowed=DASHBOARD_ROLLUP,
+            whole={"first_lesson_archived": "archived_not_student"},
+        )
+        counter_sets = (first_lessons, student_groups)
+    else:
+        data = {}
+        counter_sets = (leads, archived_leads, first_lessons, students, student_groups)
+
+    for counter_set in counter_sets:
+        data.update(counter_set.evaluate())
+
+    return data
+
+
+def dashboard_second_counters(params) -> tuple[dict[str, int], CounterSet]:
+    """
+    Funnel counters for DashboardSecondView. Also returns the lead CounterSet
+    so the view can list the rows behind "lids". Like dashboard_counters, the
+    Lid and Student counts come from the FunnelRollup when the params allow.
+    """
+    start_date = params.get("start_date")
+    end_date = params.get("end_date")
+    filial = params.get("filial")
+    is_student = _is_student(params)
+
+    filters = {}
+    if start_date:
+        filters["created_at__gte"] = start_date
+    if end_date:
+        filters["created_at__lte"] = end_date
+    if filial:
+        filters["filial_id"] = filial
+
+    active = Q(is_archived=False) if is_student else Q()
+    not_first_lesson = ~Q(ordered_stages=FIRST_LESSON_STAGE)
+
+    leads = CounterSet(Lid.objects.filter(**filters))
+    if is_student:
+        leads.filter(is_student=is_student)
+    leads.filter_dimensions(params, LEAD_DIMENSIONS)
+    leads.add("lids", active, not_first_lesson, lid_stage_type="NEW_LID")
+    leads.add(
+        "archived_lid", not_first_lesson, lid_stage_type="NEW_LID", is_archived=True
+    )
+    leads.add("orders", active, not_first_lesson, lid_stage_type="ORDERED_LID")
+    leads.add(
+        "orders_archived",
+        not_first_lesson,
+        lid_stage_type="ORDERED_LID",
+        is_archived=True,
+    )
+    leads.add(
+        "first_lesson",
+        ordered_stages=FIRST_LESSON_STAGE,
+        is_student=False,
+        is_archived=False,
+    )
+
+    # Students with One Attendance
+    students_with_one_attendance = (
+        Attendance.objects.values("student")
+        .annotate(count=Count("id"))
+        .filter(count=1, **filters)
+        .values_list("student", flat=True)
+    )
+
+    # First Course Payment Students
+    payment_students = Finance.objects.filter(
+        student__isnull=False,
+        kind__kind=FinanceKindTypeChoices.COURSE_PAYMENT,
+        **filters,
+    ).values_list("student", flat=True)
+
+    came = Q(id__in=students_with_one_attendance)
+    paid = Q(id__in=payment_students)
+    if is_student:
+        came &= Q(is_archived=False)
+        paid &= Q(is_archived=is_student)
+
+    students = CounterSet(Student.objects.filter(**filters))
+    students.filter_dimensions(params, STUDENT_DIMENSIONS)
+    students.add("first_lesson_come", came)
+    students.add("first_lesson_come_archived", came, is_archived=True)
+    students.add("first_course_payment", paid)
+    students.add("first_course_payment_archived", paid, is_archived=True)
+
+    # Not narrowed by any dimension
+    all_students = CounterSet(Student.objects.filter(is_archived=False, **filters))
+    all_students.add("new_student", student_stage_type="NEW_STUDENT")
+    all_students.add("active_student", student_stage_type="ACTIVE_STUDENT")
+
+    student_groups = CounterSet(StudentGroup.objects.filter(**filters))
+    student_groups.add("course_ended", group__status="INACTIVE")
+
+    # only plain dates map to rollup days; anything else needs the raw rows
+    first = parse_date(start_date) if start_date else None
+    last = parse_date(end_date) if end_date else None
+    dated = bool(first or not start_date) and bool(last or not end_date)
+
+    if _from_rollup(params) and dated:
+        data = rollup_sums(
+            # created_at <= end_date stops at its midnight
+            (first, last - timedelta(days=1) if last else None),
+            filial,
+            params,
+            narrowed=DASHBOARD_SECOND_ROLLUP,
+            whole={
+                "new_student": F("new_students") - F("new_students_archived"),
+                "active_student": F("active_students")
+                - F("active_students_archived"),
+            },
+        )
+        counter_sets = (students, student_groups)
+    else:
+        data = {}
+        counter_sets = (leads, students, all_students, student_groups)
+
+    for counter_set in counter_sets:
+        data.update(counter_set.evaluate())
+
+    data["all_students"] = data["new_student"] + data["active_student"]
+
+    return data, leads
@@ -0,0 +1,510 @@
+"""
+Dashboard Excel exports (see data.upload.exports).
+"""
+
+from datetime import datetime, timedelta
+from operator import itemgetter
+
+from django.db.models import Case, Count, DecimalField, F, Sum, Value, When
+from django.db.models.functions import Concat
+from openpyxl.styles import Alignment, Font, PatternFill
+
+from data.account.models import CustomUser
+from data.dashboard.monitoring import (
+    asos_balls_by_teacher,
+    results_by_teacher,
+    subjects_by_teacher,
+)
+from data.department.filial.models import Filial
+from data.finances.finance.choices import FinanceKindTypeChoices
+from data.finances.finance.models import Finance, SaleStudent
+from data.lid.new_lid.models import Lid
+from data.student.groups.models import Group
+from data.student.lesson.models import FirstLLesson
+from data.student.student.models import Student
+from data.student.studentgroup.models import StudentGroup
+from data.upload.exports import (
+    CENTER,
+    Cell,
+    Column,
+    Export,
+    Sheet,
+    newest_first,
+    register,
+)
+
+BANNER_FONT = Font(size=14, bold=True)
+
+
+@register
+class MonitoringExport(Export):
+    """Teachers and assistants by monitoring points."""
+
+    name = "monitoring"
+    filename = "monitoring_report.xlsx"
+
+    columns = [
+        Column("O'qituvchi"),
+        Column("Roli"),
+        Column("Filial"),
+        Column("Fanlar"),
+        Column("ASOS_1_2"),
+        Column("ASOS_3"),
+        Column("ASOS_4"),
+        Column("ASOS_5"),
+        Column("ASOS_6"),
+        Column("ASOS_7"),
+        Column("ASOS_8_9"),
+        Column("ASOS_10_11"),
+        Column("ASOS_12_13_14"),
+        Column("Natijalar soni"),
+        Column("Monitoring ball"),
+    ]
+
+    def teachers(self) -> list[dict]:
+        start_date_str = self.param("start_date")
+        end_date_str = self.param("end_date")
+        start_date = end_date = None
+        if start_date_str and end_date_str:
+            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
+            end_date = datetime.strptime(end_date_str, "%Y-%m-%d") + timedelta(days=1)
+        elif start_date_str:
+            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
+            end_date = start_date + timedelta(days=1)
+
+        teachers = CustomUser.objects.filter(
+            role__in=["TEACHER", "ASSISTANT"]
+        ).annotate(
+            name=Concat(F("first_name"), Value(" "), F("last_name")),
+            overall_point=F("monitoring"),
+        )
+        if role := self.param("role"):
+            teachers = teachers.filter(role=role)
+        if teacher := self.param("teacher"):
+            teachers = teachers.filter(id=teacher)
+        if course_id := self.param("course"):
+            teachers = teachers.filter(teachers_groups__course__id=course_id)
+        subject_id = self.param("subject")
+        if subject_id:
+            teachers = teachers.filter(teachers_groups__course__subject__id=subject_id)
+        if full_name := self.param("search"):
+            teachers = teachers.filter(name__icontains=full_name)
+        if filial := self.param("filial"):
+            teachers = teachers.filter(filial__id=filial)
+        if start_date and end_date:
+            teachers = teachers.filter(
+                created_at__date__gte=start_date.date(),
+                created_at__date__lt=end_date.date(),
+            )
+
+        teachers = list(teachers.prefetch_related("filial"))
+        teacher_ids = [teacher.id for teacher in teachers]
+
+        subjects = subjects_by_teacher(teacher_ids, subject_id=subject_id)
+        results = results_by_teacher(
+            teacher_ids, start=start_date, end=end_date, status="Accepted"
+        )
+        balls = asos_balls_by_teacher(teacher_ids, start=start_date, end=end_date)
+
+        teacher_data = []
+        for teacher in teachers:
+            subject_names = ", ".join(
+                sorted(set(s["subject_name"] for s in subjects.get(teacher.id, [])))
+            )
+            filial_names = [f.name for f in teacher.filial.all()]
+            teacher_data.append(
+                {
+                    "name": teacher.name,
+                    "role": teacher.role,
+                    "filial": ", ".join(filial_names) if filial_names else "-",
+                    "subjects": subject_names or "-",
+                    **balls[teacher.id],
+                    "results": results.get(teacher.id, 0),
+                    "points": teacher.overall_point or 0,
+                }
+            )
+        return sorted(teacher_data, key=itemgetter("points"), reverse=True)
+
+    def rows(self):
+        total_results = 0
+        for teacher in self.teachers():
+            yield [
+                teacher["name"],
+                "O'qituvchi" if teacher["role"] == "TEACHER" else "Assistent",
+                teacher["filial"],
+                teacher["subjects"],
+                teacher["asos_1"],
+                teacher["asos_3"],
+                teacher["asos_4"],
+                "",
+                "",
+                "",
+                "",
+                "",
+                teacher["asos_12_13_14"],
+                teacher["results"],
+                teacher["points"],
+            ]
+            total_results += teacher["results"]
+
+        yield []
+        yield ["", "", "", "Umumiy natijalar soni:", total_results]
+
+    def sheets(self):
+        yield Sheet(
+            "Monitoring",
+            self.columns,
+            self.rows(),
+            banner=Cell("📊 Monitoring hisoboti", font=BANNER_FONT, alignment=CENTER),
+            header=None,
+        )
+
+
+@register
+class DashboardExport(Export):
+    """Sales per creator, finance totals per kind and the weekly finance."""
+
+    name = "dashboard"
+    filename = "Dashboard_Data.xlsx"
+
+    def sales_rows(self):
+        filters = {}
+        for param, lookup in [
+            ("creator", "creator__id"),
+            ("sale", "sale__id"),
+            ("student", "student__id"),
+            ("filial", "filial__id"),
+        ]:
+            if value := self.param(param):
+                filters[lookup] = value
+
+        sales = SaleStudent.objects.filter(**filters).order_by()
+        # one grouped query per number, matched by creator in memory
+        voucher = dict(
+            sales.filter(sale__type="VOUCHER")
+            .values("creator")
+            .annotate(total=Sum("sale__amount"))
+            .values_list("creator", "total")
+        )
+        discount = dict(
+            sales.filter(sale__type="SALE")
+            .values("creator")
+            .annotate(
+                total=Sum(
+                    Case(
+                        When(
+                            groups__group__price_type="monthly",
+                            then=F("groups__group__price")
+                            * F("sale__amount")
+                            / Value(100),
+                        ),
+                        default=Value(0),
+                        output_field=DecimalField(),
+                    )
+                )
+            )
+            .values_list("creator", "total")
+        )
+        total = dict(
+            sales.values("creator")
+            .annotate(total=Sum("sale__amount"))
+            .values_list("creator", "total")
+        )
+
+        for creator, name, students in (
+            sales.values("creator", "creator__full_name")
+            .annotate(students=Count("student", distinct=True))
+            .values_list("creator", "creator__full_name", "students")
+        ):
+            yield [
+                name or "",
+                students,
+                voucher.get(creator) or 0,
+                discount.get(creator) or 0,
+                total.get(creator) or 0,
+            ]
+
+    def finance_rows(self):
+        filters = {}
+        for param, lookup in [
+            ("kind", "kind__id"),
+            ("action", "action"),
+            ("creator", "creator__id"),
+            ("student", "student__id"),
+            ("stuff", "stuff__id"),
+            ("casher", "casher__id"),
+            ("payment_method", "payment_method"),
+        ]:
+            if value := self.param(param):
+                filters[lookup] = value
+
+        return (
+            Finance.objects.filter(**filters)
+            .values("kind__id", "kind__name", "action")
+            .annotate(total_amount=Sum("amount"))
+            .order_by("kind__name")
+            .values_list("kind__name", "action", "total_amount")
+        )
+
+    def weekly_rows(self):
+        filters = {}
+        for param, lookup in [
+            ("casher", "casher__id"),
+            ("kind", "kind__name"),
+            ("start_date", "created_at__gte"),
+            ("end_date", "created_at__lte"),
+        ]:
+            if value := self.param(param):
+                filters[lookup] = value
+
+        return (
+            Finance.objects.filter(**filters)
+            .values("kind__name")
+            .annotate(total_amount=Sum("amount"))
+            .order_by()
+            .values_list("kind__name", "total_amount")
+        )
+
+    def sheets(self):
+        yield Sheet(
+            "Sales Data",
+            [
+                Column(title, 20)
+                for title in [
+                    "Yaratuvchi xodim",
+                    "Jami Studentlar",
+                    "Voucher Sales",
+                    "Sale Discount",
+                    "Total Sales",
+                ]
+            ],
+            self.sales_rows(),
+        )
+        yield Sheet(
+            "Finance Statistics",
+            [Column(title, 20) for title in ["Kind Name", "Action", "Total Amount"]],
+            self.finance_rows(),
+        )
+        yield Sheet(
+            "Weekly Finance",
+            [Column(title, 20) for title in ["Kind Name", "Total Amount"]],
+            self.weekly_rows(),
+        )
+
+
+# daily report rows and the fill of their numbers
+# rows of the filial sheet of the daily report, in order
+DAILY_LABELS = [
+    "Buyurtma",
+    "Birinchi darsga keladiganlar",
+    "Yangi o‘quvchi",
+    "Aktiv",
+    "Qarzdorlar",
+    "Guruhlar",
+    "Shu oyda to‘lov qilganlar",
+    "Arxiv",
+    "JAMI REAL BOR",
+    "Jami o‘quvchi",
+    "Jami aktiv",
+    "Guruhdagi jami aktiv o‘quvchilar",
+]
+
+DAILY_FILLS = {
+    "Qarzdorlar": "FF0000",
+    "Aktiv": "00FF00",
+    "JAMI REAL BOR": "FFFF00",
+    "Jami o‘quvchi": "00FFFF",
+}
+
+
+@register
+class DailyReport(Export):
+    """
+    Per-filial student numbers of the last day, and every finance row; sent
+    to the directors by send_daily_excel_report.
+    """
+
+    name = "daily_report"
+
+    @property
+    def filename(self):
+        return f"report_{datetime.now().strftime('%d-%m-%Y')}.xlsx"
+
+    def count(self):
+        # one row per label on the filial sheet, one per finance on the other
+        return len(DAILY_LABELS) + Finance.objects.count()
+
+    def filial_numbers(self) -> tuple[list, dict]:
+        since = datetime.now() - timedelta(days=1)
+        filials = list(Filial.objects.all())
+
+        data = {label: [] for label in DAILY_LABELS}
+        for filial in filials:
+            data["Buyurtma"].append(
+                Lid.objects.filter(
+                    filial=filial, ordered_date__gte=since, is_archived=False
+                ).count()
+            )
+            data["Birinchi darsga keladiganlar"].append(
+                FirstLLesson.objects.filter(
+                    filial=filial, created_at__gte=since, lid__is_archived=False
+                ).count()
+            )
+            data["Yangi o‘quvchi"].append(
+                Student.objects.filter(
+                    filial=filial,
+                    student_stage_type="NEW_STUDENT",
+                    new_student_date__gte=since,
+                    is_archived=False,
+                ).count()
+            )
+            data["Aktiv"].append(
+                Student.objects.filter(
+                    filial=filial,
+                    student_stage_type="ACTIVE_STUDENT",
+                    active_date__gte=since,
+                    is_archived=False,
+                ).count()
+            )
+            data["Qarzdorlar"].append(
+                Student.objects.filter(
+                    filial=filial, balance_status="INACTIVE", is_archived=False
+                ).count()
+            )
+            data["Guruhlar"].append(
+                Group.objects.filter(filial=filial, status="ACTIVE").count()
+            )
+            data["Shu oyda to‘lov qilganlar"].append(
+                Finance.objects.filter(
+                    student__isnull=False,
+                    filial=filial,
+                    kind__kind=FinanceKindTypeChoices.COURSE_PAYMENT,
+                    created_at__lte=datetime.today().replace(day=1),
+                    created_at__gte=datetime.today(),
+                ).count()
+            )
+            data["Arxiv"].append(
+                Lid.objects.filter(
+                    filial=filial, is_student=False, is_archived=True
+                ).count()
+                + Student.objects.filter(filial=filial, is_archived=True).count()
+            )
+            data["JAMI REAL BOR"].append(
+                Student.objects.filter(
+                    filial=filial, is_archived=False, is_frozen=False
+                ).count()
+            )
+            in_groups = StudentGroup.objects.filter(
+                filial=filial, group__status="ACTIVE", student__is_archived=False
+            ).count()
+            data["Jami o‘quvchi"].append(in_groups)
+            data["Jami aktiv"].append(
+                Student.objects.filter(filial=filial, balance_status="ACTIVE").count()
+            )
+            data["Guruhdagi jami aktiv o‘quvchilar"].append(in_groups)
+
+        for values in data.values():
+            values.append(sum(values))
+        return [filial.name for filial in filials], data
+
+    def filial_sheet(self) -> Sheet:
+        names, data = self.filial_numbers()
+        titles = ["Jarayonlar", *names, "Jami"]
+        banner = datetime.now().strftime("%d/%m/%Y")
+
+        rows = []
+        for label, values in data.items():
+            fill = DAILY_FILLS.get(label)
+            rows.append(
+                [
+                    label,
+                    *(
+                        Cell(value, fill=PatternFill("solid", fgColor=fill))
+                        if fill
+                        else value
+                        for value in values
+                    ),
+                ]
+            )
+
+        # widths fitted to the content, the banner in column A included
+        widths = [len(title) for title in titles]
+        widths[0] = max(widths[0], len(banner), *(len(label) for label in data))
+        for values in data.values():
+            for i, value in enumerate(values, 1):
+                widths[i] = max(widths[i], len(str(value)))
+
+        return Sheet(
+            "Kunlik reportlar",
+            [Column(title, width + 3) for title, width in zip(titles, widths)],
+            rows,
+            banner=Cell(
+                banner,
+                font=Font(bold=True, size=14, color="FFFFFF"),
+                fill=PatternFill("solid", fgColor="4CAF50"),
+                alignment=Alignment(horizontal="center"),
+            ),
+            header=Cell(
+                None,
+                font=Font(bold=True, size=12),
+                fill=PatternFill("solid", fgColor="FFFF00"),
+                alignment=Alignment(horizontal="center"),
+            ),
+            plain_headers=1,
+        )
+
+    def finance_rows(self):
+        for (
+            student_id,
+            first_name,
+            last_name,
+            stuff_id,
+            stuff_name,
+            comment,
+            amount,
+            payment_method,
+            casher_id,
+            casher_name,
+        ) in newest_first(
+            Finance.objects.all(),
+            "student_id",
+            "student__first_name",
+            "student__last_name",
+            "stuff_id",
+            "stuff__full_name",
+            "comment",
+            "amount",
+            "payment_method",
+            "casher_id",
+            "casher__user__full_name",
+        ):
+            if student_id:
+                kind, who = "Student to'ladi", f"{first_name} {last_name}"
+            elif stuff_id:
+                kind, who = "Hodim avans", stuff_name
+            else:
+                kind, who = "Boshqa", "Unknown"
+            yield [
+                kind,
+                who,
+                comment or "-",
+                amount,
+                payment_method,
+                casher_name if casher_id else "-",
+            ]
+
+    def sheets(self):
+        yield self.filial_sheet()
+        yield Sheet(
+            "Moliya Hisobot",
+            [
+                Column("Turi", 18),
+                Column("Kim", 30),
+                Column("Comment", 50),
+                Column("Qiy mati", 15),
+                Column("To'lov turi", 15),
+                Column("Kassa", 30),
+            ],
+            self.finance_rows(),
+            header=None,
+        )
@@ -0,0 +1,297 @@
+"""
+Maintenance and reads for the FunnelRollup table.
+
+A bucket is one (date, filial) pair, date being the local creation date of
+the lead/student. Whenever a Lid or Student is saved its bucket is marked
+dirty; after commit the bucket is rebuilt from the raw rows with two grouped
+queries. Reading a date range is then a SUM over at most one row per
+dimension combination per day, no matter how much history there is.
+
+A lead/student is attributed to the course and teacher of its latest
+non-archived group (falling back to the latest archived one), so students in
+two groups are not counted twice.
+"""
+
+from datetime import date, datetime, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from data.command.transactions import collect_on_commit
+from data.dashboard.models import FunnelRollup
+from data.lid.new_lid.models import Lid
+from data.student.student.models import Student
+from data.student.studentgroup.models import StudentGroup
+
+FIRST_LESSON_STAGE = "BIRINCHI_DARS_BELGILANGAN"
+
+# not (yet) booked for a first lesson
+NO_LESSON = ~Q(ordered_stages=FIRST_LESSON_STAGE)
+
+LEAD_COUNTERS = {
+    "leads": Q(),
+    "leads_archived": Q(lid_stage_type="NEW_LID", is_archived=True),
+    "leads_no_lesson": Q(NO_LESSON, lid_stage_type="NEW_LID"),
+    "leads_no_lesson_archived": Q(
+        NO_LESSON, lid_stage_type="NEW_LID", is_archived=True
+    ),
+    "archived_not_student": Q(is_archived=True, is_student=False),
+    "orders": Q(lid_stage_type="ORDERED_LID"),
+    "orders_archived": Q(lid_stage_type="ORDERED_LID", is_archived=True),
+    "orders_no_lesson": Q(NO_LESSON, lid_stage_type="ORDERED_LID"),
+    "orders_no_lesson_archived": Q(
+        NO_LESSON, lid_stage_type="ORDERED_LID", is_archived=True
+    ),
+    "orders_unstaged": Q(
+        lid_stage_type="ORDERED_LID",
+        lid_stages__isnull=True,
+        ordered_stages__isnull=False,
+    ),
+    "first_lessons": Q(
+        ordered_stages=FIRST_LESSON_STAGE, is_student=False, is_archived=False
+    ),
+}
+
+STUDENT_COUNTERS = {
+    "new_students": Q(student_stage_type="NEW_STUDENT"),
+    "new_students_archived": Q(student_stage_type="NEW_STUDENT", is_archived=True),
+    "active_students": Q(student_stage_type="ACTIVE_STUDENT"),
+    "active_students_archived": Q(
+        student_stage_type="ACTIVE_STUDENT", is_archived=True
+    ),
+}
+
+COUNTERS = [*LEAD_COUNTERS, *STUDENT_COUNTERS]
+
+DIMENSIONS = [
+    "filial_id",
+    "marketing_channel_id",
+    "sales_manager_id",
+    "call_operator_id",
+    "subject_id",
+    "course_id",
+    "teacher_id",
+]
+
+# query param -> FunnelRollup lookup, same names as DashboardView
+PARAM_DIMENSIONS = {
+    "filial": "filial_id",
+    "marketing_channel": "marketing_channel_id",
+    "sales_manager": "sales_manager_id",
+    "call_operator": "call_operator_id",
+    "subject": "subject_id",
+    "course": "course_id",
+    "teacher": "teacher_id",
+}
+
+
+def _bucket_of(instance, filial_id=None) -> tuple[str, str | None]:
+    created_at = instance.created_at
+    if timezone.is_aware(created_at):
+        created_at = timezone.localtime(created_at)
+    day = created_at.date() if isinstance(created_at, datetime) else created_at
+    return day.isoformat(), str(filial_id) if filial_id else None
+
+
+def mark_dirty(instance):
+    """
+    Queue the (date, filial) bucket of a saved Lid/Student (and its previous
+    filial, if that changed) for a rebuild after the transaction commits.
+    """
+    buckets = {_bucket_of(instance, instance.filial_id)}
+
+    if instance.has_changed("filial"):
+        buckets.add(_bucket_of(instance, instance.old_value("filial")))
+
+    for bucket in buckets:
+        collect_on_commit("funnel_rollup", bucket, _schedule_refresh)
+
+
+def _schedule_refresh(buckets):
+    from data.dashboard.tasks import refresh_funnel_rollup
+
+    refresh_funnel_rollup.delay(sorted(set(buckets), key=str))
+
+
+# first key of the pg_advisory_xact_lock(int, int) pairs of rollup days
+LOCK_SPACE = 0x464E4C  # "FNL"
+
+
+def _lock_days(days):
+    # two rebuilds of one day must not interleave their delete/insert; the
+    # one that waits then reads the other's rows
+    with connection.cursor() as cursor:
+        for day in sorted(set(days)):
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)", [LOCK_SPACE, day.toordinal()]
+            )
+
+
+def _latest_group(owner: str):
+    return StudentGroup.objects.filter(**{owner: OuterRef("pk")}).order_by(
+        "is_archived", "-created_at"
+    )
+
+
+def _grouped(queryset, owner: str, counters: dict):
+    groups = _latest_group(owner)
+    return (
+        queryset.annotate(
+            day=TruncDate("created_at"),
+            course_id=Subquery(groups.values("group__course_id")[:1]),
+            teacher_id=Subquery(groups.values("group__teacher_id")[:1]),
+        )
+        .order_by()
+        .values("day", *DIMENSIONS)
+        .annotate(
+            **{
+                name: Count("pk", filter=q if q else None)
+                for name, q in counters.items()
+            }
+        )
+    )
+
+
+def _build_rows(lead_qs, student_qs) -> list[FunnelRollup]:
+    rows: dict[tuple, dict] = {}
+
+    for queryset, owner, counters in (
+        (lead_qs, "lid", LEAD_COUNTERS),
+        (student_qs, "student", STUDENT_COUNTERS),
+    ):
+        for values in _grouped(queryset, owner, counters):
+            key = (values["day"], *(values[d] for d in DIMENSIONS))
+            row = rows.setdefault(key, {name: 0 for name in COUNTERS})
+            for name in counters:
+                row[name] += values[name]
+
+    return [
+        FunnelRollup(date=key[0], **dict(zip(DIMENSIONS, key[1:])), **counts)
+        for key, counts in rows.items()
+        if any(counts.values())
+    ]
+
+
+def rebuild_buckets(buckets) -> int:
+    """
+    Rebuild the given (date, filial) buckets. Returns the number of rollup
+    rows written.
+    """
+    buckets = {
+        (date.fromisoformat(day) if isinstance(day, str) else day, filial_id)
+        for day, filial_id in buckets
+    }
+    if not buckets:
+        return 0
+
+    raw = Q(pk__in=[])
+    stored = Q(pk__in=[])
+    for day, filial_id in buckets:
+        raw |= Q(created_at__date=day, filial_id=filial_id)
+        stored |= Q(date=day, filial_id=filial_id)
+
+    with transaction.atomic():
+        _lock_days(day for day, _ in buckets)
+        rows = _build_rows(Lid.objects.filter(raw), Student.objects.filter(raw))
+        FunnelRollup.objects.filter(stored).delete()
+        FunnelRollup.objects.bulk_create(rows, batch_size=1000)
+
+    return len(rows)
+
+
+def rebuild_range(start: date, end: date) -> int:
+    """Rebuild every bucket with start <= date <= end, one day at a time."""
+    written = 0
+    day = start
+    while day <= end:
+        with transaction.atomic():
+            _lock_days([day])
+            rows = _build_rows(
+                Lid.objects.filter(created_at__date=day),
+                Student.objects.filter(created_at__date=day),
+            )
+            FunnelRollup.objects.filter(date=day).delete()
+            FunnelRollup.objects.bulk_create(rows, batch_size=1000)
+        written += len(rows)
+        day += timedelta(days=1)
+    return written
+
+
+def changed_buckets(since: datetime) -> set[tuple[date, str | None]]:
+    """
+    Buckets whose rows changed since ``since`` without going through save()
+    signals: Lid/Student rows touched by updated_at and students/leads whose
+    group membership changed.
+    """
+    buckets = set()
+    for model in (Lid, Student):
+        touched = model.objects.filter(
+            Q(updated_at__gte=since)
+            | Q(created_at__gte=since)
+            | Q(groups__updated_at__gte=since)
+        )
+        buckets.update(
+            touched.annotate(day=TruncDate("created_at"))
+            .order_by()
+            .values_list("day", "filial_id")
+            .distinct()
+        )
+    return buckets
+
+
+def rollup_sums(days, filial, params, narrowed: dict, whole: dict) -> dict[str, int]:
+    """
+    Sum rollup counters over ``days`` (first, last; either may be None) of
+    ``filial`` in one query. ``narrowed`` maps a result key to a counter (or an
+    expression over counters) summed over the rows matching the dimension
+    params only; ``whole`` ones are summed over every row.
+    """
+    first, last = days
+    rollup = FunnelRollup.objects.order_by()
+    if first:
+        rollup = rollup.filter(date__gte=first)
+    if last:
+        rollup = rollup.filter(date__lte=last)
+    if filial:
+        rollup = rollup.filter(filial_id=filial)
+
+    dimensions = Q(
+        **{
+            lookup: params[param]
+            for param, lookup in PARAM_DIMENSIONS.items()
+            if param != "filial" and params.get(param)
+        }
+    )
+    totals = rollup.aggregate(
+        **{
+            key: Sum(counter, filter=dimensions or None)
+            for key, counter in narrowed.items()
+        },
+        **{key: Sum(counter) for key, counter in whole.items()},
+    )
+    return {key: value or 0 for key, value in totals.items()}
+
+
+def funnel_totals(params) -> dict[str, int]:
+    """
+    Sum the rollup for DashboardView-style query params
+    (start_date/end_date as YYYY-MM-DD, filial and the other dimensions).
+    """
+    rollup = FunnelRollup.objects.all()
+
+    start_date = params.get("start_date")
+    end_date = params.get("end_date")
+    if start_date:
+        rollup = rollup.filter(date__gte=start_date)
+    if end_date:
+        rollup = rollup.filter(date__lte=end_date)
+
+    for param, lookup in PARAM_DIMENSIONS.items():
+        value = params.get(param)
+        if value:
+            rollup = rollup.filter(**{lookup: value})
+
+    totals = rollup.aggregate(**{name: Sum(name) for name in COUNTERS})
+    return {name: value or 0 for name, value in totals.items()}
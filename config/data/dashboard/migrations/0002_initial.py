@@ -0,0 +1,41 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+        ('subject', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='funnelrollup',
+            name='subject',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='subject.subject'),
+        ),
+        migrations.AddField(
+            model_name='funnelrollup',
+            name='teacher',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='funnelrollup',
+            index=models.Index(fields=['date', 'filial'], name='dashboard_f_date_4364d6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='funnelrollup',
+            index=models.Index(fields=['filial', 'date'], name='dashboard_f_filial__ae00ce_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='funnelrollup',
+            constraint=models.UniqueConstraint(fields=('date', 'filial', 'marketing_channel', 'sales_manager', 'call_operator', 'subject', 'course', 'teacher'), name='funnel_rollup_bucket_uniq', nulls_distinct=False),
+        ),
+    ]
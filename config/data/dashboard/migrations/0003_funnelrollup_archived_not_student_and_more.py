@@ -0,0 +1,43 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='funnelrollup',
+            name='archived_not_student',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='funnelrollup',
+            name='leads_no_lesson',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='funnelrollup',
+            name='leads_no_lesson_archived',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='funnelrollup',
+            name='orders_no_lesson',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='funnelrollup',
+            name='orders_no_lesson_archived',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='funnelrollup',
+            name='orders_unstaged',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,3 +1,92 @@
 from django.db import models
+from django.contrib import admin
 
-# Create your models here.
+
+def _dimension(to: str):
+    # Rollup rows are rebuilt, never cascaded: keep the ids even if the
+    # referenced row goes away.
+    return models.ForeignKey(
+        to,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+
+class FunnelRollup(models.Model):
+    """
+    Daily lead -> order -> first lesson -> new student -> active student
+    funnel, one row per (date, filial, channel, staff, subject, course, teacher).
+
+    Rows are derived data: a (date, filial) bucket is deleted and rebuilt from
+    Lid/Student rows by data.dashboard.funnel whenever one of them changes.
+    """
+
+    date = models.DateField()
+
+    filial = _dimension("filial.Filial")
+    marketing_channel = _dimension("marketing_channel.MarketingChannel")
+    sales_manager = _dimension("account.CustomUser")
+    call_operator = _dimension("account.CustomUser")
+    subject = _dimension("subject.Subject")
+    course = _dimension("course.Course")
+    teacher = _dimension("account.CustomUser")
+
+    leads = models.PositiveIntegerField(default=0)
+    leads_archived = models.PositiveIntegerField(default=0)
+    leads_no_lesson = models.PositiveIntegerField(default=0)
+    leads_no_lesson_archived = models.PositiveIntegerField(default=0)
+    archived_not_student = models.PositiveIntegerField(default=0)
+    orders = models.PositiveIntegerField(default=0)
+    orders_archived = models.PositiveIntegerField(default=0)
+    orders_no_lesson = models.PositiveIntegerField(default=0)
+    orders_no_lesson_archived = models.PositiveIntegerField(default=0)
+    orders_unstaged = models.PositiveIntegerField(default=0)
+    first_lessons = models.PositiveIntegerField(default=0)
+    new_students = models.PositiveIntegerField(default=0)
+    new_students_archived = models.PositiveIntegerField(default=0)
+    active_students = models.PositiveIntegerField(default=0)
+    active_students_archived = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["date", "filial"]),
+            models.Index(fields=["filial", "date"]),
+        ]
+        constraints = [
+            # one row per bucket key; a racing rebuild fails instead of
+            # double-counting
+            models.UniqueConstraint(
+                fields=[
+                    "date",
+                    "filial",
+                    "marketing_channel",
+                    "sales_manager",
+                    "call_operator",
+                    "subject",
+                    "course",
+                    "teacher",
+                ],
+                nulls_distinct=False,
+                name="funnel_rollup_bucket_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"FunnelRollup(date={self.date} filial={self.filial_id})"
+
+    class Admin(admin.ModelAdmin):
+
+        list_display = [
+            "date",
+            "filial",
+            "leads",
+            "orders",
+            "first_lessons",
+            "new_students",
+            "active_students",
+        ]
+        list_filter = ["filial"]
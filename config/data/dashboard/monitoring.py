@@ -0,0 +1,128 @@
+"""
+Batched per-teacher numbers for the monitoring dashboard.
+
+Every helper takes the whole list of teacher ids and runs one grouped query,
+returning a dict keyed by teacher id, so the monitoring views run a constant
+number of queries however many teachers and assistants there are.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count, FloatField, Sum
+from django.db.models.functions import Cast
+
+from data.finances.compensation.cache import asos_id
+from data.finances.compensation.models import (
+    Monitoring,
+    MonitoringAsos1_2,
+    MonitoringAsos4,
+)
+from data.results.models import Results
+from data.student.groups.models import Group
+
+
+def _in_range(qs, start=None, end=None, end_inclusive=False):
+    if start:
+        qs = qs.filter(created_at__gte=start)
+    if end:
+        qs = qs.filter(
+            **{"created_at__lte" if end_inclusive else "created_at__lt": end}
+        )
+    return qs
+
+
+def subjects_by_teacher(teacher_ids, subject_id=None) -> dict[str, list[dict]]:
+    """
+    One {"subject_id", "subject_name"} entry per group the teacher leads,
+    in the groups' default order.
+    """
+    groups = Group.objects.filter(teacher_id__in=teacher_ids)
+    if subject_id:
+        groups = groups.filter(course__subject__id=subject_id)
+
+    subjects = defaultdict(list)
+    for row in groups.values(
+        "teacher_id", "course__subject__id", "course__subject__name"
+    ):
+        subjects[row["teacher_id"]].append(
+            {
+                "subject_id": row["course__subject__id"],
+                "subject_name": row["course__subject__name"],
+            }
+        )
+    return subjects
+
+
+def results_by_teacher(
+    teacher_ids, start=None, end=None, status=None, end_inclusive=False
+) -> dict[str, int]:
+    results = Results.objects.filter(teacher_id__in=teacher_ids)
+    if status:
+        results = results.filter(status=status)
+    results = _in_range(results, start, end, end_inclusive)
+
+    return dict(
+        results.order_by()
+        .values("teacher_id")
+        .annotate(total=Count("id"))
+        .values_list("teacher_id", "total")
+    )
+
+
+def _ball_sums(qs, *group_by) -> dict:
+    rows = (
+        qs.order_by()
+        .values("user_id", *group_by)
+        .annotate(total=Sum(Cast("ball", FloatField())))
+    )
+    return {
+        tuple(row[key] for key in ("user_id", *group_by)): row["total"] or 0
+        for row in rows
+    }
+
+
+def asos_balls_by_teacher(teacher_ids, start=None, end=None) -> dict[str, dict]:
+    """
+    ASOS 1, 3, 4 and 12 totals per teacher with three grouped queries
+    (ASOS 4 and 12 both live in MonitoringAsos4).
+    """
+    asos_3 = asos_id("ASOS_3")
+    asos_4 = asos_id("ASOS_4")
+    asos_12 = asos_id("ASOS_12")
+
+    asos_1_sums = _ball_sums(
+        _in_range(
+            MonitoringAsos1_2.objects.filter(user_id__in=teacher_ids, asos="asos1"),
+            start,
+            end,
+        )
+    )
+    asos_3_sums = _ball_sums(
+        _in_range(
+            Monitoring.objects.filter(
+                user_id__in=teacher_ids, point__asos__id=asos_3
+            ),
+            start,
+            end,
+        )
+    )
+    asos_4_sums = _ball_sums(
+        _in_range(
+            MonitoringAsos4.objects.filter(
+                user_id__in=teacher_ids, asos__id__in=[asos_4, asos_12]
+            ),
+            start,
+            end,
+        ),
+        "asos_id",
+    )
+
+    return {
+        teacher_id: {
+            "asos_1": round(asos_1_sums.get((teacher_id,), 0), 2),
+            "asos_3": round(asos_3_sums.get((teacher_id,), 0), 2),
+            "asos_4": round(asos_4_sums.get((teacher_id, asos_4), 0), 2),
+            "asos_12_13_14": round(asos_4_sums.get((teacher_id, asos_12), 0), 2),
+        }
+        for teacher_id in teacher_ids
+    }
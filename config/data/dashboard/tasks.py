@@ -1,24 +1,15 @@
 import logging
 import os
-import pandas as pd
 from celery import shared_task
-from datetime import datetime, timedelta
+from datetime import timedelta
 from django.conf import settings
+from django.utils import timezone
 from aiogram import Bot
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
 from requests import post
 
-from data.finances.finance.choices import FinanceKindTypeChoices
 from data.account.models import CustomUser
-from data.department.filial.models import Filial
-from data.finances.finance.models import Finance
-from data.lid.new_lid.models import Lid
-from data.student.groups.models import Group
-from data.student.lesson.models import FirstLLesson
-from data.student.student.models import Student
-from data.student.studentgroup.models import StudentGroup
+from data.dashboard.exports import DailyReport
+from data.upload.exports import write
 
 logging.basicConfig(level=logging.INFO)
 
@@ -94,195 +85,13 @@ bot = TelegramBot()
 def generate_excel_report():
     """
     Generates an Excel report with student data on the first sheet
-    and financial transactions on the second sheet.
+    and financial transactions on the second sheet (see exports.DailyReport).
     """
-    # Generate filename
-    file_name = f"report_{datetime.now().strftime('%d-%m-%Y')}.xlsx"
-    file_path = os.path.join(settings.MEDIA_ROOT, file_name)
+    report = DailyReport({})
+    file_path = os.path.join(settings.MEDIA_ROOT, report.filename)
 
-    # Create a new workbook and sheets
-    wb = Workbook()
-    ws1 = wb.active
-    ws1.title = "Kunlik reportlar"
-
-    # 🔹 Header Row for Student Data
-    headers = ["Jarayonlar"]
-    filials = [filial.name for filial in Filial.objects.all()]
-    headers += filials + ["Jami"]  # Add "Total" column
-
-    # 🔹 Initialize Data Collection
-    data_dict = {
-        "Buyurtma": [],
-        "Birinchi darsga keladiganlar": [],
-        "Yangi o‘quvchi": [],
-        "Aktiv": [],
-        "Qarzdorlar": [],
-        "Guruhlar": [],
-        "Shu oyda to‘lov qilganlar": [],
-        "Arxiv": [],
-        "JAMI REAL BOR": [],
-        "Jami o‘quvchi": [],
-        "Jami aktiv": [],
-        "Guruhdagi jami aktiv o‘quvchilar": [],
-    }
-
-    for filial in Filial.objects.all():
-        # 🔹 Fetch student data
-        orders = Lid.objects.filter(
-            filial=filial,
-            ordered_date__gte=datetime.now() - timedelta(days=1),
-            is_archived=False,
-        ).count()
-        first_lesson = FirstLLesson.objects.filter(
-            filial=filial,
-            created_at__gte=datetime.now() - timedelta(days=1),
-            lid__is_archived=False,
-        ).count()
-        new_student = Student.objects.filter(
-            filial=filial,
-            student_stage_type="NEW_STUDENT",
-            new_student_date__gte=datetime.now() - timedelta(days=1),
-            is_archived=False,
-        ).count()
-        student = Student.objects.filter(
-            filial=filial,
-            student_stage_type="ACTIVE_STUDENT",
-            active_date__gte=datetime.now() - timedelta(days=1),
-            is_archived=False,
-        ).count()
-        debt = Student.objects.filter(
-            filial=filial, balance_status="INACTIVE", is_archived=False
-        ).count()
-        groups = Group.objects.filter(filial=filial, status="ACTIVE").count()
-        finance_student = Finance.objects.filter(
-            student__isnull=False,
-            filial=filial,
-            # kind__name="Course payment",
-            kind__kind=FinanceKindTypeChoices.COURSE_PAYMENT,
-            created_at__lte=datetime.today().replace(day=1),
-            created_at__gte=datetime.today(),
-        ).count()
-        archived_lid = Lid.objects.filter(
-            filial=filial, is_student=False, is_archived=True
-        ).count()
-        archived_student = Student.objects.filter(
-            filial=filial, is_archived=True
-        ).count()
-        all_archived = archived_lid + archived_student
-        all_real_students = Student.objects.filter(
-            filial=filial, is_archived=False, is_frozen=False
-        ).count()
-        all_students = StudentGroup.objects.filter(
-            filial=filial, group__status="ACTIVE", student__is_archived=False
-        ).count()
-        all_active = Student.objects.filter(
-            filial=filial, balance_status="ACTIVE"
-        ).count()
-        groups_active_students = StudentGroup.objects.filter(
-            filial=filial, group__status="ACTIVE", student__is_archived=False
-        ).count()
-
-        # 🔹 Store in Data Dictionary
-        data_dict["Buyurtma"].append(orders)
-        data_dict["Birinchi darsga keladiganlar"].append(first_lesson)
-        data_dict["Yangi o‘quvchi"].append(new_student)
-        data_dict["Aktiv"].append(student)
-        data_dict["Qarzdorlar"].append(debt)
-        data_dict["Guruhlar"].append(groups)
-        data_dict["Shu oyda to‘lov qilganlar"].append(finance_student)
-        data_dict["Arxiv"].append(all_archived)
-        data_dict["JAMI REAL BOR"].append(all_real_students)
-        data_dict["Jami o‘quvchi"].append(all_students)
-        data_dict["Jami aktiv"].append(all_active)
-        data_dict["Guruhdagi jami aktiv o‘quvchilar"].append(groups_active_students)
-
-    # 🔹 Calculate Totals for each row
-    for key in data_dict.keys():
-        data_dict[key].append(sum(data_dict[key]))
-
-    # 🔹 Convert data dictionary to a list of rows
-    data = [[key] + values for key, values in data_dict.items()]
-
-    # 🔹 Styling
-    title_font = Font(bold=True, size=14, color="FFFFFF")
-    header_font = Font(bold=True, size=12)
-    title_fill = PatternFill("solid", fgColor="4CAF50")
-    header_fill = PatternFill("solid", fgColor="FFFF00")
-    red_fill = PatternFill("solid", fgColor="FF0000")
-    green_fill = PatternFill("solid", fgColor="00FF00")
-    cyan_fill = PatternFill("solid", fgColor="00FFFF")
-
-    # 🔹 Merge and style title row
-    ws1.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(headers))
-    ws1["A1"] = datetime.now().strftime("%d/%m/%Y")
-    ws1["A1"].font = title_font
-    ws1["A1"].fill = title_fill
-    ws1["A1"].alignment = Alignment(horizontal="center")
-
-    # 🔹 Insert Headers
-    ws1.append(headers)
-    for col_idx in range(2, len(headers) + 1):
-        ws1[f"{get_column_letter(col_idx)}2"].font = header_font
-        ws1[f"{get_column_letter(col_idx)}2"].fill = header_fill
-        ws1[f"{get_column_letter(col_idx)}2"].alignment = Alignment(horizontal="center")
-
-    # 🔹 Insert Student Data
-    for row in data:
-        ws1.append(row)
-        for col_idx, value in enumerate(row[1:], start=2):
-            cell = ws1.cell(row=ws1.max_row, column=col_idx)
-            if "Qarzdorlar" in row[0]:  # Red fill for debts
-                cell.fill = red_fill
-            elif "Aktiv" in row[0]:  # Green fill for active students
-                cell.fill = green_fill
-            elif "JAMI REAL BOR" in row[0]:  # Yellow fill for summary
-                cell.fill = header_fill
-            elif "Jami o‘quvchi" in row[0]:  # Cyan fill for total students
-                cell.fill = cyan_fill
-
-    # 🔹 Create Second Sheet for Financial Transactions
-    ws2 = wb.create_sheet(title="Moliya Hisobot")
-
-    finance_headers = ["Turi", "Kim", "Comment", "Qiy mati", "To'lov turi", "Kassa"]
-    ws2.append(finance_headers)
-
-    finance_entries = Finance.objects.all()
-
-    for entry in finance_entries:
-        ws2.append(
-            [
-                (
-                    "Student to'ladi"
-                    if entry.student
-                    else "Hodim avans" if entry.stuff else "Boshqa"
-                ),
-                (
-                    entry.student.first_name + " " + entry.student.last_name
-                    if entry.student
-                    else entry.stuff.full_name if entry.stuff else "Unknown"
-                ),
-                entry.comment or "-",
-                entry.amount,
-                entry.payment_method,
-                entry.casher.user.full_name if entry.casher else "-",
-            ]
-        )
-
-    # 🔹 Auto adjust column width for both sheets
-    for sheet in [ws1, ws2]:
-        for col in sheet.columns:
-            max_length = 0
-            col_letter = get_column_letter(col[0].column)
-            for cell in col:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
-            sheet.column_dimensions[col_letter].width = max_length + 3
-
-    # 🔹 Save the Excel file
-    wb.save(file_path)
+    with open(file_path, "wb") as file:
+        write(report, file)
     return file_path
 
 
@@ -327,3 +136,33 @@ def send_daily_excel_report():
         f"✅ Celery task completed: Sent Excel report to {success_count} users."
     )
     return f"Excel report sent to {success_count} users."
+
+
+@shared_task
+def refresh_funnel_rollup(buckets):
+    """
+    Rebuild the FunnelRollup (date, filial) buckets queued by Lid/Student saves.
+    """
+    from data.dashboard.funnel import rebuild_buckets
+
+    written = rebuild_buckets(buckets)
+    logging.info(f"Funnel rollup: {len(buckets)} bucket(s), {written} row(s).")
+    return written
+
+
+@shared_task
+def reconcile_funnel_rollup(hours=26):
+    """
+    Nightly: rebuild every bucket touched in the last ``hours`` hours, which
+    also catches .update() calls and group moves that never hit post_save.
+    """
+    from data.dashboard.funnel import changed_buckets, rebuild_buckets
+
+    since = timezone.now() - timedelta(hours=hours)
+    buckets = changed_buckets(since)
+
+    written = rebuild_buckets(buckets)
+    logging.info(
+        f"Funnel rollup reconcile: {len(buckets)} bucket(s), {written} row(s)."
+    )
+    return written
@@ -1,3 +1,358 @@
+from datetime import datetime, timedelta
+
+from django.db.models import Count
 from django.test import TestCase
+from django.utils import timezone
+from django.utils.timezone import make_aware
+
+from data.command.testing import QueryBudgetMixin
+from data.dashboard.counters import dashboard_counters, dashboard_second_counters
+from data.dashboard.funnel import rebuild_range
+from data.department.filial.models import Filial
+from data.department.marketing_channel.models import MarketingChannel
+from data.finances.finance.choices import FinanceKindTypeChoices
+from data.finances.finance.models import Finance
+from data.lid.new_lid.models import Lid
+from data.student.attendance.models import Attendance
+from data.student.course.models import Course
+from data.student.groups.models import Group, Room
+from data.student.lesson.models import FirstLLesson
+from data.student.student.models import Student
+from data.student.studentgroup.models import StudentGroup
+from data.student.subject.models import Subject
+
+
+def _legacy_dashboard(params):
+    """DashboardView.get counters as they were computed before CounterSet."""
+    filters = {}
+    if params.get("start_date") and params.get("end_date"):
+        filters["created_at__range"] = (
+            make_aware(datetime.strptime(params["start_date"], "%Y-%m-%d")),
+            make_aware(datetime.strptime(params["end_date"], "%Y-%m-%d")),
+        )
+    if params.get("filial"):
+        filters["filial"] = params["filial"]
+
+    lead = Lid.objects.filter(**filters)
+    archived_lead = lead.filter(lid_stage_type="NEW_LID", is_archived=True)
+    order_fix_created = lead.filter(
+        lid_stage_type="ORDERED_LID",
+        lid_stages__isnull=True,
+        ordered_stages__isnull=False,
+    )
+    orders = lead.filter(lid_stage_type="ORDERED_LID")
+    orders_archived = orders.filter(is_archived=True)
+    first_lesson = FirstLLesson.objects.filter(**filters)
+    first_lesson_come = Student.objects.filter(
+        student_stage_type="NEW_STUDENT", **filters
+    )
+    first_lesson_come_archived = first_lesson_come.filter(is_archived=True)
+
+    if params.get("marketing_channel"):
+        channel = params["marketing_channel"]
+        lead = lead.filter(marketing_channel=channel)
+        archived_lead = archived_lead.filter(marketing_channel=channel)
+        order_fix_created = order_fix_created.filter(marketing_channel=channel)
+        orders = orders.filter(marketing_channel=channel)
+        orders_archived = orders_archived.filter(marketing_channel=channel)
+        first_lesson = first_lesson.filter(lid__marketing_channel=channel)
+        first_lesson_come = first_lesson_come.filter(marketing_channel=channel)
+        first_lesson_come_archived = first_lesson_come_archived.filter(
+            marketing_channel=channel
+        )
+
+    if params.get("course"):
+        course = params["course"]
+        lead = lead.filter(groups__group__course_id=course)
+        archived_lead = archived_lead.filter(groups__group__course_id=course)
+        order_fix_created = order_fix_created.filter(groups__group__course_id=course)
+        orders = orders.filter(groups__group__course_id=course)
+        orders_archived = orders_archived.filter(groups__group__course_id=course)
+        first_lesson = first_lesson.filter(group__course__id=course)
+        first_lesson_come = first_lesson_come.filter(groups__group__course_id=course)
+        first_lesson_come_archived = first_lesson_come_archived.filter(
+            groups__group__course_id=course
+        )
+
+    new_student = StudentGroup.objects.filter(
+        student__student_stage_type="NEW_STUDENT", **filters
+    )
+    active_student = StudentGroup.objects.filter(
+        student__student_stage_type="ACTIVE_STUDENT", group__status="ACTIVE", **filters
+    )
+
+    return {
+        "lids": lead.count(),
+        "archived_lid": archived_lead.count(),
+        "order_fix_created": order_fix_created.count(),
+        "orders": orders.count(),
+        "orders_archived": orders_archived.count(),
+        "first_lesson": first_lesson.count(),
+        "first_lesson_archived": Lid.objects.filter(
+            is_archived=True, is_student=False, **filters
+        ).count(),
+        "first_lesson_come": first_lesson_come.count(),
+        "first_lesson_come_archived": first_lesson_come_archived.count(),
+        "new_student_archived": new_student.filter(student__is_archived=True).count(),
+        "new_student": new_student.count(),
+        "active_student": active_student.count(),
+        "active_student_archived": active_student.filter(
+            student__is_archived=True
+        ).count(),
+        "course_ended": StudentGroup.objects.filter(
+            group__status="INACTIVE", **filters
+        ).count(),
+    }
+
+
+def _legacy_dashboard_second(params):
+    """DashboardSecondView.get counters as they were computed before CounterSet."""
+    filters = {}
+    if params.get("start_date"):
+        filters["created_at__gte"] = params["start_date"]
+    if params.get("end_date"):
+        filters["created_at__lte"] = params["end_date"]
+    if params.get("filial"):
+        filters["filial_id"] = params["filial"]
+
+    lid = Lid.objects.filter(lid_stage_type="NEW_LID", **filters).exclude(
+        ordered_stages="BIRINCHI_DARS_BELGILANGAN"
+    )
+    archived_lid = lid.filter(is_archived=True)
+    orders = Lid.objects.filter(lid_stage_type="ORDERED_LID", **filters).exclude(
+        ordered_stages="BIRINCHI_DARS_BELGILANGAN"
+    )
+    orders_archived = orders.filter(is_archived=True)
+    first_lesson = Lid.objects.filter(
+        ordered_stages="BIRINCHI_DARS_BELGILANGAN",
+        is_student=False,
+        is_archived=False,
+        **filters,
+    )
+    one_attendance = (
+        Attendance.objects.values("student")
+        .annotate(count=Count("id"))
+        .filter(count=1, **filters)
+        .values_list("student", flat=True)
+    )
+    first_lesson_come = Student.objects.filter(id__in=one_attendance, **filters)
+    first_lesson_come_archived = first_lesson_come.filter(is_archived=True)
+    payment_students = Finance.objects.filter(
+        student__isnull=False,
+        kind__kind=FinanceKindTypeChoices.COURSE_PAYMENT,
+        **filters,
+    ).values_list("student", flat=True)
+    first_course_payment = Student.objects.filter(id__in=payment_students, **filters)
+    first_course_payment_archived = first_course_payment.filter(is_archived=True)
+
+    if params.get("marketing_channel"):
+        channel = params["marketing_channel"]
+        lid = lid.filter(marketing_channel=channel)
+        archived_lid = archived_lid.filter(marketing_channel=channel)
+        orders = orders.filter(marketing_channel=channel)
+        orders_archived = orders_archived.filter(marketing_channel=channel)
+        first_lesson = first_lesson.filter(marketing_channel=channel)
+        first_lesson_come = first_lesson_come.filter(marketing_channel=channel)
+        first_lesson_come_archived = first_lesson_come_archived.filter(
+            marketing_channel=channel
+        )
+        first_course_payment = first_course_payment.filter(marketing_channel=channel)
+        first_course_payment_archived = first_course_payment_archived.filter(
+            marketing_channel=channel
+        )
+
+    new_student = Student.objects.filter(
+        student_stage_type="NEW_STUDENT", is_archived=False, **filters
+    ).count()
+    active_student = Student.objects.filter(
+        student_stage_type="ACTIVE_STUDENT", is_archived=False, **filters
+    ).count()
+
+    return {
+        "lids": lid.count(),
+        "archived_lid": archived_lid.count(),
+        "orders": orders.count(),
+        "orders_archived": orders_archived.count(),
+        "first_lesson": first_lesson.count(),
+        "first_lesson_come": first_lesson_come.count(),
+        "first_lesson_come_archived": first_lesson_come_archived.count(),
+        "first_course_payment": first_course_payment.count(),
+        "first_course_payment_archived": first_course_payment_archived.count(),
+        "new_student": new_student,
+        "active_student": active_student,
+        "course_ended": StudentGroup.objects.filter(
+            group__status="INACTIVE", **filters
+        ).count(),
+        "all_students": new_student + active_student,
+    }
+
+
+class DashboardCountersTest(QueryBudgetMixin, TestCase):
+    """
+    The aggregated counters must match the old one-count-per-queryset numbers.
+    Rows are bulk-created so no signals add their own side effects.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+
+        cls.filial, other_filial = Filial.objects.bulk_create(
+            [Filial(name="Main"), Filial(name="Second")]
+        )
+        cls.channel = MarketingChannel.objects.create(name="Instagram")
+
+        subject = Subject.objects.create(name="Math")
+        cls.course = Course.objects.create(name="Math 1", subject=subject)
+        other_course = Course.objects.create(name="Math 2", subject=subject)
+        room = Room.objects.create(room_number="1")
+
+        active_group, inactive_group, other_group = Group.objects.bulk_create(
+            [
+                Group(name="A", course=cls.course, room_number=room, status="ACTIVE"),
+                Group(
+                    name="B", course=cls.course, room_number=room, status="INACTIVE"
+                ),
+                Group(
+                    name="C", course=other_course, room_number=room, status="ACTIVE"
+                ),
+            ]
+        )
+
+        leads = []
+        for i, (stage, ordered, archived) in enumerate(
+            [
+                ("NEW_LID", None, False),
+                ("NEW_LID", None, True),
+                ("NEW_LID", "BIRINCHI_DARS_BELGILANGAN", False),
+                ("ORDERED_LID", "YANGI_BUYURTMA", False),
+                ("ORDERED_LID", "YANGI_BUYURTMA", True),
+                ("ORDERED_LID", "BIRINCHI_DARS_BELGILANGAN", False),
+                ("ORDERED_LID", "KUTULMOQDA", True),
+            ]
+        ):
+            leads.append(
+                Lid(
+                    first_name=f"Lead {i}",
+                    lid_stage_type=stage,
+                    ordered_stages=ordered,
+                    is_archived=archived,
+                    archived_at=now if archived else None,
+                    filial=cls.filial if i % 2 == 0 else other_filial,
+                    marketing_channel=cls.channel if i % 3 == 0 else None,
+                    created_at=now - timedelta(days=i),
+                )
+            )
+        leads = Lid.objects.bulk_create(leads)
+
+        students = []
+        for i, (stage, archived) in enumerate(
+            [
+                ("NEW_STUDENT", False),
+                ("NEW_STUDENT", True),
+                ("ACTIVE_STUDENT", False),
+                ("ACTIVE_STUDENT", True),
+                ("NEW_STUDENT", False),
+            ]
+        ):
+            students.append(
+                Student(
+                    first_name=f"Student {i}",
+                    phone=f"99890000000{i}",
+                    student_stage_type=stage,
+                    is_archived=archived,
+                    archived_at=now if archived else None,
+                    filial=cls.filial if i % 2 == 0 else other_filial,
+                    marketing_channel=cls.channel if i % 2 == 1 else None,
+                    created_at=now - timedelta(days=i),
+                )
+            )
+        students = Student.objects.bulk_create(students)
+
+        groups = [active_group, inactive_group, other_group]
+        StudentGroup.objects.bulk_create(
+            [
+                StudentGroup(
+                    group=groups[i % 3],
+                    student=student,
+                    filial=student.filial,
+                    created_at=student.created_at,
+                )
+                for i, student in enumerate(students)
+            ]
+            + [
+                # second group for a student: duplicated join rows must count twice
+                StudentGroup(group=other_group, student=students[0]),
+                StudentGroup(
+                    group=active_group,
+                    lid=leads[3],
+                    first_lesson=None,
+                    is_archived=True,
+                    archived_at=now,
+                ),
+            ]
+        )
+
+        FirstLLesson.objects.bulk_create(
+            [
+                FirstLLesson(lid=leads[2], group=active_group, filial=cls.filial),
+                FirstLLesson(lid=leads[5], group=other_group),
+            ]
+        )
+
+        Attendance.objects.bulk_create(
+            [Attendance(student=students[0], group=active_group, date=now.date())]
+        )
+
+        # bulk_create skips the saves that keep the rollup up to date
+        today = timezone.localdate()
+        rebuild_range(today - timedelta(days=7), today)
+
+    def _param_sets(self):
+        today = timezone.localdate()
+        return [
+            {},
+            {"filial": str(self.filial.id)},
+            {"marketing_channel": str(self.channel.id)},
+            {"course": str(self.course.id)},
+            {
+                "start_date": (today - timedelta(days=3)).isoformat(),
+                "end_date": (today + timedelta(days=1)).isoformat(),
+            },
+            {"filial": str(self.filial.id), "marketing_channel": str(self.channel.id)},
+        ]
+
+    def test_dashboard_counters_match_legacy(self):
+        for params in self._param_sets():
+            with self.subTest(params=params):
+                self.assertEqual(dashboard_counters(params), _legacy_dashboard(params))
+
+    def test_dashboard_second_counters_match_legacy(self):
+        for params in self._param_sets():
+            if "course" in params:
+                continue  # the old view raised FieldError for course/teacher
+            with self.subTest(params=params):
+                data, _ = dashboard_second_counters(params)
+                self.assertEqual(data, _legacy_dashboard_second(params))
+
+    def test_one_query_per_base_table(self):
+        # course and is_student need the raw Lid/Student rows
+        with self.assertNumQueries(5):
+            dashboard_counters({"course": str(self.course.id)})
+        with self.assertNumQueries(4):
+            dashboard_second_counters({"is_student": "false"})
+
+    def test_lead_and_student_counters_come_from_the_rollup(self):
+        # FunnelRollup, FirstLLesson and StudentGroup
+        with self.assertNumQueries(3):
+            dashboard_counters({"filial": str(self.filial.id)})
+        # FunnelRollup, Student (attendance/payment) and StudentGroup
+        with self.assertNumQueries(3):
+            dashboard_second_counters({"filial": str(self.filial.id)})
 
-# Create your tests here.
+    def test_query_budgets(self):
+        for params in self._param_sets():
+            with self.subTest(params=params):
+                # one aggregate per base table
+                self.assertQueryBudget(5, "/dashboard/admin/", data=params)
+                self.assertQueryBudget(1, "/dashboard/funnel/", data=params)
@@ -15,11 +15,13 @@ from data.dashboard.views import (
     AdminLineGraph,
     DashboardSecondView,
     MonitoringAsosAPIView,
+    FunnelRollupView,
 )
 
 urlpatterns = [
     path("admin/", DashboardView.as_view(), name="dashboard"),
     path("secondary-admin/", DashboardSecondView.as_view()),
+    path("funnel/", FunnelRollupView.as_view(), name="dashboard-funnel"),
     path("channels/", MarketingChannels.as_view(), name="marketing-channels"),
     path(
         "room-filling/",
@@ -2,521 +2,66 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from operator import itemgetter
 
-import openpyxl
-from django.db.models import Case, When, Q, FloatField
+from django.db.models import Q
 from django.db.models import Count
-from django.db.models import Sum, F, DecimalField, Value
-from django.db.models.functions import ExtractWeekDay, Concat, Cast
-from django.http import HttpResponse
+from django.db.models import Sum, F, Value
+from django.db.models.functions import ExtractWeekDay, Concat
 from django.utils.dateparse import parse_date
-from django.utils.timezone import make_aware
-from icecream import ic
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from data.finances.finance.choices import FinanceKindTypeChoices
+from data.dashboard.counters import dashboard_counters, dashboard_second_counters
+from data.dashboard.funnel import funnel_totals
+from data.dashboard.monitoring import (
+    asos_balls_by_teacher,
+    results_by_teacher,
+    subjects_by_teacher,
+)
+from data.finances.finance.cache import kind_names
 from data.department.marketing_channel.models import MarketingChannel
 from data.finances.finance.models import (
     Finance,
     Casher,
-    Kind,
     SaleStudent,
     VoucherStudent,
 )
 from data.lid.new_lid.models import Lid
-from data.student.groups.models import Room, Group, Day
+from data.student.groups import timetable
 from data.student.studentgroup.models import StudentGroup
 from data.account.models import CustomUser
-from data.finances.compensation.models import (
-    MonitoringAsos1_2,
-    Monitoring,
-    MonitoringAsos4,
-    Asos,
-)
 from data.lid.archived.models import Archived
 from data.lid.new_lid.serializers import LeadSerializer
-from data.results.models import Results
-from data.student.attendance.models import Attendance
-from data.student.lesson.models import FirstLLesson
 from data.student.student.models import Student
+from data.upload.exports import respond
 from data.upload.serializers import FileUploadSerializer
 
 
 class DashboardView(APIView):
     def get(self, request, *args, **kwargs):
-        # Get Query Parameters
-        start_date = request.query_params.get("start_date", None)
-        end_date = request.query_params.get("end_date", None)
-        channel_id = request.query_params.get("marketing_channel")
-        service_manager = request.query_params.get("service_manager")
-        call_operator = request.query_params.get("call_operator")
-        sales_manager = request.query_params.get("sales_manager")
-        filial = request.query_params.get("filial", None)
-        subjects = request.query_params.get("subject")
-        course = request.query_params.get("course")
-        teacher = request.query_params.get("teacher")
-        is_student = request.query_params.get("is_student")
-
-        # Common Filters
-        filters = {}
-        if start_date and end_date:
-            start_dt = make_aware(datetime.strptime(start_date, "%Y-%m-%d"))
-            end_dt = make_aware(datetime.strptime(end_date, "%Y-%m-%d"))
-            filters["created_at__range"] = (start_dt, end_dt)
-        elif start_date:
-            start_dt = make_aware(datetime.strptime(start_date, "%Y-%m-%d"))
-            filters["created_at__date"] = start_dt.date()  # this one is safe as date
-        if filial:
-            filters["filial"] = filial
-
-        # Initial QuerySets
-        lead = Lid.objects.filter(**filters)
-        archived_lead = lead.filter(lid_stage_type="NEW_LID", is_archived=True)
-        order_fix_created = lead.filter(
-            lid_stage_type="ORDERED_LID",
-            lid_stages__isnull=True,
-            ordered_stages__isnull=False,
-        )
-        orders = lead.filter(lid_stage_type="ORDERED_LID")
-        orders_archived = orders.filter(is_archived=True)
-        first_lesson = FirstLLesson.objects.filter(**filters)
-
-        first_lesson_archived = Lid.objects.filter(
-            is_archived=True, is_student=False, **filters
-        )
-
-        first_lesson_come = Student.objects.filter(
-            student_stage_type="NEW_STUDENT", **filters
-        )
-        first_lesson_come_archived = first_lesson_come.filter(is_archived=True)
-        new_student = StudentGroup.objects.filter(
-            student__student_stage_type="NEW_STUDENT",
-            **filters,
-        )
-        new_student_archived = new_student.filter(student__is_archived=True)
-        active_student = StudentGroup.objects.filter(
-            student__student_stage_type="ACTIVE_STUDENT",
-            group__status="ACTIVE",
-            **filters,
-        )
-        active_student_archived = active_student.filter(student__is_archived=True)
-        course_ended = StudentGroup.objects.filter(
-            group__status="INACTIVE",
-            **filters,
-        )
-
-        # **Filtering Based on Dynamic Conditions**
-
-        if is_student:
-            is_student_value = is_student.capitalize()
-
-            lead = lead.filter(is_student=is_student_value, is_archived=False)
-            archived_lead = archived_lead.filter(is_student=is_student_value)
-            order_fix_created = order_fix_created.filter(is_student=is_student_value)
-            orders = orders.filter(is_student=is_student_value, is_archived=False)
-            orders_archived = orders_archived.filter(is_student=is_student_value)
-            first_lesson = first_lesson.filter(
-                lid__is_student=is_student_value,
-                is_archived=False,
-            )
-            first_lesson_come = first_lesson_come.filter(is_archived=False)
-
-            first_lesson_come_archived = (
-                first_lesson_come.filter(is_archived=True, is_student=False)
-                if first_lesson_come.exists()
-                else None
-            )
-
-        if channel_id:
-            channel = MarketingChannel.objects.get(id=channel_id)
-            lead = lead.filter(marketing_channel=channel)
-            order_fix_created = order_fix_created.filter(marketing_channel=channel)
-            archived_lead = archived_lead.filter(marketing_channel=channel)
-            orders = orders.filter(marketing_channel=channel)
-            orders_archived = orders_archived.filter(marketing_channel=channel)
-            first_lesson = first_lesson.filter(lid__marketing_channel=channel)
-            first_lesson_come = first_lesson_come.filter(marketing_channel=channel)
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                marketing_channel=channel
-            )
-
-        if service_manager:
-            lead = lead.filter(service_manager_id=service_manager)
-            archived_lead = archived_lead.filter(service_manager_id=service_manager)
-            order_fix_created = order_fix_created.filter(
-                service_manager_id=service_manager
-            )
-            orders = orders.filter(service_manager_id=service_manager)
-            orders_archived = orders_archived.filter(service_manager_id=service_manager)
-            first_lesson = first_lesson.filter(lid__service_manager_id=service_manager)
-            first_lesson_come = first_lesson_come.filter(
-                service_manager_id=service_manager
-            )
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                service_manager_id=service_manager
-            )
-
-        if sales_manager:
-            lead = lead.filter(sales_manager_id=sales_manager)
-            archived_lead = archived_lead.filter(sales_manager_id=sales_manager)
-            order_fix_created = order_fix_created.filter(sales_manager_id=sales_manager)
-            orders = orders.filter(sales_manager_id=sales_manager)
-            orders_archived = orders_archived.filter(sales_manager_id=sales_manager)
-            first_lesson = first_lesson.filter(lid__sales_manager_id=sales_manager)
-            first_lesson_come = first_lesson_come.filter(sales_manager_id=sales_manager)
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                sales_manager_id=sales_manager
-            )
-
-        if call_operator:
-            lead = lead.filter(call_operator_id=call_operator)
-            archived_lead = archived_lead.filter(call_operator_id=call_operator)
-            order_fix_created = order_fix_created.filter(call_operator_id=call_operator)
-            orders = orders.filter(call_operator_id=call_operator)
-            orders_archived = orders_archived.filter(call_operator_id=call_operator)
-            first_lesson = first_lesson.filter(lid__call_operator_id=call_operator)
-            first_lesson_come = first_lesson_come.filter(call_operator_id=call_operator)
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                call_operator_id=call_operator
-            )
-
-        if subjects:
-            lead = lead.filter(subject_id=subjects)
-            archived_lead = archived_lead.filter(subject_id=subjects)
-            order_fix_created = order_fix_created.filter(subject_id=subjects)
-            orders = orders.filter(subject_id=subjects)
-            orders_archived = orders_archived.filter(subject_id=subjects)
-            first_lesson = first_lesson.filter(Q(lid__subject__id=subjects))
-            first_lesson_come = first_lesson_come.filter(Q(lid__subject__id=subjects))
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                Q(lid__subject__id=subjects)
-            )
-
-        if teacher:
-            lead = lead.filter(groups__group__teacher_id=teacher)
-            archived_lead = archived_lead.filter(groups__group__teacher_id=teacher)
-            orders = orders.filter(groups__group__teacher_id=teacher)
-            order_fix_created = order_fix_created.filter(
-                groups__group__teacher_id=teacher
-            )
-            orders_archived = orders_archived.filter(groups__group__teacher_id=teacher)
-            first_lesson = first_lesson.filter(group__teacher__id=teacher)
-            first_lesson_come = first_lesson_come.filter(
-                groups__group__teacher_id=teacher
-            )
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                groups__group__teacher_id=teacher
-            )
-
-        if course:
-            lead = lead.filter(groups__group__course_id=course)
-            archived_lead = archived_lead.filter(groups__group__course_id=course)
-            orders = orders.filter(groups__group__course_id=course)
-            order_fix_created = order_fix_created.filter(
-                groups__group__course_id=course
-            )
-            orders_archived = orders_archived.filter(groups__group__course_id=course)
-            first_lesson = first_lesson.filter(group__course__id=course)
-            first_lesson_come = first_lesson_come.filter(
-                groups__group__course_id=course
-            )
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                groups__group__course_id=course
-            )
-
-        # Final Data Output
-        data = {
-            "lids": lead.count(),
-            "archived_lid": archived_lead.count(),
-            "order_fix_created": order_fix_created.count(),
-            "orders": orders.count(),
-            "orders_archived": orders_archived.count(),
-            "first_lesson": first_lesson.count(),
-            "first_lesson_archived": first_lesson_archived.count(),
-            "first_lesson_come": first_lesson_come.count(),
-            "first_lesson_come_archived": (
-                first_lesson_come_archived.count() if first_lesson_come_archived else 0
-            ),
-            "new_student_archived": new_student_archived.count(),
-            "new_student": new_student.count(),
-            "active_student": active_student.count(),
-            "active_student_archived": (
-                active_student_archived.count() if active_student_archived else 0
-            ),
-            "course_ended": course_ended.count(),
-        }
+        # Query params: start_date, end_date, filial, is_student, marketing_channel,
+        # service_manager, sales_manager, call_operator, subject, teacher, course
+        data = dashboard_counters(request.query_params)
 
         return Response(data)
 
 
 class DashboardSecondView(APIView):
     def get(self, request, *args, **kwargs):
-        # Get Query Parameters
-        start_date = request.query_params.get("start_date")
-        end_date = request.query_params.get("end_date")
-        channel_id = request.query_params.get("marketing_channel")
-        service_manager = request.query_params.get("service_manager")
-        call_operator = request.query_params.get("call_operator")
-        sales_manager = request.query_params.get("sales_manager")
-        filial = request.query_params.get("filial")
-        subjects = request.query_params.get("subject")
-        course = request.query_params.get("course")
-        teacher = request.query_params.get("teacher")
-        is_student = request.query_params.get("is_student")
-
-        # Common Filters
-        filters = {}
-
-        if start_date:
-            filters["created_at__gte"] = start_date
-        if end_date:
-            filters["created_at__lte"] = end_date
-        if filial:
-            filters["filial_id"] = filial
-
-        # Initial QuerySets
-        lid = Lid.objects.filter(lid_stage_type="NEW_LID", **filters).exclude(
-            ordered_stages="BIRINCHI_DARS_BELGILANGAN"
-        )
-        archived_lid = lid.filter(
-            lid_stage_type="NEW_LID",
-            is_archived=True,
-        )
-        orders = Lid.objects.filter(lid_stage_type="ORDERED_LID", **filters).exclude(
-            ordered_stages="BIRINCHI_DARS_BELGILANGAN"
-        )
-        orders_archived = orders.filter(is_archived=True)
-        # first_lesson = FirstLLesson.objects.filter(**filters)
-        first_lesson = Lid.objects.filter(
-            ordered_stages="BIRINCHI_DARS_BELGILANGAN",
-            is_student=False,
-            is_archived=False,
-            **filters,
-        )
-
-        # Students with One Attendance
-        students_with_one_attendance = (
-            Attendance.objects.values("student")
-            .annotate(count=Count("id"))
-            .filter(count=1, **filters)
-            .values_list("student", flat=True)
-        )
+        # Same query params as DashboardView, dates compared as gte/lte
+        data, leads = dashboard_second_counters(request.query_params)
 
-        first_lesson_come = Student.objects.filter(
-            id__in=students_with_one_attendance,
-            **filters,
-        )
-        first_lesson_come_archived = first_lesson_come.filter(is_archived=True)
-
-        # First Course Payment Students
-        payment_students = Finance.objects.filter(
-            student__isnull=False,
-            # kind__name="COURSE_PAYMENT",
-            kind__kind=FinanceKindTypeChoices.COURSE_PAYMENT,
-            **filters,
-        ).values_list("student", flat=True)
-
-        first_course_payment = Student.objects.filter(
-            id__in=payment_students,
-            **filters,
-        )
-        first_course_payment_archived = first_course_payment.filter(is_archived=True)
+        data["archive_lid_res"] = LeadSerializer(leads.rows("lids"), many=True).data
 
-        # Active and Ended Courses
-        new_student = Student.objects.filter(
-            student_stage_type="NEW_STUDENT",
-            is_archived=False,
-            **filters,
-        )
-        active_student = Student.objects.filter(
-            student_stage_type="ACTIVE_STUDENT",
-            is_archived=False,
-            **filters,
-        )
-        course_ended = StudentGroup.objects.filter(group__status="INACTIVE", **filters)
-        # all_students = Student.objects.filter(is_archived=False)
-
-        # **Filtering Based on Dynamic Conditions**
-
-        if is_student:
-            is_student_value = is_student.capitalize()
-
-            lid = lid.filter(is_student=is_student_value, is_archived=False)
-            archived_lid = archived_lid.filter(is_student=is_student_value)
-            orders = orders.filter(is_student=is_student_value, is_archived=False)
-            orders_archived = orders_archived.filter(is_student=is_student_value)
-            first_lesson = first_lesson.filter(
-                is_student=is_student_value, is_archived=False
-            )
-            first_lesson_come = first_lesson_come.filter(is_archived=False)
-
-            first_lesson_come_archived = (
-                first_lesson_come.filter(is_archived=True)
-                if first_lesson_come.exists()
-                else None
-            )
-            first_course_payment = first_course_payment.filter(
-                is_archived=is_student_value
-            )
-            first_course_payment_archived = (
-                first_course_payment.filter(is_archived=True)
-                if first_course_payment.exists()
-                else None
-            )
-
-        if channel_id:
-            channel = MarketingChannel.objects.get(id=channel_id)
-            lid = lid.filter(marketing_channel=channel)
-            archived_lid = archived_lid.filter(marketing_channel=channel)
-            orders = orders.filter(marketing_channel=channel)
-            orders_archived = orders_archived.filter(marketing_channel=channel)
-            first_lesson = first_lesson.filter(marketing_channel=channel)
-            first_lesson_come = first_lesson_come.filter(marketing_channel=channel)
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                marketing_channel=channel
-            )
-            first_course_payment = first_course_payment.filter(
-                marketing_channel=channel
-            )
-            first_course_payment_archived = first_course_payment_archived.filter(
-                marketing_channel=channel
-            )
-
-        if service_manager:
-            lid = lid.filter(service_manager_id=service_manager)
-            archived_lid = archived_lid.filter(service_manager_id=service_manager)
-            orders = orders.filter(service_manager_id=service_manager)
-            orders_archived = orders_archived.filter(service_manager_id=service_manager)
-            first_lesson = first_lesson.filter(service_manager_id=service_manager)
-            first_lesson_come = first_lesson_come.filter(
-                service_manager_id=service_manager
-            )
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                service_manager_id=service_manager
-            )
-            first_course_payment = first_course_payment.filter(
-                service_manager_id=service_manager
-            )
-            first_course_payment_archived = first_course_payment_archived.filter(
-                service_manager_id=service_manager
-            )
-
-        if sales_manager:
-            lid = lid.filter(sales_manager_id=sales_manager)
-            archived_lid = archived_lid.filter(sales_manager_id=sales_manager)
-            orders = orders.filter(sales_manager_id=sales_manager)
-            orders_archived = orders_archived.filter(sales_manager_id=sales_manager)
-            first_lesson = first_lesson.filter(sales_manager_id=sales_manager)
-            first_lesson_come = first_lesson_come.filter(sales_manager_id=sales_manager)
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                sales_manager_id=sales_manager
-            )
-            first_course_payment = first_course_payment.filter(
-                sales_manager_id=sales_manager
-            )
-            first_course_payment_archived = first_course_payment_archived.filter(
-                sales_manager_id=sales_manager
-            )
-
-        if call_operator:
-            lid = lid.filter(call_operator_id=call_operator)
-            archived_lid = archived_lid.filter(call_operator_id=call_operator)
-            orders = orders.filter(call_operator_id=call_operator)
-            orders_archived = orders_archived.filter(call_operator_id=call_operator)
-            first_lesson = first_lesson.filter(call_operator_id=call_operator)
-            first_lesson_come = first_lesson_come.filter(call_operator_id=call_operator)
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                call_operator_id=call_operator
-            )
-            first_course_payment = first_course_payment.filter(
-                call_operator_id=call_operator
-            )
-            first_course_payment_archived = first_course_payment_archived.filter(
-                call_operator_id=call_operator
-            )
-
-        if subjects:
-            lid = lid.filter(subject_id=subjects)
-            archived_lid = archived_lid.filter(subject_id=subjects)
-            orders = orders.filter(subject_id=subjects)
-            orders_archived = orders_archived.filter(subject_id=subjects)
-            first_lesson = first_lesson.filter(subject_id=subjects)
-            first_lesson_come = first_lesson_come.filter(subject_id=subjects)
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                subject_id=subjects
-            )
-            first_course_payment = first_course_payment.filter(subject_id=subjects)
-            first_course_payment_archived = first_course_payment_archived.filter(
-                subject_id=subjects
-            )
-
-        if teacher:
-            lid = lid.filter(groups__group__teacher_id=teacher)
-            archived_lid = archived_lid.filter(groups__group__teacher_id=teacher)
-            orders = orders.filter(groups__group__teacher_id=teacher)
-            orders_archived = orders_archived.filter(groups__group__teacher_id=teacher)
-            first_lesson = first_lesson.filter(group__teacher_id=teacher)
-            first_lesson_come = first_lesson_come.filter(
-                groups__group__teacher_id=teacher
-            )
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                groups__group_id=teacher
-            )
-            first_course_payment = first_course_payment.filter(
-                groups__group__teacher_id=teacher
-            )
-            first_course_payment_archived = first_course_payment_archived.filter(
-                groups__group__teacher_id=teacher
-            )
-
-        if course:
-            lid = lid.filter(groups__group__course_id=course)
-            archived_lid = archived_lid.filter(groups__group__course_id=course)
-            orders = orders.filter(groups__group__course_id=course)
-            orders_archived = orders_archived.filter(groups__group__course_id=course)
-            first_lesson = first_lesson.filter(group__course_id=course)
-            first_lesson_come = first_lesson_come.filter(
-                groups__group__course_id=course
-            )
-            first_lesson_come_archived = first_lesson_come_archived.filter(
-                groups__group__course_id=course
-            )
-            first_course_payment = first_course_payment.filter(
-                groups__group__course_id=course
-            )
-            first_course_payment_archived = first_course_payment_archived.filter(
-                groups__group__course_id=course
-            )
+        return Response(data)
 
-        # Final Data Output
-        data = {
-            "lids": lid.count(),
-            "archived_lid": archived_lid.count(),
-            "archive_lid_res": LeadSerializer(lid, many=True).data,
-            "orders": orders.count(),
-            "orders_archived": orders_archived.count(),
-            "first_lesson": first_lesson.count(),
-            "first_lesson_come": first_lesson_come.count(),
-            "first_lesson_come_archived": (
-                first_lesson_come_archived.count() if first_lesson_come_archived else 0
-            ),
-            "first_course_payment": first_course_payment.count(),
-            "new_student": new_student.count(),
-            "active_student": active_student.count(),
-            "first_course_payment_archived": (
-                first_course_payment_archived.count()
-                if first_course_payment_archived
-                else 0
-            ),
-            "course_ended": course_ended.count(),
-            "all_students": new_student.count() + active_student.count(),
-        }
 
-        return Response(data)
+class FunnelRollupView(APIView):
+    def get(self, request, *args, **kwargs):
+        # start_date/end_date (YYYY-MM-DD), filial, marketing_channel,
+        # sales_manager, call_operator, subject, course, teacher
+        return Response(funnel_totals(request.query_params))
 
 
 class MarketingChannels(APIView):
@@ -568,126 +113,79 @@ class CheckRoomFillingView(APIView):
         except ValueError:
             return Response({"error": "Invalid input format"}, status=400)
 
-        # Get all rooms in the filial if no specific room is given
-        if not room_id:
-            room_ids = list(
-                Room.objects.filter(filial_id=filial).values_list("id", flat=True)
-            )
-        else:
-            room_ids = [room_id]
-
-        # Map lesson_type to days
-        lesson_days_map = {
-            "1": ["Dushanba"],
-            "0": ["Seshanba"],
-            ".": ["Dushanba", "Seshanba"],
-        }
-        lesson_days = lesson_days_map.get(lesson_type, [])
-
-        # Get lesson days IDs
-        lesson_days_ids = Day.objects.filter(name__in=lesson_days).values_list(
-            "id", flat=True
-        )
-
-        # Fetch all active lessons within the specified rooms and lesson days
-        active_lessons = (
-            Group.objects.filter(
-                room_number_id__in=room_ids,
-                scheduled_day_type__id__in=lesson_days_ids,
-                started_at__lt=end_time,
-                ended_at__gt=start_time,
-                status="ACTIVE",
-            )
-            .order_by("started_at")
-            .distinct()
-        )
+        if lesson_duration <= 0 or end_time <= start_time:
+            return Response({"error": "Invalid input format"}, status=400)
 
-        # **Statistics Calculation**
-        total_available_time = (
-            datetime.combine(datetime.today(), end_time)
-            - datetime.combine(datetime.today(), start_time)
-        ).seconds // 60
-        ic(total_available_time)
-        total_available_lesson_hours = total_available_time // lesson_duration
-        ic(total_available_lesson_hours)
-
-        # **Count occupied lesson hours**
-        occupied_lesson_hours = (
-            sum(
-                (lesson.ended_at.hour * 60 + lesson.ended_at.minute)
-                - (lesson.started_at.hour * 60 + lesson.started_at.minute)
-                for lesson in active_lessons
+        day_names = timetable.LESSON_TYPE_DAYS.get(lesson_type, ())
+        weekdays = timetable.weekdays_of(day_names)
+
+        rooms = timetable.filial_rooms(filial, [room_id] if room_id else None)
+        occupancy = timetable.occupancy(rooms, weekdays, start_time, end_time)
+
+        start_minute = timetable.minute(start_time)
+        end_minute = timetable.minute(end_time)
+
+        # lessons that fit the window, per room and day
+        total_available_lesson_hours = (end_minute - start_minute) // lesson_duration
+
+        occupied_minutes = 0
+        free_lesson_hours = 0
+        group_ids = set()
+        room_rows = []
+        for room_key, room in rooms.items():
+            room_occupied = 0
+            room_free = {}
+            for weekday, (taken, groups) in occupancy[room_key].items():
+                room_occupied += sum(end - start for start, end in taken)
+                group_ids |= groups
+                slots = timetable.free_slots(
+                    taken, start_minute, end_minute, lesson_duration
+                )
+                free_lesson_hours += sum(
+                    (end - start) // lesson_duration for start, end in slots
+                )
+                room_free[weekday] = [
+                    [
+                        timetable.as_time(start).strftime("%H:%M"),
+                        timetable.as_time(end).strftime("%H:%M"),
+                    ]
+                    for start, end in slots
+                ]
+            occupied_minutes += room_occupied
+            room_rows.append(
+                {
+                    "id": room_key,
+                    "room_number": room.room_number,
+                    "room_filling": room.room_filling,
+                    "occupied_minutes": room_occupied,
+                    "free_slots": room_free,
+                }
             )
-            // lesson_duration
-        )
-
-        ic(occupied_lesson_hours)
 
-        free_lesson_hours = total_available_lesson_hours - occupied_lesson_hours
-        ic(free_lesson_hours)
-
-        # **Count number of lesson hour pairs**
+        occupied_lesson_hours = occupied_minutes // lesson_duration
         lesson_hour_pairs = occupied_lesson_hours // 2
-        ic(lesson_hour_pairs, occupied_lesson_hours)
-
-        # **Count unique groups running in this period**
-        total_groups = active_lessons.count()
-        ic(total_groups)
-
-        rooms = Room.objects.filter(filial_id=self.request.user.filial.first())
+        total_groups = len(group_ids)
 
         total_students_capacity = sum(
-            [room.room_filling * total_available_lesson_hours for room in rooms]
+            (room.room_filling or 0) * total_available_lesson_hours
+            for room in rooms.values()
         )
 
-        for room in rooms:
-            print(room.room_filling, total_available_lesson_hours)
-
-        # total_students_capacity = sum(
-        #     (total_available_lesson_hours) * (i.room_number.room_filling if i.room_number else 0)
-        #     for i in active_lessons
-        # )
-
-        ic(total_students_capacity)
-
-        # total_students_capacity -= sum(occupied_lesson_hours * room.room_filling for room in rooms)
-
-        ic(total_students_capacity)
-
-        if lesson_type == "1":
-            groups_students = StudentGroup.objects.filter(
-                filial_id=filial, group__scheduled_day_type__name__in=["Dushanba"]
-            )
-        elif lesson_type == "0":
-            groups_students = StudentGroup.objects.filter(
-                filial_id=filial, group__scheduled_day_type__name__in=["Seshanba"]
-            )
-        else:
-            groups_students = StudentGroup.objects.filter(filial_id=filial)
-
-        if lesson_type == "1":
-            new_students = StudentGroup.objects.filter(
-                filial_id=filial,
-                student__student_stage_type="NEW_STUDENT",
-                group__scheduled_day_type__name__in=["Dushanba"],
-            )
-        elif lesson_type == "0":
-            new_students = StudentGroup.objects.filter(
-                filial_id=filial,
-                student__student_stage_type="NEW_STUDENT",
-                group__scheduled_day_type__name__in=["Seshanba"],
-            )
-        else:
-            new_students = StudentGroup.objects.filter(
-                filial_id=filial,
-                student__student_stage_type="NEW_STUDENT",
-            )
+        students = StudentGroup.objects.filter(filial_id=filial)
+        if lesson_type in ["1", "0"]:
+            students = students.filter(group__scheduled_day_type__name__in=day_names)
+        counts = students.aggregate(
+            groups_students=Count("id"),
+            new_students=Count(
+                "id", filter=Q(student__student_stage_type="NEW_STUDENT")
+            ),
+        )
 
         # **Generate final statistics response**
         return Response(
             {
-                "groups_students": groups_students.count(),
-                "new_students": new_students.count(),
+                "groups_students": counts["groups_students"],
+                "new_students": counts["new_students"],
                 "total_available_lesson_hours": total_available_lesson_hours,
                 "occupied_lesson_hours": occupied_lesson_hours,
                 "free_lesson_hours": free_lesson_hours,
@@ -696,11 +194,12 @@ class CheckRoomFillingView(APIView):
                 "total_students_capacity": (
                     total_students_capacity * (1 if lesson_type in ["1", "0"] else 3)
                 )
-                - groups_students.count(),
+                - counts["groups_students"],
                 "all_places": total_students_capacity,
                 "weeks_capacity": total_students_capacity
                 * (1 if lesson_type in ["1", "0"] else 3),
                 "AAAAAAAAAAAA": lesson_type in ["1", "0"],
+                "rooms": room_rows,
             }
         )
 
@@ -857,35 +356,17 @@ class MonitoringView(APIView):
         elif end_date:
             teachers = teachers.filter(created_at__date__lte=end_date)
 
-        teacher_data = []
-
-        for teacher in teachers:
-            subjects_query = (
-                Group.objects.filter(teacher=teacher)
-                .annotate(
-                    subject_id=F("course__subject__id"),
-                    subject_name=F("course__subject__name"),
-                )
-                .values(
-                    "subject_id", "subject_name"
-                )  # Ensure renamed fields are used in values()
-            )
-            if subject_id:
-                subjects_query = subjects_query.filter(id=subject_id)
+        teachers = list(teachers.select_related("photo"))
+        teacher_ids = [teacher.id for teacher in teachers]
 
-            subjects = list(subjects_query)
+        subjects = subjects_by_teacher(teacher_ids, subject_id=subject_id)
+        results = results_by_teacher(
+            teacher_ids, start=start_date, end=end_date, end_inclusive=True
+        )
 
-            if start_date and end_date:
-                results = Results.objects.filter(
-                    teacher=teacher, created_at__gte=start_date, created_at_lte=end_date
-                ).count()
-            elif start_date:
-                results = Results.objects.filter(
-                    teacher=teacher, created_at__gte=start_date
-                )
-            else:
-                results = Results.objects.filter(teacher=teacher).count()
+        teacher_data = []
 
+        for teacher in teachers:
             # Use FileUploadSerializer for the photo (handling None cases)
             image_data = (
                 FileUploadSerializer(teacher.photo, context={"request": request}).data
@@ -899,8 +380,8 @@ class MonitoringView(APIView):
                     "full_name": teacher.name,
                     "image": image_data,
                     "overall_point": teacher.overall_point,
-                    "subjects": subjects,
-                    "results": results,
+                    "subjects": subjects.get(teacher.id, []),
+                    "results": results.get(teacher.id, 0),
                 }
             )
 
@@ -930,14 +411,6 @@ class MonitoringAsosAPIView(APIView):
             start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
             end_date = start_date + timedelta(days=1)
 
-        # ASOS IDs
-        asos_ids = {
-            "ASOS_1": Asos.objects.filter(name="ASOS_1").first().id,
-            "ASOS_3": Asos.objects.filter(name="ASOS_3").first().id,
-            "ASOS_4": Asos.objects.filter(name="ASOS_4").first().id,
-            "ASOS_12": Asos.objects.filter(name="ASOS_12").first().id,
-        }
-
         teachers = CustomUser.objects.filter(
             role__in=["TEACHER", "ASSISTANT"]
         ).annotate(name=Concat(F("first_name"), Value(" "), F("last_name")))
@@ -955,33 +428,22 @@ class MonitoringAsosAPIView(APIView):
         if filial:
             teachers = teachers.filter(filial__id=filial)
 
-        def get_asos_ball(model, filter_kwargs):
-            qs = model.objects.filter(**filter_kwargs)
-            if start_date and end_date:
-                qs = qs.filter(created_at__gte=start_date, created_at__lt=end_date)
-            return qs.aggregate(total=Sum(Cast("ball", FloatField())))["total"] or 0
+        teachers = list(teachers.select_related("photo").prefetch_related("filial"))
+        teacher_ids = [teacher.id for teacher in teachers]
+
+        subjects = subjects_by_teacher(teacher_ids, subject_id=subject_id)
+        results = results_by_teacher(
+            teacher_ids, start=start_date, end=end_date, status="Accepted"
+        )
+        balls = asos_balls_by_teacher(teacher_ids, start=start_date, end=end_date)
 
         teacher_data = []
 
         for teacher in teachers:
-            # Get subjects
-            subjects_qs = (
-                Group.objects.filter(teacher=teacher)
-                .annotate(subject_name=F("course__subject__name"))
-                .values("subject_name")
-            )
-            if subject_id:
-                subjects_qs = subjects_qs.filter(subject__id=subject_id)
-
             subject_names = ", ".join(
-                sorted(set(s["subject_name"] for s in subjects_qs))
+                sorted(set(s["subject_name"] for s in subjects.get(teacher.id, [])))
             )
-
-            result_qs = Results.objects.filter(teacher=teacher, status="Accepted")
-            if start_date and end_date:
-                result_qs = result_qs.filter(
-                    created_at__gte=start_date, created_at__lt=end_date
-                )
+            filial_names = [f.name for f in teacher.filial.all()]
 
             image_data = (
                 FileUploadSerializer(teacher.photo, context={"request": request}).data
@@ -989,32 +451,7 @@ class MonitoringAsosAPIView(APIView):
                 else None
             )
 
-            # ASOS ballarni oldin hisobla
-            asos_1 = round(
-                get_asos_ball(MonitoringAsos1_2, {"user": teacher.id, "asos": "asos1"}),
-                2,
-            )
-            asos_3 = round(
-                get_asos_ball(
-                    Monitoring,
-                    {"user": teacher.id, "point__asos__id": asos_ids["ASOS_3"]},
-                ),
-                2,
-            )
-            asos_4 = round(
-                get_asos_ball(
-                    MonitoringAsos4,
-                    {"user": teacher.id, "asos__id": asos_ids["ASOS_4"]},
-                ),
-                2,
-            )
-            asos_12_13_14 = round(
-                get_asos_ball(
-                    MonitoringAsos4,
-                    {"user": teacher.id, "asos__id": asos_ids["ASOS_12"]},
-                ),
-                2,
-            )
+            asos = balls[teacher.id]
 
             teacher_data.append(
                 {
@@ -1022,18 +459,11 @@ class MonitoringAsosAPIView(APIView):
                     "full_name": teacher.name,
                     "image": image_data,
                     "role": teacher.role,
-                    "filial": (
-                        ", ".join(f.name for f in teacher.filial.all())
-                        if teacher.filial.exists()
-                        else "-"
-                    ),
+                    "filial": ", ".join(filial_names) if filial_names else "-",
                     "subjects": subject_names or "-",
-                    "asos_1": asos_1,
-                    "asos_3": asos_3,
-                    "asos_4": asos_4,
-                    "asos_12_13_14": asos_12_13_14,
-                    "results": result_qs.count(),
-                    "points": round(asos_1 + asos_3 + asos_4 + asos_12_13_14, 2),
+                    **asos,
+                    "results": results.get(teacher.id, 0),
+                    "points": round(sum(asos.values()), 2),
                 }
             )
 
@@ -1043,192 +473,8 @@ class MonitoringAsosAPIView(APIView):
 
 class MonitoringExcelExportView(APIView):
     def get(self, request, *args, **kwargs):
-        full_name = request.query_params.get("search")
-        subject_id = request.query_params.get("subject")
-        course_id = request.query_params.get("course")
-        filial = request.query_params.get("filial")
-        teacher = request.query_params.get("teacher")
-        role = request.query_params.get("role")
-
-        start_date_str = request.GET.get("start_date")
-        end_date_str = request.GET.get("end_date")
-        start_date = end_date = None
-
-        if start_date_str and end_date_str:
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%d") + timedelta(days=1)
-        elif start_date_str:
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-            end_date = start_date + timedelta(days=1)
-
-        asos_ids = {
-            "ASOS_1": Asos.objects.filter(name="ASOS_1").first().id,
-            "ASOS_3": Asos.objects.filter(name="ASOS_3").first().id,
-            "ASOS_4": Asos.objects.filter(name="ASOS_4").first().id,
-            "ASOS_12": Asos.objects.filter(name="ASOS_12").first().id,
-            "ASOS_13": Asos.objects.filter(name="ASOS_13").first().id,
-            "ASOS_14": Asos.objects.filter(name="ASOS_14").first().id,
-        }
-
-        teachers = CustomUser.objects.filter(
-            role__in=["TEACHER", "ASSISTANT"]
-        ).annotate(
-            name=Concat(F("first_name"), Value(" "), F("last_name")),
-            overall_point=F("monitoring"),
-        )
-
-        if role:
-            teachers = teachers.filter(role=role)
-        if teacher:
-            teachers = teachers.filter(id=teacher)
-        if course_id:
-            teachers = teachers.filter(teachers_groups__course__id=course_id)
-        if subject_id:
-            teachers = teachers.filter(teachers_groups__course__subject__id=subject_id)
-        if full_name:
-            teachers = teachers.filter(name__icontains=full_name)
-        if filial:
-            teachers = teachers.filter(filial__id=filial)
-        if start_date and end_date:
-            teachers = teachers.filter(
-                created_at__date__gte=start_date.date(),
-                created_at__date__lt=end_date.date(),
-            )
-
-        def get_asos_ball(model, filter_kwargs):
-            qs = model.objects.filter(**filter_kwargs)
-            if start_date and end_date:
-                qs = qs.filter(created_at__gte=start_date, created_at__lt=end_date)
-            return qs.aggregate(total=Sum(Cast("ball", FloatField())))["total"] or 0
-
-        teacher_data = []
-        for teacher in teachers:
-            subjects_qs = (
-                Group.objects.filter(teacher=teacher)
-                .annotate(subject_name=F("course__subject__name"))
-                .values("subject_name")
-            )
-
-            if subject_id:
-                subjects_qs = subjects_qs.filter(subject__id=subject_id)
-
-            subject_names = ", ".join(
-                sorted(set(s["subject_name"] for s in subjects_qs))
-            )
-
-            result_qs = Results.objects.filter(teacher=teacher, status="Accepted")
-            if start_date and end_date:
-                result_qs = result_qs.filter(
-                    created_at__gte=start_date, created_at__lt=end_date
-                )
-
-            teacher_data.append(
-                {
-                    "name": teacher.name,
-                    "role": teacher.role,
-                    "filial": (
-                        ", ".join(f.name for f in teacher.filial.all())
-                        if teacher.filial.exists()
-                        else "-"
-                    ),
-                    "subjects": subject_names or "-",
-                    "asos_1": round(
-                        get_asos_ball(
-                            MonitoringAsos1_2, {"user": teacher.id, "asos": "asos1"}
-                        ),
-                        2,
-                    ),
-                    "asos_3": round(
-                        get_asos_ball(
-                            Monitoring,
-                            {"user": teacher.id, "point__asos__id": asos_ids["ASOS_3"]},
-                        ),
-                        2,
-                    ),
-                    "asos_4": round(
-                        get_asos_ball(
-                            MonitoringAsos4,
-                            {"user": teacher.id, "asos__id": asos_ids["ASOS_4"]},
-                        ),
-                        2,
-                    ),
-                    "asos_12_13_14": round(
-                        get_asos_ball(
-                            MonitoringAsos4,
-                            {"user": teacher.id, "asos__id": asos_ids["ASOS_12"]},
-                        ),
-                        2,
-                    ),
-                    "results": result_qs.count(),
-                    "points": teacher.overall_point or 0,
-                }
-            )
-
-        sorted_teachers = sorted(teacher_data, key=itemgetter("points"), reverse=True)
-
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Monitoring"
-
-        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=14)
-        title_cell = ws.cell(row=1, column=1)
-        title_cell.value = "📊 Monitoring hisoboti"
-        title_cell.font = Font(size=14, bold=True)
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        headers = [
-            "O'qituvchi",
-            "Roli",
-            "Filial",
-            "Fanlar",
-            "ASOS_1_2",
-            "ASOS_3",
-            "ASOS_4",
-            "ASOS_5",
-            "ASOS_6",
-            "ASOS_7",
-            "ASOS_8_9",
-            "ASOS_10_11",
-            "ASOS_12_13_14",
-            "Natijalar soni",
-            "Monitoring ball",
-        ]
-        ws.append(headers)
-
-        total_results = 0
-        for teacher in sorted_teachers:
-            ws.append(
-                [
-                    teacher["name"],
-                    "O'qituvchi" if teacher["role"] == "TEACHER" else "Assistent",
-                    teacher["filial"],
-                    teacher["subjects"],
-                    teacher["asos_1"],
-                    teacher["asos_3"],
-                    teacher["asos_4"],
-                    "",
-                    "",
-                    "",
-                    "",
-                    "",
-                    teacher["asos_12_13_14"],
-                    teacher["results"],
-                    teacher["points"],
-                ]
-            )
-            total_results += teacher["results"]
-
-        ws.append([])
-        ws.append(["", "", "", "Umumiy natijalar soni:", total_results])
-
-        response = HttpResponse(
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        response["Content-Disposition"] = (
-            'attachment; filename="monitoring_report.xlsx"'
-        )
-        wb.save(response)
-        return response
+        # same query params as the monitoring list; background=true for a job
+        return respond(request, "monitoring")
 
 
 class DashboardWeeklyFinanceAPIView(APIView):
@@ -1246,9 +492,7 @@ class DashboardWeeklyFinanceAPIView(APIView):
         filters = {}
 
         # Get all dynamic kinds from DB
-        existing_kinds = list(
-            Kind.objects.values_list("kind", flat=True)
-        )  # Fetch all available kinds dynamically
+        existing_kinds = kind_names()
 
         if filial:
             filters["filial"] = filial
@@ -1645,186 +889,7 @@ class StudentLanguage(APIView):
 
 class ExportDashboardToExcelAPIView(APIView):
     def get(self, request, *args, **kwargs):
-        # ✅ 1. Fetch Sales Data
-        creator = request.query_params.get("creator")
-        sale = request.query_params.get("sale")
-        student = request.query_params.get("student")
-        filial = request.query_params.get("filial")
-
-        sales_filters = {}
-        if creator:
-            sales_filters["creator__id"] = creator
-        if sale:
-            sales_filters["sale__id"] = sale
-        if student:
-            sales_filters["student__id"] = student
-        if filial:
-            sales_filters["filial__id"] = filial
-
-        student_count = (
-            SaleStudent.objects.filter(**sales_filters)
-            .values("creator")
-            .annotate(total_students=Count("student", distinct=True))
-        )
-
-        voucher_sales = (
-            SaleStudent.objects.filter(sale__type="VOUCHER", **sales_filters)
-            .values("creator")
-            .annotate(total_voucher_amount=Sum("sale__amount"))
-        )
-
-        sale_data = (
-            SaleStudent.objects.filter(sale__type="SALE", **sales_filters)
-            .values("creator")
-            .annotate(
-                total_sale_discount=Sum(
-                    Case(
-                        When(
-                            groups__group__price_type="monthly",
-                            then=F("groups__group__price")
-                            * F("sale__amount")
-                            / Value(100),
-                        ),
-                        default=Value(0),
-                        output_field=DecimalField(),
-                    )
-                )
-            )
-        )
-
-        total_sales = (
-            SaleStudent.objects.filter(**sales_filters)
-            .values("creator")
-            .annotate(total_sales_amount=Sum("sale__amount"))
-        )
-
-        # ✅ 2. Fetch Finance Statistics Data
-        finance_filters = {}
-        kind_id = request.query_params.get("kind")
-        action = request.query_params.get("action")
-        creator = request.query_params.get("creator")
-        student = request.query_params.get("student")
-        stuff = request.query_params.get("stuff")
-        casher = request.query_params.get("casher")
-        payment_method = request.query_params.get("payment_method")
-
-        if kind_id:
-            finance_filters["kind__id"] = kind_id
-        if action:
-            finance_filters["action"] = action
-        if creator:
-            finance_filters["creator__id"] = creator
-        if student:
-            finance_filters["student__id"] = student
-        if stuff:
-            finance_filters["stuff__id"] = stuff
-        if casher:
-            finance_filters["casher__id"] = casher
-        if payment_method:
-            finance_filters["payment_method"] = payment_method
-
-        finance_stats = (
-            Finance.objects.filter(**finance_filters)
-            .values("kind__id", "kind__name", "action")
-            .annotate(total_amount=Sum("amount"))
-            .order_by("kind__name")
-        )
-
-        # ✅ 3. Fetch Weekly Finance Data
-        start_date = request.query_params.get("start_date")
-        end_date = request.query_params.get("end_date")
-        casher_id = request.query_params.get("casher")
-        kind = request.query_params.get("kind")
-
-        weekly_filters = {}
-        if casher_id:
-            weekly_filters["casher__id"] = casher_id
-        if kind:
-            weekly_filters["kind__name"] = kind
-        if start_date:
-            weekly_filters["created_at__gte"] = start_date
-        if end_date:
-            weekly_filters["created_at__lte"] = end_date
-
-        weekly_finance_data = (
-            Finance.objects.filter(**weekly_filters)
-            .values("kind__name")
-            .annotate(total_amount=Sum("amount"))
-        )
-
-        # ✅ Create Excel Workbook
-        workbook = Workbook()
-
-        # ✅ Create Sales Sheet
-        sales_sheet = workbook.active
-        sales_sheet.title = "Sales Data"
-        sales_headers = [
-            "Yaratuvchi xodim",
-            "Jami Studentlar",
-            "Voucher Sales",
-            "Sale Discount",
-            "Total Sales",
-        ]
-        sales_sheet.append(sales_headers)
-
-        for entry in student_count:
-            creator_id = entry["creator"]
-            voucher_entry = next(
-                (v for v in voucher_sales if v["creator"] == creator_id),
-                {"total_voucher_amount": 0},
-            )
-            sale_entry = next(
-                (s for s in sale_data if s["creator"] == creator_id),
-                {"total_sale_discount": 0},
-            )
-            total_sales_entry = next(
-                (t for t in total_sales if t["creator"] == creator_id),
-                {"total_sales_amount": 0},
-            )
-
-            sales_sheet.append(
-                [
-                    entry["total_students"],
-                    voucher_entry["total_voucher_amount"],
-                    sale_entry["total_sale_discount"],
-                    total_sales_entry["total_sales_amount"],
-                ]
-            )
-
-        # ✅ Create Finance Statistics Sheet
-        finance_sheet = workbook.create_sheet(title="Finance Statistics")
-        finance_headers = ["Kind Name", "Action", "Total Amount"]
-        finance_sheet.append(finance_headers)
-
-        for entry in finance_stats:
-            finance_sheet.append(
-                [entry["kind__name"], entry["action"], entry["total_amount"]]
-            )
-
-        # ✅ Create Weekly Finance Data Sheet
-        weekly_sheet = workbook.create_sheet(title="Weekly Finance")
-        weekly_headers = ["Kind Name", "Total Amount"]
-        weekly_sheet.append(weekly_headers)
-
-        for entry in weekly_finance_data:
-            weekly_sheet.append([entry["kind__name"], entry["total_amount"]])
-
-        # ✅ Style headers
-        for sheet in [sales_sheet, finance_sheet, weekly_sheet]:
-            for col_num, header in enumerate(sheet[1], 1):
-                cell = sheet.cell(row=1, column=col_num)
-                cell.font = Font(bold=True, size=12)
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                sheet.column_dimensions[cell.column_letter].width = 20
-
-        # ✅ Create HTTP Response
-        response = HttpResponse(
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        response["Content-Disposition"] = 'attachment; filename="Dashboard_Data.xlsx"'
-        workbook.save(response)
-
-        return response
+        return respond(request, "dashboard")
 
 
 class AdminLineGraph(APIView):
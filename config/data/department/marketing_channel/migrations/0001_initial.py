@@ -0,0 +1,48 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('filial', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConfirmationCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone', models.CharField(max_length=20, unique=True)),
+                ('code', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MarketingChannel',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('name', models.CharField(max_length=100)),
+                ('type', models.CharField(blank=True, max_length=100, null=True)),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+                'constraints': [models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='marketing_channel_marketingchannel_arch_ts_chk')],
+            },
+        ),
+    ]
@@ -0,0 +1,247 @@
+"""
+Employee balance moves.
+
+An EmployeeTransaction moves its employee's balance by ``effective_amount``
+when it is created and back when it is deleted or archived, with a Log row
+holding the balance before and after. The balance is changed by
+``UPDATE ... SET balance = balance + delta``, never written back from a
+copy read earlier, so a lesson payment and a month-end bonus of the same
+teacher in two processes both land.
+
+Inside ``buffered()`` the moves of a bulk job are collected per employee
+and written when the block ends: the employees are locked in id order, the
+Logs are bulk-created and all balances change in one UPDATE.
+
+``reconcile()`` compares every balance with the sum of the employee's live
+transactions in one grouped query.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Callable, NamedTuple
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Q, Sum, Value, When
+
+from data.account.models import CustomUser
+from data.employee.transactions.models import EmployeeTransaction
+from data.logs.models import Log
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+_BALANCE = DecimalField(max_digits=12, decimal_places=2)
+
+
+class Move(NamedTuple):
+    employee_id: object
+    delta: Decimal
+    # (employee full name, start balance, final balance) -> unsaved Log
+    log: Callable[[str, Decimal, Decimal], Log] | None
+
+
+def _move(employee_id, delta) -> tuple[Decimal, Decimal, str]:
+    with transaction.atomic():
+        CustomUser.objects.filter(pk=employee_id).update(
+            balance=F("balance") + Value(Decimal(delta), output_field=_BALANCE)
+        )
+        # our UPDATE holds the row lock, so this reads our own result
+        final, name = CustomUser.objects.values_list("balance", "full_name").get(
+            pk=employee_id
+        )
+    return final - delta, final, name
+
+
+def move(employee_id, delta) -> tuple[Decimal, Decimal]:
+    """Add ``delta`` to the balance; returns the balance before and after."""
+    start, final, _ = _move(employee_id, delta)
+    return start, final
+
+
+def _apply(item: Move):
+    with transaction.atomic():
+        start, final, name = _move(item.employee_id, item.delta)
+        if item.log is not None:
+            item.log(name, start, final).save()
+
+
+def _flush(items: list[Move]):
+    totals = defaultdict(Decimal)
+    for item in items:
+        totals[item.employee_id] += item.delta
+
+    rows = (
+        CustomUser.objects.select_for_update()
+        .filter(pk__in=totals)
+        .order_by("pk")
+        .values_list("pk", "balance", "full_name")
+    )
+    balances, names = {}, {}
+    for pk, balance, name in rows:
+        balances[pk], names[pk] = balance, name
+
+    logs = []
+    for item in items:
+        if item.employee_id not in balances:
+            continue
+        start = balances[item.employee_id]
+        balances[item.employee_id] = start + item.delta
+        if item.log is not None:
+            logs.append(
+                item.log(names[item.employee_id], start, balances[item.employee_id])
+            )
+
+    changed = {pk: delta for pk, delta in totals.items() if delta}
+    if changed:
+        CustomUser.objects.filter(pk__in=changed).update(
+            balance=Case(
+                *[
+                    When(pk=pk, then=F("balance") + Value(delta))
+                    for pk, delta in changed.items()
+                ],
+                default=F("balance"),
+                output_field=_BALANCE,
+            )
+        )
+    Log.objects.bulk_create(logs, batch_size=1000)
+
+
+@contextmanager
+def buffered():
+    """
+    Collect the balance moves of the block and write them when it ends, in
+    the block's transaction. Nested blocks join the outermost one.
+    """
+    if getattr(_local, "buffer", None) is not None:
+        yield
+        return
+
+    _local.buffer = []
+    try:
+        with transaction.atomic():
+            yield
+            items, _local.buffer = _local.buffer, None
+            if items:
+                _flush(items)
+    finally:
+        _local.buffer = None
+
+
+def record(employee_id, delta, log=None):
+    """Move the balance now, or when the surrounding ``buffered()`` ends."""
+    item = Move(employee_id, Decimal(delta), log)
+    buffer = getattr(_local, "buffer", None)
+    if buffer is not None:
+        buffer.append(item)
+    else:
+        _apply(item)
+
+
+def _by(tx: EmployeeTransaction) -> str:
+    if not tx.created_by_id:
+        return "-"
+    return f"By {tx.created_by.full_name}({tx.created_by.phone})"
+
+
+def created(tx: EmployeeTransaction):
+    by = _by(tx)
+    record(
+        tx.employee_id,
+        tx.effective_amount,
+        lambda name, start, final: Log(
+            object="EMPLOYEE",
+            action="TRANSACTION_CREATED",
+            employee_transaction=tx,
+            employee_id=tx.employee_id,
+            comment=(
+                f"Transaction created for employee {name}. {by}, "
+                f"Start: {start}, Change: +{tx.effective_amount}, "
+                f"Final: {final}."
+            ),
+        ),
+    )
+
+
+def deleted(tx: EmployeeTransaction):
+    by = _by(tx)
+    record(
+        tx.employee_id,
+        -tx.effective_amount,
+        lambda name, start, final: Log(
+            object="EMPLOYEE",
+            action="TRANSACTION_DELETED",
+            # the row is gone; keep the link only while it exists
+            employee_transaction=None,
+            employee_id=tx.employee_id,
+            comment=(
+                f"Transaction deleted for employee {name}. {by}, "
+                f"Start: {start}, Change: -{tx.effective_amount}, "
+                f"Final: {final}."
+            ),
+        ),
+    )
+
+
+def archived(tx: EmployeeTransaction, comment: str | None = None):
+    record(
+        tx.employee_id,
+        -tx.effective_amount,
+        lambda name, start, final: Log(
+            object="EMPLOYEE",
+            action="TRANSACTION_DELETED",
+            employee_transaction=tx,
+            employee_id=tx.employee_id,
+            comment=(
+                f"Transaction archived for employee {name}. "
+                f"Start: {start}, Change: -{tx.effective_amount}, "
+                f"Final: {final}. Comment: {comment}"
+            ),
+        ),
+    )
+
+
+def expected_balances(employee_ids=None) -> dict:
+    """{employee id: sum of the effective amounts of live transactions}"""
+    rows = EmployeeTransaction.objects.filter(
+        employee__isnull=False, is_archived=False
+    )
+    if employee_ids is not None:
+        rows = rows.filter(employee_id__in=employee_ids)
+    return dict(
+        rows.values("employee_id")
+        .annotate(total=Sum("effective_amount"))
+        .order_by()
+        .values_list("employee_id", "total")
+    )
+
+
+def reconcile(fix: bool = False) -> list[tuple]:
+    """
+    ``(employee id, balance, expected)`` of every employee whose balance is
+    not the sum of their live transactions; ``fix`` moves each balance by
+    the difference.
+    """
+    expected = expected_balances()
+    employees = CustomUser.objects.filter(
+        Q(pk__in=expected) | ~Q(balance=0)
+    ).values_list("pk", "balance")
+
+    drift = []
+    for pk, balance in employees.order_by("pk").iterator():
+        total = expected.get(pk) or Decimal(0)
+        if balance != total:
+            drift.append((pk, balance, total))
+
+    if drift:
+        logger.warning(
+            "%d employee balances drift from their transactions", len(drift)
+        )
+    if fix:
+        # by the difference seen, so a move committed meanwhile still counts
+        for pk, balance, total in drift:
+            move(pk, total - balance)
+    return drift
@@ -0,0 +1,34 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from data.employee.payroll import run_monthly_payroll
+
+
+class Command(BaseCommand):
+    help = "Run the monthly payroll; with --dry-run only print the computed sheet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--month",
+            type=date.fromisoformat,
+            help="Any day of the month to run (default: the current month)",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        result = run_monthly_payroll(options["month"], dry_run=options["dry_run"])
+
+        if options["dry_run"]:
+            for line in result["sheet"]:
+                self.stdout.write(
+                    f"{line['employee_id']}  {line['reason']:<32} {line['amount']:>12}"
+                    f"  {line['student_id'] or ''}"
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result['month']}: {result['lines']} lines, total {result['total']}"
+                + ("" if options["dry_run"] else f", {result['created']} written")
+            )
+        )
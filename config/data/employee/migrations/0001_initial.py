@@ -0,0 +1,78 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import data.employee.methods
+import django.contrib.postgres.fields.ranges
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('account', '0002_initial'),
+        ('attendance', '0001_initial'),
+        ('filial', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FinanceManagerKpi',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('action', models.CharField(choices=[('BONUS', 'Bonus'), ('FINE', 'Jarima')], max_length=255)),
+                ('range', django.contrib.postgres.fields.ranges.DecimalRangeField()),
+                ('amount', models.IntegerField()),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Employee',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('account.customuser', data.employee.methods.EmployeeMethods),
+        ),
+        migrations.CreateModel(
+            name='EmployeeTransaction',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('reason', models.CharField(choices=[('BONUS', 'Bonus'), ('FINE', 'Fine')], max_length=255)),
+                ('action', models.CharField(choices=[('INCOME', 'Kirim'), ('EXPENSE', 'Chiqim')])),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('effective_amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('idempotency_key', models.CharField(blank=True, help_text='Set by the monthly payroll run, so a rerun of the same month skips rows it already wrote.', max_length=255, null=True, unique=True)),
+                ('attendance', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transactions', to='attendance.attendance')),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('employee', '0002_initial'),
+        ('firstlesson', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeetransaction',
+            name='first_lesson_new',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employee_transactions', to='firstlesson.firstlesson'),
+        ),
+    ]
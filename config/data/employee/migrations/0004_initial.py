@@ -0,0 +1,69 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.contrib.postgres.constraints
+import django.db.models.constraints
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('employee', '0003_initial'),
+        ('filial', '0001_initial'),
+        ('lesson', '0001_initial'),
+        ('new_lid', '0001_initial'),
+        ('student', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeetransaction',
+            name='lead',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employee_transactions', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='employeetransaction',
+            name='old_first_lesson',
+            field=models.ForeignKey(blank=True, help_text='Field for referencing student in Employee transactions, for something like ', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employee_transactions', to='lesson.firstllesson'),
+        ),
+        migrations.AddField(
+            model_name='employeetransaction',
+            name='student',
+            field=models.ForeignKey(blank=True, help_text='Field for referencing student in Employee transactions, for something like course_payment or other things.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='student_employee_transaction', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='financemanagerkpi',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='financemanagerkpi',
+            name='employee',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='finance_manager_kpis', to='employee.employee'),
+        ),
+        migrations.AddField(
+            model_name='employeetransaction',
+            name='created_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='employee.employee'),
+        ),
+        migrations.AddField(
+            model_name='employeetransaction',
+            name='employee',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to='employee.employee'),
+        ),
+        migrations.AddConstraint(
+            model_name='financemanagerkpi',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='employee_financemanagerkpi_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='financemanagerkpi',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(deferrable=django.db.models.constraints.Deferrable['DEFERRED'], expressions=[('employee', '='), ('range', '&&')], name='kpi_no_overlap_per_employee'),
+        ),
+        migrations.AddConstraint(
+            model_name='employeetransaction',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='employee_employeetransaction_arch_ts_chk'),
+        ),
+    ]
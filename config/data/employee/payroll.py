@@ -0,0 +1,259 @@
+"""
+Monthly payroll run.
+
+Computes the monthly accruals the per-employee ``EmployeeMethods`` used to
+write one ``transactions.create()`` at a time:
+
+- service managers: bonus for each of their active students;
+- filial managers, monitoring managers, testologs and head teachers: bonus
+  for each active student of their filials;
+- accountants: the FinanceManagerKpi bonus (or fine) for every student
+  without (or with) debt, picked by the share of students without debt.
+
+Student counts come from grouped aggregates, so the cost does not grow with
+the number of employees. The resulting sheet is written with ``bulk_create``
+in one transaction, together with the transaction logs and one UPDATE of
+the employee balances, which is what the EmployeeTransaction signals do row
+by row.
+
+Every line carries an idempotency key per (month, employee, reason[,
+student]); rerunning a month only writes the lines that are missing.
+"""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from data.account.models import CustomUser
+from data.employee import balance
+from data.employee.finance import FinanceManagerKpi
+from data.employee.transactions.models import EmployeeTransaction
+from data.student.student.models import Student
+
+BATCH_SIZE = 1000
+
+FILIAL_MANAGER_ROLES = [
+    "FILIAL_Manager",
+    "MONITORING_MANAGER",
+    "TESTOLOG",
+    "HEAD_TEACHER",
+]
+
+
+def month_start(day: date | None = None) -> date:
+    return (day or timezone.localdate()).replace(day=1)
+
+
+def _line(month: date, employee_id, reason: str, amount, comment: str, student_id=None):
+    key = f"payroll:{month:%Y-%m}:{employee_id}:{reason}"
+    if student_id:
+        key = f"{key}:{student_id}"
+    return {
+        "key": key,
+        "employee_id": employee_id,
+        "reason": reason,
+        "amount": Decimal(amount),
+        "student_id": student_id,
+        "comment": comment,
+    }
+
+
+def _active_students():
+    return Student.objects.filter(is_archived=False, student_stage_type="ACTIVE_STUDENT")
+
+
+def service_manager_lines(month: date) -> list[dict]:
+    managers = CustomUser.objects.filter(
+        is_archived=False,
+        role="SERVICE_MANAGER",
+        f_svm_bonus_for_each_active_student__gt=0,
+    ).values_list("id", "f_svm_bonus_for_each_active_student")
+    bonuses = dict(managers)
+    if not bonuses:
+        return []
+
+    counts = dict(
+        _active_students()
+        .filter(service_manager_id__in=bonuses)
+        .values("service_manager_id")
+        .annotate(count=Count("id"))
+        .values_list("service_manager_id", "count")
+        .order_by()
+    )
+
+    return [
+        _line(
+            month,
+            employee_id,
+            "BONUS_FOR_EACH_ACTIVE_STUDENT",
+            bonus * counts[employee_id],
+            f"Har bir aktiv o'quvchi uchun bonus. Bonus miqdori: {bonus}, "
+            f"O'quvchilar soni: {counts[employee_id]}",
+        )
+        for employee_id, bonus in bonuses.items()
+        if counts.get(employee_id)
+    ]
+
+
+def filial_manager_lines(month: date) -> list[dict]:
+    managers = CustomUser.objects.filter(
+        is_archived=False,
+        role__in=FILIAL_MANAGER_ROLES,
+        f_managers_bonus_for_each_active_student__gt=0,
+    ).values_list("id", "f_managers_bonus_for_each_active_student")
+    bonuses = dict(managers)
+    if not bonuses:
+        return []
+
+    filials = defaultdict(set)
+    for user_id, filial_id in CustomUser.filial.through.objects.filter(
+        customuser_id__in=bonuses
+    ).values_list("customuser_id", "filial_id"):
+        filials[user_id].add(filial_id)
+
+    per_filial = dict(
+        _active_students()
+        .filter(filial_id__in=set().union(*filials.values()))
+        .values("filial_id")
+        .annotate(count=Count("id"))
+        .values_list("filial_id", "count")
+        .order_by()
+    )
+
+    lines = []
+    for employee_id, bonus in bonuses.items():
+        count = sum(per_filial.get(filial_id, 0) for filial_id in filials[employee_id])
+        if count:
+            lines.append(
+                _line(
+                    month,
+                    employee_id,
+                    "BONUS_FOR_EACH_ACTIVE_STUDENT",
+                    bonus * count,
+                    f"Har bir aktiv o'quvchi uchun bonus. Bonus miqdori: {bonus}, "
+                    f"O'quvchilar soni: {count}",
+                )
+            )
+    return lines
+
+
+def accountant_lines(month: date) -> list[dict]:
+    students = Student.objects.filter(is_archived=False)
+    totals = students.aggregate(
+        total=Count("id"), non_debt=Count("id", filter=Q(balance__gte=0))
+    )
+    if not totals["total"]:
+        return []
+    entitled = round(totals["non_debt"] / totals["total"] * 100, 2)
+
+    # the newest matching rule per accountant, like .filter(...).first()
+    kpis = {}
+    for kpi in FinanceManagerKpi.objects.filter(
+        employee__is_archived=False,
+        employee__role="ACCOUNTING",
+        range__num_contains=entitled,
+    ).order_by("-created_at"):
+        kpis.setdefault(kpi.employee_id, kpi)
+    if not kpis:
+        return []
+
+    student_ids = {}
+    lines = []
+    for employee_id, kpi in kpis.items():
+        if kpi.action == "BONUS":
+            reason, condition = "BONUS_FOR_EACH_ENTITLED_STUDENT", Q(balance__gte=0)
+            comment = f"KPI Bonus: {entitled}% entitled students"
+        elif kpi.action == "FINE":
+            reason, condition = "FINE_FOR_EACH_INDEBT_STUDENT", Q(balance__lt=0)
+            comment = f"KPI Fine: {entitled}% entitled students"
+        else:
+            continue
+
+        if reason not in student_ids:
+            student_ids[reason] = list(
+                students.filter(condition).values_list("id", flat=True).order_by()
+            )
+        lines.extend(
+            _line(month, employee_id, reason, kpi.amount, comment, student_id)
+            for student_id in student_ids[reason]
+        )
+    return lines
+
+
+def compute_sheet(month: date) -> list[dict]:
+    return service_manager_lines(month) + filial_manager_lines(month) + accountant_lines(month)
+
+
+def _existing_keys(keys: list[str]) -> set[str]:
+    existing = set()
+    for i in range(0, len(keys), BATCH_SIZE):
+        existing.update(
+            EmployeeTransaction.objects.filter(
+                idempotency_key__in=keys[i : i + BATCH_SIZE]
+            ).values_list("idempotency_key", flat=True)
+        )
+    return existing
+
+
+def write_sheet(lines: list[dict]) -> int:
+    """
+    Write the lines that are not in the database yet, with their logs and
+    balance changes. Returns the number of transactions created.
+    """
+    with transaction.atomic():
+        existing = _existing_keys([line["key"] for line in lines])
+        lines = [line for line in lines if line["key"] not in existing]
+        if not lines:
+            return 0
+
+        transactions = []
+        for line in lines:
+            action = EmployeeTransaction.REASON_TO_ACTION[line["reason"]]
+            transactions.append(
+                EmployeeTransaction(
+                    employee_id=line["employee_id"],
+                    reason=line["reason"],
+                    action=action,
+                    amount=line["amount"],
+                    effective_amount=(
+                        line["amount"]
+                        if action == EmployeeTransaction.INCOME
+                        else -line["amount"]
+                    ),
+                    student_id=line["student_id"],
+                    comment=line["comment"],
+                    idempotency_key=line["key"],
+                )
+            )
+        EmployeeTransaction.objects.bulk_create(transactions, batch_size=BATCH_SIZE)
+
+        # bulk_create skips the signals: logs and balances go in one flush
+        with balance.buffered():
+            for tx in transactions:
+                balance.created(tx)
+
+    return len(transactions)
+
+
+def run_monthly_payroll(month: date | None = None, dry_run: bool = False) -> dict:
+    """
+    Compute (and unless ``dry_run``, write) the payroll of ``month``,
+    defaulting to the current one. The dry run returns the whole sheet.
+    """
+    month = month_start(month)
+    lines = compute_sheet(month)
+
+    result = {
+        "month": month.isoformat(),
+        "lines": len(lines),
+        "total": sum((line["amount"] for line in lines), Decimal(0)),
+    }
+    if dry_run:
+        result["sheet"] = lines
+    else:
+        result["created"] = write_sheet(lines)
+    return result
@@ -1,11 +1,10 @@
 from django.dispatch import receiver
-from django.db import transaction
 from django.core.exceptions import ValidationError
 
 
 from django.db.models.signals import pre_save, post_save, post_delete
 
-from data.logs.models import Log
+from data.employee import balance
 from data.employee.models import EmployeeTransaction
 
 
@@ -30,51 +29,10 @@ def on_employee_transaction_created(
     if not created:
         return
 
-    employee = instance.employee
-
-    with transaction.atomic():
-        start_balance = employee.balance
-        final_balance = start_balance + instance.effective_amount
-
-        # Update balance
-        employee.balance = final_balance
-        employee.save(update_fields=["balance"])
-
-        # Log creation
-        Log.objects.create(
-            object="EMPLOYEE",
-            action="TRANSACTION_CREATED",
-            employee_transaction=instance,
-            employee=employee,
-            comment=(
-                f"Transaction created for employee {employee.full_name}. {f'By {instance.created_by.full_name}({instance.created_by.phone})' if instance.created_by else "-"}, "
-                f"Start: {start_balance}, Change: +{instance.effective_amount}, "
-                f"Final: {final_balance}."
-            ),
-        )
+    # balance += effective_amount in SQL, with the TRANSACTION_CREATED log
+    balance.created(instance)
 
 
 @receiver(post_delete, sender=EmployeeTransaction)
 def on_transaction_deleted(sender, instance: EmployeeTransaction, **kwargs):
-    employee = instance.employee
-
-    with transaction.atomic():
-        start_balance = employee.balance
-        final_balance = start_balance - instance.effective_amount
-
-        # Update balance
-        employee.balance = final_balance
-        employee.save(update_fields=["balance"])
-
-        # Log deletion
-        Log.objects.create(
-            object="EMPLOYEE",
-            action="TRANSACTION_DELETED",
-            employee_transaction=instance,
-            employee=employee,
-            comment=(
-                f"Transaction deleted for employee {employee.full_name}. {f'By {instance.created_by.full_name}({instance.created_by.phone})' if instance.created_by else "-"}, "
-                f"Start: {start_balance}, Change: -{instance.effective_amount}, "
-                f"Final: {final_balance}."
-            ),
-        )
+    balance.deleted(instance)
@@ -1,13 +1,34 @@
 from celery import shared_task
 
-from data.employee.models import Employee
+from data.employee import balance
+from data.employee.payroll import run_monthly_payroll
 
 
 @shared_task
 def bonuses_for_each_active_student():
 
-    employees = Employee.objects.filter(is_archived=False)
+    result = run_monthly_payroll()
 
-    for employee in employees:
+    # JSON result backend
+    result["total"] = str(result["total"])
+    return result
 
-        employee.calculate_monthly_salary()
+
+@shared_task
+def reconcile_employee_balances(fix=False):
+    """Employees whose balance is not the sum of their live transactions."""
+    drift = balance.reconcile(fix=fix)
+
+    # JSON result backend
+    return {
+        "drift": len(drift),
+        "fixed": fix,
+        "employees": [
+            {
+                "employee_id": str(pk),
+                "balance": str(current),
+                "expected": str(expected),
+            }
+            for pk, current, expected in drift[:100]
+        ],
+    }
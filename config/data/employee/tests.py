@@ -1,3 +1,122 @@
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from data.account.models import CustomUser
+from data.employee import balance
+from data.employee.models import Employee, EmployeeTransaction
+from data.logs.models import Log
+from data.employee.payroll import run_monthly_payroll
+from data.student.student.models import Student
+
+
+class MonthlyPayrollTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = Employee.objects.create(
+            phone="+998900000001",
+            first_name="Service",
+            last_name="Manager",
+            role="SERVICE_MANAGER",
+            f_svm_bonus_for_each_active_student=1000,
+        )
+        for i in range(3):
+            Student.objects.create(
+                first_name=f"Student {i}",
+                phone=f"+99891000000{i}",
+                student_stage_type="ACTIVE_STUDENT",
+                service_manager=cls.manager,
+            )
+        Student.objects.create(
+            first_name="New",
+            phone="+998919999999",
+            service_manager=cls.manager,
+        )
+
+    def test_dry_run_writes_nothing(self):
+        result = run_monthly_payroll(dry_run=True)
+
+        self.assertEqual(len(result["sheet"]), 1)
+        line = result["sheet"][0]
+        self.assertEqual(line["employee_id"], self.manager.id)
+        self.assertEqual(line["reason"], "BONUS_FOR_EACH_ACTIVE_STUDENT")
+        self.assertEqual(line["amount"], Decimal(3000))
+        self.assertFalse(EmployeeTransaction.objects.exists())
+
+    def test_run_is_idempotent_per_month(self):
+        start_balance = self.manager.balance
+
+        self.assertEqual(run_monthly_payroll()["created"], 1)
+        self.assertEqual(run_monthly_payroll()["created"], 0)
+
+        transaction = EmployeeTransaction.objects.get(employee=self.manager)
+        self.assertEqual(transaction.action, "INCOME")
+        self.assertEqual(transaction.effective_amount, Decimal(3000))
+
+        self.manager.refresh_from_db()
+        self.assertEqual(self.manager.balance, start_balance + 3000)
+
+
+class EmployeeBalanceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = Employee.objects.create(
+            phone="+998900000002", first_name="Teacher", role="TEACHER"
+        )
+
+    def balance(self):
+        return CustomUser.objects.get(pk=self.teacher.pk).balance
+
+    def transaction(self, amount, reason="BONUS"):
+        return EmployeeTransaction.objects.create(
+            employee=self.teacher, reason=reason, amount=amount
+        )
+
+    def test_moves_are_deltas(self):
+        stale = CustomUser.objects.get(pk=self.teacher.pk)
+
+        self.transaction(100)
+        self.transaction(30, reason="FINE")
+        # a copy read before the moves must not write its balance back
+        stale.save()
+
+        self.assertEqual(self.balance(), Decimal(70))
+        self.assertEqual(
+            Log.objects.filter(
+                employee_id=self.teacher.pk, action="TRANSACTION_CREATED"
+            ).count(),
+            2,
+        )
+
+    def test_cancel_and_delete_move_back(self):
+        kept = self.transaction(100)
+        self.transaction(50).cancel("test")
+        self.transaction(20).delete()
+
+        self.assertEqual(self.balance(), Decimal(100))
+        kept.refresh_from_db()
+        self.assertFalse(kept.is_archived)
+
+    def test_buffered_moves_are_written_once(self):
+        with balance.buffered():
+            balance.record(self.teacher.pk, Decimal(10))
+            balance.record(self.teacher.pk, Decimal(-4))
+            # a nested block joins the outer one
+            with balance.buffered():
+                balance.record(self.teacher.pk, Decimal(5))
+            self.assertEqual(self.balance(), Decimal(0))
+
+        self.assertEqual(self.balance(), Decimal(11))
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        self.transaction(100)
+        CustomUser.objects.filter(pk=self.teacher.pk).update(balance=40)
+
+        self.assertEqual(
+            balance.reconcile(), [(self.teacher.pk, Decimal(40), Decimal(100))]
+        )
+        self.assertEqual(self.balance(), Decimal(40))
+
+        balance.reconcile(fix=True)
+        self.assertEqual(self.balance(), Decimal(100))
+        self.assertEqual(balance.reconcile(), [])
@@ -5,7 +5,6 @@ from django.contrib import admin
 
 from data.command.models import BaseModel
 from data.firstlesson.models import FirstLesson
-from data.logs.models import Log
 from data.student.attendance.models import Attendance
 
 from django.db import transaction
@@ -143,10 +142,21 @@ class EmployeeTransaction(BaseModel):
         blank=True,
     )
 
+    idempotency_key = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        unique=True,
+        help_text="Set by the monthly payroll run, so a rerun of the same month skips rows it already wrote.",
+    )
+
     def save(self, *args, **kwargs):
 
         print(self.action, self.amount)
 
+        # the pre_save signal sets the action too, but only after this sign
+        self.action = self.REASON_TO_ACTION.get(self.reason, self.action)
+
         # Apply business rule before saving
         if self.action == "INCOME":
             self.effective_amount = self.amount
@@ -166,28 +176,10 @@ class EmployeeTransaction(BaseModel):
         readonly_fields = ["effective_amount"]
 
     def cancel(self, comment: str | None = None):
+        from data.employee import balance
 
         with transaction.atomic():
-
-            start_balance = self.employee.balance
-            final_balance = start_balance - self.effective_amount
-
-            # Update balance
-            self.employee.balance = final_balance
-            self.employee.save(update_fields=["balance"])
-
-            # Log deletion
-            Log.objects.create(
-                object="EMPLOYEE",
-                action="TRANSACTION_DELETED",
-                employee_transaction=self,
-                employee=self.employee,
-                comment=(
-                    f"Transaction archived for employee {self.employee.full_name}. "
-                    f"Start: {start_balance}, Change: -{self.effective_amount}, "
-                    f"Final: {final_balance}. Comment: {comment}"
-                ),
-            )
+            balance.archived(self, comment)
 
             self.is_archived = True
             self.set_archived_at()
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('filial', '0001_initial'),
+        ('upload', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('title', models.CharField(blank=True, max_length=120, null=True)),
+                ('link_preview', models.CharField(blank=True, null=True)),
+                ('link', models.URLField(blank=True, null=True)),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('has_countdown', models.BooleanField(default=False)),
+                ('status', models.CharField(blank=True, choices=[('Expired', 'Expired'), ('Soon', 'Soon')], default='Soon', max_length=20, null=True)),
+                ('file', models.ManyToManyField(related_name='events_file', to='upload.file')),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+                ('photo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events_photo', to='upload.file')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+                'constraints': [models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='event_event_arch_ts_chk')],
+            },
+        ),
+    ]
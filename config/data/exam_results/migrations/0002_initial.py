@@ -0,0 +1,60 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('course', '0002_initial'),
+        ('exam_results', '0001_initial'),
+        ('filial', '0001_initial'),
+        ('groups', '0001_initial'),
+        ('subject', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='levelexam',
+            name='group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='level_course_groups_mock', to='groups.group'),
+        ),
+        migrations.AddField(
+            model_name='levelexam',
+            name='subject',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='level_subject_mock', to='subject.subject'),
+        ),
+        migrations.AddField(
+            model_name='mockexam',
+            name='course',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mock_exam_courses', to='course.course'),
+        ),
+        migrations.AddField(
+            model_name='mockexam',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='mockexam',
+            name='group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mock_exam_groups', to='groups.group'),
+        ),
+        migrations.AddField(
+            model_name='mockexam',
+            name='options',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mock_exam_options', to='subject.subject'),
+        ),
+        migrations.AddField(
+            model_name='mockexamresult',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='mockexamresult',
+            name='mock',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mock_exam_results', to='exam_results.mockexam'),
+        ),
+    ]
@@ -7,3 +7,4 @@ class CompensationConfig(AppConfig):
 
     def ready(self):
         import data.finances.compensation.signals
+        import data.finances.compensation.cache
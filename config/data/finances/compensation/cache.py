@@ -0,0 +1,35 @@
+"""
+Asos name -> id lookup (see data.command.reference). Asos rows almost never
+change, so the map is built once per process and rebuilt on a save/delete.
+"""
+
+from data.command.reference import Reference
+from data.finances.compensation.models import Asos
+
+
+def _asos_ids() -> dict:
+    # for duplicated names the oldest row wins, like .first()
+    ids = {}
+    for name, pk in Asos.objects.order_by("created_at").values_list("name", "id"):
+        ids.setdefault(name, pk)
+    return ids
+
+
+asos: Reference[dict] = Reference("compensation.asos", _asos_ids, Asos)
+
+
+def asos_ids() -> dict:
+    """{name: id}"""
+    return asos.get()
+
+
+def asos_id(name: str):
+    return asos.get().get(name)
+
+
+def asos_id_like(fragment: str):
+    """Id of the oldest Asos whose name contains ``fragment``, any case."""
+    fragment = fragment.lower()
+    return next(
+        (pk for name, pk in asos.get().items() if fragment in name.lower()), None
+    )
@@ -0,0 +1,156 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('compensation', '0001_initial'),
+        ('employee', '0001_initial'),
+        ('filial', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='page',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pages', to='employee.employee'),
+        ),
+        migrations.AddField(
+            model_name='point',
+            name='asos',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='compensation.asos'),
+        ),
+        migrations.AddField(
+            model_name='point',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='monitoring',
+            name='point',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='point_monitoring', to='compensation.point'),
+        ),
+        migrations.AddField(
+            model_name='resultname',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='monitoringasos4',
+            name='result',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='compensation.resultname'),
+        ),
+        migrations.AddField(
+            model_name='resultsubjects',
+            name='asos',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='compensation.asos'),
+        ),
+        migrations.AddField(
+            model_name='resultsubjects',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='resultsubjects',
+            name='result',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='compensation.resultname'),
+        ),
+        migrations.AddField(
+            model_name='monitoringasos4',
+            name='subject',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='compensation.resultsubjects'),
+        ),
+        migrations.AddField(
+            model_name='studentcatchingmonitoring',
+            name='asos',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='compensation.asos'),
+        ),
+        migrations.AddField(
+            model_name='studentcatchingmonitoring',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='studentcatchingmonitoring',
+            name='teacher',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='StudentCatchingMonitoring_teacher', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='studentcountmonitoring',
+            name='asos',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='compensation.asos'),
+        ),
+        migrations.AddField(
+            model_name='studentcountmonitoring',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='studentcountmonitoring',
+            name='teacher',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='student_count_monitoring_teacher', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='asos',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_asos_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='asos1_2',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_asos1_2_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='comments',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_comments_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='monitoring5',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_monitoring5_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='monitoringasos1_2',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_monitoringasos1_2_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='page',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_page_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='page',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='unique_user_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='point',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_point_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='monitoring',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_monitoring_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='resultname',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_resultname_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='resultsubjects',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_resultsubjects_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='monitoringasos4',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_monitoringasos4_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentcatchingmonitoring',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_studentcatchingmonitoring_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentcountmonitoring',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='compensation_studentcountmonitoring_arch_ts_chk'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compensation', '0002_initial'),
+        ('filial', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monitoring5',
+            name='month',
+            field=models.DateField(blank=True, help_text='First day of the month of the monthly run that wrote the row; a rerun skips the teachers it already has.', null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='monitoring5',
+            constraint=models.UniqueConstraint(fields=('teacher', 'month'), name='monitoring5_teacher_month_uniq'),
+        ),
+    ]
@@ -400,10 +400,21 @@ class Monitoring5(BaseModel):
         blank=True,
         related_name="Monitoring5_creator_comments",
     )
+    month = models.DateField(
+        null=True,
+        blank=True,
+        help_text="First day of the month of the monthly run that wrote the row; a rerun skips the teachers it already has.",
+    )
 
     class Meta(BaseModel.Meta):
         verbose_name = "Monitoring 5"
         verbose_name_plural = "Monitoring 5"
+        constraints = [
+            *BaseModel.Meta.constraints,
+            models.UniqueConstraint(
+                fields=["teacher", "month"], name="monitoring5_teacher_month_uniq"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.teacher.full_name}  {self.student_count} - {self.ball}"
@@ -1,6 +1,11 @@
 import logging
+from collections import defaultdict
+
 from data.student.studentgroup.models import StudentGroup
 from celery import shared_task
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+from django.utils import timezone
 
 from .models import StudentCountMonitoring, Monitoring5
 from data.account.models import CustomUser
@@ -8,18 +13,74 @@ from data.account.models import CustomUser
 logging.basicConfig(level=logging.INFO)
 
 
+def _point(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 @shared_task
 def check_monthly_student_catching_monitoring():
-    counts = StudentCountMonitoring.objects.all()
-    for count in counts:
-        for teacher in CustomUser.objects.filter(role="TEACHER"):
-            student_count = StudentGroup.objects.filter(group_teacher=teacher).count()
-            if student_count >= count.from_point and student_count <= count.to_point:
-                monitoring = Monitoring5.objects.create(
-                    teacher=teacher,
-                    student_count=student_count,
-                    ball=count.max_ball,
+    """
+    Give every teacher the Monitoring5 points of their student count, once
+    per month: a retry or a rerun skips the teachers the month already has.
+    """
+    month = timezone.localdate().replace(day=1)
+    done = set(
+        Monitoring5.objects.filter(month=month).values_list("teacher_id", flat=True)
+    )
+    teachers = [
+        teacher_id
+        for teacher_id in CustomUser.objects.filter(role="TEACHER").values_list(
+            "id", flat=True
+        )
+        if teacher_id not in done
+    ]
+
+    # one grouped query instead of a count per (bracket, teacher)
+    student_counts = dict(
+        StudentGroup.objects.filter(group__teacher_id__in=teachers)
+        .values("group__teacher_id")
+        .annotate(count=Count("id"))
+        .values_list("group__teacher_id", "count")
+        .order_by()
+    )
+
+    monitorings = []
+    for count in StudentCountMonitoring.objects.all():
+        from_point, to_point = _point(count.from_point), _point(count.to_point)
+        if from_point is None or to_point is None:
+            continue
+        for teacher_id in teachers:
+            student_count = student_counts.get(teacher_id, 0)
+            # one row per teacher and month: the first bracket that fits
+            if from_point <= student_count <= to_point and teacher_id not in done:
+                done.add(teacher_id)
+                monitorings.append(
+                    Monitoring5(
+                        teacher_id=teacher_id,
+                        student_count=student_count,
+                        ball=count.max_ball,
+                        month=month,
+                    )
                 )
 
-                if monitoring:
-                    logging.info("Asos 5 uchun monitoring utkazildi!....")
+    # what the Monitoring5 post_save signal does row by row
+    points = defaultdict(int)
+    for monitoring in monitorings:
+        points[monitoring.teacher_id] += int(monitoring.ball)
+
+    # a concurrent run of the same month fails on the (teacher, month)
+    # constraint and rolls its points back with it
+    with transaction.atomic():
+        Monitoring5.objects.bulk_create(monitorings, batch_size=1000)
+        if points:
+            CustomUser.objects.filter(id__in=points).update(
+                monitoring=F("monitoring")
+                + Case(
+                    *[When(id=teacher_id, then=Value(ball)) for teacher_id, ball in points.items()],
+                    default=Value(0),
+                )
+            )
+    logging.info(f"Asos 5 uchun {len(monitorings)} ta monitoring utkazildi!....")
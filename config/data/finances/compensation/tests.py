@@ -1,3 +1,30 @@
 from django.test import TestCase
 
-# Create your tests here.
+from data.account.models import CustomUser
+from data.finances.compensation.models import Asos, Monitoring5, StudentCountMonitoring
+from data.finances.compensation.tasks import check_monthly_student_catching_monitoring
+
+
+class StudentCountMonitoringTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = CustomUser.objects.create(phone="+998900000051", role="TEACHER")
+        # bulk_create: its post_save gives points to the bracket's own teacher
+        StudentCountMonitoring.objects.bulk_create(
+            [
+                StudentCountMonitoring(
+                    asos=Asos.objects.create(name="Asos 5"),
+                    max_ball=3,
+                    from_point="0",
+                    to_point="10",
+                )
+            ]
+        )
+
+    def test_a_rerun_of_the_month_writes_nothing(self):
+        check_monthly_student_catching_monitoring()
+        check_monthly_student_catching_monitoring()
+
+        self.assertEqual(Monitoring5.objects.filter(teacher=self.teacher).count(), 1)
+        self.teacher.refresh_from_db()
+        self.assertEqual(self.teacher.monitoring, 3)
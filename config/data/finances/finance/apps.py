@@ -7,3 +7,4 @@ class FinansConfig(AppConfig):
 
     def ready(self):
          import data.finances.finance.signals
+         import data.finances.finance.cache
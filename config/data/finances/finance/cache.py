@@ -0,0 +1,86 @@
+"""
+Finance reference data (see data.command.reference): the Kinds by kind,
+casher ids by role and the payment method names.
+"""
+
+from django.db import DEFAULT_DB_ALIAS
+
+from data.command.reference import Reference
+from data.finances.finance.models import Casher, Kind, PaymentMethod
+
+_KIND_FIELDS = [field.attname for field in Kind._meta.concrete_fields]
+
+
+def _kind_rows() -> dict:
+    # Kind.kind is unique where set
+    return {
+        row[_KIND_FIELDS.index("kind")]: row
+        for row in Kind.objects.filter(kind__isnull=False).values_list(*_KIND_FIELDS)
+    }
+
+
+def _casher_ids() -> dict:
+    ids = {}
+    for role, pk in Casher.objects.order_by("created_at").values_list("role", "id"):
+        ids.setdefault(role, pk)
+    return ids
+
+
+def _payment_methods() -> tuple[str, ...]:
+    return tuple(
+        PaymentMethod.objects.filter(is_archived=False)
+        .order_by("created_at")
+        .values_list("name", flat=True)
+    )
+
+
+kinds: Reference[dict] = Reference("finance.kinds", _kind_rows, Kind)
+
+cashers: Reference[dict] = Reference("finance.cashers", _casher_ids, Casher)
+
+payment_methods: Reference[tuple[str, ...]] = Reference(
+    "finance.payment_methods", _payment_methods, PaymentMethod
+)
+
+
+def get_kind(kind: str, raise_if_not_exists: bool = False) -> Kind:
+    """
+    Kind.get() without the query: a fresh instance of the cached row, so
+    callers may assign it to a foreign key and read it back for free.
+    """
+    row = kinds.get().get(kind)
+    if row is None:
+        return Kind.get(kind, raise_if_not_exists)
+    return Kind.from_db(DEFAULT_DB_ALIAS, _KIND_FIELDS, row)
+
+
+def kind_id(kind: str):
+    """Id of the Kind of ``kind``, created like Kind.get() if it is missing."""
+    row = kinds.get().get(kind)
+    if row is None:
+        return Kind.get(kind).pk
+    return row[_KIND_FIELDS.index("id")]
+
+
+def existing_kind_ids(*kinds_: str) -> list:
+    """Ids of the Kinds of ``kinds_`` that exist; never creates one."""
+    rows = kinds.get()
+    return [rows[kind][_KIND_FIELDS.index("id")] for kind in kinds_ if kind in rows]
+
+
+def kind_names() -> list[str]:
+    """The ``kind`` of every Kind that has one."""
+    return list(kinds.get())
+
+
+def casher_ids() -> dict:
+    """{role: id} of the oldest casher of each role."""
+    return cashers.get()
+
+
+def wealth_casher_id():
+    return cashers.get().get("WEALTH")
+
+
+def payment_method_names() -> tuple[str, ...]:
+    return payment_methods.get()
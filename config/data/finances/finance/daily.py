@@ -0,0 +1,174 @@
+"""
+Maintenance and reads for the CasherDailyTotal table.
+
+A bucket is one (date, casher) pair, date being the local creation date of
+the finance row. Whenever a Finance row is saved or deleted its bucket is
+marked dirty; after commit the bucket is rebuilt from the raw rows with one
+grouped query. A casher balance or a date range total is then a SUM over at
+most one row per kind, payment method and action per day, instead of a scan
+of the casher's whole Finance history.
+
+Cashier handovers are two Finance rows, so they go through the same path.
+"""
+
+from datetime import date, datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from data.command.transactions import collect_on_commit
+from data.finances.finance.cache import existing_kind_ids
+from data.finances.finance.choices import FinanceKindTypeChoices
+from data.finances.finance.models import Casher, CasherDailyTotal, Finance
+
+DIMENSIONS = [
+    "casher_id",
+    "filial_id",
+    "kind_id",
+    "payment_method",
+    "action",
+]
+
+# not cash movements; every casher statistic leaves them out
+NOT_COUNTED_KINDS = [
+    FinanceKindTypeChoices.BONUS,
+    FinanceKindTypeChoices.MONEY_BACK,
+]
+
+
+def _bucket_of(created_at, casher_id) -> tuple[str, str | None]:
+    if timezone.is_aware(created_at):
+        created_at = timezone.localtime(created_at)
+    day = created_at.date() if isinstance(created_at, datetime) else created_at
+    return day.isoformat(), str(casher_id) if casher_id else None
+
+
+def mark_dirty(instance: Finance):
+    """
+    Queue the (date, casher) bucket of a saved or deleted Finance row (and
+    its previous one, if the casher or the date changed) for a rebuild after
+    the transaction commits.
+    """
+    buckets = {_bucket_of(instance.created_at, instance.casher_id)}
+
+    if instance.has_changed("casher") or instance.has_changed("created_at"):
+        buckets.add(
+            _bucket_of(
+                instance.old_value("created_at", instance.created_at),
+                instance.old_value("casher", instance.casher_id),
+            )
+        )
+
+    for bucket in buckets:
+        collect_on_commit("casher_daily_totals", bucket, rebuild_buckets)
+
+
+def _build_rows(finances) -> list[CasherDailyTotal]:
+    return [
+        CasherDailyTotal(date=values.pop("day"), **values)
+        for values in finances.annotate(day=TruncDate("created_at"))
+        .order_by()
+        .values("day", *DIMENSIONS)
+        .annotate(amount=Sum("amount"), finances=Count("pk"))
+    ]
+
+
+def _lock_cashers(casher_ids):
+    # two rebuilds of one casher's day must not interleave their
+    # delete/insert; the one that waits then reads the other's rows
+    list(
+        Casher.objects.select_for_update()
+        .filter(pk__in=[pk for pk in casher_ids if pk])
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def rebuild_buckets(buckets) -> int:
+    """
+    Rebuild the given (date, casher) buckets. Returns the number of rows
+    written.
+    """
+    buckets = {
+        (date.fromisoformat(day) if isinstance(day, str) else day, casher_id)
+        for day, casher_id in buckets
+    }
+    if not buckets:
+        return 0
+
+    raw = Q(pk__in=[])
+    stored = Q(pk__in=[])
+    for day, casher_id in buckets:
+        raw |= Q(created_at__date=day, casher_id=casher_id)
+        stored |= Q(date=day, casher_id=casher_id)
+
+    with transaction.atomic():
+        _lock_cashers(casher_id for _, casher_id in buckets)
+        rows = _build_rows(Finance.objects.filter(raw))
+        CasherDailyTotal.objects.filter(stored).delete()
+        CasherDailyTotal.objects.bulk_create(rows, batch_size=1000)
+
+    return len(rows)
+
+
+def rebuild_range(start: date, end: date) -> int:
+    """Rebuild every bucket with start <= date <= end, one day at a time."""
+    written = 0
+    day = start
+    while day <= end:
+        with transaction.atomic():
+            _lock_cashers(Casher.objects.values_list("pk", flat=True))
+            rows = _build_rows(Finance.objects.filter(created_at__date=day))
+            CasherDailyTotal.objects.filter(date=day).delete()
+            CasherDailyTotal.objects.bulk_create(rows, batch_size=1000)
+        written += len(rows)
+        day += timedelta(days=1)
+    return written
+
+
+def changed_buckets(since: datetime) -> set[tuple[date, str | None]]:
+    """
+    Buckets of the Finance rows saved since ``since``; catches rows whose
+    rebuild after commit was lost.
+    """
+    return set(
+        Finance.objects.filter(Q(updated_at__gte=since) | Q(created_at__gte=since))
+        .annotate(day=TruncDate("created_at"))
+        .order_by()
+        .values_list("day", "casher_id")
+        .distinct()
+    )
+
+
+def totals(*fields, start=None, end=None, **filters) -> dict[tuple, float]:
+    """
+    {(values of ``fields``): amount} over the days start..end (inclusive,
+    all history when not given), without bonus and money back rows, in one
+    grouped query. ``filters`` are CasherDailyTotal lookups, such as
+    ``casher_id=...`` or ``casher__role=...``.
+    """
+    rows = CasherDailyTotal.objects.filter(**filters).exclude(
+        kind_id__in=existing_kind_ids(*NOT_COUNTED_KINDS)
+    )
+    if start:
+        rows = rows.filter(date__gte=start)
+    if end:
+        rows = rows.filter(date__lte=end)
+
+    return {
+        tuple(values[:-1]): values[-1] or 0
+        for values in rows.order_by()
+        .values(*fields)
+        .annotate(total=Sum("amount"))
+        .values_list(*fields, "total")
+    }
+
+
+def income_and_expense(totals_by_action: dict) -> tuple[float, float]:
+    """(income, expense) of ``totals("action", ...)``."""
+    return (
+        totals_by_action.get(("INCOME",), 0),
+        totals_by_action.get(("EXPENSE",), 0),
+    )
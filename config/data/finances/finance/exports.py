@@ -0,0 +1,214 @@
+"""
+Finance Excel exports (see data.upload.exports).
+"""
+
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+from openpyxl.styles import Alignment, Font
+
+from data.finances.finance import daily
+from data.finances.finance.choices import FinanceKindTypeChoices
+from data.finances.finance.models import Finance
+from data.upload.exports import (
+    Cell,
+    Column,
+    Export,
+    Sheet,
+    newest_first,
+    register,
+)
+
+ROLE_LABELS = {
+    "WEALTH": "Asosiy kassa",
+    "ACCOUNTANT": "Buxgalteriya kassa",
+    "ADMINISTRATOR": "Filial kassa",
+}
+PAYMENT_LABELS = {
+    "Cash": "Naqd pul",
+    "Money_send": "Pul kuchirish",
+    "Card": "Karta orqali",
+    "Payme": "Payme",
+    "Click": "Click",
+}
+ACTION_LABELS = {
+    "INCOME": "Kirim",
+    "EXPENSE": "Xarajat",
+}
+
+PAYMENT_METHODS = ["Click", "Payme", "Cash", "Card", "Money_send"]
+
+CURRENCY = '#,##0 "so\'m"'
+
+BOLD = Font(bold=True)
+RIGHT = Alignment(horizontal="right")
+
+
+def _not_bonus_or_refund(finances):
+    return finances.exclude(
+        Q(kind__kind=FinanceKindTypeChoices.BONUS)
+        | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
+    )
+
+
+@register
+class FinanceExport(Export):
+    """The finance list of FinanceExcel, with income/expense totals."""
+
+    name = "finance"
+    filename = "finance_report.xlsx"
+
+    columns = [
+        Column("Kassa egasi", 22),
+        Column("Role", 18),
+        Column("To'lov turi", 22),
+        Column("Action", 12),
+        Column("Miqdor", 16, CURRENCY, "right"),
+        Column("To'lov usuli", 18),
+        Column("Comment", 40),
+        Column("Yaratilgan vaqti", 22),
+    ]
+
+    def queryset(self):
+        filters = Q()
+        if filial := self.param("filial"):
+            filters &= Q(casher__user__filial__id=filial)
+        if casher_id := self.param("cashier"):
+            filters &= Q(casher__id=casher_id)
+        if casher_role := self.param("casher_role"):
+            filters &= Q(casher__role=casher_role)
+        if kind_id := self.param("kind"):
+            filters &= Q(kind__id=kind_id)
+        if action := self.param("action"):
+            filters &= Q(action=action)
+
+        finances = _not_bonus_or_refund(Finance.objects.filter(filters))
+
+        start_date_str = self.param("start_date")
+        end_date_str = self.param("end_date")
+        if start_date_str and end_date_str:
+            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
+            end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
+            finances = finances.filter(
+                created_at__gte=start_date,
+                created_at__lt=end_date + timedelta(days=1),
+            )
+        elif start_date_str:
+            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
+            finances = finances.filter(
+                created_at__gte=start_date,
+                created_at__lt=start_date + timedelta(days=1) - timedelta(seconds=1),
+            )
+        return finances
+
+    def count(self):
+        return self.queryset().count()
+
+    def rows(self):
+        self.total_amount = self.total_income = self.total_expense = 0
+
+        for (
+            casher_name,
+            casher_role,
+            kind_name,
+            action,
+            amount,
+            payment_method,
+            comment,
+            created_at,
+        ) in newest_first(
+            self.queryset(),
+            "casher__name",
+            "casher__role",
+            "kind__name",
+            "action",
+            "amount",
+            "payment_method",
+            "comment",
+            "created_at",
+        ):
+            amount = float(amount or 0)
+            if action == "INCOME":
+                self.total_income += amount
+                self.total_amount += amount
+            else:
+                # expenses are summed as negative numbers
+                self.total_expense -= amount
+                self.total_amount -= amount
+
+            yield [
+                casher_name or "-",
+                ROLE_LABELS.get(casher_role, ""),
+                kind_name or "",
+                ACTION_LABELS.get(action, action or ""),
+                amount,
+                PAYMENT_LABELS.get(payment_method, payment_method or ""),
+                comment or "-",
+                created_at.strftime("%d-%m-%Y %H:%M:%S"),
+            ]
+
+    def totals(self):
+        """The rows under the data, once ``rows()`` summed them."""
+        yield []
+        for label, total in [
+            ("Jami Kirim:", self.total_income),
+            ("Jami Chiqim:", self.total_expense),
+            ("JAMI:", self.total_amount),
+        ]:
+            yield [
+                "",
+                "",
+                "",
+                Cell(label, font=BOLD),
+                Cell(total, font=BOLD, alignment=RIGHT),
+            ]
+
+    def sheets(self):
+        yield Sheet(
+            "Finance Report",
+            self.columns,
+            self.rows(),
+            header=Cell(None, font=BOLD),
+            footer=self.totals,
+        )
+
+
+@register
+class PaymentStatisticsExport(Export):
+    """Income and expense of one casher per payment method, in one row."""
+
+    name = "payment_statistics"
+
+    @property
+    def filename(self):
+        return f"payment_casher_statistics_{datetime.now():%Y%m%d_%H%M%S}.xlsx"
+
+    def totals(self) -> dict:
+        start_date = self.param("start_date")
+        end_date = self.param("end_date")
+        return daily.totals(
+            "payment_method",
+            "action",
+            start=parse_date(start_date) if start_date else None,
+            end=parse_date(end_date) if end_date else None,
+            casher_id=self.param("casher_id"),
+            payment_method__in=PAYMENT_METHODS,
+        )
+
+    def sheets(self):
+        totals = self.totals()
+
+        data = {"Casher ID": self.param("casher_id")}
+        for method in PAYMENT_METHODS:
+            data[f"{method}_Income"] = totals.get((method, "INCOME")) or 0
+            data[f"{method}_Expense"] = totals.get((method, "EXPENSE")) or 0
+        data["Total_Income"] = sum(data[f"{p}_Income"] for p in PAYMENT_METHODS)
+        data["Total_Expense"] = sum(data[f"{p}_Expense"] for p in PAYMENT_METHODS)
+
+        yield Sheet(
+            "Payment Statistics",
+            [Column(name) for name in data],
+            [list(data.values())],
+            header=Cell(None, font=BOLD),
+        )
@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from data.finances.finance.daily import rebuild_range
+from data.finances.finance.models import Finance
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the CasherDailyTotal table for a date range "
+        "(default: all history)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="start", type=date.fromisoformat)
+        parser.add_argument("--to", dest="end", type=date.fromisoformat)
+
+    def handle(self, *args, **options):
+        start = options["start"]
+        end = options["end"] or date.today()
+
+        if start is None:
+            first = (
+                Finance.objects.order_by("created_at")
+                .values_list("created_at", flat=True)
+                .first()
+            )
+            start = first.date() if first else end
+
+        self.stdout.write(f"Rebuilding casher daily totals {start} .. {end}")
+
+        written = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=29), end)
+            written += rebuild_range(chunk_start, chunk_end)
+            self.stdout.write(f"  {chunk_start} .. {chunk_end}: {written} rows so far")
+            chunk_start = chunk_end + timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(f"Done, {written} daily total rows."))
@@ -0,0 +1,249 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('filial', '0001_initial'),
+        ('finance', '0001_initial'),
+        ('groups', '0002_initial'),
+        ('new_lid', '0001_initial'),
+        ('student', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='finance',
+            name='lid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='finance',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='finance',
+            name='stuff',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='finance_stuff', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='handover',
+            name='casher',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='finances_casher_handover', to='finance.casher'),
+        ),
+        migrations.AddField(
+            model_name='handover',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='handover',
+            name='receiver',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='finances_receiver_handover', to='finance.casher'),
+        ),
+        migrations.AddField(
+            model_name='kind',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='finance',
+            name='kind',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='finances_kind', to='finance.kind'),
+        ),
+        migrations.AddField(
+            model_name='casherdailytotal',
+            name='kind',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='finance.kind'),
+        ),
+        migrations.AddField(
+            model_name='kpifinance',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='kpifinance',
+            name='lid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='finances_kpi_lid', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='kpifinance',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='finances_kpi_student', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='kpifinance',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='paymentmethod',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='creator',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='finances_creator_sale', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='salestudent',
+            name='creator',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='finances_creator_student_sale', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='salestudent',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='salestudent',
+            name='group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='finances_group_sale_student', to='groups.group'),
+        ),
+        migrations.AddField(
+            model_name='salestudent',
+            name='lid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sales', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='salestudent',
+            name='sale',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='finances_sale_student', to='finance.sale'),
+        ),
+        migrations.AddField(
+            model_name='salestudent',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='finances_student_sale', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='voucher',
+            name='creator',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='finances_voucher_creator', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='voucher',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='voucher',
+            name='lid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='finances_voucher_lid', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='voucher',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='finances_voucher_student', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='voucherstudent',
+            name='creator',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='finances_creator_student_voucher', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='voucherstudent',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='voucherstudent',
+            name='lid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='finances_lid_voucher', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='voucherstudent',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='finances_student_voucher', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='voucherstudent',
+            name='voucher',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='finances_voucher_voucher', to='finance.voucher'),
+        ),
+        migrations.AddConstraint(
+            model_name='casher',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='finance_casher_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='casher',
+            constraint=models.UniqueConstraint(condition=models.Q(('role', 'WEALTH')), fields=('role',), name='unique_wealth_casher'),
+        ),
+        migrations.AddConstraint(
+            model_name='handover',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='finance_handover_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='kind',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='finance_kind_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='kind',
+            constraint=models.UniqueConstraint(condition=models.Q(('kind', None), _negated=True), fields=('kind',), name='unique_kind_not_null'),
+        ),
+        migrations.AddIndex(
+            model_name='finance',
+            index=models.Index(fields=['student', '-created_at'], name='fin_student_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finance',
+            index=models.Index(fields=['casher', '-created_at'], name='fin_casher_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finance',
+            index=models.Index(fields=['kind', 'action', 'created_at'], name='fin_kind_action_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finance',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['action', 'created_at'], name='fin_live_action_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='finance',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='finance_finance_arch_ts_chk'),
+        ),
+        migrations.AddIndex(
+            model_name='casherdailytotal',
+            index=models.Index(fields=['casher', 'date'], name='finance_cas_casher__613056_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='casherdailytotal',
+            index=models.Index(fields=['date', 'filial'], name='finance_cas_date_d84af6_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='kpifinance',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='finance_kpifinance_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='paymentmethod',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='finance_paymentmethod_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='sale',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='finance_sale_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='salestudent',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='finance_salestudent_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='voucher',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='finance_voucher_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='voucherstudent',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='finance_voucherstudent_arch_ts_chk'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
 from typing import Literal
+from django.contrib import admin
 from django.db import models
 from django.db.models import Q
 
@@ -200,6 +201,25 @@ class Finance(BaseModel):
 
     is_given = models.BooleanField(default=False, null=True, blank=True)
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["student", "-created_at"], name="fin_student_created_idx"
+            ),
+            models.Index(
+                fields=["casher", "-created_at"], name="fin_casher_created_idx"
+            ),
+            # dashboard sums per kind and action over a period
+            models.Index(
+                fields=["kind", "action", "created_at"], name="fin_kind_action_created_idx"
+            ),
+            models.Index(
+                fields=["action", "created_at"],
+                condition=Q(is_archived=False),
+                name="fin_live_action_created_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.amount}  {self.action}"
 
@@ -223,6 +243,65 @@ class Handover(BaseModel):
         return f"{self.casher} {self.receiver} {self.amount}"
 
 
+def _dimension(to: str):
+    # Daily totals are rebuilt, never cascaded: keep the ids even if the
+    # referenced row goes away.
+    return models.ForeignKey(
+        to,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+
+class CasherDailyTotal(models.Model):
+    """
+    Sum of the Finance rows of one day, one row per
+    (date, casher, filial, kind, payment method, action).
+
+    Rows are derived data: a (date, casher) bucket is deleted and rebuilt
+    from Finance rows by data.finances.finance.daily whenever one of them
+    changes, so a casher balance is a SUM over these rows.
+    """
+
+    date = models.DateField()
+
+    casher = _dimension("finance.Casher")
+    filial = _dimension("filial.Filial")
+    kind = _dimension("finance.Kind")
+
+    payment_method = models.CharField(max_length=100, null=True, blank=True)
+    action = models.CharField(max_length=20)
+
+    amount = models.FloatField(default=0)
+    finances = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["casher", "date"]),
+            models.Index(fields=["date", "filial"]),
+        ]
+
+    def __str__(self):
+        return f"CasherDailyTotal(date={self.date} casher={self.casher_id})"
+
+    class Admin(admin.ModelAdmin):
+
+        list_display = [
+            "date",
+            "casher",
+            "kind",
+            "payment_method",
+            "action",
+            "amount",
+            "finances",
+        ]
+        list_filter = ["casher", "action", "payment_method"]
+
+
 class KpiFinance(BaseModel):
 
     user: "CustomUser" = models.ForeignKey(
@@ -1,13 +1,16 @@
 from decimal import Decimal
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from data.employee.models import EmployeeTransaction
 from data.finances.finance.choices import FinanceKindTypeChoices
 
-from .models import Finance, VoucherStudent, Casher, Kind
+from .cache import get_kind
+from .models import Finance, VoucherStudent, Casher
 from data.logs.models import Log
+from data.student.student.ledger import finance_entry_reason, post_entry, to_amount
+from data.student.student.models import StudentLedgerEntry
 
 
 @receiver(post_save, sender=Finance)
@@ -18,19 +21,18 @@ def on_create(sender, instance: Finance, created, **kwargs):
                 instance.lid.balance += Decimal(instance.amount)
                 instance.lid.save()
 
-        # if instance.student and not instance.kind.name == "Lesson payment":
-        if (
-            instance.student
-            and not instance.kind.kind == FinanceKindTypeChoices.LESSON_PAYMENT
-        ):
-            if instance.action == "INCOME":
-                instance.student.balance += Decimal(instance.amount)
-                instance.student.save()
-            else:
-                # if not instance.kind.name == "Voucher":
-                if not instance.kind.kind == FinanceKindTypeChoices.VOUCHER:
-                    instance.student.balance -= Decimal(instance.amount)
-                    instance.student.save()
+        if instance.student:
+            reason = finance_entry_reason(instance)
+            if reason:
+                amount = to_amount(instance.amount)
+                post_entry(
+                    instance.student,
+                    amount if instance.action == "INCOME" else -amount,
+                    reason,
+                    finance=instance,
+                    attendance=instance.attendance,
+                    comment=instance.comment,
+                )
 
         # if instance.stuff:
         #     if (
@@ -101,6 +103,15 @@ def on_finance_create(sender, instance: Finance, created, **kwargs):
         print("Log for finance updated ...")
 
 
+@receiver(post_save, sender=Finance)
+@receiver(post_delete, sender=Finance)
+def on_casher_totals_change(sender, instance: Finance, **kwargs):
+    """Rebuild this row's day of the casher daily totals after commit."""
+    from data.finances.finance.daily import mark_dirty
+
+    mark_dirty(instance)
+
+
 @receiver(post_save, sender=VoucherStudent)
 def on_create(sender, instance: VoucherStudent, created, **kwargs):
     if created:
@@ -126,7 +137,7 @@ def on_create(sender, instance: VoucherStudent, created, **kwargs):
                 action="EXPENSE",
                 amount=instance.voucher.amount,
                 # kind=Kind.objects.filter(name="Voucher").first(),
-                kind=Kind.get(FinanceKindTypeChoices.VOUCHER),
+                kind=get_kind(FinanceKindTypeChoices.VOUCHER),
                 payment_method="Cash",
                 lid=instance.lid,
                 comment=f"Ushbu buyurtma uchun {instance.voucher.amount} so'm miqdorida voucher qo'shildi!",
@@ -140,13 +151,18 @@ def on_create(sender, instance: VoucherStudent, created, **kwargs):
                 action="EXPENSE",
                 amount=instance.voucher.amount,
                 # kind=Kind.objects.filter(name="Voucher").first(),
-                kind=Kind.get(FinanceKindTypeChoices.VOUCHER),
+                kind=get_kind(FinanceKindTypeChoices.VOUCHER),
                 payment_method="Cash",
                 student=instance.student,
                 comment=f"Ushbu o'quvchi uchun {instance.voucher.amount} so'm miqdorida voucher qo'shildi!",
             )
-            finance.student.balance += Decimal(finance.amount)
-            finance.student.save()
+            post_entry(
+                finance.student,
+                finance.amount,
+                StudentLedgerEntry.VOUCHER,
+                finance=finance,
+                comment=finance.comment,
+            )
 
 
 # Bu modelni polni olib tashlavomman, shunga o'chirib qo'ydim.
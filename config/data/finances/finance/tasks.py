@@ -1,7 +1,8 @@
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from celery import shared_task
+from django.utils import timezone
 
 from data.finances.finance.models import SaleStudent
 
@@ -14,3 +15,21 @@ def check_daily_tasks():
         task.save()
 
         logging.info("{sale for student has deleted...}")
+
+
+@shared_task
+def reconcile_casher_totals(hours=26):
+    """
+    Nightly: rebuild every CasherDailyTotal bucket touched in the last
+    ``hours`` hours, in case a rebuild after commit was lost.
+    """
+    from data.finances.finance.daily import changed_buckets, rebuild_buckets
+
+    since = timezone.now() - timedelta(hours=hours)
+    buckets = changed_buckets(since)
+
+    written = rebuild_buckets(buckets)
+    logging.info(
+        f"Casher daily totals reconcile: {len(buckets)} bucket(s), {written} row(s)."
+    )
+    return written
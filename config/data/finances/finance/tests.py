@@ -1,3 +1,137 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from data.command.testing import QueryBudgetMixin
+from data.employee.models import Employee
+from data.finances.finance.choices import FinanceKindTypeChoices
+from data.finances.finance.daily import rebuild_range
+from data.finances.finance.models import Casher, CasherDailyTotal, Finance, Kind
+
+
+class FinanceQueryBudgetTest(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Kind.objects.bulk_create(
+            Kind(name=f"Kind {i}", action="INCOME", color="green") for i in range(8)
+        )
+
+    def test_kind_list(self):
+        # count + page, however many kinds
+        response = self.assertQueryBudget(
+            2, "/finance/kind/", data={"action": "INCOME"}
+        )
+        self.assertEqual(len(response.data), 8)
+
+
+class CasherDailyTotalTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = Employee.objects.create(phone="+998900000041", role="DIRECTOR")
+        cls.wealth = Casher.objects.create(name="Main", user=cls.user, role="WEALTH")
+        cls.admin = Casher.objects.create(
+            name="Branch", user=cls.user, role="ADMINISTRATOR"
+        )
+        cls.course = Kind.objects.create(name="Course payment", action="INCOME")
+        # Kind.get() creates missing kinds with an empty, unique name
+        cls.bonus = Kind.objects.create(
+            name="Bonus", kind=FinanceKindTypeChoices.BONUS, action="EXPENSE"
+        )
+        Kind.objects.create(
+            name="Cashier handover",
+            kind=FinanceKindTypeChoices.CASHIER_HANDOVER,
+            action="EXPENSE",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _finance(self, casher, amount, action="INCOME", kind=None, **kwargs):
+        kwargs.setdefault("payment_method", "Cash")
+        with self.captureOnCommitCallbacks(execute=True):
+            return Finance.objects.create(
+                casher=casher,
+                amount=amount,
+                action=action,
+                kind=kind or self.course,
+                **kwargs,
+            )
+
+    def _stats(self, casher, **params):
+        return self.client.get(f"/finance/casher/stats/{casher.pk}/", params).data
+
+    def test_follows_finance_writes(self):
+        yesterday = timezone.now() - timedelta(days=1)
+        self._finance(self.wealth, 300, created_at=yesterday)
+        self._finance(self.wealth, 100)
+        self._finance(self.wealth, 40, action="EXPENSE")
+        # bonuses are not cash movements
+        self._finance(self.wealth, 1000, action="EXPENSE", kind=self.bonus)
+
+        today = timezone.localdate().isoformat()
+        self.assertEqual(
+            self._stats(self.wealth, start_date=today),
+            {"income": 100, "expense": 40, "balance": 360},
+        )
+
+        expense = Finance.objects.get(amount=40)
+        with self.captureOnCommitCallbacks(execute=True):
+            expense.amount = 60
+            expense.save()
+        self.assertEqual(self._stats(self.wealth)["balance"], 340)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            expense.casher = self.admin
+            expense.save()
+        self.assertEqual(self._stats(self.wealth)["balance"], 400)
+        self.assertEqual(self._stats(self.admin)["balance"], -60)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            expense.delete()
+        self.assertEqual(self._stats(self.admin)["balance"], 0)
+
+        statistics = self.client.get("/finance/statistics/").data
+        self.assertEqual(statistics["main_casher"], 400)
+        self.assertEqual(statistics["admin_casher"], 0)
+
+    def test_handover_moves_both_balances(self):
+        self._finance(self.admin, 500)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/finance/handover",
+                {
+                    "casher": self.admin.pk,
+                    "receiver": self.wealth.pk,
+                    "amount": 200,
+                    "payment_method": "Cash",
+                },
+            )
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(self._stats(self.admin)["balance"], 300)
+        self.assertEqual(self._stats(self.wealth)["balance"], 200)
+
+    def test_rebuild_range_matches_the_incremental_rows(self):
+        self._finance(self.wealth, 100)
+        self._finance(self.admin, 70, action="EXPENSE", payment_method="Card")
+        incremental = set(
+            CasherDailyTotal.objects.values_list(
+                "date", "casher_id", "kind_id", "payment_method", "action", "amount"
+            )
+        )
 
-# Create your tests here.
+        CasherDailyTotal.objects.all().delete()
+        today = timezone.localdate()
+        self.assertEqual(rebuild_range(today, today), 2)
+        self.assertEqual(
+            set(
+                CasherDailyTotal.objects.values_list(
+                    "date", "casher_id", "kind_id", "payment_method", "action", "amount"
+                )
+            ),
+            incremental,
+        )
@@ -1,16 +1,11 @@
 import datetime
 from datetime import datetime, timedelta, time
 
-import openpyxl
-import pandas as pd
-from django.db.models import Q, When, Case, Value, F, FloatField
+from django.db.models import Q
 from django.db.models import Sum
-from django.db.models.functions import Coalesce
-from django.http import HttpResponse
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime, parse_date
 from django.utils.timezone import make_aware
-from django.utils.timezone import now
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -29,6 +24,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from data.account.models import CustomUser
+from data.finances.finance import daily
+from data.finances.finance.cache import get_kind
 from data.finances.finance.models import Finance, Kind
 from data.student.student.models import Student
 from .models import (
@@ -57,11 +54,10 @@ from data.student.groups.models import Group
 
 
 from data.finances.finance.choices import FinanceKindTypeChoices
+from data.upload.exports import respond
 
 from django.db import transaction
 
-from openpyxl.styles import Alignment, Font
-from openpyxl.utils import get_column_letter
 
 
 # class CashierListCreateAPIView(ListCreateAPIView):
@@ -175,7 +171,7 @@ class FinanceListAPIView(ListCreateAPIView):
 
         if kind:
             try:
-                kind_obj = Kind.get(kind, True)
+                kind_obj = get_kind(kind, True)
                 queryset = queryset.filter(kind=kind_obj)
             except Kind.DoesNotExist:
                 return Finance.objects.none()
@@ -313,28 +309,8 @@ class FinancePaymentMethodsAmountsListAPIView(APIView):
 
         casher_obj = Casher.objects.filter(id=casher_id).first()
 
-        income = (
-            Finance.objects.filter(
-                casher=casher_obj, action="INCOME", payment_method=payment_method
-            )
-            .exclude(
-                Q(kind__kind=FinanceKindTypeChoices.BONUS)
-                | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-            )
-            .aggregate(Sum("amount"))["amount__sum"]
-            or 0
-        )
-
-        expense = (
-            Finance.objects.filter(
-                casher=casher_obj, action="EXPENSE", payment_method=payment_method
-            )
-            .exclude(
-                Q(kind__kind=FinanceKindTypeChoices.BONUS)
-                | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-            )
-            .aggregate(Sum("amount"))["amount__sum"]
-            or 0
+        income, expense = daily.income_and_expense(
+            daily.totals("action", casher=casher_obj, payment_method=payment_method)
         )
 
         return Response(
@@ -353,6 +329,7 @@ class CasherHandoverAPIView(CreateAPIView):
     serializer_class = CasherHandoverSerializer
     permission_classes = [IsAuthenticated]
 
+    @transaction.atomic
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -367,7 +344,7 @@ class CasherHandoverAPIView(CreateAPIView):
             # handover, _ = Kind.objects.get_or_create(
             #     name="CASHIER_HANDOVER", action="EXPENSE"
             # )
-            handover = Kind.get(FinanceKindTypeChoices.CASHIER_HANDOVER)
+            handover = get_kind(FinanceKindTypeChoices.CASHIER_HANDOVER)
 
             # Deduct from sender (casher)
             Finance.objects.create(
@@ -386,7 +363,7 @@ class CasherHandoverAPIView(CreateAPIView):
             #     name="CASHIER_ACCEPTANCE", action="INCOME"
             # )
 
-            acception = Kind.get(FinanceKindTypeChoices.CASHIER_ACCEPTANCE)
+            acception = get_kind(FinanceKindTypeChoices.CASHIER_ACCEPTANCE)
 
             # Add to receiver
             Finance.objects.create(
@@ -430,32 +407,10 @@ class FinanceStatisticsAPIView(APIView):
         if filial:
             filters["filial_id"] = filial
 
-        def get_balance(role):
-
-            total_income = (
-                Finance.objects.filter(casher__role=role, action="INCOME", **filters)
-                .exclude(
-                    Q(kind__kind=FinanceKindTypeChoices.BONUS)
-                    | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-                )
-                .aggregate(total_income=Sum("amount"))["total_income"]
-                or 0
-            )
-
-            total_outcome = (
-                Finance.objects.filter(casher__role=role, action="EXPENSE", **filters)
-                .exclude(
-                    Q(kind__kind=FinanceKindTypeChoices.BONUS)
-                    | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-                )
-                .aggregate(total_outcome=Sum("amount"))["total_outcome"]
-                or 0
-            )
-
-            balance = total_income - total_outcome
+        totals = daily.totals("casher__role", "action", **filters)
 
-            ic(role, total_income, total_outcome, balance)
-            return balance
+        def get_balance(role):
+            return totals.get((role, "INCOME"), 0) - totals.get((role, "EXPENSE"), 0)
 
         response_data = {
             "main_casher": get_balance("WEALTH"),
@@ -487,32 +442,23 @@ class CashierStatisticsAPIView(APIView):
         end_date_str = request.GET.get("end_date")
 
         filters = {}
+        start_date = end_date = None
 
         # Handle start date
         if start_date_str:
             try:
-                start_dt = make_aware(datetime.strptime(start_date_str, "%Y-%m-%d"))
-                filters["created_at__gte"] = start_dt
-
-                if not end_date_str:
-                    # Set end of day as end date
-                    end_dt = start_dt + timedelta(days=1) - timedelta(seconds=1)
-                    filters["created_at__lte"] = end_dt
+                start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
             except ValueError:
                 return Response(
                     {"error": "Invalid start_date format. Use YYYY-MM-DD."}, status=400
                 )
+            # a single day unless end_date is given
+            end_date = start_date
 
         # Handle end date
         if end_date_str:
             try:
-                end_dt = (
-                    datetime.strptime(end_date_str, "%Y-%m-%d")
-                    + timedelta(days=1)
-                    - timedelta(seconds=1)
-                )
-                end_dt = make_aware(end_dt)
-                filters["created_at__lte"] = end_dt
+                end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
             except ValueError:
                 return Response(
                     {"error": "Invalid end_date format. Use YYYY-MM-DD."}, status=400
@@ -520,73 +466,32 @@ class CashierStatisticsAPIView(APIView):
 
         # Handle kind filtering
         if kind_id:
-            try:
-                filters["kind"] = Kind.objects.get(id=kind_id)
-            except Kind.DoesNotExist:
+            if not Kind.objects.filter(id=kind_id).exists():
                 return Response({"error": "Kind not found."}, status=404)
+            filters["kind_id"] = kind_id
 
         # Check casher and return results
 
         if casher_id:
-            queryset = Finance.objects.filter(casher_id=casher_id, **filters).exclude(
-                # Q(kind__kind=FinanceKindTypeChoices.BONUS) | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-                Q(
-                    kind__kind__in=[
-                        FinanceKindTypeChoices.BONUS,
-                        FinanceKindTypeChoices.MONEY_BACK,
-                    ]
+            income, expense = daily.income_and_expense(
+                daily.totals(
+                    "action",
+                    start=start_date,
+                    end=end_date,
+                    casher_id=casher_id,
+                    **filters,
                 )
             )
 
-            balance_data = queryset.aggregate(
-                income=Coalesce(
-                    Sum(
-                        Case(
-                            When(action="INCOME", then=F("amount")),
-                            output_field=FloatField(),
-                        )
-                    ),
-                    Value(0.0),
-                ),
-                expense=Coalesce(
-                    Sum(
-                        Case(
-                            When(action="EXPENSE", then=F("amount")),
-                            output_field=FloatField(),
-                        )
-                    ),
-                    Value(0.0),
-                ),
+            all_income, all_expense = daily.income_and_expense(
+                daily.totals("action", casher_id=casher_id)
             )
 
-            all_qs = Finance.objects.filter(casher_id=casher_id).exclude(
-                # Q(kind__kind=FinanceKindTypeChoices.BONUS) | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-                Q(
-                    kind__kind__in=[
-                        FinanceKindTypeChoices.BONUS,
-                        FinanceKindTypeChoices.MONEY_BACK,
-                    ]
-                )
-            )
-
-            balance = all_qs.aggregate(
-                total=Coalesce(
-                    Sum(
-                        Case(
-                            When(action="INCOME", then=F("amount")),
-                            When(action="EXPENSE", then=F("amount") * -1),
-                            output_field=FloatField(),
-                        )
-                    ),
-                    Value(0.0),
-                )
-            )["total"]
-
             return Response(
                 {
-                    "income": round(balance_data["income"], 2),
-                    "expense": round(balance_data["expense"], 2),
-                    "balance": round(balance, 2),
+                    "income": round(income, 2),
+                    "expense": round(expense, 2),
+                    "balance": round(all_income - all_expense, 2),
                 }
             )
 
@@ -667,7 +572,7 @@ class TeacherGroupFinanceAPIView(APIView):
             # kind = Kind.objects.filter(
             #     action="INCOME", name__icontains="Lesson payment"
             # ).first()
-            kind = Kind.get(FinanceKindTypeChoices.LESSON_PAYMENT)
+            kind = get_kind(FinanceKindTypeChoices.LESSON_PAYMENT)
 
             finance_records = Finance.objects.filter(
                 **finance_filters, stuff__id=teacher_id, kind=kind
@@ -780,337 +685,11 @@ class FinanceTeacher(ListAPIView):
         return Finance.objects.none()
 
 
-# class FinanceExcel(APIView):
-
-#     def get(self, request, *args, **kwargs):
-#         filial = request.GET.get("filial")
-#         casher_id = request.GET.get("cashier")
-#         casher_role = request.GET.get("casher_role")
-#         kind_id = request.GET.get("kind")
-#         action = request.GET.get("action")
-
-#         filters = Q()
-#         if filial:
-#             filters &= Q(casher__user__filial__id=filial)
-#         if casher_id:
-#             filters &= Q(casher__id=casher_id)
-#         if casher_role:
-#             filters &= Q(casher__role=casher_role)
-#         if kind_id:
-#             filters &= Q(kind__id=kind_id)
-#         if action:
-#             filters &= Q(action=action)
-
-#         finances = Finance.objects.filter(filters).exclude(
-#             Q(kind__kind=FinanceKindTypeChoices.BONUS) | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-#         )
-
-#         start_date_str = request.GET.get("start_date")
-#         end_date_str = request.GET.get("end_date")
-
-#         if start_date_str and end_date_str:
-#             start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-#             end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
-#             finances = finances.filter(
-#                 created_at__gte=start_date, created_at__lt=end_date + timedelta(days=1)
-#             )
-
-#         elif start_date_str:
-#             start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-#             finances = finances.filter(
-#                 created_at__gte=start_date,
-#                 created_at__lt=start_date + timedelta(days=1) - timedelta(seconds=1),
-#             )
-
-#         # Create an Excel workbook
-#         workbook = openpyxl.Workbook()
-#         sheet = workbook.active
-#         sheet.title = "Finance Report"
-
-#         # Add headers
-#         headers = [
-#             "Cassa egasi",
-#             "Role",
-#             "To'lov turi",
-#             "Action",
-#             "Miqdor",
-#             "To'lov metodi",
-#             "Comment",
-#             "Yaratilgan vaqti",
-#         ]
-#         sheet.append(headers)
-
-#         # Add data
-#         total_amount = 0
-#         total_income = 0
-#         total_expense = 0
-#         for finance in finances:
-#             amount = finance.amount or 0
-
-#             # Subtract for expense, add for income
-#             if finance.action == "INCOME":
-#                 total_income += amount
-#                 total_amount += amount
-#             else:
-#                 total_expense -= amount
-#                 total_amount -= amount
-
-#             sheet.append(
-#                 [
-#                     finance.casher.name if finance.casher else "-",
-#                     (
-#                         "Asosiy kassa"
-#                         if finance.casher.role == "WEALTH"
-#                         else (
-#                             "Buxgalteriya kassa"
-#                             if finance.casher.role == "ACCOUNTANT"
-#                             else (
-#                                 "Filial kassa"
-#                                 if finance.casher.role == "ADMINISTRATOR"
-#                                 else ""
-#                             )
-#                         )
-#                     ),
-#                     (
-#                         finance.kind.name
-#                         if finance.kind
-#                         else ""
-#                         # "Kassa qabul qilish"
-#                         # if finance.kind.name == "CASHIER_ACCEPTANCE"
-#                         # else (
-#                         #     "Kassa topshirish"
-#                         #     if finance.kind.name == "CASHIER_HANDOVER"
-#                         #     else (
-#                         #         "Oylik maosh"
-#                         #         if finance.kind.name == "Salary"
-#                         #         else (
-#                         #             "Kurs to'lovi"
-#                         #             if finance.kind.name == "Course payment"
-#                         #             else (
-#                         #                 "1 dars uchun to'lov"
-#                         #                 if finance.kind.name == "Lesson payment"
-#                         #                 else (
-#                         #                     "Pul qaytarish"
-#                         #                     if finance.kind.name == "Money back"
-#                         #                     else (
-#                         #                         finance.kind.name
-#                         #                         if hasattr(finance.kind, "name")
-#                         #                         else str(finance.kind)
-#                         #                     )
-#                         #                 )
-#                         #             )
-#                         #         )
-#                         #     )
-#                         # )
-#                     ),
-#                     "Kirim" if finance.action == "INCOME" else "Xarajat",
-#                     amount,
-#                     (
-#                         "Naqt pul"
-#                         if finance.payment_method == "Cash"
-#                         else (
-#                             "Pul kuchirish"
-#                             if finance.payment_method == "Money_send"
-#                             else (
-#                                 "Karta orqali"
-#                                 if finance.payment_method == "Card"
-#                                 else (
-#                                     "Payme"
-#                                     if finance.payment_method == "Payme"
-#                                     else "Click"
-#                                 )
-#                             )
-#                         )
-#                     ),
-#                     finance.comment or "-",
-#                     finance.created_at.strftime("%d-%m-%Y %H:%M:%S"),
-#                 ]
-#             )
-
-#         # ✅ Add total row
-#         sheet.append([])
-#         sheet.append(["", "", "", "Jami Kirim:", total_income])
-#         sheet.append(["", "", "", "Jami Chiqim:", total_expense])
-#         sheet.append(["", "", "", "JAMI:", total_amount])
-
-#         response = HttpResponse(
-#             content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-#         )
-#         response["Content-Disposition"] = 'attachment; filename="finance_report.xlsx"'
-#         workbook.save(response)
-#         return response
-
-
 class FinanceExcel(APIView):
+    """The finance list as xlsx; ``background=true`` runs it as an ExportJob."""
 
     def get(self, request, *args, **kwargs):
-        filial = request.GET.get("filial")
-        casher_id = request.GET.get("cashier")
-        casher_role = request.GET.get("casher_role")
-        kind_id = request.GET.get("kind")
-        action = request.GET.get("action")
-
-        # ---- filters ----
-        filters = Q()
-        if filial:
-            filters &= Q(casher__user__filial__id=filial)
-        if casher_id:
-            filters &= Q(casher__id=casher_id)
-        if casher_role:
-            filters &= Q(casher__role=casher_role)
-        if kind_id:
-            filters &= Q(kind__id=kind_id)
-        if action:
-            filters &= Q(action=action)
-
-        finances = (
-            Finance.objects.filter(filters)
-            .exclude(
-                Q(kind__kind=FinanceKindTypeChoices.BONUS)
-                | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-            )
-            .select_related("casher", "kind")
-        )
-
-        # ---- date range ----
-        start_date_str = request.GET.get("start_date")
-        end_date_str = request.GET.get("end_date")
-
-        if start_date_str and end_date_str:
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
-            finances = finances.filter(
-                created_at__gte=start_date,
-                created_at__lt=end_date + timedelta(days=1),
-            )
-        elif start_date_str:
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-            finances = finances.filter(
-                created_at__gte=start_date,
-                created_at__lt=start_date + timedelta(days=1) - timedelta(seconds=1),
-            )
-
-        # ---- mappings to avoid nested if/else ----
-        role_map = {
-            "WEALTH": "Asosiy kassa",
-            "ACCOUNTANT": "Buxgalteriya kassa",
-            "ADMINISTRATOR": "Filial kassa",
-        }
-        payment_map = {
-            "Cash": "Naqd pul",
-            "Money_send": "Pul kuchirish",
-            "Card": "Karta orqali",
-            "Payme": "Payme",
-            "Click": "Click",
-        }
-        action_map = {
-            "INCOME": "Kirim",
-            "EXPENSE": "Xarajat",
-        }
-
-        # ---- workbook ----
-        workbook = openpyxl.Workbook()
-        sheet = workbook.active
-        sheet.title = "Finance Report"
-
-        headers = [
-            "Kassa egasi",
-            "Role",
-            "To'lov turi",
-            "Action",
-            "Miqdor",
-            "To'lov usuli",
-            "Comment",
-            "Yaratilgan vaqti",
-        ]
-        sheet.append(headers)
-
-        # style header
-        for col in range(1, len(headers) + 1):
-            c = sheet.cell(row=1, column=col)
-            c.font = Font(bold=True)
-
-        # ---- data + totals ----
-        total_amount = 0
-        total_income = 0
-        total_expense = 0
-
-        for finance in finances:
-            amount = float(finance.amount or 0)
-
-            # running totals
-            if finance.action == "INCOME":
-                total_income += amount
-                total_amount += amount
-            else:
-                total_expense -= amount  # keeping your original sign convention
-                total_amount -= amount
-
-            sheet.append(
-                [
-                    finance.casher.name if finance.casher else "-",
-                    role_map.get(getattr(finance.casher, "role", None), ""),
-                    (finance.kind.name if finance.kind else ""),
-                    action_map.get(finance.action, finance.action or ""),
-                    amount,  # keep numeric
-                    payment_map.get(
-                        finance.payment_method, finance.payment_method or ""
-                    ),
-                    (finance.comment or "-"),
-                    finance.created_at.strftime("%d-%m-%Y %H:%M:%S"),
-                ]
-            )
-
-        # blank row + totals
-        sheet.append([])
-        sheet.append(["", "", "", "Jami Kirim:", total_income])
-        sheet.append(["", "", "", "Jami Chiqim:", total_expense])
-        sheet.append(["", "", "", "JAMI:", total_amount])
-
-        # ---- number format for the Miqdor column (keeps numeric + formulas safe) ----
-        amount_col_idx = headers.index("Miqdor") + 1  # 1-based column index
-        amount_col_letter = get_column_letter(amount_col_idx)
-        currency_fmt = (
-            '#,##0 "so\'m"'  # change to '#,##0.00 "so\'m"' if you need decimals
-        )
-
-        # Apply format from first data row (2) through last row (including totals)
-        for r in range(2, sheet.max_row + 1):
-            cell = sheet[f"{amount_col_letter}{r}"]
-            cell.number_format = currency_fmt
-            cell.alignment = Alignment(horizontal="right")
-
-        # Also right-align & bold the total labels
-        last_row = sheet.max_row
-        for r in range(last_row - 2, last_row + 1):
-            label_cell = sheet.cell(row=r, column=4)  # "Jami ..." labels
-            value_cell = sheet.cell(row=r, column=5)  # totals amount
-            label_cell.font = Font(bold=True)
-            value_cell.font = Font(bold=True)
-            value_cell.number_format = currency_fmt
-            value_cell.alignment = Alignment(horizontal="right")
-
-        # (Optional) a bit of readable width
-        width_map = {
-            1: 22,  # Cassa egasi
-            2: 18,  # Role
-            3: 22,  # To'lov turi
-            4: 12,  # Action
-            5: 16,  # Miqdor
-            6: 18,  # To'lov metodi
-            7: 40,  # Comment
-            8: 22,  # Yaratilgan vaqti
-        }
-        for idx, w in width_map.items():
-            sheet.column_dimensions[get_column_letter(idx)].width = w
-
-        # ---- response ----
-        response = HttpResponse(
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        response["Content-Disposition"] = 'attachment; filename="finance_report.xlsx"'
-        workbook.save(response)
-        return response
+        return respond(request, "finance")
 
 
 class KindList(ListCreateAPIView):
@@ -1161,13 +740,9 @@ class PaymentStatistics(APIView):
         filter = {}
 
         if casher_id:
-            filter["casher__id"] = casher_id
+            filter["casher_id"] = casher_id
         if filial:
-            filter["filial"] = filial
-        if start_date:
-            filter["created_at__gte"] = start_date
-        if end_date:
-            filter["created_at__lte"] = end_date
+            filter["filial_id"] = filial
 
         valid_payment_methods = [
             "Click",
@@ -1179,18 +754,16 @@ class PaymentStatistics(APIView):
             "BONUS",
         ]
 
+        totals = daily.totals(
+            "payment_method",
+            "action",
+            start=parse_date(start_date) if start_date else None,
+            end=parse_date(end_date) if end_date else None,
+            **filter,
+        )
+
         def get_total_amount(payment_name, action_type):
-            return (
-                Finance.objects.filter(
-                    payment_method=payment_name, action=action_type, **filter
-                )
-                .exclude(
-                    Q(kind__kind=FinanceKindTypeChoices.BONUS)
-                    | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-                )
-                .aggregate(total=Sum("amount"))["total"]
-                or 0
-            )
+            return totals.get((payment_name, action_type), 0)
 
         data = {}
 
@@ -1243,28 +816,16 @@ class PaymentCasherStatistics(ListAPIView):
             "BONUS",
         ]
 
-        def get_total_amount(payment_method, action_type):
-            qs = Finance.objects.filter(
-                payment_method=payment_method, action=action_type
-            ).exclude(
-                Q(kind__kind=FinanceKindTypeChoices.BONUS)
-                | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-            )
-            if cashier_id:
-                qs = qs.filter(casher__id=cashier_id)
+        filters = {"casher_id": cashier_id} if cashier_id else {}
+        # start_date alone is one day; end_date alone filters nothing
+        if start_date:
+            filters["start"] = start_date.date()
+            filters["end"] = (end_date or start_date).date()
 
-            if start_date and not end_date:
-                qs = qs.filter(
-                    created_at__gte=start_date,
-                    created_at__lt=start_date + timedelta(days=1),
-                )
-            elif start_date and end_date:
-                qs = qs.filter(
-                    created_at__gte=start_date,
-                    created_at__lt=end_date + timedelta(days=1),
-                )
+        totals = daily.totals("payment_method", "action", **filters)
 
-            return qs.aggregate(total=Sum("amount"))["total"] or 0
+        def get_total_amount(payment_method, action_type):
+            return totals.get((payment_method, action_type), 0)
 
         # ✅ Build statistics data
         data = {}
@@ -1369,34 +930,19 @@ class PaymentStatisticsByKind(APIView):
         filters = {}
         if start_date:
             start_date = parse_date(start_date)
-            filters["created_at__gte"] = start_date
         if end_date:
             end_date = parse_date(end_date)
-            filters["created_at__lte"] = end_date
         if filial:
             filters["filial_id"] = filial
 
         kinds = Kind.objects.all()
 
-        # Function to get total amount for a given kind and action type
-        def get_total_amount(kind, action_type):
-            return (
-                Finance.objects.filter(kind=kind, action=action_type, **filters)
-                .exclude(
-                    Q(kind__kind=FinanceKindTypeChoices.BONUS)
-                    | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-                )
-                .aggregate(total=Sum("amount"))["total"]
-                or 0
-            )
+        totals = daily.totals(
+            "kind_id", "action", start=start_date, end=end_date, **filters
+        )
 
-        # Function to get distinct actions for a given kind
-        def get_kind_actions(kind):
-            return list(
-                Finance.objects.filter(kind=kind, **filters)
-                .values_list("action", flat=True)
-                .distinct()
-            )
+        def get_total_amount(kind, action_type):
+            return totals.get((kind.pk, action_type), 0)
 
         data = {}
 
@@ -1500,6 +1046,12 @@ class GeneratePaymentExcelAPIView(APIView):
                 description="End date (Optional, format: YYYY-MM-DD)",
                 type=openapi.TYPE_STRING,
             ),
+            openapi.Parameter(
+                "background",
+                openapi.IN_QUERY,
+                description="Export in a Celery task; poll upload/exports/<id>/",
+                type=openapi.TYPE_BOOLEAN,
+            ),
         ],
         responses={
             200: "Excel file containing payment statistics",
@@ -1507,67 +1059,7 @@ class GeneratePaymentExcelAPIView(APIView):
         },
     )
     def get(self, request, *args, **kwargs):
-        casher_id = request.GET.get("casher_id")
-        start_date = request.GET.get("start_date")
-        end_date = request.GET.get("end_date")
-
-        if not casher_id:
+        if not request.GET.get("casher_id"):
             return Response({"error": "Casher ID is required"}, status=400)
 
-        # Base filter
-        filters = {"casher_id": casher_id}
-        if start_date:
-            filters["created_at__gte"] = start_date
-        if end_date:
-            filters["created_at__lte"] = end_date
-
-        # Payment methods
-        payment_methods = ["Click", "Payme", "Cash", "Card", "Money_send"]
-
-        # Aggregating income and expense per payment method
-        data = {"Casher ID": casher_id}
-
-        for method in payment_methods:
-            income = (
-                Finance.objects.filter(
-                    payment_method=method, action="INCOME", **filters
-                )
-                .exclude(
-                    Q(kind__kind=FinanceKindTypeChoices.BONUS)
-                    | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-                )
-                .aggregate(total=Sum("amount"))["total"]
-                or 0
-            )
-            expense = (
-                Finance.objects.filter(
-                    payment_method=method, action="EXPENSE", **filters
-                )
-                .exclude(
-                    Q(kind__kind=FinanceKindTypeChoices.BONUS)
-                    | Q(kind__kind=FinanceKindTypeChoices.MONEY_BACK)
-                )
-                .aggregate(total=Sum("amount"))["total"]
-                or 0
-            )
-            data[f"{method}_Income"] = income
-            data[f"{method}_Expense"] = expense
-
-        # Compute total income and expense
-        data["Total_Income"] = sum(data[f"{p}_Income"] for p in payment_methods)
-        data["Total_Expense"] = sum(data[f"{p}_Expense"] for p in payment_methods)
-
-        # Create DataFrame
-        df = pd.DataFrame([data])
-
-        # Generate Excel file
-        file_name = f"payment_casher_statistics_{now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        response = HttpResponse(
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        response["Content-Disposition"] = f"attachment; filename={file_name}"
-
-        with pd.ExcelWriter(response, engine="xlsxwriter") as writer:
-            df.to_excel(writer, index=False, sheet_name="Payment Statistics")
-
-        return response
+        return respond(request, "payment_statistics")
@@ -6,4 +6,5 @@ class TimetrackerConfig(AppConfig):
     name = 'data.finances.timetracker'
 
     def ready(self):
-        import data.finances.timetracker.signals
\ No newline at end of file
+        import data.finances.timetracker.signals
+        import data.finances.timetracker.schedule
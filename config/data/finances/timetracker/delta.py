@@ -12,42 +12,51 @@ class Range:
     def __repr__(self):
         return f"Range({self.start}, {self.end})"
 
+
+def merge_intervals(intervals) -> list[tuple]:
+    """Sort and merge overlapping or touching (start, end) pairs."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def intersect_intervals(a: list[tuple], b: list[tuple]) -> list[tuple]:
+    """Intersection of two merged interval lists, in one pass over both."""
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if end > start:
+            result.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
 def include_only_ranges(main_ranges: List[Range], includes: List[Range]) -> timedelta:
     """
     Given a list of main_ranges and a list of include ranges,
     returns the effective duration that is inside both any of the main_ranges
     and any of the include ranges.
 
+    Both lists are merged first and then intersected in a single sweep, so
+    the cost is O((n + m) log(n + m)) instead of comparing every pair.
+
     The result is returned as a timedelta.
     """
-    intervals = []
-    for main_range in main_ranges:
-        for include in includes:
-            # Find the overlapping part between main_range and include
-            effective_start = max(main_range.start, include.start)
-            effective_end = min(main_range.end, include.end)
-            if effective_end > effective_start:
-                intervals.append((effective_start, effective_end))
-
-    # Sort intervals by start time
-    intervals.sort(key=lambda interval: interval[0])
-
-    # Merge overlapping or adjacent intervals
-    merged_intervals = []
-    for interval in intervals:
-        if not merged_intervals:
-            merged_intervals.append(interval)
-        else:
-            last_start, last_end = merged_intervals[-1]
-            current_start, current_end = interval
-            if current_start <= last_end:  # Overlap or adjacent
-                merged_intervals[-1] = (last_start, max(last_end, current_end))
-            else:
-                merged_intervals.append(interval)
-
-    # Calculate total included duration
+    main = merge_intervals((r.start, r.end) for r in main_ranges)
+    included = merge_intervals((r.start, r.end) for r in includes)
+
     total_included = timedelta(0)
-    for start, end in merged_intervals:
+    for start, end in intersect_intervals(main, included):
         total_included += end - start
 
     return total_included
@@ -0,0 +1,248 @@
+"""
+Scheduled working time of employees.
+
+A user's week is kept as a sorted list of non-overlapping (start, end)
+minute offsets from Monday 00:00: teachers and assistants get the sessions
+of their groups, everybody else their UserTimeLine rows. A month's
+scheduled minutes are then the length of each weekday's intervals times the
+number of such weekdays in the month (less the common holidays of
+lesson_calendar), with no per-day loop.
+
+Weeks are built for many users with two queries and cached per user; the
+cache key carries a per-user version that the UserTimeLine, Group and
+StudentGroup signals below bump.
+"""
+
+import calendar
+from collections import defaultdict
+from datetime import time
+
+from django.core.cache import caches
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from data.account.models import CustomUser
+from data.command.reference import CACHE_ALIAS
+from data.finances.timetracker.delta import merge_intervals
+from data.finances.timetracker.models import UserTimeLine
+from data.student.groups.lesson_calendar import UZBEK_WEEKDAYS, holiday_dates
+from data.student.groups.models import Group
+from data.student.studentgroup.models import StudentGroup
+
+DAY_MINUTES = 24 * 60
+
+SCHEDULE_TIMEOUT = 60 * 60
+
+
+def _cache():
+    # the shared cache: a version bump must reach every web and Celery
+    # process, not only the one that saved the change
+    return caches[CACHE_ALIAS]
+
+TEACHER_ROLES = {"TEACHER", "ASSISTANT"}
+
+# UserTimeLine.day
+WEEKDAYS = {name: index for index, name in enumerate(calendar.day_name)}
+
+
+def _minute(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _session(weekday: int, start: time, end: time):
+    start_minute, end_minute = _minute(start), _minute(end)
+    if end_minute <= start_minute:
+        return None
+    offset = weekday * DAY_MINUTES
+    return (offset + start_minute, offset + end_minute)
+
+
+def _build_weeks(users: dict) -> dict:
+    """{user id: merged weekly intervals} for {user id: role}."""
+    sessions = defaultdict(list)
+
+    teachers = [user_id for user_id, role in users.items() if role in TEACHER_ROLES]
+    if teachers:
+        rows = (
+            Group.objects.filter(
+                Q(teacher_id__in=teachers) | Q(secondary_teacher_id__in=teachers),
+                students__isnull=False,
+                scheduled_day_type__name__in=list(UZBEK_WEEKDAYS),
+            )
+            .values_list(
+                "id",
+                "teacher_id",
+                "secondary_teacher_id",
+                "started_at",
+                "ended_at",
+                "scheduled_day_type__name",
+            )
+            .distinct()
+        )
+        for _, teacher_id, secondary_id, started_at, ended_at, day in rows:
+            if not started_at or not ended_at:
+                continue
+            session = _session(UZBEK_WEEKDAYS[day], started_at, ended_at)
+            if session is None:
+                continue
+            for user_id in {teacher_id, secondary_id}:
+                if users.get(user_id) in TEACHER_ROLES:
+                    sessions[user_id].append(session)
+
+    others = [user_id for user_id, role in users.items() if role not in TEACHER_ROLES]
+    if others:
+        rows = UserTimeLine.objects.filter(user_id__in=others).values_list(
+            "user_id", "day", "start_time", "end_time"
+        )
+        for user_id, day, start_time, end_time in rows:
+            weekday = WEEKDAYS.get((day or "").strip().capitalize())
+            if weekday is None or not start_time or not end_time:
+                continue
+            session = _session(weekday, start_time, end_time)
+            if session is not None:
+                sessions[user_id].append(session)
+
+    return {user_id: merge_intervals(sessions[user_id]) for user_id in users}
+
+
+def weekday_counts(year: int, month: int) -> list[int]:
+    """How many Mondays, Tuesdays, ... the month has."""
+    first_weekday, days = calendar.monthrange(year, month)
+    counts = [days // 7] * 7
+    for extra in range(days % 7):
+        counts[(first_weekday + extra) % 7] += 1
+    return counts
+
+
+def minutes_per_weekday(week: list[tuple]) -> list[int]:
+    minutes = [0] * 7
+    for start, end in week:
+        minutes[start // DAY_MINUTES] += end - start
+    return minutes
+
+
+def month_minutes(week: list[tuple], year: int, month: int, skip=()) -> int:
+    """Scheduled minutes of the month, without the days in ``skip``."""
+    counts = weekday_counts(year, month)
+    for day in skip:
+        if (day.year, day.month) == (year, month):
+            counts[day.weekday()] -= 1
+    return sum(
+        minutes * count for minutes, count in zip(minutes_per_weekday(week), counts)
+    )
+
+
+def day_intervals(week: list[tuple], weekday: int) -> list[tuple]:
+    """The intervals of one weekday, as minutes from that day's midnight."""
+    offset = weekday * DAY_MINUTES
+    return [
+        (start - offset, end - offset)
+        for start, end in week
+        if offset <= start < offset + DAY_MINUTES
+    ]
+
+
+# ---------- cache ----------
+
+
+def _version_key(user_id) -> str:
+    return f"timetracker:schedule_version:{user_id}"
+
+
+def _week_key(user_id, role, version) -> str:
+    return f"timetracker:schedule:{user_id}:{role}:{version}"
+
+
+def weekly_schedules(user_ids) -> dict:
+    """{user id: merged weekly intervals}, from the cache where possible."""
+    users = dict(CustomUser.objects.filter(id__in=user_ids).values_list("id", "role"))
+    versions = _cache().get_many([_version_key(user_id) for user_id in users])
+    keys = {
+        user_id: _week_key(user_id, role, versions.get(_version_key(user_id), 0))
+        for user_id, role in users.items()
+    }
+
+    cached = _cache().get_many(list(keys.values()))
+    weeks = {
+        user_id: [tuple(interval) for interval in cached[key]]
+        for user_id, key in keys.items()
+        if key in cached
+    }
+
+    missing = {user_id: users[user_id] for user_id in users if user_id not in weeks}
+    if missing:
+        built = _build_weeks(missing)
+        _cache().set_many(
+            {keys[user_id]: week for user_id, week in built.items()}, SCHEDULE_TIMEOUT
+        )
+        weeks.update(built)
+
+    return weeks
+
+
+def monthly_minutes(user_ids, year: int, month: int) -> dict:
+    """{user id: scheduled minutes in the month}, the common holidays off."""
+    holidays = holiday_dates()
+    return {
+        user_id: month_minutes(week, year, month, holidays)
+        for user_id, week in weekly_schedules(user_ids).items()
+    }
+
+
+def invalidate(*user_ids):
+    for user_id in {user_id for user_id in user_ids if user_id}:
+        key = _version_key(user_id)
+        try:
+            _cache().incr(key)
+        except ValueError:
+            _cache().set(key, 1, None)
+
+
+# ---------- invalidation ----------
+
+
+@receiver(post_save, sender=UserTimeLine)
+@receiver(post_delete, sender=UserTimeLine)
+def on_timeline_change(sender, instance: UserTimeLine, **kwargs):
+    invalidate(instance.user_id, instance.old_value("user"))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def on_group_change(sender, instance: Group, **kwargs):
+    invalidate(
+        instance.teacher_id,
+        instance.secondary_teacher_id,
+        instance.old_value("teacher"),
+        instance.old_value("secondary_teacher"),
+    )
+
+
+@receiver(m2m_changed, sender=Group.scheduled_day_type.through)
+def on_group_days_change(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # day.group_set.add(...): rare, drop every affected teacher
+        teachers = Group.objects.filter(pk__in=kwargs["pk_set"] or []).values_list(
+            "teacher_id", "secondary_teacher_id"
+        )
+        invalidate(*[user_id for pair in teachers for user_id in pair])
+    else:
+        invalidate(instance.teacher_id, instance.secondary_teacher_id)
+
+
+# a group only counts while it has students
+@receiver(post_save, sender=StudentGroup)
+@receiver(post_delete, sender=StudentGroup)
+def on_student_group_change(sender, instance: StudentGroup, **kwargs):
+    group_ids = {instance.group_id, instance.old_value("group")} - {None}
+    if kwargs["signal"] is post_save and not kwargs["created"]:
+        if len(group_ids) < 2:
+            return
+    if group_ids:
+        teachers = Group.objects.filter(pk__in=group_ids).values_list(
+            "teacher_id", "secondary_teacher_id"
+        )
+        invalidate(*[user_id for pair in teachers for user_id in pair])
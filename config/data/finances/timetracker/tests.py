@@ -1,3 +1,69 @@
-from django.test import TestCase
+from datetime import date, datetime, time
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from data.account.models import CustomUser
+from data.finances.timetracker.delta import (
+    Range,
+    include_only_ranges,
+    intersect_intervals,
+    merge_intervals,
+)
+from data.finances.timetracker.models import UserTimeLine
+from data.finances.timetracker.schedule import monthly_minutes, weekday_counts
+from data.student.groups.models import Holiday
+
+
+class IntervalTest(SimpleTestCase):
+    def test_merge_and_intersect(self):
+        self.assertEqual(
+            merge_intervals([(5, 8), (1, 3), (2, 4), (8, 9)]), [(1, 4), (5, 9)]
+        )
+        self.assertEqual(
+            intersect_intervals([(1, 4), (5, 9)], [(3, 6), (8, 12)]),
+            [(3, 4), (5, 6), (8, 9)],
+        )
+
+    def test_include_only_ranges_counts_overlaps_once(self):
+        def at(hour, minute=0):
+            return datetime(2026, 6, 1, hour, minute)
+
+        schedule = [Range(at(9), at(12)), Range(at(11), at(13))]
+        present = [Range(at(8), at(10)), Range(at(9, 30), at(12, 30))]
+
+        self.assertEqual(
+            include_only_ranges(schedule, present).total_seconds() / 60, 210
+        )
+
+    def test_weekday_counts(self):
+        # June 2026 starts on a Monday and has 30 days
+        self.assertEqual(weekday_counts(2026, 6), [5, 5, 4, 4, 4, 4, 4])
+
+
+class ScheduleTest(TestCase):
+    def test_monthly_minutes_follow_timeline_changes(self):
+        user = CustomUser.objects.create(phone="+998900000002", role="DIRECTOR")
+        UserTimeLine.objects.create(
+            user=user, day="Monday", start_time=time(9), end_time=time(18)
+        )
+        UserTimeLine.objects.create(
+            user=user, day="Monday", start_time=time(17), end_time=time(19)
+        )
+
+        self.assertEqual(monthly_minutes([user.id], 2026, 6), {user.id: 600 * 5})
+
+        UserTimeLine.objects.create(
+            user=user, day="Tuesday", start_time=time(9), end_time=time(10)
+        )
+        self.assertEqual(monthly_minutes([user.id], 2026, 6), {user.id: 600 * 5 + 60 * 5})
+
+    def test_common_holidays_are_not_scheduled(self):
+        user = CustomUser.objects.create(phone="+998900000003", role="DIRECTOR")
+        UserTimeLine.objects.create(
+            user=user, day="Monday", start_time=time(9), end_time=time(18)
+        )
+        holiday = Holiday.objects.create(date=date(2026, 6, 8), name="Bayram")
+        # the holidays cache outlives the test transaction, drop it on the way out
+        self.addCleanup(holiday.delete)
+
+        self.assertEqual(monthly_minutes([user.id], 2026, 6), {user.id: 540 * 4})
@@ -1,4 +1,3 @@
-import calendar
 import decimal
 from datetime import date
 from datetime import datetime
@@ -10,14 +9,16 @@ from icecream import ic
 
 from data.finances.finance.choices import FinanceKindTypeChoices
 from data.account.models import CustomUser
-from data.finances.finance.models import Finance, Kind
+from data.employee import balance
+from data.finances.finance.cache import get_kind
+from data.finances.finance.models import Finance
 from data.finances.timetracker.delta import include_only_ranges, Range
+from data.finances.timetracker.schedule import monthly_minutes
 from data.finances.timetracker.models import (
     UserTimeLine,
     Stuff_Attendance,
     Employee_attendance,
 )
-from data.student.groups.models import Group
 from data.student.studentgroup.models import StudentGroup
 
 TASHKENT_TZ = pytz.timezone("Asia/Tashkent")
@@ -55,75 +56,39 @@ def get_updated_datas(user, date):
     return all_actions
 
 
-def get_monthly_per_minute_salary(user_id):
-    user = CustomUser.objects.filter(id=user_id).first()
-    if not user or not user.salary:
-        return {"total_minutes": 0, "per_minute_salary": 0}
-
-    today = date.today()
-    _, days_in_month = calendar.monthrange(today.year, today.month)
-    total_minutes = 0
-
-    if user.role in {"TEACHER", "ASSISTANT"}:
-        student_groups = StudentGroup.objects.filter(
-            Q(group__teacher=user) | Q(group__secondary_teacher=user)
-        ).select_related("group")
-
-        group_ids = [sg.group.id for sg in student_groups]
-        groups = Group.objects.filter(id__in=group_ids).prefetch_related(
-            "scheduled_day_type"
+def monthly_per_minute_salaries(user_ids, day=None):
+    """
+    {user id: {"total_minutes", "per_minute_salary"}} for the month of
+    ``day`` (default today), for any number of users in a few queries.
+    """
+    day = day or date.today()
+    salaries = {
+        str(user_id): salary
+        for user_id, salary in CustomUser.objects.filter(id__in=user_ids).values_list(
+            "id", "salary"
         )
+    }
+    paid = [user_id for user_id, salary in salaries.items() if salary]
+    minutes = {
+        str(user_id): total
+        for user_id, total in monthly_minutes(paid, day.year, day.month).items()
+    }
+
+    result = {}
+    for user_id in user_ids:
+        total_minutes = minutes.get(str(user_id), 0)
+        salary = salaries.get(str(user_id))
+        result[user_id] = {
+            "total_minutes": total_minutes,
+            "per_minute_salary": (
+                round(salary / total_minutes, 2) if salary and total_minutes else 0
+            ),
+        }
+    return result
 
-        for group in groups:
-            if not group.started_at or not group.ended_at:
-                continue
-
-            session_start = datetime.combine(today, group.started_at)
-            session_end = datetime.combine(today, group.ended_at)
-            daily_minutes = int((session_end - session_start).total_seconds() / 60)
-
-            scheduled_days = group.scheduled_day_type.values_list("name", flat=True)
-            scheduled_indexes = {
-                UZBEK_WEEKDAYS[day] for day in scheduled_days if day in UZBEK_WEEKDAYS
-            }
-
-            session_count = sum(
-                1
-                for day in range(1, days_in_month + 1)
-                if date(today.year, today.month, day).weekday() in scheduled_indexes
-            )
-
-            total_minutes += daily_minutes * session_count
-
-    else:
-        timelines = UserTimeLine.objects.filter(user=user)
-
-        for timeline in timelines:
-            if not timeline.start_time or not timeline.end_time:
-                continue
-
-            day_normalized = timeline.day.strip().capitalize()
-            if day_normalized not in calendar.day_name:
-                continue
 
-            weekday_index = list(calendar.day_name).index(day_normalized)
-
-            start_dt = datetime.combine(today, timeline.start_time)
-            end_dt = datetime.combine(today, timeline.end_time)
-            daily_minutes = int((end_dt - start_dt).total_seconds() / 60)
-
-            work_days = [
-                date(today.year, today.month, d)
-                for d in range(1, days_in_month + 1)
-                if date(today.year, today.month, d).weekday() == weekday_index
-            ]
-
-            total_minutes += daily_minutes * len(work_days)
-
-    ic("Total minutesssssssss: ", total_minutes)
-
-    per_minute_salary = round(user.salary / total_minutes, 2) if total_minutes else 0
-    return {"total_minutes": total_minutes, "per_minute_salary": per_minute_salary}
+def get_monthly_per_minute_salary(user_id):
+    return monthly_per_minute_salaries([user_id])[user_id]
 
 
 # FIXED DELETE FUNCTION:
@@ -179,8 +144,7 @@ def delete_user_finances(user, daily_att):
         else:
             amount = finances.amount
 
-        user.balance -= amount
-        user.save()
+        _, user.balance = balance.move(user.pk, -amount)
 
         finances.delete()
 
@@ -242,13 +206,9 @@ def calculate_amount(user, actions):
     # penalty_kind = Kind.objects.filter(action="EXPENSE", name__icontains="Money back").first()
     # bonus_kind = Kind.objects.filter(action="EXPENSE", name__icontains="Bonus").first()
 
-    penalty_kind, penalty_kind_created = Kind.objects.get_or_create(
-        kind=FinanceKindTypeChoices.MONEY_BACK
-    )
+    penalty_kind = get_kind(FinanceKindTypeChoices.MONEY_BACK)
 
-    bonus_kind, bonus_kind_created = Kind.objects.get_or_create(
-        kind=FinanceKindTypeChoices.BONUS
-    )
+    bonus_kind = get_kind(FinanceKindTypeChoices.BONUS)
 
     total_eff_amount = 0
 
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('course', '0001_initial'),
+        ('employee', '0002_initial'),
+        ('filial', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FirstLesson',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('date', models.DateTimeField()),
+                ('status', models.CharField(choices=[('PENDING', 'Kutilmoqda'), ('DIDNTCOME', 'Darsga kelmadi.'), ('CAME', 'CAME')], default='PENDING', max_length=255)),
+                ('lesson_number', models.IntegerField(default=1, help_text=("O'quvchining nechinmi martta sinov darsiga yozilvotti?\nBu narsa lead 3 martta darsga  kelmasa, archivelavorish uchun kerak.",))),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('is_archived_automatically', models.BooleanField(default=False)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='first_lessons', to='course.course')),
+                ('creator', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='employee.employee')),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+            ],
+            options={
+                'verbose_name': 'Sinov darsi',
+                'verbose_name_plural': 'Sinov darslari',
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('firstlesson', '0001_initial'),
+        ('groups', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='firstlesson',
+            name='group',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='first_lessons', to='groups.group'),
+        ),
+    ]
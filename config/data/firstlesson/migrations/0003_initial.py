@@ -0,0 +1,47 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('employee', '0004_initial'),
+        ('firstlesson', '0002_initial'),
+        ('new_lid', '0001_initial'),
+        ('subject', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='firstlesson',
+            name='lead',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='first_lessons', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='firstlesson',
+            name='level',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='first_lessons', to='subject.level'),
+        ),
+        migrations.AddField(
+            model_name='firstlesson',
+            name='subject',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='first_lessons', to='subject.subject'),
+        ),
+        migrations.AddField(
+            model_name='firstlesson',
+            name='teacher',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='first_lessons', to='employee.employee'),
+        ),
+        migrations.AddConstraint(
+            model_name='firstlesson',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='firstlesson_firstlesson_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='firstlesson',
+            constraint=models.UniqueConstraint(fields=('lead', 'group', 'date'), name='unique_lead_group_date'),
+        ),
+    ]
@@ -50,20 +50,11 @@ def on_update(sender, instance: "FirstLesson", **kwargs):
         return
 
     # No-op unless group actually changed
-    changes = set(instance.changed_fields() or [])
-    if "group" not in changes:
+    if not instance.has_changed("group"):
         return
 
-    # Fetch previous group_id for this FirstLesson
-    try:
-        old = sender.objects.only("group_id").get(pk=instance.pk)
-    except sender.DoesNotExist:
-        return
-
-    old_gid = old.group_id
+    old_gid = instance.old_value("group")
     new_gid = instance.group_id
-    if old_gid == new_gid:
-        return
 
     # 1) Archive old group's StudentGroup (active rows) for this lead
     StudentGroup.objects.filter(
@@ -90,9 +81,7 @@ def on_date_change(sender, instance: "FirstLesson", **kwargs):
 
     if instance._state.adding:
         return
-    changes = set(instance.changed_fields() or [])
-
-    if "date" not in changes:
+    if not instance.has_changed("date"):
         return
 
     instance.status = "PENDING"
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('archived', '0002_initial'),
+        ('comments', '0001_initial'),
+        ('filial', '0001_initial'),
+        ('new_lid', '0001_initial'),
+        ('student', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archived',
+            name='lid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_lead', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='archived',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_students', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='frozen',
+            name='comment',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='frozen_comments', to='comments.comment'),
+        ),
+        migrations.AddField(
+            model_name='frozen',
+            name='creator',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='frozen_user_creator', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='frozen',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='frozen',
+            name='lid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='frozen_lead', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='frozen',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='frozen_students', to='student.student'),
+        ),
+        migrations.AddConstraint(
+            model_name='archived',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='archived_archived_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='frozen',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='archived_frozen_arch_ts_chk'),
+        ),
+    ]
@@ -0,0 +1,177 @@
+"""
+Lead Excel export (see data.upload.exports).
+"""
+
+from datetime import datetime
+
+from data.lid.new_lid.models import Lid
+from data.upload.exports import Column, Export, Sheet, newest_first, register
+
+FIELDS = [
+    "first_name",
+    "last_name",
+    "phone_number",
+    "date_of_birth",
+    "education_lang",
+    "edu_class",
+    "subject__name",
+    "ball",
+    "filial__name",
+    "marketing_channel__name",
+    "lid_stage_type",
+    "lid_stages",
+    "ordered_stages",
+    "is_archived",
+    "call_operator__full_name",
+    "sales_manager__full_name",
+    "is_student",
+    "service_manager__full_name",
+    "created_at",
+]
+
+EDUCATION_LANG_LABELS = {
+    "UZB": "Uzbek tili",
+    "ENG": "Ingliz tili",
+    "RU": "Rus tili",
+}
+EDU_CLASS_LABELS = {
+    "SCHOOL": "Maktab",
+    "UNIVERSITY": "Universitet",
+}
+ORDERED_STAGE_LABELS = {
+    "KUTULMOQDA": "Jarayonda",
+    "BIRINCHI_DARSGA_KELMAGAN": "Sinov darsiga kelmagan",
+    "BIRINCHI_DARS_BELGILANGAN": "Sinov darsi belgilangan",
+    "YANGI_BUYURTMA": "Yangi buyurtma",
+}
+LID_STAGE_LABELS = {
+    "YANGI_LEAD": "Yangi lead",
+    "KUTULMOQDA": "Jarayonda",
+}
+
+# query param -> Lid filter
+FILTERS = {
+    "filial": "filial__id",
+    "course": "groups__course__id",
+    "call_operator": "call_operator__id",
+    "service_manager": "service_manager__id",
+    "sales_manager": "sales_manager__id",
+    "teacher": "groups__teacher__id",
+    "marketing_channel": "marketing_channel__id",
+    "subject": "subject__id",
+}
+BOOLEAN_FILTERS = {
+    "is_archived": "is_archived",
+    "is_student": "is_student",
+}
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+@register
+class LeadExport(Export):
+    name = "leads"
+    filename = "Lids_Data.xlsx"
+
+    columns = [
+        Column(title, 20)
+        for title in [
+            "Ism",
+            "Familiya",
+            "Telefon raqami",
+            "Tug'ulgan sanasi",
+            "O'quv tili",
+            "O'quv sinfi",
+            "Fan",
+            "Ball",
+            "Filial",
+            "Marketing kanali",
+            "Lead varonkasi",
+            "Lead etapi",
+            "Buyurtma etapi",
+            "Arxivlangan",
+            "Call Operator",
+            "Sotuv menejeri",
+            "O'quvchi bo'lgan",
+            "Service manager",
+            "Yaratilgan vaqti",
+        ]
+    ]
+
+    def queryset(self):
+        filters = {}
+        for param, lookup in FILTERS.items():
+            if value := self.param(param):
+                filters[lookup] = value
+        for param, lookup in BOOLEAN_FILTERS.items():
+            if value := self.param(param):
+                filters[lookup] = value.capitalize()
+
+        queryset = Lid.objects.filter(**filters)
+
+        start_date_str = self.param("start_date")
+        end_date_str = self.param("end_date")
+        if start_date_str:
+            start_date = datetime.strptime(start_date_str, DATE_FORMAT)
+            end_date = (
+                datetime.strptime(end_date_str, DATE_FORMAT)
+                if end_date_str
+                else start_date
+            )
+            queryset = queryset.filter(
+                created_at__range=(
+                    datetime.combine(start_date, datetime.min.time()),
+                    datetime.combine(end_date, datetime.max.time()),
+                )
+            )
+
+        if lid_stage_type := self.param("lid_stage_type"):
+            queryset = queryset.filter(lid_stage_type=lid_stage_type)
+        return queryset
+
+    def count(self):
+        return self.queryset().count()
+
+    def rows(self):
+        for row in newest_first(self.queryset(), *FIELDS):
+            lid = dict(zip(FIELDS, row))
+            yield [
+                lid["first_name"],
+                lid["last_name"],
+                lid["phone_number"],
+                (
+                    lid["date_of_birth"].strftime("%d-%m-%Y")
+                    if lid["date_of_birth"]
+                    else ""
+                ),
+                EDUCATION_LANG_LABELS.get(lid["education_lang"], ""),
+                (
+                    EDU_CLASS_LABELS.get(lid["edu_class"], "Abutirent")
+                    if lid["edu_class"]
+                    else ""
+                ),
+                lid["subject__name"] or "",
+                lid["ball"],
+                lid["filial__name"] or "",
+                lid["marketing_channel__name"] or "",
+                (
+                    "Buyurtma yaratilgan"
+                    if lid["lid_stage_type"] == "ORDERED_LID"
+                    else "Yangi lead"
+                ),
+                LID_STAGE_LABELS.get(lid["lid_stages"], ""),
+                ORDERED_STAGE_LABELS.get(lid["ordered_stages"], ""),
+                "Ha" if lid["is_archived"] else "Yo'q",
+                lid["call_operator__full_name"] or "",
+                lid["sales_manager__full_name"] or "",
+                "Ha" if lid["is_student"] else "Yo'q",
+                lid["service_manager__full_name"] or "",
+                (
+                    lid["created_at"].strftime("%d-%m-%Y %H:%M:%S")
+                    if lid["created_at"]
+                    else ""
+                ),
+            ]
+
+    def sheets(self):
+        yield Sheet("Lids Data", self.columns, self.rows())
@@ -7,7 +7,8 @@ from django.contrib.auth.hashers import make_password
 
 from django.db import transaction
 
-from data.student.student.models import Student
+from data.student.student.ledger import post_entry
+from data.student.student.models import Student, StudentLedgerEntry
 
 if TYPE_CHECKING:
     from data.lid.new_lid.models import Lid
@@ -75,9 +76,6 @@ class LeadMethods:
             student.call_operator = self.call_operator
             student.service_manager = self.service_manager
             student.sales_manager = self.sales_manager
-            student.balance = (
-                self.balance if self.balance == 0 else student.balance + self.balance
-            )
 
             student.save()
 
@@ -93,6 +91,23 @@ class LeadMethods:
             #     """
             # )
 
+        if student_created:
+            # the balance came in with the defaults, only journal it
+            StudentLedgerEntry.objects.create(
+                student=student,
+                reason=StudentLedgerEntry.LEAD_TRANSFER,
+                amount=student.balance,
+                balance_after=student.balance,
+                comment=f"Lid balansidan o'tkazildi. Lid: {self.id}",
+            )
+        elif self.balance:
+            post_entry(
+                student,
+                self.balance,
+                StudentLedgerEntry.LEAD_TRANSFER,
+                comment=f"Lid balansidan o'tkazildi. Lid: {self.id}",
+            )
+
         # StudentGroup.objects.filter(lid=self).update(student=student, lid=None)
         self.groups.update(student=student)
 
@@ -108,9 +123,10 @@ class LeadMethods:
         # Relatives.objects.filter(lid=self).update(student=student)
         self.relatives.update(student=student)
 
-        self.is_archived = True
-        self.set_archived_at()
-        self.save()
+        if not self.is_archived:
+            self.is_archived = True
+            self.set_archived_at()
+            self.save()
 
         if self.sales_manager and self.sales_manager.f_sm_bonus_first_lesson_come:
 
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('new_lid', '0001_initial'),
+        ('student', '0001_initial'),
+        ('subject', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lid',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='lid_student', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='lid',
+            name='subject',
+            field=models.ForeignKey(blank=True, help_text='Subject that student won at competition', null=True, on_delete=django.db.models.deletion.SET_NULL, to='subject.subject'),
+        ),
+        migrations.AddIndex(
+            model_name='lid',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['filial', 'lid_stage_type', '-created_at'], name='lid_live_filial_stage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lid',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['sales_manager', 'lid_stage_type'], name='lid_live_sales_manager_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lid',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['call_operator', 'lid_stage_type'], name='lid_live_call_operator_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='lid',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='new_lid_lid_arch_ts_chk'),
+        ),
+    ]
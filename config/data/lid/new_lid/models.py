@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING
 
 from decimal import Decimal
 from django.db import models, transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from data.command.models import BaseModel
@@ -219,6 +220,26 @@ class Lid(BaseModel, LeadMethods):
     relatives: "models.QuerySet[Relatives]"
     first_lessons: "models.QuerySet[FirstLesson]"
 
+    class Meta(BaseModel.Meta):
+        # list and dashboard filters only ever look at live leads
+        indexes = [
+            models.Index(
+                fields=["filial", "lid_stage_type", "-created_at"],
+                condition=Q(is_archived=False),
+                name="lid_live_filial_stage_idx",
+            ),
+            models.Index(
+                fields=["sales_manager", "lid_stage_type"],
+                condition=Q(is_archived=False),
+                name="lid_live_sales_manager_idx",
+            ),
+            models.Index(
+                fields=["call_operator", "lid_stage_type"],
+                condition=Q(is_archived=False),
+                name="lid_live_call_operator_idx",
+            ),
+        ]
+
     def __str__(self):
         return (
             # f"{self.first_name} {self.subject} {self.ball} in {self.lid_stages} stage"
@@ -8,6 +8,7 @@ from django.db.models.signals import post_save, m2m_changed
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
 
+from data.command.pipeline import CREATE, UPDATE, derive, derived_fields
 from data.lid.new_lid.models import Lid
 from data.account.models import CustomUser
 from data.finances.finance.models import SaleStudent
@@ -68,58 +69,49 @@ sms = SayqalSms()
 #                     instance.save(update_fields=["call_operator"])
 
 
-@receiver(post_save, sender=Lid)
-def on_details_create(sender, instance: Lid, created, **kwargs):
-    """
-    Signal to create or update a Student when a Lid is created or updated,
-    provided `is_student=True` and `phone_number` is available.
-    """
-    if not created:
-        # if instance.lid_stage_type == "NEW_LID":
+@derive(Lid, "lid_stages", on=CREATE)
+def new_lead_stage(instance: Lid):
+    if instance.lid_stage_type is not None and instance.lid_stages is None:
+        instance.lid_stages = "YANGI_LEAD"
 
-        #     if instance.lid_stages == "YANGI_LEAD":
-        #         instance.lid_stages = "KUTULMOQDA"
 
-        if instance.lid_stage_type == "ORDERED_LID":
-            if instance.ordered_date == None:
-                instance.ordered_date = datetime.now()
+@derive(Lid, "ordered_date", "ordered_stages", "is_expired", on=UPDATE)
+def ordered_lead_stage(instance: Lid):
+    if instance.lid_stage_type == "ORDERED_LID":
+        if instance.ordered_date is None:
+            instance.ordered_date = datetime.now()
 
-            if instance.ordered_stages == "YANGI_BUYURTMA":
-                instance.ordered_stages = "KUTULMOQDA"
+        if instance.ordered_stages == "YANGI_BUYURTMA":
+            instance.ordered_stages = "KUTULMOQDA"
 
-        if instance.is_expired:
-            instance.is_expired = False
-            instance.save()
+    # any update brings an expired lead back
+    instance.is_expired = False
 
-        if not instance.is_archived and instance.is_student and instance.filial:
-            instance.migrate_to_student()
 
-            # Archive the Lid
-            # post_save.disconnect(on_details_create, sender=Lid)
-            # post_save.connect(on_details_create, sender=Lid)
+@derive(Lid, "is_archived", "archived_at", on=UPDATE)
+def archive_on_student(instance: Lid):
+    """A lead that became a student is archived; on_details_create moves it."""
+    if not instance.is_archived and instance.is_student and instance.filial_id:
+        instance.is_archived = True
+        instance.set_archived_at()
 
-        else:
-            if instance.filial is None:
-                print(
-                    "This lead's education branch is not updated, please add education branch."
-                )
 
-            post_save.disconnect(on_details_create, sender=Lid)
-            instance.save()
-            post_save.connect(on_details_create, sender=Lid)
+@receiver(post_save, sender=Lid)
+def on_details_create(sender, instance: Lid, created, **kwargs):
+    """
+    Create or update the Student of a lead that was just archived for
+    becoming a student (see archive_on_student).
+    """
+    if not created and "is_archived" in derived_fields(instance):
+        instance.migrate_to_student()
 
 
 @receiver(post_save, sender=Lid)
-def on_expired_delete(sender, instance: Lid, created, **kwargs):
-    if not created:
-        if instance.is_expired:
-            instance.is_expired = False
-            instance.save()
+def on_funnel_change(sender, instance: Lid, created, **kwargs):
+    """Rebuild this lead's day in the dashboard funnel rollup after commit."""
+    from data.dashboard.funnel import mark_dirty
 
-    if created:
-        if instance.lid_stage_type != None and instance.lid_stages == None:
-            instance.lid_stages = "YANGI_LEAD"
-            instance.save()
+    mark_dirty(instance)
 
 
 # Logs Lid catching
@@ -187,30 +179,28 @@ def _human(model_instance, field: dj_models.Field, value):
     return str(value)
 
 
-def _collect_changes(old_obj: Lid, new_obj: Lid):
+def _collect_changes(instance: Lid):
     """
     Return dict: {field_name: (old_value, new_value)} for all changed fields.
     FK compare by *_id.
     """
     changes = {}
-    for field in new_obj._meta.get_fields():
+    for name, (old_val, new_val) in instance.changes().items():
+        field = instance._meta.get_field(name)
         if not _is_trackable_field(field):
             continue
 
-        # For FKs, compare *_id to avoid fetching relations
         if isinstance(field, dj_models.ForeignKey):
-            old_id = getattr(old_obj, f"{field.name}_id", None)
-            new_id = getattr(new_obj, f"{field.name}_id", None)
-            if old_id != new_id:
-                # Render human-friendly using actual related values
-                old_val = getattr(old_obj, field.name, None)
-                new_val = getattr(new_obj, field.name, None)
-                changes[field.name] = (old_val, new_val)
+            # Render human-friendly using actual related values
+            old_val = (
+                field.related_model._base_manager.filter(pk=old_val).first()
+                if old_val is not None
+                else None
+            )
+            new_val = getattr(instance, field.name, None)
         else:
-            old_val = getattr(old_obj, field.name, None)
-            new_val = getattr(new_obj, field.name, None)
-            if old_val != new_val:
-                changes[field.name] = (old_val, new_val)
+            new_val = getattr(instance, field.name, None)
+        changes[name] = (old_val, new_val)
     return changes
 
 
@@ -233,19 +223,14 @@ def _format_changes_for_comment(inst: Lid, changes: dict) -> str:
 @receiver(pre_save, sender=Lid)
 def lid_cache_changes(sender, instance: Lid, **kwargs):
     """
-    Before saving: compute diffs vs DB row and stash on instance.
+    Before saving: compute diffs vs the loaded row and stash on instance.
     """
     instance._changes = {}
-    if not instance.pk:
+    if instance._state.adding:
         # new row; no diffs yet
         return
 
-    try:
-        old = sender.objects.get(pk=instance.pk)
-    except sender.DoesNotExist:
-        return
-
-    instance._changes = _collect_changes(old, instance)
+    instance._changes = _collect_changes(instance)
 
 
 @receiver(post_save, sender=Lid)
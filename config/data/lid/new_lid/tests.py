@@ -1,4 +1,12 @@
+from datetime import date
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from data.department.filial.models import Filial
+from data.lid.new_lid.models import Lid
+from data.student.student.models import Student
 
 # Create your tests here.
 from rest_framework.pagination import PageNumberPagination
@@ -24,3 +32,68 @@ class CustomPagination(PageNumberPagination):
                 },
             }
         )
+
+
+def _writes(queries, model) -> list[str]:
+    """INSERT/UPDATE statements against ``model``'s table."""
+    table = f'"{model._meta.db_table}"'
+    return [
+        query["sql"]
+        for query in queries.captured_queries
+        if query["sql"].startswith((f"UPDATE {table}", f"INSERT INTO {table}"))
+    ]
+
+
+class LeadSavePipelineTest(TestCase):
+    def test_create_writes_the_derived_stage_in_the_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            lead = Lid.objects.create(first_name="Ali", lid_stage_type="NEW_LID")
+
+        self.assertEqual(len(_writes(queries, Lid)), 1)
+        lead.refresh_from_db()
+        self.assertEqual(lead.lid_stages, "YANGI_LEAD")
+
+    def test_update_is_a_single_write(self):
+        lead = Lid.objects.create(
+            first_name="Ali", lid_stage_type="NEW_LID", is_expired=True
+        )
+        lead.lid_stage_type = "ORDERED_LID"
+        lead.ordered_stages = "YANGI_BUYURTMA"
+
+        with CaptureQueriesContext(connection) as queries:
+            lead.save()
+
+        self.assertEqual(len(_writes(queries, Lid)), 1)
+        lead.refresh_from_db()
+        self.assertEqual(lead.ordered_stages, "KUTULMOQDA")
+        self.assertIsNotNone(lead.ordered_date)
+        self.assertFalse(lead.is_expired)
+
+    def test_update_fields_carry_the_derived_fields(self):
+        lead = Lid.objects.create(first_name="Ali", lid_stage_type="ORDERED_LID")
+        lead.first_name = "Vali"
+        lead.save(update_fields=["first_name"])
+
+        lead.refresh_from_db()
+        self.assertEqual(lead.first_name, "Vali")
+        self.assertIsNotNone(lead.ordered_date)
+
+    def test_lead_becoming_a_student_is_archived_once(self):
+        # bulk_create: the Filial post_save registers the branch in HrPulse
+        [filial] = Filial.objects.bulk_create([Filial(name="Main")])
+        lead = Lid.objects.create(
+            first_name="Ali",
+            phone_number="+998901112233",
+            date_of_birth=date(2008, 5, 1),
+            filial=filial,
+        )
+        lead.is_student = True
+
+        with CaptureQueriesContext(connection) as queries:
+            lead.save()
+
+        self.assertEqual(len(_writes(queries, Lid)), 1)
+        lead.refresh_from_db()
+        self.assertTrue(lead.is_archived)
+        self.assertIsNotNone(lead.archived_at)
+        self.assertTrue(Student.objects.filter(phone="+998901112233").exists())
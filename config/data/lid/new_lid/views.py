@@ -5,7 +5,7 @@ from django.utils import timezone
 from django.core.exceptions import FieldError
 from django.db.models import Q, Sum, Value, F
 from django.db.models.functions import Coalesce
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest
 from django.utils.dateparse import parse_datetime
 from django.db.models import Case, When, IntegerField, FloatField
 
@@ -30,13 +30,10 @@ from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment
-
-
 from data.archive.models import Archive
 from data.lid.archived.models import Archived
 from data.student.lesson.models import FirstLLesson
+from data.upload.exports import respond
 
 from .models import Lid
 from .serializers import LeadArchiveSerializer, LeadSerializer
@@ -343,171 +340,17 @@ class ExportLeadToExcelAPIView(APIView):
                 description="Filter by lid stage type",
                 type=openapi.TYPE_STRING,
             ),
+            openapi.Parameter(
+                "background",
+                openapi.IN_QUERY,
+                description="Export in a Celery task; poll upload/exports/<id>/",
+                type=openapi.TYPE_BOOLEAN,
+            ),
         ],
         responses={200: "Excel file generated"},
     )
     def get(self, request):
-        # Get filters from query parameters
-        start_date_str = request.GET.get("start_date")
-        end_date_str = request.GET.get("end_date")
-
-        lid_stage_type = request.GET.get("lid_stage_type")
-        filial = self.request.GET.get("filial")
-        is_archived = self.request.GET.get("is_archived")
-        course_id = self.request.GET.get("course")
-        call_operator_id = self.request.GET.get("call_operator")
-        service_manager = self.request.GET.get("service_manager")
-        sales_manager = self.request.GET.get("sales_manager")
-        teacher = self.request.GET.get("teacher")
-        channel = self.request.GET.get("marketing_channel")
-        subject = self.request.GET.get("subject")
-        is_student = self.request.GET.get("is_student")
-
-        filter = {}
-        if filial:
-            filter["filial__id"] = filial
-        if is_archived:
-            filter["is_archived"] = is_archived.capitalize()
-        if course_id:
-            filter["groups__course__id"] = course_id
-        if call_operator_id:
-            filter["call_operator__id"] = call_operator_id
-        if service_manager:
-            filter["service_manager__id"] = service_manager
-        if sales_manager:
-            filter["sales_manager__id"] = sales_manager
-        if teacher:
-            filter["groups__teacher__id"] = teacher
-        if channel:
-            filter["marketing_channel__id"] = channel
-        if subject:
-            filter["subject__id"] = subject
-        if is_student:
-            filter["is_student"] = is_student.capitalize()
-
-        queryset = Lid.objects.filter(**filter)
-
-        date_format = "%Y-%m-%d"
-
-        if start_date_str and end_date_str:
-            start_date = datetime.strptime(start_date_str, date_format)
-            end_date = datetime.strptime(end_date_str, date_format)
-            start_datetime = datetime.combine(start_date, datetime.min.time())
-            end_datetime = datetime.combine(end_date, datetime.max.time())
-            queryset = queryset.filter(created_at__range=(start_datetime, end_datetime))
-
-        elif start_date_str:
-            start_date = datetime.strptime(start_date_str, date_format)
-            start_datetime = datetime.combine(start_date, datetime.min.time())
-            end_datetime = datetime.combine(start_date, datetime.max.time())
-            queryset = queryset.filter(created_at__range=(start_datetime, end_datetime))
-
-        if lid_stage_type:
-            queryset = queryset.filter(lid_stage_type=lid_stage_type)
-
-        # Create Excel workbook
-        workbook = Workbook()
-        sheet = workbook.active
-        sheet.title = "Lids Data"
-
-        # Define headers
-        headers = [
-            "Ism",
-            "Familiya",
-            "Telefon raqami",
-            "Tug'ulgan sanasi",
-            "O'quv tili",
-            "O'quv sinfi",
-            "Fan",
-            "Ball",
-            "Filial",
-            "Marketing kanali",
-            "Lead varonkasi",
-            "Lead etapi",
-            "Buyurtma etapi",
-            "Arxivlangan",
-            "Call Operator",
-            "Sotuv menejeri",
-            "O'quvchi bo'lgan",
-            "Service manager",
-            "Yaratilgan vaqti",
-        ]
-        sheet.append(headers)
-
-        ORDERED_STAGE_LABELS = {
-            "KUTULMOQDA": "Jarayonda",
-            "BIRINCHI_DARSGA_KELMAGAN": "Sinov darsiga kelmagan",
-            "BIRINCHI_DARS_BELGILANGAN": "Sinov darsi belgilangan",
-            "YANGI_BUYURTMA": "Yangi buyurtma",
-        }
-        Lid_STAGE_LABELS = {
-            "YANGI_LEAD": "Yangi lead",
-            "KUTULMOQDA": "Jarayonda",
-        }
-        for lid in queryset:
-            sheet.append(
-                [
-                    lid.first_name,
-                    lid.last_name,
-                    lid.phone_number,
-                    lid.date_of_birth.strftime("%d-%m-%Y") if lid.date_of_birth else "",
-                    (
-                        "Uzbek tili"
-                        if lid.education_lang == "UZB"
-                        else (
-                            "Ingliz tili"
-                            if lid.education_lang == "ENG"
-                            else "Rus tili" if lid.education_lang == "RU" else ""
-                        )
-                    ),
-                    (
-                        "Maktab"
-                        if lid.edu_class == "SCHOOL"
-                        else (
-                            "Universitet"
-                            if lid.edu_class == "UNIVERSITY"
-                            else "Abutirent" if lid.edu_class else ""
-                        )
-                    ),
-                    lid.subject.name if lid.subject else "",
-                    lid.ball,
-                    lid.filial.name if lid.filial else "",
-                    lid.marketing_channel.name if lid.marketing_channel else "",
-                    (
-                        "Buyurtma yaratilgan"
-                        if lid.lid_stage_type == "ORDERED_LID"
-                        else "Yangi lead"
-                    ),
-                    Lid_STAGE_LABELS.get(lid.lid_stages, ""),
-                    ORDERED_STAGE_LABELS.get(lid.ordered_stages, ""),
-                    "Ha" if lid.is_archived else "Yo'q",
-                    lid.call_operator.full_name if lid.call_operator else "",
-                    lid.sales_manager.full_name if lid.sales_manager else "",
-                    "Ha" if lid.is_student else "Yo'q",
-                    lid.service_manager.full_name if lid.service_manager else "",
-                    (
-                        lid.created_at.strftime("%d-%m-%Y %H:%M:%S")
-                        if lid.created_at
-                        else ""
-                    ),
-                ]
-            )
-
-        # Style headers
-        for col_num, header in enumerate(headers, 1):
-            cell = sheet.cell(row=1, column=col_num)
-            cell.font = Font(bold=True, size=12)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            sheet.column_dimensions[cell.column_letter].width = 20
-
-        # Create the HTTP response with the Excel file
-        response = HttpResponse(
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        response["Content-Disposition"] = 'attachment; filename="Lids_Data.xlsx"'
-        workbook.save(response)
-
-        return response
+        return respond(request, "leads")
 
 
 class LeadStatisticsView(ListAPIView):
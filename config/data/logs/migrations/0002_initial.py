@@ -0,0 +1,50 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('logs', '0001_initial'),
+        ('new_lid', '0002_initial'),
+        ('results', '0001_initial'),
+        ('student', '0001_initial'),
+        ('studentgroup', '0001_initial'),
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='log',
+            name='lead',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='log_lids', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='log',
+            name='result',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='log_results', to='results.results'),
+        ),
+        migrations.AddField(
+            model_name='log',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='log_students', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='log',
+            name='student_group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='logs', to='studentgroup.studentgroup'),
+        ),
+        migrations.AddField(
+            model_name='log',
+            name='task',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='log_tasks', to='tasks.task'),
+        ),
+        migrations.AddConstraint(
+            model_name='log',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='logs_log_arch_ts_chk'),
+        ),
+    ]
@@ -1,4 +1,6 @@
+from django.contrib import admin
 from django.db import models
+from django.db.models import Q
 
 from data.account.models import CustomUser
 from data.command.models import BaseModel
@@ -38,6 +40,17 @@ class Notification(BaseModel):
 
     has_read = models.BooleanField(default=False)
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="notif_user_created_idx"),
+            # unread badge counts
+            models.Index(
+                fields=["user"],
+                condition=Q(is_read=False),
+                name="notif_unread_user_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user} | {self.comment} | {self.come_from} {self.is_read}"
 
@@ -63,3 +76,86 @@ class UserRFToken(BaseModel):
     )
 
     token = models.TextField(null=True, blank=True)
+
+
+class PushOutbox(models.Model):
+    """
+    Push notifications waiting for delivery.
+
+    A row is written in the same transaction as its Notification and picked
+    up by ``data.notifications.tasks.deliver_push_outbox`` after commit, so
+    requests never wait on Firebase and a rolled back request sends nothing.
+    """
+
+    PENDING = "PENDING"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+    NO_TOKEN = "NO_TOKEN"
+
+    id = models.BigAutoField(primary_key=True)
+
+    notification: "Notification | None" = models.ForeignKey(
+        "notifications.Notification",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="push_outbox",
+    )
+
+    user: "CustomUser" = models.ForeignKey(
+        "account.CustomUser",
+        on_delete=models.CASCADE,
+        related_name="push_outbox",
+    )
+
+    title = models.CharField(max_length=255, default="Fitrat")
+    body = models.TextField(null=True, blank=True)
+    data = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(
+        max_length=10,
+        choices=[
+            (PENDING, "Pending"),
+            (SENDING, "Sending"),
+            (SENT, "Sent"),
+            (FAILED, "Failed"),
+            (NO_TOKEN, "No token"),
+        ],
+        default=PENDING,
+    )
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # start of the SENDING lease of the run that claimed the row
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("id",)
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=Q(status="PENDING"),
+                name="push_outbox_pending_idx",
+            ),
+            models.Index(
+                fields=["claimed_at"],
+                condition=Q(status="SENDING"),
+                name="push_outbox_sending_idx",
+            ),
+            models.Index(
+                fields=["status", "created_at"], name="push_outbox_status_idx"
+            ),
+        ]
+
+    class Admin(admin.ModelAdmin):
+
+        list_display = ["user", "status", "attempts", "created_at", "sent_at"]
+
+        list_filter = ["status"]
+
+    def __str__(self):
+        return f"{self.user_id} {self.status}"
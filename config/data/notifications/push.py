@@ -0,0 +1,274 @@
+"""
+Batched delivery of the push outbox.
+
+``enqueue`` writes a PushOutbox row for a Notification and asks for a
+delivery run once the surrounding transaction commits; everything created
+in one request triggers a single run. ``deliver_pending`` claims pending rows
+(``SKIP LOCKED``, so several workers can run side by side) by marking them
+SENDING under a lease, coalesces them into one push per user, sends one
+message per device token with ``send_each`` in chunks of 500 outside any
+transaction, then records the outcome and deletes tokens Firebase reports
+as dead.
+
+The Firebase client is ``settings.FCM_CLIENT`` when set (tests use a fake),
+``firebase_admin.messaging`` otherwise.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from firebase_admin import messaging
+
+from data.command.transactions import collect_on_commit
+from data.notifications.models import Notification, PushOutbox, UserRFToken
+from data.notifications.send_notifications import initialize_firebase
+
+logger = logging.getLogger(__name__)
+
+FCM_BATCH_SIZE = 500  # send_each limit
+OUTBOX_BATCH_SIZE = 2000
+MAX_ATTEMPTS = 5
+# how long a claimed row may stay SENDING before another run takes it over
+SEND_LEASE = timedelta(minutes=10)
+
+DEAD_TOKEN_ERRORS = (messaging.UnregisteredError, messaging.SenderIdMismatchError)
+
+
+def get_client():
+    path = getattr(settings, "FCM_CLIENT", None)
+    if path:
+        return import_string(path)()
+    initialize_firebase()
+    return messaging
+
+
+def notification_data(instance: Notification) -> dict:
+    """The data payload the app expects: every set column as a string."""
+    data = {}
+    for field in instance._meta.concrete_fields:
+        value = getattr(instance, field.attname)
+        if value is not None:
+            data[field.attname] = str(value)
+    data["click_action"] = "FLUTTER_NOTIFICATION_CLICK"
+    return data
+
+
+def _schedule_delivery(items):
+    from data.notifications.tasks import deliver_push_outbox
+
+    deliver_push_outbox.delay()
+
+
+def enqueue(notifications):
+    """Queue pushes for saved notifications; delivery starts after commit."""
+    rows = [
+        PushOutbox(
+            notification=notification,
+            user_id=notification.user_id,
+            body=notification.comment,
+            data=notification_data(notification),
+        )
+        for notification in notifications
+        if notification.user_id
+    ]
+    if not rows:
+        return
+    PushOutbox.objects.bulk_create(rows)
+    collect_on_commit("notifications.push", len(rows), _schedule_delivery)
+
+
+def _coalesce(rows: list[PushOutbox]) -> tuple[str, str, dict]:
+    """One (title, body, data) for all pending rows of a user, newest last."""
+    latest = rows[-1]
+    if len(rows) == 1:
+        return latest.title, latest.body or "", latest.data
+
+    data = dict(latest.data)
+    data["count"] = str(len(rows))
+    body = f"{len(rows)} ta yangi bildirishnoma. {latest.body or ''}".strip()
+    return latest.title, body, data
+
+
+def _message(token: str, title: str, body: str, data: dict):
+    return messaging.Message(
+        notification=messaging.Notification(title=title, body=body),
+        token=token,
+        data=data,
+        apns=messaging.APNSConfig(
+            payload=messaging.APNSPayload(aps=messaging.Aps(badge=0))
+        ),
+    )
+
+
+def _send(client, messages) -> list:
+    """Responses in message order, sending in chunks of FCM_BATCH_SIZE."""
+    responses = []
+    for i in range(0, len(messages), FCM_BATCH_SIZE):
+        batch = client.send_each(messages[i : i + FCM_BATCH_SIZE])
+        responses.extend(batch.responses)
+    return responses
+
+
+def _claim(limit: int) -> tuple[list[PushOutbox], object]:
+    """
+    Mark up to ``limit`` due rows SENDING under a fresh lease and return
+    them with the lease stamp. Rows whose lease ran out (the worker died
+    mid-send) are due again, or FAILED once they used up their attempts.
+    """
+    now = timezone.now()
+    expired = Q(status=PushOutbox.SENDING, claimed_at__lt=now - SEND_LEASE)
+
+    with transaction.atomic():
+        PushOutbox.objects.filter(expired, attempts__gte=MAX_ATTEMPTS).update(
+            status=PushOutbox.FAILED, error="Delivery lease expired."
+        )
+        rows = list(
+            PushOutbox.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=PushOutbox.PENDING) | expired)
+            .order_by("id")[:limit]
+        )
+        # the attempt counts when it starts, so a send that never records
+        # its outcome still uses one up
+        PushOutbox.objects.filter(id__in=[row.id for row in rows]).update(
+            status=PushOutbox.SENDING, claimed_at=now, attempts=F("attempts") + 1
+        )
+    for row in rows:
+        row.status = PushOutbox.SENDING
+        row.claimed_at = now
+        row.attempts += 1
+    return rows, now
+
+
+def deliver_pending(client=None, limit: int = OUTBOX_BATCH_SIZE) -> dict:
+    """
+    Deliver up to ``limit`` pending rows. Returns the run's counters.
+
+    Rows are claimed and their outcome recorded in two short transactions;
+    Firebase is called in between, with no transaction or row lock open.
+    """
+    client = client or get_client()
+    stats = defaultdict(int)
+
+    rows, claimed_at = _claim(limit)
+    if not rows:
+        return dict(stats)
+    stats["rows"] = len(rows)
+
+    by_user = defaultdict(list)
+    for row in rows:
+        by_user[row.user_id].append(row)
+
+    tokens = defaultdict(list)
+    rows_with_token = (
+        UserRFToken.objects.filter(user_id__in=by_user)
+        .exclude(Q(token=None) | Q(token=""))
+        .values_list("id", "user_id", "token")
+    )
+    for token_id, user_id, token in rows_with_token:
+        tokens[user_id].append((token_id, token))
+
+    messages, targets = [], []
+    for user_id, user_rows in by_user.items():
+        title, body, data = _coalesce(user_rows)
+        for token_id, token in tokens.get(user_id, []):
+            messages.append(_message(token, title, body, data))
+            targets.append((user_id, token_id))
+    stats["pushes"] = len(by_user)
+    stats["messages"] = len(messages)
+
+    responses = _send(client, messages) if messages else []
+
+    delivered, errors, dead_tokens = set(), {}, []
+    for (user_id, token_id), response in zip(targets, responses):
+        if response.success:
+            delivered.add(user_id)
+        elif isinstance(response.exception, DEAD_TOKEN_ERRORS):
+            dead_tokens.append(token_id)
+        else:
+            errors[user_id] = str(response.exception)
+
+    sent, retry, failed, no_token = [], set(), set(), []
+    for user_id, user_rows in by_user.items():
+        ids = [row.id for row in user_rows]
+        if user_id in delivered:
+            sent += ids
+        elif user_id in errors:
+            for row in user_rows:
+                gave_up = row.attempts >= MAX_ATTEMPTS
+                (failed if gave_up else retry).add(row.id)
+        else:
+            # no token, or every token turned out dead
+            no_token += ids
+
+    with transaction.atomic():
+        if dead_tokens:
+            UserRFToken.objects.filter(id__in=dead_tokens).delete()
+
+        # only rows still under our lease; another worker owns the rest
+        ours = PushOutbox.objects.filter(
+            status=PushOutbox.SENDING, claimed_at=claimed_at
+        )
+        ours.filter(id__in=sent).update(
+            status=PushOutbox.SENT, sent_at=timezone.now()
+        )
+        ours.filter(id__in=no_token).update(status=PushOutbox.NO_TOKEN)
+
+        for status, ids in ((PushOutbox.PENDING, retry), (PushOutbox.FAILED, failed)):
+            by_error = defaultdict(list)
+            for row in rows:
+                if row.id in ids:
+                    by_error[errors[row.user_id]].append(row.id)
+            for error, error_ids in by_error.items():
+                ours.filter(id__in=error_ids).update(status=status, error=error)
+
+    stats.update(
+        pruned_tokens=len(dead_tokens),
+        sent=len(sent),
+        retried=len(retry),
+        failed=len(failed),
+        no_token=len(no_token),
+    )
+
+    logger.info("Push outbox run: %s", dict(stats))
+    return dict(stats)
+
+
+def delivery_metrics(hours: int = 24) -> dict:
+    """Outbox counters and delivery latency over the last ``hours``."""
+    since = timezone.now() - timedelta(hours=hours)
+    recent = PushOutbox.objects.filter(created_at__gte=since)
+
+    by_status = dict(
+        recent.values("status").annotate(n=Count("id")).values_list("status", "n")
+    )
+    latency = recent.filter(status=PushOutbox.SENT).aggregate(
+        avg=Avg(F("sent_at") - F("created_at")),
+        max=Max(F("sent_at") - F("created_at")),
+    )
+    oldest_pending = (
+        PushOutbox.objects.filter(status=PushOutbox.PENDING)
+        .order_by("id")
+        .values_list("created_at", flat=True)
+        .first()
+    )
+
+    def seconds(delta):
+        return delta.total_seconds() if delta is not None else None
+
+    statuses = PushOutbox._meta.get_field("status").choices
+    return {
+        "hours": hours,
+        "by_status": {status: by_status.get(status, 0) for status, _ in statuses},
+        "avg_latency_seconds": seconds(latency["avg"]),
+        "max_latency_seconds": seconds(latency["max"]),
+        "oldest_pending_seconds": seconds(
+            timezone.now() - oldest_pending if oldest_pending else None
+        ),
+    }
+
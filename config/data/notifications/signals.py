@@ -1,8 +1,8 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from .models import Notification, UserRFToken
-from .send_notifications import send_push_notification
+from .models import Notification
+from .push import enqueue
 
 #
 # @receiver(post_save, sender=Notification)
@@ -15,25 +15,8 @@ from .send_notifications import send_push_notification
 
 @receiver(post_save, sender=Notification)
 def send_notification_on_create(sender, instance: Notification, created, **kwargs):
+    """Queue the push; it is delivered by a worker once the request commits."""
     if not created:
         return
 
-    user = instance.user
-    fcm_token = UserRFToken.objects.filter(user=user).first()
-    if not fcm_token:
-        print("❌ No FCM token found for user.")
-        return
-
-    model_dict = Notification.objects.filter(id=instance.id).values().first()
-    stringified_data = {k: str(v) for k, v in model_dict.items() if v is not None}
-    stringified_data["click_action"] = "FLUTTER_NOTIFICATION_CLICK"
-
-    try:
-        send_push_notification(
-            title="Fitrat",
-            body=instance.comment,
-            token=fcm_token.token,
-            data=stringified_data,
-        )
-    except Exception as e:
-        print("❌ Error sending push notification:", e)
+    enqueue([instance])
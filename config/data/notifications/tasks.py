@@ -0,0 +1,18 @@
+from collections import Counter
+
+from celery import shared_task
+
+from data.notifications.push import OUTBOX_BATCH_SIZE, deliver_pending, get_client
+
+
+@shared_task
+def deliver_push_outbox(max_batches: int = 50):
+    """Drain the push outbox, one coalesced batch at a time."""
+    client = get_client()
+    totals = Counter()
+    for _ in range(max_batches):
+        stats = deliver_pending(client)
+        totals.update(stats)
+        if stats.get("rows", 0) < OUTBOX_BATCH_SIZE:
+            break
+    return dict(totals)
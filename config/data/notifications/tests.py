@@ -1,3 +1,169 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from firebase_admin import messaging
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from data.account.models import CustomUser
+from data.notifications.models import Notification, PushOutbox, UserRFToken
+from data.notifications.push import (
+    FCM_BATCH_SIZE,
+    MAX_ATTEMPTS,
+    SEND_LEASE,
+    delivery_metrics,
+    deliver_pending,
+)
+
+
+class FakeMessaging:
+    """
+    Stand-in for ``firebase_admin.messaging`` (``FCM_CLIENT`` setting).
+    Records what was sent; tokens in ``dead_tokens`` fail as unregistered.
+    """
+
+    sent: list = []
+    dead_tokens: set = set()
+
+    class _Response:
+        def __init__(self, exception=None):
+            self.exception = exception
+            self.success = exception is None
+            self.message_id = None if exception else "fake"
+
+    class _BatchResponse:
+        def __init__(self, responses):
+            self.responses = responses
+            self.success_count = sum(r.success for r in responses)
+            self.failure_count = len(responses) - self.success_count
+
+    @classmethod
+    def reset(cls):
+        cls.sent = []
+        cls.dead_tokens = set()
+
+    def send_each(self, messages):
+        if len(messages) > FCM_BATCH_SIZE:
+            raise ValueError("send_each takes at most 500 messages")
+        responses = []
+        for message in messages:
+            if message.token in self.dead_tokens:
+                error = messaging.UnregisteredError("token not registered")
+                responses.append(self._Response(error))
+            else:
+                self.sent.append(message)
+                responses.append(self._Response())
+        return self._BatchResponse(responses)
+
+
+class BrokenMessaging:
+    def send_each(self, messages):
+        raise ConnectionError("network down")
+
+
+@override_settings(FCM_CLIENT="data.notifications.tests.FakeMessaging")
+class PushOutboxTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(phone="+998900000011", role="TEACHER")
+        cls.other = CustomUser.objects.create(phone="+998900000012", role="TEACHER")
+        UserRFToken.objects.create(user=cls.user, token="phone")
+        UserRFToken.objects.create(user=cls.user, token="tablet")
+
+    def setUp(self):
+        FakeMessaging.reset()
+
+    def test_delivery_is_scheduled_once_per_transaction(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            for i in range(3):
+                Notification.objects.create(user=self.user, comment=f"n{i}")
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(PushOutbox.objects.filter(status="PENDING").count(), 3)
+        self.assertEqual(FakeMessaging.sent, [])
+
+    def test_pending_rows_are_coalesced_per_user(self):
+        with self.captureOnCommitCallbacks():
+            for i in range(3):
+                Notification.objects.create(user=self.user, comment=f"n{i}")
+            Notification.objects.create(user=self.other, comment="no device")
+
+        stats = deliver_pending(FakeMessaging())
+
+        # one push per user, one message per device
+        self.assertEqual(stats["pushes"], 2)
+        self.assertEqual(len(FakeMessaging.sent), 2)
+        message = FakeMessaging.sent[0]
+        self.assertEqual(message.data["count"], "3")
+        self.assertIn("n2", message.notification.body)
+
+        self.assertEqual(PushOutbox.objects.filter(status="SENT").count(), 3)
+        self.assertEqual(PushOutbox.objects.filter(status="NO_TOKEN").count(), 1)
+        self.assertEqual(deliver_pending(FakeMessaging()), {})
+
+    def test_dead_tokens_are_pruned(self):
+        FakeMessaging.dead_tokens = {"tablet"}
+        with self.captureOnCommitCallbacks():
+            Notification.objects.create(user=self.user, comment="hello")
+
+        stats = deliver_pending(FakeMessaging())
+
+        self.assertEqual(stats["pruned_tokens"], 1)
+        tokens = UserRFToken.objects.filter(user=self.user)
+        self.assertEqual(list(tokens.values_list("token", flat=True)), ["phone"])
+        self.assertEqual(PushOutbox.objects.get().status, "SENT")
+
+    def test_sends_in_chunks_of_the_fcm_limit(self):
+        users = CustomUser.objects.bulk_create(
+            CustomUser(phone=f"+99891{i:07d}", role="TEACHER")
+            for i in range(FCM_BATCH_SIZE + 1)
+        )
+        UserRFToken.objects.bulk_create(
+            UserRFToken(user=user, token=f"t{user.pk}") for user in users
+        )
+        PushOutbox.objects.bulk_create(
+            PushOutbox(user=user, body="hi") for user in users
+        )
+
+        stats = deliver_pending(FakeMessaging())
+
+        self.assertEqual(stats["messages"], FCM_BATCH_SIZE + 1)
+        self.assertEqual(len(FakeMessaging.sent), FCM_BATCH_SIZE + 1)
+        self.assertEqual(delivery_metrics()["by_status"]["SENT"], FCM_BATCH_SIZE + 1)
+
+    def test_a_crashed_send_keeps_its_attempt_until_the_lease_ends(self):
+        with self.captureOnCommitCallbacks():
+            Notification.objects.create(user=self.user, comment="hello")
+
+        with self.assertRaises(ConnectionError):
+            deliver_pending(BrokenMessaging())
+        row = PushOutbox.objects.get()
+        self.assertEqual((row.status, row.attempts), ("SENDING", 1))
+
+        # still leased: nothing to do
+        self.assertEqual(deliver_pending(FakeMessaging()), {})
+
+        PushOutbox.objects.update(claimed_at=timezone.now() - SEND_LEASE * 2)
+        self.assertEqual(deliver_pending(FakeMessaging())["sent"], 1)
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), ("SENT", 2))
+
+    def test_an_expired_lease_on_the_last_attempt_fails_the_row(self):
+        PushOutbox.objects.create(
+            user=self.user,
+            status="SENDING",
+            attempts=MAX_ATTEMPTS,
+            claimed_at=timezone.now() - SEND_LEASE * 2,
+        )
+
+        self.assertEqual(deliver_pending(FakeMessaging()), {})
+        self.assertEqual(PushOutbox.objects.get().status, "FAILED")
+        self.assertEqual(FakeMessaging.sent, [])
+
+    def test_metrics_are_for_directors_only(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get("/notifications/push-metrics/").status_code, 403)
+
+        client.force_authenticate(
+            CustomUser.objects.create(phone="+998900000013", role="DIRECTOR")
+        )
+        self.assertEqual(client.get("/notifications/push-metrics/").status_code, 200)
@@ -5,6 +5,7 @@ from .views import (
     NotificationListNoPG,
     NotificationRetrieveUpdateDestroyAPIView,
     MarkAllNotificationsReadAPIView,
+    PushDeliveryMetricsAPIView,
     UserRFTokenListCreateAPIView,
     UserRFTokenRetrieveUpdateDestroyAPIView,
 )
@@ -16,4 +17,5 @@ urlpatterns = [
     path("mark-all-read/", MarkAllNotificationsReadAPIView.as_view()),
     path("rftoken/", UserRFTokenListCreateAPIView.as_view()),
     path("rftoken/<uuid:pk>", UserRFTokenRetrieveUpdateDestroyAPIView.as_view()),
+    path("push-metrics/", PushDeliveryMetricsAPIView.as_view()),
 ]
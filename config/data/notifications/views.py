@@ -9,8 +9,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .models import Notification, UserRFToken
+from .push import delivery_metrics
 from .serializers import NotificationSerializer, UserRFTokenSerializer
 from data.account.models import CustomUser
+from data.account.permission import IsDirector
 
 
 class NotificationListAPIView(ListCreateAPIView):
@@ -81,3 +83,17 @@ class UserRFTokenRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
     serializer_class = UserRFTokenSerializer
     queryset = UserRFToken.objects.all()
     permission_classes = [IsAuthenticated]
+
+
+class PushDeliveryMetricsAPIView(APIView):
+    permission_classes = [IsDirector]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            hours = int(request.GET.get("hours", 24))
+        except ValueError:
+            return Response(
+                {"detail": "hours must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(delivery_metrics(hours))
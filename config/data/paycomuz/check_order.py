@@ -8,7 +8,8 @@ from rest_framework import serializers
 from data.lid.new_lid.models import Lid
 from data.paycomuz import PayComResponse
 from data.paycomuz.models import Transaction
-from data.student.student.models import Student
+from data.student.student.ledger import post_entry
+from data.student.student.models import Student, StudentLedgerEntry
 
 
 class CheckOrder(PayComResponse):
@@ -148,7 +149,14 @@ class CheckOrder(PayComResponse):
                 Student.objects.filter(id=order_key).first()
                 or Lid.objects.filter(id=order_key).first()
             )
-            if user:
+            if isinstance(user, Student):
+                post_entry(
+                    user,
+                    amount,
+                    StudentLedgerEntry.PAYMENT,
+                    comment=f"Payme to'lovi. Tranzaksiya: {transaction._id}",
+                )
+            elif user:
                 user.balance += amount
                 user.save()
 
@@ -2,7 +2,8 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 from data.finances.finance.choices import FinanceKindTypeChoices
-from data.finances.finance.models import Finance, Kind
+from data.finances.finance.cache import get_kind
+from data.finances.finance.models import Finance
 from data.lid.new_lid.models import Lid
 from data.paycomuz.models import Transaction
 from data.student.student.models import Student
@@ -14,9 +15,7 @@ def on_pre_save(sender, instance: Transaction, created, **kwargs):
     if created and instance.state == "success":
 
         # kind = Kind.objects.filter(name="Lesson payment").first()
-        kind, created = Kind.objects.get_or_create(
-            kind=FinanceKindTypeChoices.LESSON_PAYMENT
-        )
+        kind = get_kind(FinanceKindTypeChoices.LESSON_PAYMENT)
 
         student = Student.objects.filter(id=instance.order_key).first()
         lid = Lid.objects.filter(id=instance.order_key).first()
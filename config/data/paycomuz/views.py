@@ -24,7 +24,8 @@ from .models import Transaction
 from .serializers.payme_operation import PaycomOperationSerialzer
 from .serializers.serializers import PaycomuzSerializer
 from .status import *
-from data.finances.finance.models import Finance, Kind
+from data.finances.finance.cache import get_kind
+from data.finances.finance.models import Finance
 from data.lid.new_lid.models import Lid
 from data.student.student.models import Student
 
@@ -267,9 +268,7 @@ class MerchantAPIView(APIView):
                 try:
                     # kind = Kind.objects.filter(name="Lesson payment").first()
 
-                    kind, created = Kind.objects.get_or_create(
-                        kind=FinanceKindTypeChoices.LESSON_PAYMENT
-                    )
+                    kind = get_kind(FinanceKindTypeChoices.LESSON_PAYMENT)
 
                     student = Student.objects.filter(id=obj.order_key).first()
                     lid = Lid.objects.filter(id=obj.order_key).first()
@@ -0,0 +1,419 @@
+"""
+Side effects of accepting a result.
+
+Saving a result as Accepted records a ResultTransition; after the commit a
+Celery job (data.results.tasks.apply_result_transition) calls ``apply`` with
+its id. ``apply`` locks the row and does nothing unless it is still PENDING,
+so a redelivered or retried job never rewards twice, and saving an already
+accepted result again rewards nothing.
+
+The reward is one MonitoringAsos4 for the teacher, Coins for the student, a
+bonus Finance expense from the WEALTH casher and two notifications. ASOS_4,
+the bonus Kind and the casher come from the process-local reference caches;
+only the ResultSubjects matching the result are queried.
+
+A reward that cannot be given (missing ResultSubjects, teacher, ...) rolls
+back, marks the transition FAILED and puts the result back In_progress,
+like the old post_save handler did.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from data.command.transactions import collect_on_commit
+from data.finances.compensation.cache import asos_id_like
+from data.finances.compensation.models import (
+    MonitoringAsos4,
+    ResultName,
+    ResultSubjects,
+)
+from data.finances.finance.cache import kind_id, wealth_casher_id
+from data.finances.finance.choices import FinanceKindTypeChoices
+from data.finances.finance.models import Finance
+from data.notifications.models import Notification
+from data.results.models import Results, ResultTransition
+from data.student.shop.models import Coins
+
+DEGREE_ORDER = ["A1", "A2", "B1", "B2", "C1", "C2"]
+
+
+@dataclass
+class Reward:
+    subject: ResultSubjects
+    type: str
+    ball: object
+    # "Sizga <whose> uchun ..." in the coin, bonus and notification texts
+    whose: str
+    asos_id: object = None
+    result_name: ResultName | None = None
+    # the ball quoted in the "... ball qo'shildi!" notification
+    notified_ball: object = None
+
+
+def asos_4_id():
+    pk = asos_id_like("ASOS_4")
+    if pk is None:
+        raise ValueError("ASOS_4 topilmadi! Avval ASOS_4 yarating.")
+    return pk
+
+
+def _student_name(result: Results) -> str:
+    return f"{result.student.first_name} {result.student.last_name}"
+
+
+def _checked(subject: ResultSubjects, label: str) -> ResultSubjects:
+    if subject.max_ball is None:
+        raise ValueError(
+            f"ResultSubjects uchun max_ball qiymati topilmadi. {label}: {subject.id}"
+        )
+    if subject.amount is None:
+        raise ValueError(
+            f"ResultSubjects uchun amount qiymati topilmadi. {label}: {subject.id}"
+        )
+    return subject
+
+
+def _olimpiada(result: Results) -> Reward:
+    asos_id = asos_4_id()
+    level = ResultSubjects.objects.filter(
+        asos_id=asos_id, level=result.level, degree=result.degree
+    ).first()
+    if not level:
+        raise ValueError(
+            "Olimpiada uchun mos ResultSubjects topilmadi. "
+            f"Level: {result.level}, Degree: {result.degree}"
+        )
+    if not result.teacher:
+        raise ValueError("O'qituvchi ma'lumoti topilmadi!")
+    _checked(level, "Level ID")
+
+    if result.who == "Mine":
+        whose = "natijangiz"
+    else:
+        whose = (
+            f"talabangiz {_student_name(result)} ning  olimpiadada "
+            f"{result.result_score} ball bilan {result.level} bosqichidagi natijasi"
+        )
+    return Reward(
+        subject=level,
+        type="Olimpiada",
+        ball=result.result_score,
+        whose=whose,
+        asos_id=asos_id,
+        notified_ball=level.coin,
+    )
+
+
+def _university(result: Results) -> Reward | None:
+    if not result.teacher:
+        raise ValueError("O'qituvchi ma'lumoti topilmadi!")
+    if not result.university_entering_type:
+        raise ValueError("University entering type belgilanmagan!")
+    if not result.university_type:
+        raise ValueError("University type belgilanmagan!")
+    asos_4_id()
+
+    if result.who not in ("Mine", "Student"):
+        return None
+
+    entry = "Grant" if result.university_entering_type == "Grant" else "Contract"
+    level = ResultSubjects.objects.filter(
+        asos__name__icontains="ASOS_4",
+        entry_type=entry,
+        university_type=(
+            "Personal" if result.university_type == "Unofficial" else "National"
+        ),
+    ).first()
+    if not level:
+        raise ValueError(
+            "University uchun mos ResultSubjects topilmadi. "
+            f"Entry: {entry}, University type: {result.university_type}"
+        )
+    _checked(level, "Level ID")
+
+    if result.who == "Mine":
+        whose = "natijangiz"
+    else:
+        if result.university_type == "Official":
+            exam = "DTM"
+        elif result.university_type == "Unofficial":
+            exam = f"Xususiy {result.university_name} universitet"
+        else:
+            exam = f"Xorijiy {result.university_name} universitet"
+        whose = (
+            f"talabangiz {_student_name(result)} ning  {exam} imtihonida "
+            f"{result.result_score} ball bilan {result.level} bosqichidagi natijasi"
+        )
+    # the university monitoring never carried the asos
+    return Reward(
+        subject=level,
+        type="University",
+        ball=level.max_ball,
+        whose=whose,
+        notified_ball=level.max_ball,
+    )
+
+
+def _certificate_subject(point: ResultName, who: str, band_score: str | None):
+    subjects = ResultSubjects.objects.filter(
+        asos__name__icontains="ASOS_4", result=point, result_type=who
+    )
+    as_float = subjects.annotate(
+        from_point_float=Cast("from_point", FloatField()),
+        to_point_float=Cast("to_point", FloatField()),
+    )
+
+    def number(kind):
+        try:
+            return float(band_score)
+        except (ValueError, TypeError):
+            raise ValueError(f"Band score '{band_score}' {kind} formatida emas!")
+
+    def degree():
+        if band_score not in DEGREE_ORDER:
+            raise ValueError(
+                f"Band score '{band_score}' noto'g'ri degree formatida! "
+                f"Mumkin bo'lgan qiymatlar: {DEGREE_ORDER}"
+            )
+        return DEGREE_ORDER.index(band_score)
+
+    kind = {"Percentage": "percentage", "Ball": "ball"}.get(point.point_type)
+
+    if point.type == "Two":
+        if point.point_type == "Percentage":
+            value = number(kind)
+            return as_float.filter(
+                from_point_float__lte=value, to_point_float__gte=value
+            ).first()
+        if point.point_type == "Ball":
+            # band scores are stored as text, matched like the range bounds
+            return subjects.filter(from_point__icontains=band_score).first()
+        if point.point_type == "Degree":
+            band = degree()
+            for subject in subjects:
+                try:
+                    low = DEGREE_ORDER.index(subject.from_point.upper())
+                    high = DEGREE_ORDER.index(subject.to_point.upper())
+                except (ValueError, AttributeError):
+                    continue
+                if low <= band <= high:
+                    return subject
+
+    elif point.type == "One":
+        if point.point_type in ("Percentage", "Ball"):
+            return as_float.filter(from_point_float=number(kind)).first()
+        if point.point_type == "Degree" and band_score:
+            degree()
+            return subjects.filter(from_point__icontains=band_score).first()
+
+    return None
+
+
+def _certificate(result: Results) -> Reward:
+    if not result.teacher:
+        raise ValueError("O'qituvchi ma'lumoti topilmadi!")
+    if not result.result_fk_name:
+        raise ValueError("result_fk_name belgilanmagan!")
+    if not result.band_score:
+        raise ValueError("band_score belgilanmagan!")
+    asos_id = asos_4_id()
+
+    who = "Mine" if result.who == "Mine" else "Student"
+    name = result.result_fk_name.name
+    point = (
+        ResultName.objects.filter(name__icontains=name, who=who).first()
+        or ResultName.objects.filter(name__icontains=name).first()
+    )
+    if not point:
+        raise ValueError(f"'{name}' nomli ResultName topilmadi!")
+
+    band_score = str(result.band_score).upper()
+    subject = _certificate_subject(point, who, band_score)
+    if not subject:
+        raise ValueError(
+            f"Band score '{band_score}' uchun mos ResultSubjects topilmadi! "
+            f"Point: {point.name}, Type: {point.type}, "
+            f"Point type: {point.point_type}"
+        )
+    _checked(subject, "Subject ID")
+
+    whose = (
+        "natijangiz"
+        if result.who == "Mine"
+        else f"talabangiz {_student_name(result)} ning"
+    )
+    return Reward(
+        subject=subject,
+        type="Certificate",
+        ball=subject.max_ball,
+        whose=f"{whose} {name} sertifikati imtihonida {result.band_score} ball",
+        asos_id=asos_id,
+        result_name=point,
+        notified_ball=subject.max_ball,
+    )
+
+
+REWARDS = {
+    "Olimpiada": _olimpiada,
+    "University": _university,
+    "Certificate": _certificate,
+}
+
+
+def _payload(result: Results) -> str:
+    """Notification.come_from of a result notification."""
+    return json.dumps(
+        {
+            "id": str(result.id),
+            "universityEnteringBall": result.university_entering_ball,
+            "results": result.results,
+            "band_score": result.band_score,
+            "result_score": result.result_score,
+            "university_name": result.university_name,
+            "status": result.status,
+            "level": result.level,
+            "result_fk_name": (
+                {"name": result.result_fk_name.name} if result.result_fk_name else None
+            ),
+            "student": (
+                {
+                    "first_name": result.student.first_name,
+                    "last_name": result.student.last_name,
+                }
+                if result.student
+                else None
+            ),
+            "university_entering_type": result.university_entering_type,
+            "degree": result.degree,
+            "file": {"id": result.id, "choice": None, "file": None},
+            "created_at": result.created_at,
+        },
+        default=str,
+    )
+
+
+def reward(result: Results):
+    """Give the reward of an accepted result."""
+    build = REWARDS.get(result.results)
+    if build is None:
+        raise ValueError(f"Noma'lum results turi: {result.results}")
+    given = build(result)
+    if given is None:
+        return
+
+    subject = given.subject
+    text = f"Sizga {given.whose} uchun"
+    # the olimpiada coin text always quoted max_ball
+    coins = subject.max_ball if given.type == "Olimpiada" else subject.coin
+
+    MonitoringAsos4.objects.create(
+        creator=result.teacher,
+        asos_id=given.asos_id,
+        user=result.teacher,
+        subject=subject,
+        result=given.result_name,
+        type=given.type,
+        ball=given.ball,
+    )
+    # a teacher's own result has no student to give the coins to
+    if result.student:
+        Coins.objects.create(
+            coin=subject.coin,
+            student=result.student,
+            choice="Result",
+            comment=f"{text} {coins} coin qo'shildi!",
+            status="Given",
+        )
+    finance = Finance.objects.create(
+        casher_id=wealth_casher_id(),
+        action="EXPENSE",
+        kind_id=kind_id(FinanceKindTypeChoices.BONUS),
+        amount=subject.amount,
+        stuff=result.teacher,
+        comment=f"{text} {subject.amount} so'm qo'shildi!",
+    )
+
+    payload = _payload(result)
+    if finance.amount:
+        Notification.objects.create(
+            user=result.teacher,
+            comment=f"{text} {subject.amount} so'm qo'shildi!",
+            come_from=payload,
+            choice="Results",
+        )
+        logging.info(f"Sizga {subject.amount} sum qo'shildi!")
+
+    Notification.objects.create(
+        user=result.teacher,
+        comment=f"{text} {given.notified_ball} ball qo'shildi!",
+        come_from=payload,
+        choice="Results",
+    )
+
+
+def _schedule(transition_ids):
+    from data.results.tasks import apply_result_transition
+
+    for pk in transition_ids:
+        apply_result_transition.delay(str(pk))
+
+
+def enqueue(result: Results, created: bool) -> ResultTransition | None:
+    """
+    Record the acceptance of a just saved result; its side effects run in a
+    job after the commit. Saves that did not change the status record nothing.
+    """
+    if result.status != "Accepted":
+        return None
+    if not created and not result.has_changed("status"):
+        return None
+    transition = ResultTransition.objects.create(
+        result=result,
+        from_status=None if created else result.old_value("status"),
+        to_status=result.status,
+        filial_id=result.filial_id,
+    )
+    collect_on_commit("results.acceptance", transition.pk, _schedule)
+    return transition
+
+
+def apply(transition_id) -> str | None:
+    """Run the side effects of a transition once; returns its final state."""
+    with transaction.atomic():
+        transition = (
+            ResultTransition.objects.select_for_update()
+            .filter(pk=transition_id)
+            .first()
+        )
+        if transition is None or transition.state != ResultTransition.PENDING:
+            return transition and transition.state
+
+        result = (
+            Results.objects.select_related("teacher", "student", "result_fk_name")
+            .filter(pk=transition.result_id)
+            .first()
+        )
+        if result is None or result.status != transition.to_status:
+            # changed again before the job ran; that change has its own row
+            transition.state = ResultTransition.SKIPPED
+        else:
+            try:
+                with transaction.atomic():
+                    reward(result)
+            except Exception as e:
+                logging.error(f"Result acceptance error: {str(e)}", exc_info=True)
+                transition.state = ResultTransition.FAILED
+                transition.error = str(e)
+                Results.objects.filter(pk=result.pk).update(status="In_progress")
+            else:
+                transition.state = ResultTransition.DONE
+
+        transition.processed_at = timezone.now()
+        transition.save(update_fields=["state", "error", "processed_at"])
+        return transition.state
@@ -0,0 +1,101 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('compensation', '0002_initial'),
+        ('filial', '0001_initial'),
+        ('student', '0001_initial'),
+        ('subject', '0001_initial'),
+        ('upload', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Results',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('who', models.CharField(blank=True, choices=[('Mine', 'Mine'), ('Student', 'Student')], max_length=20, null=True)),
+                ('results', models.CharField(blank=True, choices=[('University', 'entering to the university'), ('Certificate', 'Geting certificate'), ('Olimpiada', 'Olimpiada natijalari')], max_length=100, null=True)),
+                ('university_type', models.CharField(blank=True, choices=[('Official', 'Official'), ('Unofficial', 'Unofficial'), ('Foreign_university', 'Foreign_university')], max_length=100, null=True)),
+                ('university_name', models.CharField(blank=True, max_length=120, null=True)),
+                ('university_entering_type', models.CharField(blank=True, choices=[('Grant', 'Grant'), ('Kontrakt', 'Kontrakt')], max_length=100, null=True)),
+                ('university_entering_ball', models.FloatField(blank=True, null=True)),
+                ('degree', models.CharField(blank=True, choices=[('1', '1'), ('2', '2'), ('3', '3')], max_length=100, null=True)),
+                ('level', models.CharField(blank=True, choices=[('Region', 'Region'), ('Respublika', 'Respublika'), ('Respublika Xususiy', 'Respublika Xususiy'), ('International', 'International'), ('International personal', 'International personal'), ('Regional', 'Regional')], max_length=256, null=True)),
+                ('band_score', models.CharField(blank=True, max_length=10, null=True)),
+                ('reading_score', models.FloatField(blank=True, null=True)),
+                ('listening_score', models.FloatField(blank=True, null=True)),
+                ('speaking_score', models.FloatField(blank=True, null=True)),
+                ('writing_score', models.FloatField(blank=True, null=True)),
+                ('result_name', models.CharField(blank=True, max_length=120, null=True)),
+                ('result_score', models.FloatField(blank=True, default=0, null=True)),
+                ('subject_name', models.CharField(blank=True, max_length=120, null=True)),
+                ('status', models.CharField(choices=[('Accepted', 'Accepted'), ('Rejected', 'Rejected'), ('In_progress', 'in_progress')], default='In_progress', max_length=100)),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+                ('national', models.ForeignKey(blank=True, help_text='National sertificate subject', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='national_results', to='subject.subject')),
+                ('result_fk_name', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='monitoring_result_name', to='compensation.resultname')),
+                ('student', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='student_results', to='student.student')),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='teacher_results', to=settings.AUTH_USER_MODEL)),
+                ('updater', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updater_results', to=settings.AUTH_USER_MODEL)),
+                ('upload_file', models.ManyToManyField(to='upload.file')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ResultTransition',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('from_status', models.CharField(blank=True, max_length=100, null=True)),
+                ('to_status', models.CharField(max_length=100)),
+                ('state', models.CharField(choices=[('PENDING', 'Pending'), ('DONE', 'Done'), ('FAILED', 'Failed'), ('SKIPPED', 'Skipped')], default='PENDING', max_length=20)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+                ('result', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions', to='results.results')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='results',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='results_results_arch_ts_chk'),
+        ),
+        migrations.AddIndex(
+            model_name='resulttransition',
+            index=models.Index(condition=models.Q(('state', 'PENDING')), fields=['created_at'], name='result_transition_pending'),
+        ),
+        migrations.AddConstraint(
+            model_name='resulttransition',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='results_resulttransition_arch_ts_chk'),
+        ),
+    ]
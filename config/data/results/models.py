@@ -1,3 +1,4 @@
+from django.contrib import admin
 from django.db import models
 
 from data.account.models import CustomUser
@@ -140,3 +141,50 @@ class Results(BaseModel):
 
     # def __str__(self):
     #     return f"{self.results} -- {self.student.first_name}"
+
+
+class ResultTransition(BaseModel):
+    """
+    A status change of a result whose side effects (monitoring, coins, bonus,
+    notifications) run in a Celery job after the change commits; the row
+    makes the job run them once however many times it is delivered.
+    """
+
+    PENDING = "PENDING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+    SKIPPED = "SKIPPED"
+
+    result: "Results" = models.ForeignKey(
+        "results.Results", on_delete=models.CASCADE, related_name="transitions"
+    )
+    from_status = models.CharField(max_length=100, null=True, blank=True)
+    to_status = models.CharField(max_length=100)
+
+    state = models.CharField(
+        choices=[
+            (PENDING, "Pending"),
+            (DONE, "Done"),
+            (FAILED, "Failed"),
+            (SKIPPED, "Skipped"),
+        ],
+        default=PENDING,
+        max_length=20,
+    )
+    error = models.TextField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(state="PENDING"),
+                name="result_transition_pending",
+            ),
+        ]
+
+    class Admin(admin.ModelAdmin):
+
+        list_display = ["result", "from_status", "to_status", "state", "processed_at"]
+
+        list_filter = ["state", "to_status"]
@@ -1,48 +1,28 @@
 import json
 import logging
 
-from django.db.models import FloatField
-from django.db.models.functions import Cast
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
-from icecream import ic
 
-from data.finances.finance.choices import FinanceKindTypeChoices
+from data.command.pipeline import CREATE, derive
+from data.logs.models import Log
+from data.notifications.models import Notification
 
+from . import acceptance
 from .models import Results
 from .utils import (
     validate_olimpiada_requirements,
     validate_university_requirements,
     validate_certificate_requirements,
 )
-from data.finances.compensation.models import (
-    MonitoringAsos4,
-    Asos,
-    ResultName,
-    ResultSubjects,
-)
-from data.finances.finance.models import Finance, Casher, Kind
-from data.logs.models import Log
-from data.notifications.models import Notification
-from data.student.shop.models import Coins
 
 
-@receiver(post_save, sender=Results)
-def on_create(sender, instance: Results, created, **kwargs):
-    # if not created and instance.status == "Accepted":
-    #     asos = Asos.objects.filter(name__in = "Asos 4").first()
-    #
-    #     result_name = ResultName.objects.get(name=instance.name)
-    #
-    #     monitoring = MonitoringAsos4.objects.create(
-    #         user=instance.teacher,
-    #         asos=asos,
-    #         result=instance,
-    #
-    #     )
-    if created and instance.teacher and instance.teacher.filial.exists():
-        instance.filial = instance.teacher.filial.first()
-        instance.save()
+@derive(Results, "filial", on=CREATE)
+def teacher_filial(instance: Results):
+    """A new result belongs to its teacher's (first) filial."""
+    filial = instance.teacher.filial.first() if instance.teacher else None
+    if filial is not None:
+        instance.filial = filial
 
 
 @receiver(pre_save, sender=Results)
@@ -51,13 +31,8 @@ def validate_before_acceptance(sender, instance: Results, **kwargs):
     if instance.status == "Accepted":
         try:
             # Check if this is an update (not creation) and status is actually changing
-            if instance.pk:
-                try:
-                    original = Results.objects.get(pk=instance.pk)
-                    if original.status == "Accepted":
-                        return  # Status was already "Accepted", no need to process
-                except Results.DoesNotExist:
-                    pass  # New instance, continue processing
+            if not instance._state.adding and not instance.has_changed("status"):
+                return  # Status was already "Accepted", no need to process
 
             # Validate all requirements before allowing the save
             if instance.results == "Olimpiada":
@@ -83,605 +58,14 @@ def validate_before_acceptance(sender, instance: Results, **kwargs):
 
 
 @receiver(post_save, sender=Results)
-def on_update(sender, instance: Results, created, **kwargs):
-    if not created:
-        try:
-
-            in_obj = Results.objects.filter(id=instance.id).first()
-            id = instance.id
-            instance_obj = {
-                "id": str(id),
-                "universityEnteringBall": getattr(
-                    in_obj, "university_entering_ball", None
-                ),
-                "results": getattr(in_obj, "results", None),
-                "band_score": getattr(in_obj, "band_score", None),
-                "result_score": getattr(in_obj, "result_score", None),
-                "university_name": getattr(instance, "university_name", None),
-                "status": getattr(instance, "status", None),
-                "level": getattr(instance, "level", None),
-                "result_fk_name": (
-                    {
-                        # "id": getattr(in_obj.result_fk_name, "id", None),
-                        "name": getattr(in_obj.result_fk_name, "name", None),
-                        # "description": getattr(in_obj.result_fk_name, "who", None),
-                    }
-                    if getattr(in_obj, "result_fk_name", None)
-                    else None
-                ),
-                "student": (
-                    {
-                        # "id": getattr(in_obj.student, "id", None),
-                        "first_name": getattr(in_obj.student, "first_name", None),
-                        "last_name": getattr(in_obj.student, "last_name", None),
-                        # "phone": getattr(in_obj.student, "phone", None),
-                    }
-                    if getattr(in_obj, "student", None)
-                    else None
-                ),
-                "university_entering_type": getattr(
-                    in_obj, "university_entering_type", None
-                ),
-                "degree": getattr(in_obj, "degree", None),
-                "file": {
-                    "id": getattr(in_obj, "id", None),
-                    "choice": getattr(in_obj, "choice", None),
-                    "file": getattr(in_obj, "file", None),
-                },
-                "created_at": getattr(in_obj, "created_at", None),
-            }
-
-            if instance.status == "Accepted":
-
-                if instance.results == "Olimpiada":
-                    who = "Mine" if instance.who == "Mine" else "Student"
-
-                    asos = Asos.objects.filter(name__icontains="ASOS_4").first()
-
-                    if not asos:
-                        raise ValueError("ASOS_4 topilmadi! Avval ASOS_4 yarating.")
-
-                    # Check if level exists
-                    level = ResultSubjects.objects.filter(
-                        asos=asos,
-                        level=instance.level,
-                        degree=instance.degree,
-                    ).first()
-                    if not level:
-                        raise ValueError(
-                            f"Olimpiada uchun mos ResultSubjects topilmadi. Level: {instance.level}, Degree: {instance.degree}"
-                        )
-
-                    # Check if teacher exists
-                    if not instance.teacher:
-                        raise ValueError("O'qituvchi ma'lumoti topilmadi!")
-
-                    # Check if max_ball and amount exist
-                    if not hasattr(level, "max_ball") or level.max_ball is None:
-                        raise ValueError(
-                            f"ResultSubjects uchun max_ball qiymati topilmadi. Level ID: {level.id}"
-                        )
-
-                    if not hasattr(level, "amount") or level.amount is None:
-                        raise ValueError(
-                            f"ResultSubjects uchun amount qiymati topilmadi. Level ID: {level.id}"
-                        )
-
-                    # Check if casher exists
-                    casher = Casher.objects.filter(role="WEALTH").first()
-                    if not casher:
-                        casher = None
-
-                    # Check if bonus kind exists
-                    # bonus_kind = Kind.objects.filter(
-                    #     action="EXPENSE", name__icontains="Bonus"
-                    # ).first()
-                    bonus_kind = Kind.objects.filter(
-                        action="EXPENSE", kind=FinanceKindTypeChoices.BONUS
-                    ).first()
-                    if not bonus_kind:
-                        raise ValueError("Results turi topilmadi!")
-
-                    # Create monitoring record
-                    ball = MonitoringAsos4.objects.create(
-                        creator=instance.teacher,
-                        asos=asos,
-                        user=instance.teacher,
-                        subject=level,
-                        result=None,
-                        type="Olimpiada",
-                        ball=instance.result_score,
-                    )
-                    coin = Coins.objects.create(
-                        coin=level.coin,
-                        student=instance.student,
-                        choice="Result",
-                        comment=f"Sizga {'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'
-                                                                                     f'  olimpiadada {instance.result_score} ball bilan {instance.level} bosqichidagi natijasi'} uchun {level.max_ball} coin qo'shildi!",
-                        status="Given",
-                    )
-
-                    # Create finance record
-                    finance = Finance.objects.create(
-                        casher=casher,
-                        action="EXPENSE",
-                        kind=bonus_kind,
-                        amount=level.amount,
-                        stuff=instance.teacher,
-                        comment=f"Sizga {'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'
-                                                                                     f'  olimpiadada {instance.result_score} ball bilan {instance.level} bosqichidagi natijasi'} uchun {level.amount} so'm qo'shildi!",
-                    )
-
-                    if finance.amount:
-                        Notification.objects.create(
-                            user=instance.teacher,
-                            comment=f"Sizga {'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'
-                                                                                         f'  olimpiadada {instance.result_score} ball bilan {instance.level} bosqichidagi natijasi'} uchun {level.amount} so'm qo'shildi!",
-                            come_from=json.dumps(instance_obj, default=str),
-                            choice="Results",
-                        )
-                        logging.info(f"Sizga {level.amount} sum qo'shildi!")
-
-                    if ball:
-                        Notification.objects.create(
-                            user=instance.teacher,
-                            comment=f"Sizga {'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'
-                                                                                         f'  olimpiadada {instance.result_score} ball bilan {instance.level} bosqichidagi natijasi'} uchun {level.coin} ball qo'shildi!",
-                            come_from=json.dumps(instance_obj, default=str),
-                            choice="Results",
-                        )
-
-                elif instance.results == "University":
-                    if not instance.teacher:
-                        raise ValueError("O'qituvchi ma'lumoti topilmadi!")
-
-                    if not instance.university_entering_type:
-                        raise ValueError("University entering type belgilanmagan!")
-
-                    if not instance.university_type:
-                        raise ValueError("University type belgilanmagan!")
-
-                    # Check if ASOS_4 exists
-                    asos = Asos.objects.filter(name__icontains="ASOS_4").first()
-                    if not asos:
-                        raise ValueError("ASOS_4 topilmadi! Avval ASOS_4 yarating.")
-
-                    # Check if casher exists
-                    casher = Casher.objects.filter(role="WEALTH").first()
-                    if not casher:
-                        casher = None
-
-                    # Check if bonus kind exists
-                    # bonus_kind = Kind.objects.filter(
-                    #     action="EXPENSE", name__icontains="Bonus"
-                    # ).first()
-                    bonus_kind = Kind.objects.filter(
-                        action="EXPENSE", kind=FinanceKindTypeChoices.BONUS
-                    ).first()
-                    if not bonus_kind:
-                        raise ValueError("Results turi topilmadi!")
-
-                    if instance.who == "Mine" or instance.who == "Student":
-                        entry = (
-                            "Grant"
-                            if instance.university_entering_type == "Grant"
-                            else "Contract"
-                        )
-                        ic(entry)
-
-                        level = ResultSubjects.objects.filter(
-                            asos__name__icontains="ASOS_4",
-                            entry_type=entry,
-                            university_type=(
-                                "Personal"
-                                if instance.university_type == "Unofficial"
-                                else "National"
-                            ),
-                        ).first()
-
-                        if not level:
-                            raise ValueError(
-                                f"University uchun mos ResultSubjects topilmadi. Entry: {entry}, University type: {instance.university_type}"
-                            )
-
-                        ic(level)
-
-                        # Check if max_ball and amount exist
-                        if not hasattr(level, "max_ball") or level.max_ball is None:
-                            raise ValueError(
-                                f"ResultSubjects uchun max_ball qiymati topilmadi. Level ID: {level.id}"
-                            )
-
-                        if not hasattr(level, "amount") or level.amount is None:
-                            raise ValueError(
-                                f"ResultSubjects uchun amount qiymati topilmadi. Level ID: {level.id}"
-                            )
-
-                        ball = MonitoringAsos4.objects.create(
-                            creator=instance.teacher,
-                            user=instance.teacher,
-                            subject=level,
-                            result=None,
-                            type="University",
-                            ball=level.max_ball,
-                        )
-                        coin = Coins.objects.create(
-                            coin=level.coin,
-                            student=instance.student,
-                            choice="Result",
-                            comment=f"Sizga {'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'
-                                                                                         f'  {"DTM" if instance.university_type == "Official" else f"Xususiy {instance.university_name} universitet" if
-                                                                                         instance.university_type == "Unofficial" else f"Xorijiy {instance.university_name} universitet"} imtihonida {instance.result_score} '
-                                                                                         f'ball bilan {instance.level} bosqichidagi natijasi'} uchun {level.coin} coin qo'shildi!",
-                            status="Given",
-                        )
-
-                        finance = Finance.objects.create(
-                            casher=casher,
-                            action="EXPENSE",
-                            kind=bonus_kind,
-                            amount=level.amount,
-                            stuff=instance.teacher,
-                            comment=f"Sizga {'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'
-                                                                                         f'  {"DTM" if instance.university_type == "Official" else f"Xususiy {instance.university_name} universitet" if
-                                                                                         instance.university_type == "Unofficial" else f"Xorijiy {instance.university_name} universitet"} imtihonida {instance.result_score} '
-                                                                                         f'ball bilan {instance.level} bosqichidagi natijasi'} uchun {level.amount} so'm qo'shildi!",
-                        )
-
-                        if finance.amount:
-                            Notification.objects.create(
-                                user=instance.teacher,
-                                comment=f"Sizga {'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'
-                                                                                             f'  {"DTM" if instance.university_type == "Official" else f"Xususiy {instance.university_name} universitet" if
-                                                                                             instance.university_type == "Unofficial" else f"Xorijiy {instance.university_name} universitet"} imtihonida {instance.result_score} '
-                                                                                             f'ball bilan {instance.level} bosqichidagi natijasi'} uchun {level.amount} so'm qo'shildi!",
-                                come_from=json.dumps(instance_obj, default=str),
-                                choice="Results",
-                            )
-                            logging.info(f"Sizga {level.amount} sum qo'shildi!")
-
-                        if ball:
-                            Notification.objects.create(
-                                user=instance.teacher,
-                                comment=f"Sizga {'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'
-                                                                                             f'  {"DTM" if instance.university_type == "Official" else f"Xususiy {instance.university_name} universitet" if
-                                                                                             instance.university_type == "Unofficial" else f"Xorijiy {instance.university_name} universitet"} imtihonida {instance.result_score} '
-                                                                                             f'ball bilan {instance.level} bosqichidagi natijasi'} uchun {level.max_ball} ball qo'shildi!",
-                                come_from=json.dumps(instance_obj, default=str),
-                                choice="Results",
-                            )
-
-                elif instance.results == "Certificate":
-                    if not instance.teacher:
-                        raise ValueError("O'qituvchi ma'lumoti topilmadi!")
-
-                    if not instance.result_fk_name:
-                        raise ValueError("result_fk_name belgilanmagan!")
-
-                    if not instance.band_score:
-                        raise ValueError("band_score belgilanmagan!")
-
-                    # Check if ASOS_4 exists
-                    asos = Asos.objects.filter(name__icontains="ASOS_4").first()
-                    if not asos:
-                        raise ValueError("ASOS_4 topilmadi! Avval ASOS_4 yarating.")
-
-                    # Check if casher exists
-                    casher = Casher.objects.filter(role="WEALTH").first()
-                    if not casher:
-                        casher = None
-
-                    # bonus_kind = Kind.objects.filter(
-                    #     action="EXPENSE", name__icontains="Bonus"
-                    # ).first()
-
-                    bonus_kind = Kind.objects.filter(
-                        action="EXPENSE", kind=FinanceKindTypeChoices.BONUS
-                    ).first()
-
-                    if not bonus_kind:
-                        raise ValueError("Results turi topilmadi!")
-
-                    who = "Mine" if instance.who == "Mine" else "Student"
-                    DEGREE_ORDER = ["A1", "A2", "B1", "B2", "C1", "C2"]
-                    ic(instance.result_fk_name.name)
-
-                    point = ResultName.objects.filter(
-                        name__icontains=instance.result_fk_name.name,
-                        who=who,
-                    ).first()
-
-                    ic(point)
-
-                    if not point:
-                        name_exists = ResultName.objects.filter(
-                            name__icontains=instance.result_fk_name.name
-                        ).values_list("name", "who", "type", "point_type")
-
-                        point = ResultName.objects.filter(
-                            name__icontains=instance.result_fk_name.name,
-                        ).first()
-
-                    if not point:
-                        raise ValueError(
-                            f"'{instance.result_fk_name.name}' nomli ResultName topilmadi!"
-                        )
-
-                    subject = None
-
-                    # Normalize band_score for comparison
-                    band_score = (
-                        str(instance.band_score).upper()
-                        if instance.band_score
-                        else None
-                    )
-                    ic(band_score)
-
-                    if point.type == "Two":
-                        # For type "Two", filter using range (from_point to to_point)
-                        if point.point_type == "Percentage":
-                            try:
-                                band_score_float = float(band_score)
-
-                                subject = (
-                                    ResultSubjects.objects.annotate(
-                                        from_point_float=Cast(
-                                            "from_point", FloatField()
-                                        ),
-                                        to_point_float=Cast("to_point", FloatField()),
-                                    )
-                                    .filter(
-                                        asos__name__icontains="ASOS_4",
-                                        result=point,
-                                        result_type=who,
-                                        from_point_float__lte=band_score_float,
-                                        to_point_float__gte=band_score_float,
-                                    )
-                                    .first()
-                                )
-                            except (ValueError, TypeError):
-                                raise ValueError(
-                                    f"Band score '{band_score}' percentage formatida emas!"
-                                )
-
-                        elif point.point_type == "Ball":
-                            try:
-                                if type(band_score) == float:
-                                    band_score_float = float(band_score)
-
-                                    subject = (
-                                        ResultSubjects.objects.annotate(
-                                            from_point_float=Cast(
-                                                "from_point", FloatField()
-                                            ),
-                                            to_point_float=Cast(
-                                                "to_point", FloatField()
-                                            ),
-                                        )
-                                        .filter(
-                                            asos__name__icontains="ASOS_4",
-                                            result=point,
-                                            result_type=who,
-                                            from_point_float__lte=band_score_float,
-                                            to_point_float__gte=band_score_float,
-                                        )
-                                        .first()
-                                    )
-                                else:
-                                    subject = ResultSubjects.objects.filter(
-                                        asos__name__icontains="ASOS_4",
-                                        result=point,
-                                        result_type=who,
-                                        from_point__icontains=band_score,
-                                    )
-
-                            except (ValueError, TypeError):
-                                raise ValueError(
-                                    f"Band score '{band_score}' ball formatida emas!"
-                                )
-
-                        elif point.point_type == "Degree":
-                            if band_score not in DEGREE_ORDER:
-                                raise ValueError(
-                                    f"Band score '{band_score}' noto'g'ri degree formatida! Mumkin bo'lgan qiymatlar: {DEGREE_ORDER}"
-                                )
-
-                            # Get all possible subjects first
-                            possible_subjects = ResultSubjects.objects.filter(
-                                asos__name__icontains="ASOS_4",
-                                result=point,
-                                result_type=who,
-                            )
-
-                            # Filter in Python to check degree hierarchy
-                            for subj in possible_subjects:
-                                try:
-                                    from_idx = DEGREE_ORDER.index(
-                                        subj.from_point.upper()
-                                    )
-                                    to_idx = DEGREE_ORDER.index(subj.to_point.upper())
-                                    band_idx = DEGREE_ORDER.index(band_score)
-
-                                    if from_idx <= band_idx <= to_idx:
-                                        subject = subj
-                                        break
-                                except (ValueError, AttributeError):
-                                    continue
-
-                    elif point.type == "One":
-                        if point.point_type == "Percentage":
-                            try:
-                                band_score_float = float(band_score)
-
-                                subject = (
-                                    ResultSubjects.objects.annotate(
-                                        from_point_float=Cast(
-                                            "from_point", FloatField()
-                                        ),
-                                    )
-                                    .filter(
-                                        asos__name__icontains="ASOS_4",
-                                        result=point,
-                                        result_type=who,
-                                        from_point_float=band_score_float,
-                                    )
-                                    .first()
-                                )
-                            except (ValueError, TypeError):
-                                raise ValueError(
-                                    f"Band score '{band_score}' percentage formatida emas!"
-                                )
-
-                        elif point.point_type == "Ball":
-                            try:
-                                band_score_float = float(band_score)
-
-                                subject = (
-                                    ResultSubjects.objects.annotate(
-                                        from_point_float=Cast(
-                                            "from_point", FloatField()
-                                        ),
-                                    )
-                                    .filter(
-                                        asos__name__icontains="ASOS_4",
-                                        result=point,
-                                        result_type=who,
-                                        from_point_float=band_score_float,
-                                    )
-                                    .first()
-                                )
-                            except (ValueError, TypeError):
-                                raise ValueError(
-                                    f"Band score '{band_score}' ball formatida emas!"
-                                )
-
-                        elif point.point_type == "Degree" and band_score:
-                            if band_score not in DEGREE_ORDER:
-                                raise ValueError(
-                                    f"Band score '{band_score}' noto'g'ri degree formatida! Mumkin bo'lgan qiymatlar: {DEGREE_ORDER}"
-                                )
-
-                            if type(band_score) == float:
-
-                                band_score_float = float(band_score)
-
-                                subject = (
-                                    ResultSubjects.objects.annotate(
-                                        from_point_float=Cast(
-                                            "from_point", FloatField()
-                                        ),
-                                    )
-                                    .filter(
-                                        asos__name__icontains="ASOS_4",
-                                        result=point,
-                                        result_type=who,
-                                        from_point_float=band_score_float,
-                                    )
-                                    .first()
-                                )
-                            else:
-                                subject = ResultSubjects.objects.filter(
-                                    asos__name__icontains="ASOS_4",
-                                    result=point,
-                                    result_type=who,
-                                    from_point__icontains=band_score,
-                                ).first()
-                    ic(subject)
-
-                    if not subject:
-                        raise ValueError(
-                            f"Band score '{band_score}' uchun mos ResultSubjects topilmadi! Point: {point.name}, Type: {point.type}, Point type: {point.point_type}"
-                        )
-
-                    # Check if max_ball and amount exist
-                    if not hasattr(subject, "max_ball") or subject.max_ball is None:
-                        raise ValueError(
-                            f"ResultSubjects uchun max_ball qiymati topilmadi. Subject ID: {subject.id}"
-                        )
-
-                    if not hasattr(subject, "amount") or subject.amount is None:
-                        raise ValueError(
-                            f"ResultSubjects uchun amount qiymati topilmadi. Subject ID: {subject.id}"
-                        )
-
-                    ic("Max_Ball : ", subject.max_ball)
-
-                    ball = MonitoringAsos4.objects.create(
-                        creator=instance.teacher,
-                        asos=asos,
-                        user=instance.teacher,
-                        subject=subject,
-                        result=point,
-                        type="Certificate",
-                        ball=subject.max_ball,
-                    )
-                    coin = Coins.objects.create(
-                        coin=subject.coin,
-                        student=instance.student,
-                        choice="Result",
-                        comment=(
-                            f"Sizga "
-                            f"{'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'} "
-                            f"{instance.result_fk_name.name} sertifikati imtihonida "
-                            f"{instance.band_score} ball uchun {subject.coin} coin qo'shildi!"
-                        ),
-                        status="Given",
-                    )
-                    finance = Finance.objects.create(
-                        casher=casher,
-                        action="EXPENSE",
-                        kind=bonus_kind,
-                        amount=subject.amount,
-                        stuff=instance.teacher,
-                        comment=(
-                            f"Sizga "
-                            f"{'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'} "
-                            f"{instance.result_fk_name.name} sertifikati imtihonida "
-                            f"{instance.band_score} ball uchun {subject.amount} so'm qo'shildi!"
-                        ),
-                    )
-
-                    if finance.amount:
-                        Notification.objects.create(
-                            user=instance.teacher,
-                            comment=(
-                                f"Sizga "
-                                f"{'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'} "
-                                f"{instance.result_fk_name.name} sertifikati imtihonida "
-                                f"{instance.band_score} ball uchun {subject.amount} so'm qo'shildi!"
-                            ),
-                            come_from=json.dumps(instance_obj, default=str),
-                            choice="Results",
-                        )
-                        logging.info(f"Sizga {subject.amount} sum qo'shildi!")
-
-                    if ball:
-                        Notification.objects.create(
-                            user=instance.teacher,
-                            comment=(
-                                f"Sizga "
-                                f"{'natijangiz' if instance.who == 'Mine' else f'talabangiz {instance.student.first_name} {instance.student.last_name} ning'} "
-                                f"{instance.result_fk_name.name} sertifikati imtihonida "
-                                f"{instance.band_score} ball uchun {subject.max_ball} ball qo'shildi!"
-                            ),
-                            come_from=json.dumps(instance_obj, default=str),
-                            choice="Results",
-                        )
-
-                else:
-                    raise ValueError(f"Noma'lum results turi: {instance.results}")
-
-        except Exception as e:
-
-            logging.error(f"Signal handler error: {str(e)}", exc_info=True)
-
-            Results.objects.filter(pk=instance.pk).update(status="In_progress")
+def on_accept(sender, instance: Results, created, **kwargs):
+    acceptance.enqueue(instance, created)
 
 
 @receiver(post_save, sender=Results)
 def send_notf(sender, instance: Results, created, **kwargs):
     if not created:
-        instance_obj = Results.objects.filter(id=instance.id).first()
+        instance_obj = instance
 
         if instance.status == "Rejected":
             Notification.objects.create(
@@ -698,7 +82,6 @@ def on_logs(sender, instance: Results, created, **kwargs):
         Log.objects.create(
             object="STUDENT",
             action="RESULT_CREATED",
-            model_action="Created",
             student=instance.student,
             account=instance.teacher,
             result=instance,
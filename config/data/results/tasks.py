@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from data.results import acceptance
+from data.results.models import ResultTransition
+
+# a transition still pending after this long lost its job (broker down, ...)
+STALE_AFTER = timedelta(minutes=5)
+
+
+@shared_task
+def apply_result_transition(transition_id: str):
+    return acceptance.apply(transition_id)
+
+
+@shared_task
+def apply_pending_result_transitions(limit: int = 200):
+    """Run the transitions whose job never ran."""
+    ids = ResultTransition.objects.filter(
+        state=ResultTransition.PENDING,
+        created_at__lt=timezone.now() - STALE_AFTER,
+    ).order_by("created_at").values_list("id", flat=True)[:limit]
+    states = [acceptance.apply(pk) for pk in ids]
+    return {state: states.count(state) for state in set(states)}
@@ -2,5 +2,91 @@ from datetime import datetime
 
 from django.test import TestCase
 
+from data.account.models import CustomUser
+from data.command.reference import reset_all
+from data.finances.compensation.models import Asos, MonitoringAsos4, ResultSubjects
+from data.finances.finance.models import Finance
+from data.results import acceptance
+from data.results.models import Results, ResultTransition
+from data.student.shop.models import Coins
+
 # Create your tests here.
-print(int(datetime.now().timestamp() * 1000))
\ No newline at end of file
+print(int(datetime.now().timestamp() * 1000))
+
+
+class AcceptanceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = CustomUser.objects.create(phone="+998900000021", role="TEACHER")
+        asos = Asos.objects.create(name="ASOS_4")
+        cls.subject = ResultSubjects.objects.create(
+            asos=asos,
+            name="Olimpiada",
+            level="Region",
+            degree="1",
+            max_ball="5",
+            amount="100000",
+            coin=3,
+        )
+
+    def setUp(self):
+        # the reference caches outlive the rows of other tests
+        reset_all()
+
+    def _accepted(self):
+        result = Results.objects.create(
+            who="Mine",
+            results="Olimpiada",
+            teacher=self.teacher,
+            level="Region",
+            degree="1",
+            result_score=48,
+        )
+        self.assertFalse(result.transitions.exists())
+        result.status = "Accepted"
+        result.save()
+        return result
+
+    def test_rewards_once_per_acceptance(self):
+        result = self._accepted()
+        transition = result.transitions.get()
+        self.assertEqual(transition.from_status, "In_progress")
+        self.assertEqual(transition.state, ResultTransition.PENDING)
+
+        self.assertEqual(acceptance.apply(transition.pk), ResultTransition.DONE)
+        # a redelivered job
+        self.assertEqual(acceptance.apply(transition.pk), ResultTransition.DONE)
+
+        self.assertEqual(MonitoringAsos4.objects.filter(user=self.teacher).count(), 1)
+        # a teacher's own result gives no student coins
+        self.assertFalse(Coins.objects.filter(choice="Result").exists())
+        finance = Finance.objects.get(stuff=self.teacher)
+        self.assertEqual(finance.amount, 100000)
+        self.assertEqual(finance.kind.kind, "BONUS")
+
+        # saving an accepted result again is not a new acceptance
+        result.result_score = 50
+        result.save()
+        self.assertEqual(result.transitions.count(), 1)
+
+    def test_failed_reward_is_rolled_back(self):
+        result = self._accepted()
+        transition = result.transitions.get()
+        ResultSubjects.objects.filter(pk=self.subject.pk).update(amount=None)
+
+        self.assertEqual(acceptance.apply(transition.pk), ResultTransition.FAILED)
+
+        transition.refresh_from_db()
+        self.assertIn("amount", transition.error)
+        result.refresh_from_db()
+        self.assertEqual(result.status, "In_progress")
+        self.assertFalse(MonitoringAsos4.objects.exists())
+        self.assertFalse(Finance.objects.exists())
+
+    def test_changed_status_is_skipped(self):
+        result = self._accepted()
+        Results.objects.filter(pk=result.pk).update(status="Rejected")
+
+        transition = result.transitions.get()
+        self.assertEqual(acceptance.apply(transition.pk), ResultTransition.SKIPPED)
+        self.assertFalse(MonitoringAsos4.objects.exists())
@@ -1,9 +1,10 @@
 from django.db.models import FloatField
 from django.db.models.functions import Cast
 
+from data.finances.compensation.cache import asos_id_like
+from data.finances.finance.cache import kind_id
 from data.finances.finance.choices import FinanceKindTypeChoices
-from data.finances.compensation.models import Asos, ResultSubjects, ResultName
-from data.finances.finance.models import Kind
+from data.finances.compensation.models import ResultSubjects, ResultName
 
 
 def validate_olimpiada_requirements(instance):
@@ -13,12 +14,12 @@ def validate_olimpiada_requirements(instance):
         raise ValueError("O'qituvchi ma'lumoti topilmadi!")
 
     # Check if ASOS_4 exists
-    asos = Asos.objects.filter(name__icontains="ASOS_4").first()
-    if not asos:
+    asos_id = asos_id_like("ASOS_4")
+    if not asos_id:
         raise ValueError("ASOS_4 topilmadi! Avval ASOS_4 yarating.")
 
     level = ResultSubjects.objects.filter(
-        asos=asos,
+        asos_id=asos_id,
         level=instance.level,
         degree=instance.degree,
     ).first()
@@ -46,7 +47,7 @@ def validate_olimpiada_requirements(instance):
     # bonus_kind = Kind.objects.filter(
     #     action="EXPENSE", kind=FinanceKindTypeChoices.BONUS
     # ).first()
-    bonus_kind = Kind.get(FinanceKindTypeChoices.BONUS)
+    bonus_kind = kind_id(FinanceKindTypeChoices.BONUS)
 
     if not bonus_kind:
         raise ValueError("Bonus turi topilmadi!")
@@ -64,8 +65,8 @@ def validate_university_requirements(instance):
         raise ValueError("University type belgilanmagan!")
 
     # Check if ASOS_4 exists
-    asos = Asos.objects.filter(name__icontains="ASOS_4").first()
-    if not asos:
+    asos_id = asos_id_like("ASOS_4")
+    if not asos_id:
         raise ValueError("ASOS_4 topilmadi! Avval ASOS_4 yarating.")
 
     # # Check if casher exists
@@ -80,7 +81,7 @@ def validate_university_requirements(instance):
     #     action="EXPENSE", kind=FinanceKindTypeChoices.BONUS
     # ).first()
 
-    bonus_kind = Kind.get(FinanceKindTypeChoices.BONUS)
+    bonus_kind = kind_id(FinanceKindTypeChoices.BONUS)
 
     if not bonus_kind:
         raise ValueError("Bonus turi topilmadi!")
@@ -125,8 +126,8 @@ def validate_certificate_requirements(instance):
         raise ValueError("band_score belgilanmagan!")
 
     # Check if ASOS_4 exists
-    asos = Asos.objects.filter(name__icontains="ASOS_4").first()
-    if not asos:
+    asos_id = asos_id_like("ASOS_4")
+    if not asos_id:
         raise ValueError("ASOS_4 topilmadi! Avval ASOS_4 yarating.")
 
     # Check if casher exists
@@ -137,7 +138,7 @@ def validate_certificate_requirements(instance):
     # Check if bonus kind exists
     # bonus_kind = Kind.objects.filter(action="EXPENSE", name__icontains="Bonus").first()
 
-    bonus_kind = Kind.get(FinanceKindTypeChoices.BONUS)
+    bonus_kind = kind_id(FinanceKindTypeChoices.BONUS)
 
     if not bonus_kind:
         raise ValueError("Bonus turi topilmadi!")
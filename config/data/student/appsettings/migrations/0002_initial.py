@@ -0,0 +1,40 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('appsettings', '0001_initial'),
+        ('filial', '0001_initial'),
+        ('student', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='strike',
+            name='student',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_strike', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='versionupdate',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddConstraint(
+            model_name='store',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='appsettings_store_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='strike',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='appsettings_strike_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='versionupdate',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='appsettings_versionupdate_arch_ts_chk'),
+        ),
+    ]
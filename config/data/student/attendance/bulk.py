@@ -0,0 +1,368 @@
+"""
+Set-based attendance submission for one group and day.
+
+``submit_group_day`` does what ``AttendanceCreateAPIView`` used to do one
+student at a time through ``Attendance.objects.update_or_create`` and the
+Attendance, Homework_history, Mastering and EmployeeTransaction signals:
+
+- upserts the attendances of the day: one INSERT for the new rows, one
+  UPDATE for the changed ones (the unique constraints are partial, so a
+  single ``ON CONFLICT`` statement is not available);
+- cancels and re-creates the teacher's LESSON_PAYMENT transactions of the
+  rows whose status changed, with their logs and one balance UPDATE;
+- creates Homework_history rows and the Mastering placeholders of new rows;
+- queues the absence streaks of the changed rows for a refresh;
+- creates the absence / inactive balance notifications in one batch.
+
+Rows that still need per-object ``save()`` because their own signals carry
+business logic keep it: the first lessons and leads of trial students, and
+students with at most three attendances whose funnel stage is set here.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from data.employee import balance as employee_balance
+from data.employee.models import EmployeeTransaction
+from data.exam_results.models import UnitTest
+from data.exam_results.tasks import send_unit_test_notification
+from data.notifications.models import Notification
+from data.notifications.push import enqueue
+from data.parents.models import Relatives
+from data.student.attendance.choices import AttendanceStatusChoices
+from data.student.attendance.models import Attendance
+from data.student.homeworks.models import Homework, Homework_history
+from data.student.mastering.models import Mastering
+from data.student.quiz.models import Quiz
+from data.student.mastering.coins import Event, award
+from data.student.studentgroup import streaks
+from data.student.studentgroup.models import StudentGroup
+
+CENT = Decimal("0.01")
+
+LESSON_PAYMENT = "LESSON_PAYMENT"
+
+# students get their funnel stage from their first lessons
+NEW_STUDENT_LESSONS = 3
+
+
+def _key(student_group) -> tuple:
+    return (student_group.pk, student_group.student_id, student_group.lid_id)
+
+
+def _upsert(group, date, items) -> tuple[list, list, list]:
+    """
+    Write the day's attendances. Returns ``(rows, created, changed)``: every
+    submitted row, the new ones, and the new or existing rows whose status
+    changed.
+    Related student, lead and first lesson come from the StudentGroup.
+    """
+    existing = {
+        (row.student_group_id, row.student_id, row.lead_id): row
+        for row in Attendance.objects.filter(group=group, date=date)
+    }
+
+    rows, created, updated, changed = [], [], [], []
+    for item in items:
+        student_group = item["student"]
+        row = existing.get(_key(student_group))
+
+        if row is None:
+            row = Attendance(date=date, group=group)
+            created.append(row)
+            changed.append(row)
+        else:
+            if row.status != item["status"]:
+                changed.append(row)
+            row.updated_at = timezone.now()
+            updated.append(row)
+
+        row.student_group = student_group
+        row.student = student_group.student
+        row.lead = student_group.lid
+        row.first_lesson = student_group.first_lesson
+        row.status = item["status"]
+        row.comment = item.get("comment")
+        rows.append(row)
+
+    Attendance.objects.bulk_create(created)
+    if updated:
+        Attendance.objects.bulk_update(
+            updated, ["status", "comment", "first_lesson", "updated_at"]
+        )
+    return rows, created, changed
+
+
+def _lesson_payments(group, rows):
+    """
+    LESSON_PAYMENT bookkeeping of the rows whose status changed: archive the
+    teacher's live transactions of those rows and book a new one for every
+    present student, moving the teacher's balance once.
+    """
+    teacher = group.teacher
+    if teacher is None or not rows:
+        return
+
+    with employee_balance.buffered():
+        cancelled = list(
+            EmployeeTransaction.objects.filter(
+                employee_id=teacher.pk,
+                attendance__in=rows,
+                reason=LESSON_PAYMENT,
+                is_archived=False,
+            )
+        )
+        statuses = {row.pk: row.status for row in rows}
+        for tx in cancelled:
+            employee_balance.archived(
+                tx, f"Attendance state changed: {statuses[tx.attendance_id]}"
+            )
+        if cancelled:
+            now = timezone.now()
+            EmployeeTransaction.objects.filter(
+                pk__in=[tx.pk for tx in cancelled]
+            ).update(is_archived=True, archived_at=now, updated_at=now)
+
+        percent = Decimal(teacher.f_t_lesson_payment_percent)
+        created = []
+        for row in rows:
+            if row.status != AttendanceStatusChoices.IS_PRESENT:
+                continue
+            price = row.student_group.price
+            amount = (price * percent / Decimal("100")).quantize(CENT)
+            if amount <= 0:
+                continue
+            created.append(
+                EmployeeTransaction(
+                    employee_id=teacher.pk,
+                    reason=LESSON_PAYMENT,
+                    action=EmployeeTransaction.REASON_TO_ACTION[LESSON_PAYMENT],
+                    attendance=row,
+                    student_id=row.student_id,
+                    lead_id=row.lead_id,
+                    amount=amount,
+                    effective_amount=amount,
+                    comment=f"{row.date.strftime('%d/%m/%Y')} dagi dars uchun to'lov.",
+                )
+            )
+        EmployeeTransaction.objects.bulk_create(created)
+
+        for tx in created:
+            employee_balance.created(tx)
+
+
+def _placeholders(rows, theme, homework, quiz):
+    """Homework history and zero-ball Mastering rows of new attendances."""
+    histories = [
+        # mark 0: the Homework_history signal only flips test_checked
+        Homework_history(
+            homework=homework,
+            student_id=row.student_id,
+            status="Passed",
+            mark=0,
+            test_checked=True,
+        )
+        for row in rows
+        if homework and row.student_id
+    ]
+    Homework_history.objects.bulk_create(histories)
+
+    choices = ["Homework"]
+    if theme.course.subject.is_language:
+        choices.append("Speaking")
+
+    masterings = [
+        Mastering(
+            student_id=row.student_id,
+            lid_id=row.lead_id,
+            theme=theme,
+            test=quiz if choice == "Homework" else None,
+            choice=choice,
+            ball=0,
+        )
+        for row in rows
+        for choice in choices
+    ]
+    Mastering.objects.bulk_create(masterings)
+
+    # bulk_create skips the Mastering signal; 0 balls earn coins only if a
+    # setting says so, which the engine finds out with one query
+    award(Event.of(mastering, True) for mastering in masterings)
+
+
+def _lead_effects(rows, notifications):
+    """What the Attendance signal does for trial (lead) attendances."""
+    rows = [row for row in rows if row.lead_id]
+    if not rows:
+        return
+    counts = dict(
+        Attendance.objects.filter(lead_id__in=[row.lead_id for row in rows])
+        .values("lead_id")
+        .annotate(n=Count("id"))
+        .values_list("lead_id", "n")
+        .order_by()
+    )
+    for row in rows:
+        lead, first_lesson = row.lead, row.first_lesson
+        absent = row.status != AttendanceStatusChoices.IS_PRESENT
+        if counts[row.lead_id] == 1 and absent:
+            if first_lesson:
+                first_lesson.status = "DIDNTCOME"
+                first_lesson.save()
+            notifications.append(
+                Notification(
+                    user_id=lead.call_operator_id,
+                    comment=(
+                        f"Lead {lead.first_name} {lead.phone_number} - "
+                        f"{counts[row.lead_id]} darsga qatnashmagan!"
+                    ),
+                    come_from=lead.id,
+                    choice="First_Lesson_Lid",
+                )
+            )
+        if row.status == AttendanceStatusChoices.IS_PRESENT:
+            if first_lesson:
+                first_lesson.status = "CAME"
+                first_lesson.save()
+            lead.is_student = True
+            lead.save()
+
+
+def _student_effects(group, rows, notifications):
+    """Funnel stages and notifications the Attendance signal derives."""
+    rows = [row for row in rows if row.student_id]
+    if not rows:
+        return
+    counts = dict(
+        Attendance.objects.filter(student_id__in=[row.student_id for row in rows])
+        .values("student_id")
+        .annotate(n=Count("id"))
+        .values_list("student_id", "n")
+        .order_by()
+    )
+
+    parents = defaultdict(list)
+    absent = [
+        row.student_id
+        for row in rows
+        if row.status == AttendanceStatusChoices.UNREASONED
+        and counts[row.student_id] > 1
+    ]
+    for student_id, user_id in Relatives.objects.filter(
+        student_id__in=absent
+    ).values_list("student_id", "user_id"):
+        parents[student_id].append(user_id)
+
+    for row in rows:
+        student, count = row.student, counts[row.student_id]
+
+        if count <= NEW_STUDENT_LESSONS:
+            student.new_student_stages = (
+                "BIRINCHI_DARS"
+                if row.status == AttendanceStatusChoices.IS_PRESENT
+                else "BIRINCHI_DARSGA_KELMAGAN"
+            )
+            # Student signals (activation, balance reminders) run on save
+            student.save()
+
+        if count <= 1:
+            continue
+
+        if (
+            row.status == AttendanceStatusChoices.IS_PRESENT
+            and student.balance_status == "INACTIVE"
+        ):
+            notifications.append(
+                Notification(
+                    user_id=student.sales_manager_id,
+                    comment=(
+                        f"Talaba {student.first_name} {student.phone} - {count} darsga "
+                        f"qatnashdi va balansi statusi inactive, "
+                        f"To'lov haqida ogohlantiring!"
+                    ),
+                    come_from=student.id,
+                    choice="New_Student",
+                )
+            )
+        elif row.status == AttendanceStatusChoices.UNREASONED:
+            notifications.append(
+                Notification(
+                    user_id=student.sales_manager_id,
+                    comment=(
+                        f"Talaba {student.first_name} {student.phone} - "
+                        f"{count} darsga qatnashmagan!"
+                    ),
+                    come_from=student.id,
+                    choice="New_Student",
+                )
+            )
+            notifications.extend(
+                Notification(
+                    user_id=user_id,
+                    comment=(
+                        f"Talaba {student.first_name} {student.last_name}  -  "
+                        f"bugungi {group.name} guruhidagi {count} darsiga "
+                        f"qatnashmadi!"
+                    ),
+                    come_from=student.id,
+                    choice="Students",
+                )
+                for user_id in parents[row.student_id]
+            )
+
+
+def _unit_test(group, theme):
+    unit_test = UnitTest.objects.filter(group=group).first()
+    if unit_test and unit_test.themes.filter(id=theme.id).exists():
+        send_unit_test_notification.apply_async(
+            args=[unit_test.id, group.id],
+            eta=timezone.now() + timedelta(minutes=1),
+        )
+
+
+def submit_group_day(group, date, theme, repeated: bool, items) -> dict:
+    """
+    Record the attendance of ``items`` (``{"student": StudentGroup,
+    "status", "comment"}``) for ``group`` on ``date``. Returns counters.
+    """
+    homework = Homework.objects.filter(theme=theme).first()
+    quiz = Quiz.objects.filter(homework=homework).first()
+
+    student_groups = StudentGroup.objects.select_related(
+        "student", "lid", "first_lesson"
+    ).in_bulk([item["student"].pk for item in items])
+    items = [
+        {**item, "student": student_groups[item["student"].pk]} for item in items
+    ]
+
+    with transaction.atomic():
+        group.lessons.update_or_create(
+            date=date, defaults=dict(theme=theme, is_repeat=repeated)
+        )
+
+        rows, created, changed = _upsert(group, date, items)
+
+        _lesson_payments(group, changed)
+        _placeholders(created, theme, homework, quiz)
+        for row in changed:
+            streaks.touched(row.group_id, row.student_id, row.lead_id)
+
+        notifications = []
+        _lead_effects(rows, notifications)
+        _student_effects(group, rows, notifications)
+        Notification.objects.bulk_create(notifications)
+        enqueue(notifications)
+
+        if created:
+            transaction.on_commit(lambda: _unit_test(group, theme))
+
+    return {
+        "created": len(created),
+        "changed": len(changed),
+        "notifications": len(notifications),
+    }
@@ -0,0 +1,153 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from data.student.attendance.bulk import submit_group_day
+from data.student.attendance.models import Attendance
+from data.student.groups.models import Group
+from data.student.homeworks.models import Homework, Homework_history
+from data.student.mastering.models import Mastering
+from data.student.quiz.models import Quiz
+
+STATUSES = ["IS_PRESENT"] * 8 + ["UNREASONED", "REASONED"]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _row_by_row(group, date, theme, repeated, items):
+    """The per-student loop AttendanceCreateAPIView ran before submit_group_day."""
+    homework = Homework.objects.filter(theme=theme).first()
+    quiz = Quiz.objects.filter(homework=homework).first()
+
+    group.lessons.update_or_create(
+        date=date, defaults=dict(theme=theme, is_repeat=repeated)
+    )
+    for item in items:
+        student_group = item["student"]
+        attendance, created = Attendance.objects.update_or_create(
+            student_group=student_group,
+            student=student_group.student,
+            lead=student_group.lid,
+            date=date,
+            group=group,
+            defaults=dict(
+                status=item["status"],
+                comment=item.get("comment"),
+                first_lesson=student_group.first_lesson,
+            ),
+        )
+        if created:
+            if student_group.student is not None and homework:
+                Homework_history.objects.create(
+                    homework=homework,
+                    student=student_group.student,
+                    status="Passed",
+                    mark=0,
+                )
+            Mastering.objects.create(
+                student=student_group.student,
+                lid=student_group.lid,
+                theme=theme,
+                test=quiz,
+                ball=0,
+            )
+            if theme.course.subject.is_language:
+                Mastering.objects.create(
+                    student=student_group.student,
+                    lid=student_group.lid,
+                    theme=theme,
+                    test=None,
+                    choice="Speaking",
+                    ball=0,
+                )
+
+
+class Command(BaseCommand):
+    help = (
+        "Time one group-day attendance submission, row by row through the "
+        "signals vs. submit_group_day (everything is rolled back)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--group", help="Group id (default: the largest live group)"
+        )
+        parser.add_argument("--students", type=int, default=40)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        group = self._group(options["group"])
+        student_groups = list(
+            group.students.filter(is_archived=False)[: options["students"]]
+        )
+        theme = group.course.themes.filter(level=group.level).first()
+        if theme is None:
+            raise CommandError("The group's course has no theme for its level.")
+
+        # a day without attendances, so the first submission creates every row
+        date = timezone.localdate()
+        while Attendance.objects.filter(group=group, date=date).exists():
+            date = date.replace(year=date.year + 1)
+
+        self.stdout.write(
+            f"Group {group.name!r} ({group.pk}): {len(student_groups)} students, "
+            f"{date}"
+        )
+        self.stdout.write(f"{'path':<14}{'step':<10}{'queries':>9}{'ms':>10}")
+
+        for name, submit in (("row by row", _row_by_row), ("bulk", submit_group_day)):
+            for step, queries, ms in self._measure(
+                submit, group, date, theme, student_groups, options["repeat"]
+            ):
+                self.stdout.write(f"{name:<14}{step:<10}{queries:>9}{ms:>10.1f}")
+
+    def _measure(self, submit, group, date, theme, student_groups, repeat):
+        results = {"create": [], "resubmit": []}
+        for _ in range(repeat):
+            first = [
+                {"student": sg, "status": random.choice(STATUSES)}
+                for sg in student_groups
+            ]
+            # a teacher correcting a few statuses of the same day
+            second = [
+                {**item, "status": random.choice(STATUSES)} for item in first
+            ]
+            try:
+                with transaction.atomic():
+                    for step, items in (("create", first), ("resubmit", second)):
+                        with CaptureQueriesContext(connection) as queries:
+                            started = time.perf_counter()
+                            submit(group, date, theme, False, items)
+                            elapsed = (time.perf_counter() - started) * 1e3
+                        results[step].append((len(queries), elapsed))
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+        for step, runs in results.items():
+            yield (
+                step,
+                min(queries for queries, _ in runs),
+                min(ms for _, ms in runs),
+            )
+
+    def _group(self, group_id):
+        if group_id:
+            group = Group.objects.filter(pk=group_id).first()
+        else:
+            group = (
+                Group.objects.filter(is_archived=False)
+                .annotate(size=Count("students", filter=Q(students__is_archived=False)))
+                .order_by("-size")
+                .first()
+            )
+        if group is None:
+            raise CommandError("No group to benchmark.")
+        return group
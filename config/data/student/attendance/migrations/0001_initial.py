@@ -0,0 +1,60 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('filial', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SecondaryAttendance',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('IS_PRESENT', 'IS_PRESENT'), ('REASONED', 'Sababli'), ('UNREASONED', 'Sababsiz'), ('EMPTY', 'Belgilanmagan')], default='UNREASONED', help_text='Attendance holati (Sababli/Sababsiz)', max_length=20)),
+                ('comment', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Attendance',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('IS_PRESENT', 'IS_PRESENT'), ('REASONED', 'Sababli'), ('UNREASONED', 'Sababsiz'), ('EMPTY', 'Belgilanmagan')], default='EMPTY', help_text='Attendance reason (Sababli/Sababsiz)', max_length=20)),
+                ('comment', models.TextField(blank=True, help_text='Comment', null=True)),
+                ('amount', models.CharField(blank=True, help_text='Attendance counted amount ...', max_length=50, null=True)),
+                ('attended_at', models.DateTimeField(blank=True, null=True)),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+    ]
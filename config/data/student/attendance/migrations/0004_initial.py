@@ -0,0 +1,85 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('attendance', '0003_initial'),
+        ('filial', '0001_initial'),
+        ('groups', '0002_initial'),
+        ('new_lid', '0001_initial'),
+        ('student', '0001_initial'),
+        ('studentgroup', '0001_initial'),
+        ('subject', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='lead',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attendances', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attendances', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='student_group',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='attendances', to='studentgroup.studentgroup'),
+        ),
+        migrations.AddField(
+            model_name='secondaryattendance',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='secondaryattendance',
+            name='group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attendances', to='groups.secondarygroup'),
+        ),
+        migrations.AddField(
+            model_name='secondaryattendance',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='secondary_attendances', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='secondaryattendance',
+            name='theme',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='secondary_group_attendance', to='subject.theme'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['student', '-created_at'], name='att_student_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['group', 'date'], name='att_live_group_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['student', 'group', '-date'], name='att_student_group_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='attendance_attendance_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.UniqueConstraint(condition=models.Q(('student__isnull', False)), fields=('date', 'group', 'student'), name='attendance_unique_date_group_student'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.UniqueConstraint(condition=models.Q(('lead__isnull', False)), fields=('date', 'group', 'lead'), name='attendance_unique_date_group_lead'),
+        ),
+        migrations.AddConstraint(
+            model_name='secondaryattendance',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='attendance_secondaryattendance_arch_ts_chk'),
+        ),
+    ]
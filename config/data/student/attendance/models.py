@@ -83,6 +83,22 @@ class Attendance(BaseModel):
         return f" Attendance(date={self.date.strftime("%d/%m/%Y")} st={self.student} gr={self.group})"
 
     class Meta(BaseModel.Meta):
+        indexes = [
+            # a student's attendance history, newest first
+            models.Index(
+                fields=["student", "-created_at"], name="att_student_created_idx"
+            ),
+            # group journal of a day / date range
+            models.Index(
+                fields=["group", "date"],
+                condition=Q(is_archived=False),
+                name="att_live_group_date_idx",
+            ),
+            # streaks: a student's attendances in one group by date
+            models.Index(
+                fields=["student", "group", "-date"], name="att_student_group_date_idx"
+            ),
+        ]
         constraints = [
             *BaseModel.Meta.constraints,
             # Exactly one of student or lid must be set (XOR)
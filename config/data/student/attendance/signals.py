@@ -3,7 +3,7 @@ from datetime import timedelta
 from decimal import Decimal
 from threading import local
 
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from icecream import ic
@@ -18,6 +18,7 @@ from data.exam_results.models import UnitTest
 from data.finances.finance.models import Finance, Kind, SaleStudent
 from data.notifications.models import Notification
 from data.parents.models import Relatives
+from data.student.studentgroup import streaks
 
 _signal_state = local()
 
@@ -335,14 +336,8 @@ def on_attendance(sender, instance: Attendance, **kwargs):
     - Create a new LESSON_PAYMENT if status is IS_PRESENT
     """
 
-    try:
-        old_instance = Attendance.objects.get(pk=instance.pk)
-        status_changed = old_instance.status != instance.status
-    except Attendance.DoesNotExist:
-        # New attendance, consider status as changed
-        status_changed = True
-
-    if not status_changed:
+    # New attendance, consider status as changed
+    if not instance._state.adding and not instance.has_changed("status"):
         return
 
     teacher = instance.group.teacher
@@ -493,3 +488,20 @@ def on_unit_test(sender, instance: Attendance, created, **kwargs):
             args=[unit_test.id, instance.group.id],
             eta=timezone.now() + timedelta(minutes=1),
         )
+
+
+_STREAK_FIELDS = ["date", "status", "group", "student", "lead"]
+
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def on_attendance_streak(sender, instance: Attendance, **kwargs):
+    # StudentGroup.current_absence_streak of the row's student (or lead)
+    changed = kwargs["signal"] is post_delete or kwargs["created"]
+    if not changed and not any(instance.has_changed(f) for f in _STREAK_FIELDS):
+        return
+
+    streaks.touched(instance.group_id, instance.student_id, instance.lead_id)
+    old = [instance.old_value(f) for f in ("group", "student", "lead")]
+    if old != [instance.group_id, instance.student_id, instance.lead_id]:
+        streaks.touched(*old)
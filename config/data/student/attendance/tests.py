@@ -1,3 +1,109 @@
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from data.account.models import CustomUser
+from data.employee.models import EmployeeTransaction
+from data.student.attendance.bulk import submit_group_day
+from data.student.attendance.models import Attendance
+from data.student.attendance.v2.serializers import CreateAttendanceV2Serializer
+from data.student.course.models import Course
+from data.student.groups.models import Group, Room
+from data.student.mastering.models import Mastering
+from data.student.student.models import Student
+from data.student.studentgroup.models import StudentGroup
+from data.student.subject.models import Subject, Theme
+
+
+class SubmitGroupDayTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        subject = Subject.objects.create(name="English", is_language=True)
+        course = Course.objects.create(name="English 1", subject=subject)
+        cls.theme = Theme.objects.create(
+            subject=subject, course=course, title="Present simple", description="-"
+        )
+        cls.teacher = CustomUser.objects.create(
+            phone="+998900000021", role="TEACHER", f_t_lesson_payment_percent=10
+        )
+        cls.group = Group.objects.create(
+            name="A",
+            course=course,
+            teacher=cls.teacher,
+            room_number=Room.objects.create(room_number="1"),
+            status="ACTIVE",
+        )
+        # bulk_create: no Student signals, every student is past the new stage
+        students = Student.objects.bulk_create(
+            Student(
+                first_name=f"Student {i}",
+                phone=f"+99891000000{i}",
+                student_stage_type="ACTIVE_STUDENT",
+                balance_status="ACTIVE",
+                balance=500000,
+            )
+            for i in range(4)
+        )
+        cls.student_groups = StudentGroup.objects.bulk_create(
+            StudentGroup(group=cls.group, student=student, price=100000)
+            for student in students
+        )
+
+    def _submit(self, *statuses):
+        items = [
+            {"student": student_group, "status": status}
+            for student_group, status in zip(self.student_groups, statuses)
+        ]
+        return submit_group_day(self.group, date(2026, 3, 2), self.theme, False, items)
+
+    def _lesson_payments(self):
+        return EmployeeTransaction.objects.filter(
+            employee_id=self.teacher.pk, reason="LESSON_PAYMENT", is_archived=False
+        )
+
+    def test_first_submission_books_the_present_students(self):
+        result = self._submit("IS_PRESENT", "IS_PRESENT", "UNREASONED", "REASONED")
+
+        self.assertEqual(result["created"], 4)
+        self.assertEqual(Attendance.objects.filter(group=self.group).count(), 4)
+        self.assertEqual(
+            sorted(self._lesson_payments().values_list("amount", flat=True)),
+            [Decimal("10000.00"), Decimal("10000.00")],
+        )
+        self.teacher.refresh_from_db()
+        self.assertEqual(self.teacher.balance, Decimal("20000.00"))
+        # a Homework and a Speaking placeholder per student of a language course
+        self.assertEqual(Mastering.objects.filter(ball=0).count(), 8)
+
+    def test_resubmission_only_rebooks_changed_statuses(self):
+        self._submit("IS_PRESENT", "IS_PRESENT", "UNREASONED", "REASONED")
+        result = self._submit("IS_PRESENT", "UNREASONED", "IS_PRESENT", "REASONED")
+
+        self.assertEqual(result, {"created": 0, "changed": 2, "notifications": 0})
+        self.assertEqual(Attendance.objects.filter(group=self.group).count(), 4)
+        payments = self._lesson_payments()
+        self.assertEqual(payments.count(), 2)
+        self.assertEqual(
+            set(payments.values_list("student_id", flat=True)),
+            {self.student_groups[0].student_id, self.student_groups[2].student_id},
+        )
+        self.teacher.refresh_from_db()
+        self.assertEqual(self.teacher.balance, Decimal("20000.00"))
+        self.assertEqual(Mastering.objects.count(), 8)
+
+    def test_a_repeated_student_is_rejected(self):
+        student_group = self.student_groups[0]
+        serializer = CreateAttendanceV2Serializer(
+            data={
+                "group": self.group.pk,
+                "theme": self.theme.pk,
+                "items": [
+                    {"student": student_group.pk, "status": "IS_PRESENT"},
+                    {"student": student_group.pk, "status": "UNREASONED"},
+                ],
+            }
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("items", serializer.errors)
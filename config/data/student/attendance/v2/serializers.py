@@ -34,6 +34,19 @@ class CreateAttendanceV2Serializer(serializers.Serializer):
 
     repeated = serializers.BooleanField(default=False)
 
+    def validate_items(self, items):
+        # one attendance per student / lead and day
+        seen = set()
+        for item in items:
+            student_group: StudentGroup = item["student"]
+            key = (student_group.student_id, student_group.lid_id)
+            if key in seen:
+                raise serializers.ValidationError(
+                    "Bitta talaba yoki lid bir kunda faqat bir marta belgilanadi."
+                )
+            seen.add(key)
+        return items
+
     def validate(self, attrs: Dict):
         group: Group = attrs["group"]
         d = attrs.get("date") or _date.today()
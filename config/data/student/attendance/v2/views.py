@@ -1,7 +1,6 @@
 from typing import Dict
 from django.db import transaction
 from django.utils import timezone
-from datetime import date as _date
 
 from django.db.models import Q, Count
 
@@ -14,6 +13,7 @@ from rest_framework.exceptions import NotFound
 from rest_framework import status as rest_framwork_status
 
 
+from data.student.attendance.bulk import submit_group_day
 from data.student.attendance.models import Attendance
 from data.student.attendance.v2.serializers import (
     AttendanceGroupStateSerializer,
@@ -23,10 +23,6 @@ from data.student.attendance.v2.serializers import (
 from data.student.subject.models import Level
 
 from data.student.groups.models import Group
-from data.student.homeworks.models import Homework, Homework_history
-from data.student.mastering.models import Mastering
-from data.student.quiz.models import Quiz
-from data.student.studentgroup.models import StudentGroup
 from data.student.subject.models import Theme
 
 from rest_framework.response import Response
@@ -49,66 +45,9 @@ class AttendanceCreateAPIView(APIView):
 
         items = data["items"]
 
-        homework = Homework.objects.filter(theme=theme).first()
-        quiz = Quiz.objects.filter(homework=homework).first()
-
         with transaction.atomic():
 
-            lesson, created = group.lessons.update_or_create(
-                date=date,
-                defaults=dict(
-                    theme=theme,
-                    is_repeat=repeated,
-                ),
-            )
-
-            for item in items:
-
-                student_group: "StudentGroup" = item["student"]
-
-                status = item["status"]
-                comment = item.get("comment")
-
-                attendance, created = Attendance.objects.update_or_create(
-                    student_group=student_group,
-                    student=student_group.student,
-                    lead=student_group.lid,
-                    date=date,
-                    group=group,
-                    defaults=dict(
-                        status=status,
-                        comment=comment,
-                        first_lesson=student_group.first_lesson,
-                    ),
-                )
-
-                if created:
-                    if student_group.student != None and homework:
-                        Homework_history.objects.create(
-                            homework=homework,
-                            student=student_group.student,
-                            status="Passed",
-                            mark=0,
-                        )
-
-                    mastering = Mastering.objects.create(
-                        student=student_group.student,
-                        lid=student_group.lid,
-                        theme=theme,
-                        test=quiz,
-                        ball=0,
-                    )
-
-                    if theme.course.subject.is_language:
-
-                        Mastering.objects.create(
-                            student=student_group.student,
-                            lid=student_group.lid,
-                            theme=theme,
-                            test=None,
-                            choice="Speaking",
-                            ball=0,
-                        )
+            submit_group_day(group, date, theme, repeated, items)
 
             self._check_and_change_to_next_level(group)
 
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('course', '0001_initial'),
+        ('subject', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='level',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='courses_level', to='subject.level'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='subject',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='subject.subject'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='theme',
+            field=models.ManyToManyField(blank=True, related_name='courses', to='subject.theme'),
+        ),
+        migrations.AddConstraint(
+            model_name='course',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='course_course_arch_ts_chk'),
+        ),
+    ]
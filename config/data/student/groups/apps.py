@@ -7,3 +7,4 @@ class GroupsConfig(AppConfig):
 
     def ready(self):
         import data.student.groups.signals
+        import data.student.groups.timetable
@@ -0,0 +1,19 @@
+"""
+Week days by name (see data.command.reference); Day.name is unique.
+"""
+
+from data.command.reference import Reference
+from data.student.groups.models import Day
+
+days: Reference[dict] = Reference(
+    "groups.days", lambda: dict(Day.objects.values_list("name", "id")), Day
+)
+
+
+def day_ids() -> dict:
+    """{name: id}"""
+    return days.get()
+
+
+def day_id(name: str):
+    return days.get().get(name)
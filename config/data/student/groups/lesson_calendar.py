@@ -0,0 +1,321 @@
+"""
+Planned lesson dates of groups.
+
+A group's plan is its first ``total`` lesson days from ``start_date``: every
+scheduled weekday, skipping holidays, where ``total`` is the number of live
+themes of its course and level plus its repeated lessons. The dates are
+produced a week at a time from the weekday set instead of walking the
+calendar day by day, and kept as a sorted tuple, so the nth lesson is an
+index and "lessons between two dates" a pair of bisects.
+
+Plans are built for many groups with four queries and cached per group; the
+key carries a per-group version bumped by the signals below (schedule,
+course/level, repeats, themes) and a global holidays version.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from data.command.reference import CACHE_ALIAS
+from data.student.groups.models import Group, GroupLesson, Holiday
+from data.student.subject.models import Theme
+
+CALENDAR_TIMEOUT = 24 * 60 * 60
+
+
+def _cache():
+    # the shared cache: a version bump must reach every web and Celery
+    # process, not only the one that saved the change
+    return caches[CACHE_ALIAS]
+
+# Day.name -> date.weekday()
+UZBEK_WEEKDAYS = {
+    "Dushanba": 0,
+    "Seshanba": 1,
+    "Chorshanba": 2,
+    "Payshanba": 3,
+    "Juma": 4,
+    "Shanba": 5,
+    "Yakshanba": 6,
+}
+
+
+def _as_date(value: date | datetime) -> date:
+    if isinstance(value, datetime):
+        return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+    return value
+
+
+def lesson_days(start: date, weekdays, skip=()):
+    """Scheduled days from ``start`` on, week by week, without ``skip``."""
+    weekdays = sorted(set(weekdays))
+    if not weekdays:
+        return
+    skip = set(skip)
+    monday = start - timedelta(days=start.weekday())
+    while True:
+        for weekday in weekdays:
+            day = monday + timedelta(days=weekday)
+            if day >= start and day not in skip:
+                yield day
+        monday += timedelta(weeks=1)
+
+
+def plan(start: date, weekdays, total: int, skip=()) -> tuple[date, ...]:
+    """The first ``total`` lesson days from ``start``."""
+    dates = []
+    if total > 0:
+        for day in lesson_days(start, weekdays, skip):
+            dates.append(day)
+            if len(dates) == total:
+                break
+    return tuple(dates)
+
+
+class LessonCalendar:
+    """A group's planned lesson dates, ascending."""
+
+    def __init__(self, dates):
+        self.dates = tuple(dates)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __eq__(self, other):
+        return isinstance(other, LessonCalendar) and self.dates == other.dates
+
+    @property
+    def finish(self) -> date | None:
+        return self.dates[-1] if self.dates else None
+
+    def nth(self, n: int) -> date | None:
+        """Date of the ``n``th lesson (1-based)."""
+        return self.dates[n - 1] if 0 < n <= len(self.dates) else None
+
+    def number(self, day: date) -> int:
+        """How many lessons were planned up to and including ``day``."""
+        return bisect_right(self.dates, day)
+
+    def between(self, first: date, last: date) -> tuple[date, ...]:
+        """Lesson dates from ``first`` to ``last`` inclusive."""
+        start = bisect_left(self.dates, first)
+        return self.dates[start : bisect_right(self.dates, last)]
+
+    def count_between(self, first: date, last: date) -> int:
+        return max(0, bisect_right(self.dates, last) - bisect_left(self.dates, first))
+
+    def next_after(self, day: date) -> date | None:
+        index = bisect_right(self.dates, day)
+        return self.dates[index] if index < len(self.dates) else None
+
+
+# ---------- holidays ----------
+
+HOLIDAYS_VERSION_KEY = "groups:holidays_version"
+
+
+def _holidays_version():
+    return _cache().get(HOLIDAYS_VERSION_KEY, 0)
+
+
+def holidays() -> dict:
+    """{filial id or None: [dates]}; None holds the days off of every filial."""
+    key = f"groups:holidays:{_holidays_version()}"
+    result = _cache().get(key)
+    if result is None:
+        result = defaultdict(list)
+        for filial_id, day in Holiday.objects.filter(is_archived=False).values_list(
+            "filial_id", "date"
+        ):
+            result[filial_id and str(filial_id)].append(day)
+        result = dict(result)
+        _cache().set(key, result, CALENDAR_TIMEOUT)
+    return result
+
+
+def holiday_dates(filial=None) -> list[date]:
+    """Days off of ``filial``, the common ones included."""
+    days = holidays()
+    return sorted(set(days.get(None, [])) | set(days.get(filial and str(filial), [])))
+
+
+# ---------- group plans ----------
+
+
+def _build(group_ids) -> dict:
+    """{group id: LessonCalendar} for ``group_ids``."""
+    rows = Group.objects.filter(pk__in=group_ids).values_list(
+        "id",
+        "filial_id",
+        "course_id",
+        "level_id",
+        "start_date",
+        "scheduled_day_type__name",
+    )
+    groups, weekdays = {}, defaultdict(set)
+    for group_id, filial_id, course_id, level_id, start_date, day in rows:
+        groups[group_id] = (filial_id, course_id, level_id, start_date)
+        if day in UZBEK_WEEKDAYS:
+            weekdays[group_id].add(UZBEK_WEEKDAYS[day])
+
+    course_levels = Q()
+    for _, course_id, level_id, _ in groups.values():
+        course_levels |= Q(course_id=course_id, level_id=level_id)
+    themes = Counter()
+    if groups:
+        for course_id, level_id, count in (
+            Theme.objects.filter(course_levels, is_archived=False)
+            .values_list("course_id", "level_id")
+            .annotate(count=Count("id"))
+            .order_by()
+        ):
+            themes[course_id, level_id] = count
+
+    repeats = dict(
+        GroupLesson.objects.filter(group_id__in=groups, is_repeat=True)
+        .values_list("group_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    calendars = {}
+    for group_id, (filial_id, course_id, level_id, start_date) in groups.items():
+        total = themes[course_id, level_id] + repeats.get(group_id, 0)
+        calendars[str(group_id)] = LessonCalendar(
+            plan(
+                _as_date(start_date),
+                weekdays[group_id],
+                total,
+                holiday_dates(filial_id),
+            )
+            if start_date
+            else ()
+        )
+    return calendars
+
+
+def _version_key(group_id) -> str:
+    return f"groups:calendar_version:{group_id}"
+
+
+def _calendar_key(group_id, version, holidays_version) -> str:
+    return f"groups:calendar:{group_id}:{version}:{holidays_version}"
+
+
+def group_calendars(group_ids) -> dict:
+    """{group id (str): LessonCalendar}, from the cache where possible."""
+    ids = list(dict.fromkeys(str(group_id) for group_id in group_ids if group_id))
+    holidays_version = _holidays_version()
+    versions = _cache().get_many([_version_key(group_id) for group_id in ids])
+    keys = {
+        group_id: _calendar_key(
+            group_id, versions.get(_version_key(group_id), 0), holidays_version
+        )
+        for group_id in ids
+    }
+
+    cached = _cache().get_many(list(keys.values()))
+    calendars = {
+        group_id: LessonCalendar(cached[key])
+        for group_id, key in keys.items()
+        if key in cached
+    }
+
+    missing = [group_id for group_id in ids if group_id not in calendars]
+    if missing:
+        built = _build(missing)
+        _cache().set_many(
+            {keys[group_id]: calendar.dates for group_id, calendar in built.items()},
+            CALENDAR_TIMEOUT,
+        )
+        calendars.update(built)
+
+    return calendars
+
+
+def group_calendar(group) -> LessonCalendar:
+    group_id = str(getattr(group, "pk", group))
+    return group_calendars([group_id]).get(group_id, LessonCalendar(()))
+
+
+def finish_datetime(group: Group) -> datetime | None:
+    """Group.finish_date from the plan: the last lesson day at start_date's time."""
+    finish = group_calendar(group).finish
+    if finish is None or group.start_date is None:
+        return None
+    return group.start_date + timedelta(days=(finish - _as_date(group.start_date)).days)
+
+
+# ---------- invalidation ----------
+
+
+def invalidate(*group_ids):
+    for group_id in {str(group_id) for group_id in group_ids if group_id}:
+        key = _version_key(group_id)
+        try:
+            _cache().incr(key)
+        except ValueError:
+            _cache().set(key, 1, None)
+
+
+@receiver(post_save, sender=Group)
+def on_group_change(sender, instance: Group, created: bool, **kwargs):
+    if created or any(
+        instance.has_changed(field)
+        for field in ("start_date", "course", "level", "filial")
+    ):
+        invalidate(instance.pk)
+
+
+@receiver(m2m_changed, sender=Group.scheduled_day_type.through)
+def on_group_days_change(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        invalidate(*(kwargs["pk_set"] or []))
+    else:
+        invalidate(instance.pk)
+
+
+@receiver(post_save, sender=GroupLesson)
+@receiver(post_delete, sender=GroupLesson)
+def on_repeat_change(sender, instance: GroupLesson, **kwargs):
+    if instance.is_repeat or instance.has_changed("is_repeat"):
+        invalidate(instance.group_id, instance.old_value("group"))
+
+
+@receiver(post_save, sender=Theme)
+@receiver(post_delete, sender=Theme)
+def on_theme_change(sender, instance: Theme, **kwargs):
+    if kwargs["signal"] is post_save and not kwargs["created"]:
+        if not any(
+            instance.has_changed(field) for field in ("course", "level", "is_archived")
+        ):
+            return
+
+    course_levels = {
+        (instance.course_id, instance.level_id),
+        (instance.old_value("course"), instance.old_value("level")),
+    }
+    query = Q()
+    for course_id, level_id in course_levels:
+        if course_id:
+            query |= Q(course_id=course_id, level_id=level_id)
+    if query:
+        invalidate(*Group.objects.filter(query).values_list("id", flat=True))
+
+
+@receiver(post_save, sender=Holiday)
+@receiver(post_delete, sender=Holiday)
+def on_holiday_change(sender, instance: Holiday, **kwargs):
+    try:
+        _cache().incr(HOLIDAYS_VERSION_KEY)
+    except ValueError:
+        _cache().set(HOLIDAYS_VERSION_KEY, 1, None)
@@ -1,5 +1,8 @@
 from collections import defaultdict
-from datetime import timedelta, datetime
+from datetime import datetime
+
+from data.student.groups.lesson_calendar import UZBEK_WEEKDAYS
+from data.student.groups.lesson_calendar import lesson_days as calendar_days
 
 
 def calculate_lessons(start_date, end_date: None, lesson_type, holidays, days_off):
@@ -26,55 +29,24 @@ def calculate_lessons(start_date, end_date: None, lesson_type, holidays, days_of
     # if end_date is None:
     #     end_date = today() + timedelta(days=365)
 
-    holidays = set(datetime.strptime(date, "%Y-%m-%d") for date in holidays if date)
+    holidays = {datetime.strptime(date, "%Y-%m-%d") for date in holidays if date}
 
     days_off_numbers = {
-        [
-            "Dushanba",
-            "Seshanba",
-            "Chorshanba",
-            "Payshanba",
-            "Juma",
-            "Shanba",
-            "Yakshanba",
-        ].index(day)
-        for day in days_off
+        UZBEK_WEEKDAYS[day] for day in days_off if day in UZBEK_WEEKDAYS
     }
 
     lesson_days = [day.strip() for day in lesson_type.split(",")]
 
     lesson_day_numbers = {
-        [
-            "Dushanba",
-            "Seshanba",
-            "Chorshanba",
-            "Payshanba",
-            "Juma",
-            "Shanba",
-            "Yakshanba",
-        ].index(day)
-        for day in lesson_days
-    }
-
-    all_dates = [
-        start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)
-    ]
-
-    lesson_days_in_range = [
-        date for date in all_dates if date.weekday() in lesson_day_numbers
-    ]
-
-    # Filter out holidays and days off
-    valid_dates = [
-        date
-        for date in lesson_days_in_range
-        if date not in holidays and date.weekday() not in days_off_numbers
-    ]
+        UZBEK_WEEKDAYS[day] for day in lesson_days if day in UZBEK_WEEKDAYS
+    } - days_off_numbers
 
-    # Group by month
+    # Filter out holidays and days off; dates come a week at a time
     grouped_schedule = defaultdict(list)
-    for date in valid_dates:
-        grouped_schedule[date.strftime("%Y-%m")]  # Use Year-Month format as the key
+    for date in calendar_days(start_date, lesson_day_numbers, holidays):
+        if date > end_date:
+            break
+        # Group by month, Year-Month format as the key
         grouped_schedule[date.strftime("%Y-%m")].append(date.strftime("%Y-%m-%d"))
 
     return dict(grouped_schedule)
@@ -0,0 +1,69 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('employee', '0003_initial'),
+        ('filial', '0001_initial'),
+        ('groups', '0001_initial'),
+        ('subject', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='level',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='groups_level', to='subject.level'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='scheduled_day_type',
+            field=models.ManyToManyField(to='groups.day'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='secondary_teacher',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='secondary_teacher', to='employee.employee'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='start_theme',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='subject.theme'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='teacher',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='teachers_groups', to='employee.employee'),
+        ),
+        migrations.AddField(
+            model_name='grouplesson',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='grouplesson',
+            name='group',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lessons', to='groups.group'),
+        ),
+        migrations.AddField(
+            model_name='grouplesson',
+            name='theme',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='lessons', to='subject.theme'),
+        ),
+        migrations.AddField(
+            model_name='groupsalestudent',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='groupsalestudent',
+            name='group',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sale_student_group', to='groups.group'),
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('employee', '0004_initial'),
+        ('filial', '0001_initial'),
+        ('groups', '0002_initial'),
+        ('new_lid', '0001_initial'),
+        ('student', '0001_initial'),
+        ('studentgroup', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='groupsalestudent',
+            name='lid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sale_student_lid', to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='groupsalestudent',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sale_student_student', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='groupsalestudent',
+            name='student_group',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='group_sale_students', to='studentgroup.studentgroup'),
+        ),
+        migrations.AddField(
+            model_name='holiday',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='room_number',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='groups.room'),
+        ),
+        migrations.AddField(
+            model_name='secondarygroup',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='secondarygroup',
+            name='group',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='groups.group'),
+        ),
+        migrations.AddField(
+            model_name='secondarygroup',
+            name='scheduled_day_type',
+            field=models.ManyToManyField(related_name='secondary_scheduled_day_type', to='groups.day'),
+        ),
+        migrations.AddField(
+            model_name='secondarygroup',
+            name='teacher',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='employee.employee'),
+        ),
+        migrations.AddConstraint(
+            model_name='day',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='groups_day_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='grouplesson',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='groups_grouplesson_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='grouplesson',
+            constraint=models.UniqueConstraint(fields=('group', 'date'), name='unique_group_date'),
+        ),
+        migrations.AddConstraint(
+            model_name='grouplesson',
+            constraint=models.UniqueConstraint(fields=('group', 'theme', 'is_repeat'), name='unique_group_theme'),
+        ),
+        migrations.AddConstraint(
+            model_name='groupsalestudent',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='groups_groupsalestudent_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='holiday',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='groups_holiday_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='room',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='groups_room_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='group',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='groups_group_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='secondarygroup',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='groups_secondarygroup_arch_ts_chk'),
+        ),
+    ]
@@ -50,6 +50,28 @@ class Day(BaseModel):
         return f"Day({self.name} index={self.index})"
 
 
+class Holiday(BaseModel):
+    """Dam olish kuni: shu kuni darslar o'tilmaydi (filial bo'sh bo'lsa, hammasida)"""
+
+    date = models.DateField()
+
+    name = models.CharField(max_length=255, null=True, blank=True)
+
+    class Meta(BaseModel.Meta):
+        ordering = ["date"]
+
+    class Admin(admin.ModelAdmin):
+
+        list_display = ["date", "name", "filial"]
+
+        list_filter = ["filial"]
+
+        date_hierarchy = "date"
+
+    def __str__(self):
+        return f"{self.date} {self.name or ''}".strip()
+
+
 def one_year_from_now():
     return timezone.now() + timedelta(days=365)
 
@@ -3,6 +3,7 @@ from datetime import date
 from django.db.models import Count, Q
 from rest_framework import serializers
 
+from . import lesson_calendar, timetable
 from .lesson_date_calculator import calculate_lessons
 from .models import Group, Day, Room, SecondaryGroup, GroupSaleStudent
 from .room_filings_calculate import calculate_room_filling_statistics
@@ -17,6 +18,18 @@ from data.account.models import CustomUser
 from data.account.serializers import UserSerializer
 from data.lid.new_lid.models import Lid
 
+# GroupSerializer fields that can make a group clash with another one
+SCHEDULE_FIELDS = {
+    "scheduled_day_type",
+    "started_at",
+    "ended_at",
+    "start_date",
+    "finish_date",
+    "room_number",
+    "teacher",
+    "status",
+    "is_archived",
+}
 
 class DaySerializer(serializers.ModelSerializer):
     class Meta:
@@ -188,6 +201,67 @@ class GroupSerializer(serializers.ModelSerializer):
 
         return res
 
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+
+        # a change that does not touch the schedule (a rename, say) is not
+        # blocked by a conflict the group already has
+        if self.instance is not None and not SCHEDULE_FIELDS.intersection(attrs):
+            return attrs
+
+        def value(name):
+            return attrs[name] if name in attrs else getattr(self.instance, name, None)
+
+        if "scheduled_day_type" in attrs:
+            days = attrs["scheduled_day_type"]
+        elif self.instance is not None:
+            days = self.instance.scheduled_day_type.all()
+        else:
+            days = []
+
+        started_at, ended_at = value("started_at"), value("ended_at")
+        if (
+            value("status") == "INACTIVE"
+            or value("is_archived")
+            or not started_at
+            or not ended_at
+            or ended_at <= started_at
+        ):
+            return attrs
+
+        start_date, finish_date = value("start_date"), value("finish_date")
+        room, teacher = value("room_number"), value("teacher")
+        found = timetable.conflicts(
+            timetable.weekdays_of(days),
+            started_at,
+            ended_at,
+            room=room.pk if room else None,
+            teacher=teacher.pk if teacher else None,
+            first=start_date.date() if start_date else None,
+            last=finish_date.date() if finish_date else None,
+            exclude=self.instance.pk if self.instance else None,
+        )
+        if found["room"] or found["teacher"]:
+            names = {
+                str(pk): name
+                for pk, name in Group.objects.filter(
+                    pk__in=found["room"] + found["teacher"]
+                ).values_list("id", "name")
+            }
+            errors = {}
+            for field, key, message in (
+                ("room_number", "room", "Xona bu vaqtda band"),
+                ("teacher", "teacher", "O'qituvchining bu vaqtda darsi bor"),
+            ):
+                if found[key]:
+                    groups = ", ".join(
+                        names.get(group_id, group_id) for group_id in found[key]
+                    )
+                    errors[field] = f"{message}! Guruhlar: {groups}."
+            raise serializers.ValidationError(errors)
+
+        return attrs
+
     def create(self, validated_data):
         status = validated_data.pop("status", None)
         scheduled_day_type_data = validated_data.pop("scheduled_day_type", [])
@@ -264,8 +338,8 @@ class GroupLessonSerializer(serializers.ModelSerializer):
         ]  # Assuming 'name' stores the weekday name (e.g., 'Monday')
 
         holidays = [
-            ""
-        ]  # Replace with actual logic to fetch holidays, e.g., from another model
+            day.isoformat() for day in lesson_calendar.holiday_dates(obj.filial_id)
+        ]
         days_off = ["Yakshanba"]  # Replace or fetch from settings/config
 
         if start_date and end_date:
@@ -1,13 +1,11 @@
-from datetime import timedelta
-
-from data.student.groups.utils import calculate_finish_date
+from data.student.groups import lesson_calendar
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 
-from .models import Group, GroupLesson, SecondaryGroup, Day, GroupSaleStudent
+from .cache import day_ids
+from .models import Group, GroupLesson, SecondaryGroup, GroupSaleStudent
 from data.student.studentgroup.models import StudentGroup, SecondaryStudentGroup
-from data.student.subject.models import Theme
-from data.account.models import CustomUser
+from data.account.cache import director_id
 
 # from data.department.marketing_channel.models import Group_Type
 from data.finances.finance.models import SaleStudent, Sale
@@ -40,9 +38,10 @@ def on_create(sender, instance: Group, created, **kwargs):
             else:
                 week_days = ["Dushanba", "Chorshanba", "Juma"]
 
-            day_objs = Day.objects.filter(name__in=week_days)
-
-            secondary.scheduled_day_type.set(day_objs)
+            ids = day_ids()
+            secondary.scheduled_day_type.set(
+                [ids[name] for name in week_days if name in ids]
+            )
         else:
             secondary.scheduled_day_type.clear()
 
@@ -98,12 +97,7 @@ def on_group_price_change(sender, instance: Group, created: bool, **kwargs):
     if created:
         return
 
-    try:
-        old_instance = Group.objects.get(pk=instance.pk)
-    except Group.DoesNotExist:
-        return
-
-    if old_instance.price != instance.price:
+    if instance.has_changed("price"):
         price = instance.price
 
         group_students = GroupSaleStudent.objects.filter(group=instance)
@@ -113,50 +107,14 @@ def on_group_price_change(sender, instance: Group, created: bool, **kwargs):
             student.save()
 
 
-UZBEK_WEEKDAYS = [
-    "Dushanba",
-    "Seshanba",
-    "Chorshanba",
-    "Payshanba",
-    "Juma",
-    "Shanba",
-    "Yakshanba",
-]
-
-
 @receiver(post_save, sender=Group)
 def group_finish_date(sender, instance: Group, created: bool, **kwargs):
     if created and instance.finish_date is None:
-        themes = Theme.objects.filter(
-            course=instance.course, level=instance.level, is_archived=False
-        )
-        total_lessons = themes.count()
-
-        scheduled_days = (
-            instance.scheduled_day_type.all()
-        )  # Assume this gives Uzbek day names
-        scheduled_day_numbers = [
-            UZBEK_WEEKDAYS.index(day.name)
-            for day in scheduled_days
-            if day.name in UZBEK_WEEKDAYS
-        ]
-
-        if not scheduled_day_numbers:
+        finish_date = lesson_calendar.finish_datetime(instance)
+        if finish_date is None:
             return  # Can't calculate finish date without schedule
 
-        start_date = instance.start_date
-        finish_date = start_date
-        lessons_scheduled = 0
-
-        while lessons_scheduled < total_lessons:
-            if finish_date.weekday() in scheduled_day_numbers:
-                lessons_scheduled += 1
-            finish_date += timedelta(days=1)
-
-        instance.finish_date = finish_date - timedelta(
-            days=1
-        )  # subtract last extra day
-
+        instance.finish_date = finish_date
         instance.save(update_fields=["finish_date"])
 
 
@@ -165,9 +123,9 @@ def add_sales_student(sender, instance: GroupSaleStudent, created: bool, **kwarg
     if created:
 
         amount = instance.group.price - instance.amount
-        creator = CustomUser.objects.filter(role="DIRECTOR").first()
+        creator_id = director_id()
         sale = Sale.objects.create(
-            creator=creator,
+            creator_id=creator_id,
             name="Sale",
             status="ACTIVE",
             amount=amount,
@@ -176,7 +134,7 @@ def add_sales_student(sender, instance: GroupSaleStudent, created: bool, **kwarg
             student=instance.student if instance.student else None,
             sale=sale,
             lid=instance.lid if instance.lid else None,
-            creator=creator,
+            creator_id=creator_id,
         )
 
 
@@ -189,31 +147,14 @@ def change_group_finish_date_on_repeat(
 
     group = instance.group
 
-    scheduled_days = group.scheduled_day_type.all()
-    scheduled_day_numbers = [
-        UZBEK_WEEKDAYS.index(day.name)
-        for day in scheduled_days
-        if day.name in UZBEK_WEEKDAYS
-    ]
-    if not scheduled_day_numbers:
-        return
-
-    current_finish_date = group.finish_date
-
     """
         Here goes the logic of exteding the group finished date 
         when lesson is repeated we should extend group finished date by one lesson
     """
 
-    if current_finish_date is not None:
-        default_number_of_repeated_number = group.lessons.filter(is_repeat=True).count()
-        finish_date_after_repeated = calculate_finish_date(
-            course=instance.group.course,
-            level=instance.group.level,
-            week_days=instance.group.scheduled_day_type.all(),
-            start_date=instance.group.start_date,
-            number_of_repeated_lessons=default_number_of_repeated_number,
-        )
-
-        group.finish_date = finish_date_after_repeated
-        group.save(update_fields=["finish_date"])
+    if group.finish_date is not None:
+        # the plan counts the repeats, lesson_calendar dropped it on this save
+        finish_date = lesson_calendar.finish_datetime(group)
+        if finish_date is not None and finish_date != group.finish_date:
+            group.finish_date = finish_date
+            group.save(update_fields=["finish_date"])
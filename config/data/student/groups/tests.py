@@ -1,3 +1,260 @@
-from django.test import TestCase
+from datetime import date, datetime, time
 
-# Create your tests here.
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from data.account.models import CustomUser
+from data.department.filial.models import Filial
+from data.student.course.models import Course
+from data.student.groups import lesson_calendar, timetable
+from data.student.groups.models import (
+    Day,
+    Group,
+    GroupLesson,
+    Holiday,
+    Room,
+    SecondaryGroup,
+)
+from data.student.groups.serializers import GroupSerializer
+from data.student.subject.models import Subject, Theme
+
+
+class TimetableTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create: no Filial signals
+        [cls.filial] = Filial.objects.bulk_create([Filial(name="Main")])
+        cls.monday = Day.objects.create(name="Dushanba", display_name="Du", index=1)
+        cls.tuesday = Day.objects.create(name="Seshanba", display_name="Se", index=2)
+        cls.room, cls.other_room = Room.objects.bulk_create(
+            [
+                Room(room_number="1", filial=cls.filial),
+                Room(room_number="2", filial=cls.filial),
+            ]
+        )
+        cls.teacher = CustomUser.objects.create(
+            phone="+998900000001", role="TEACHER"
+        )
+        cls.assistant = CustomUser.objects.create(
+            phone="+998900000002", role="ASSISTANT"
+        )
+        subject = Subject.objects.create(name="Math")
+        cls.course = Course.objects.create(name="Math 1", subject=subject)
+
+    def _group(self, started_at, ended_at, days, room=None, **kwargs):
+        group = Group.objects.create(
+            name=f"{started_at}-{ended_at}",
+            course=self.course,
+            room_number=room or self.room,
+            started_at=started_at,
+            ended_at=ended_at,
+            **kwargs,
+        )
+        group.scheduled_day_type.set(days)
+        return group
+
+    def test_occupancy_merges_sessions_of_a_room(self):
+        first = self._group(time(9), time(10, 30), [self.monday])
+        second = self._group(time(10), time(11, 30), [self.monday, self.tuesday])
+        self._group(time(9), time(11), [self.monday], status="INACTIVE")
+
+        rooms = timetable.filial_rooms(self.filial.pk)
+        occupancy = timetable.occupancy(rooms, [0, 1], time(8), time(20))
+
+        taken, groups = occupancy[str(self.room.pk)][0]
+        self.assertEqual(taken, [(9 * 60, 11 * 60 + 30)])
+        self.assertEqual(groups, {str(first.pk), str(second.pk)})
+        self.assertEqual(occupancy[str(self.other_room.pk)][0], ([], set()))
+
+        self.assertEqual(
+            timetable.free_slots(taken, 8 * 60, 20 * 60, 90),
+            [(11 * 60 + 30, 20 * 60)],
+        )
+
+    def test_index_follows_group_saves(self):
+        group = self._group(time(9), time(10, 30), [self.monday])
+        other = str(self.other_room.pk)
+        timetable.weeks(timetable.ROOM, [self.room.pk, other])
+
+        group.started_at, group.ended_at = time(14), time(15, 30)
+        group.save()
+
+        # only the room of the saved group is rebuilt
+        with CaptureQueriesContext(connection) as queries:
+            weeks = timetable.weeks(timetable.ROOM, [self.room.pk, other])
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(
+            timetable.busy(weeks[str(self.room.pk)], 0), [(14 * 60, 15 * 60 + 30)]
+        )
+
+        group.room_number = self.other_room
+        group.save()
+        weeks = timetable.weeks(timetable.ROOM, [self.room.pk, other])
+        self.assertEqual(weeks[str(self.room.pk)], [])
+        self.assertEqual(len(weeks[other]), 1)
+
+        group.scheduled_day_type.add(self.tuesday)
+        weeks = timetable.weeks(timetable.ROOM, [other])
+        self.assertEqual(sorted(session.weekday for session in weeks[other]), [0, 1])
+
+    def test_rolled_back_saves_are_not_cached(self):
+        class Abort(Exception):
+            pass
+
+        with self.assertRaises(Abort), transaction.atomic():
+            self._group(time(14), time(15), [self.monday])
+            weeks = timetable.weeks(timetable.ROOM, [self.room.pk])
+            self.assertEqual(len(weeks[str(self.room.pk)]), 1)
+            raise Abort
+
+        weeks = timetable.weeks(timetable.ROOM, [self.room.pk])
+        self.assertEqual(weeks[str(self.room.pk)], [])
+
+    def test_conflicts_with_room_and_teacher(self):
+        group = self._group(
+            time(9), time(10, 30), [self.monday], teacher_id=self.teacher.pk
+        )
+        secondary = SecondaryGroup.objects.create(
+            name="Yordamchi",
+            group=group,
+            teacher_id=self.assistant.pk,
+            started_at=time(9),
+            ended_at=time(10),
+        )
+        secondary.scheduled_day_type.set([self.tuesday])
+
+        found = timetable.conflicts(
+            [0], time(10), time(11), room=self.room.pk, teacher=self.teacher.pk
+        )
+        self.assertEqual(found, {"room": [str(group.pk)], "teacher": [str(group.pk)]})
+
+        # the assistant's lessons are held in the main group's room
+        found = timetable.conflicts(
+            [1], time(9), time(10), room=self.room.pk, teacher=self.assistant.pk
+        )
+        self.assertEqual(found, {"room": [str(group.pk)], "teacher": [str(group.pk)]})
+
+        self.assertEqual(
+            timetable.conflicts(
+                [0], time(10, 30), time(12), room=self.room.pk, teacher=self.teacher.pk
+            ),
+            {"room": [], "teacher": []},
+        )
+        self.assertEqual(
+            timetable.conflicts(
+                [0], time(10), time(11), room=self.room.pk, exclude=group.pk
+            ),
+            {"room": [], "teacher": []},
+        )
+
+    def test_serializer_checks_only_schedule_changes(self):
+        self._group(time(9), time(10, 30), [self.monday])
+        # created around the check, so it already clashes with the first
+        clashing = self._group(time(10), time(11), [self.monday])
+
+        rename = GroupSerializer(clashing, data={"name": "Renamed"}, partial=True)
+        self.assertTrue(rename.is_valid(), rename.errors)
+
+        move = GroupSerializer(clashing, data={"started_at": "09:30"}, partial=True)
+        self.assertFalse(move.is_valid())
+        self.assertIn("room_number", move.errors)
+
+
+class LessonPlanTest(SimpleTestCase):
+    def test_plan_skips_holidays_and_starts_mid_week(self):
+        # 2026-06-03 is a Wednesday; Mon/Wed/Fri
+        dates = lesson_calendar.plan(
+            date(2026, 6, 3), [0, 2, 4], 5, skip=[date(2026, 6, 8)]
+        )
+        self.assertEqual(
+            dates,
+            (
+                date(2026, 6, 3),
+                date(2026, 6, 5),
+                date(2026, 6, 10),
+                date(2026, 6, 12),
+                date(2026, 6, 15),
+            ),
+        )
+        self.assertEqual(lesson_calendar.plan(date(2026, 6, 3), [], 5), ())
+
+    def test_lookups(self):
+        calendar = lesson_calendar.LessonCalendar(
+            lesson_calendar.plan(date(2026, 6, 1), [0, 2, 4], 12)
+        )
+        self.assertEqual(calendar.nth(4), date(2026, 6, 8))
+        self.assertIsNone(calendar.nth(13))
+        self.assertEqual(calendar.finish, date(2026, 6, 26))
+        self.assertEqual(
+            calendar.between(date(2026, 6, 6), date(2026, 6, 12)),
+            (date(2026, 6, 8), date(2026, 6, 10), date(2026, 6, 12)),
+        )
+        self.assertEqual(
+            calendar.count_between(date(2026, 6, 1), date(2026, 6, 30)), 12
+        )
+        self.assertEqual(calendar.number(date(2026, 6, 9)), 4)
+        self.assertEqual(calendar.next_after(date(2026, 6, 26)), None)
+
+
+class GroupLessonCalendarTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.days = [
+            Day.objects.create(name=name, display_name=name[:2], index=index)
+            for index, name in ((1, "Dushanba"), (3, "Chorshanba"), (5, "Juma"))
+        ]
+        subject = Subject.objects.create(name="Math")
+        cls.course = Course.objects.create(name="Math 1", subject=subject)
+        cls.room = Room.objects.create(room_number="1")
+        Theme.objects.bulk_create(
+            [
+                Theme(subject=subject, course=cls.course, description=str(i))
+                for i in range(4)
+            ]
+        )
+
+    def setUp(self):
+        start = timezone.make_aware(datetime(2026, 6, 1, 9))
+        self.group = Group.objects.create(
+            name="A", course=self.course, room_number=self.room, start_date=start
+        )
+        self.group.scheduled_day_type.set(self.days)
+
+    def test_plan_follows_holidays_and_repeats(self):
+        calendar = lesson_calendar.group_calendar(self.group)
+        self.assertEqual(calendar.finish, date(2026, 6, 8))
+
+        holiday = Holiday.objects.create(date=date(2026, 6, 3), name="Bayram")
+        # the holidays cache outlives the test transaction, drop it on the way out
+        self.addCleanup(holiday.delete)
+        calendar = lesson_calendar.group_calendar(self.group)
+        self.assertEqual(calendar.nth(2), date(2026, 6, 5))
+        self.assertEqual(calendar.finish, date(2026, 6, 10))
+
+        GroupLesson.objects.create(
+            group=self.group, date=date(2026, 6, 5), is_repeat=True
+        )
+
+        self.group.refresh_from_db()
+        self.assertEqual(
+            timezone.localtime(self.group.finish_date).date(), date(2026, 6, 12)
+        )
+        self.assertEqual(self.group.finish_date.time(), self.group.start_date.time())
+
+    def test_new_theme_moves_the_finish_date(self):
+        GroupLesson.objects.create(group=self.group, date=date(2026, 6, 1))
+        self.group.refresh_from_db()
+        self.assertEqual(
+            timezone.localtime(self.group.finish_date).date(), date(2026, 6, 8)
+        )
+
+        Theme.objects.create(
+            subject=self.course.subject, course=self.course, description="5"
+        )
+
+        self.group.refresh_from_db()
+        self.assertEqual(
+            timezone.localtime(self.group.finish_date).date(), date(2026, 6, 10)
+        )
@@ -0,0 +1,401 @@
+"""
+Room and teacher timetables.
+
+The week of a room (or a teacher) is the list of its weekly sessions: one
+Session per scheduled day of every live Group held there, plus the sessions
+of the groups' SecondaryGroup, which take place in the main group's room.
+Times are minutes from that weekday's midnight, weekdays are 0 (Monday) to 6.
+
+Weeks are built for many rooms/teachers with two queries and cached one per
+room/teacher; the key carries a version that the Group and SecondaryGroup
+signals below bump for just the rooms and teachers a save touched, so a
+filial's occupancy, free slots and conflicts come from the cache except for
+the few rooms that changed since. Weeks built inside the transaction that
+touched them are not cached: they hold rows that may still roll back.
+"""
+
+from datetime import date, datetime, time
+from typing import NamedTuple
+
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from data.command.reference import CACHE_ALIAS
+from data.finances.timetracker.delta import merge_intervals
+from data.student.groups.lesson_calendar import UZBEK_WEEKDAYS
+from data.student.groups.models import Group, Room, SecondaryGroup
+
+TIMETABLE_TIMEOUT = 60 * 60
+
+
+def _cache():
+    # the shared cache: a version bump must reach every web and Celery
+    # process, not only the one that saved the change
+    return caches[CACHE_ALIAS]
+
+# CheckRoomFillingView lesson_type: odd-day (Mon/Wed/Fri) and even-day
+# (Tue/Thu/Sat) groups are told apart by their first day
+LESSON_TYPE_DAYS = {
+    "1": ("Dushanba",),
+    "0": ("Seshanba",),
+    ".": ("Dushanba", "Seshanba"),
+}
+
+ROOM = "room"
+TEACHER = "teacher"
+
+
+class Session(NamedTuple):
+    weekday: int
+    start: int
+    end: int
+    group_id: str
+    start_date: date | None
+    finish_date: date | None
+
+    def runs_between(self, first: date | None, last: date | None) -> bool:
+        if first and self.finish_date and first > self.finish_date:
+            return False
+        return not (last and self.start_date and last < self.start_date)
+
+    def runs_on(self, on: date | None) -> bool:
+        return self.runs_between(on, on)
+
+
+def minute(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def as_time(minutes: int) -> time:
+    return time(minutes // 60, minutes % 60)
+
+
+def _date(value: datetime | None) -> date | None:
+    if value is None:
+        return None
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+def _sessions(rows) -> dict:
+    """{key: [Session]} from (key, group id, start, end, from, to, day) rows."""
+    by_key = {}
+    for key, group_id, started_at, ended_at, start_date, finish_date, day in rows:
+        weekday = UZBEK_WEEKDAYS.get(day)
+        if key is None or weekday is None or not started_at or not ended_at:
+            continue
+        start, end = minute(started_at), minute(ended_at)
+        if end <= start:
+            continue
+        by_key.setdefault(str(key), []).append(
+            Session(
+                weekday,
+                start,
+                end,
+                str(group_id),
+                _date(start_date),
+                _date(finish_date),
+            )
+        )
+    return by_key
+
+
+def _build(kind: str, ids) -> dict:
+    """{room or teacher id: [Session]} for ``ids``."""
+    if kind == ROOM:
+        group_key, secondary_key = "room_number_id", "group__room_number_id"
+    else:
+        group_key, secondary_key = "teacher_id", "teacher_id"
+    fields = ["started_at", "ended_at", "start_date", "finish_date"]
+
+    groups = (
+        Group.objects.filter(**{f"{group_key}__in": ids}, is_archived=False)
+        .exclude(status="INACTIVE")
+        .values_list(group_key, "id", *fields, "scheduled_day_type__name")
+    )
+    secondary = (
+        SecondaryGroup.objects.filter(
+            **{f"{secondary_key}__in": ids},
+            is_archived=False,
+            group__is_archived=False,
+        )
+        .exclude(Q(status="INACTIVE") | Q(group__status="INACTIVE"))
+        .values_list(secondary_key, "group_id", *fields, "scheduled_day_type__name")
+    )
+
+    by_key = {key: [] for key in ids}
+    for rows in (groups, secondary):
+        for key, sessions in _sessions(rows).items():
+            by_key[key].extend(sessions)
+    for sessions in by_key.values():
+        sessions.sort()
+    return by_key
+
+
+# ---------- cache ----------
+
+
+def _version_key(kind: str, key) -> str:
+    return f"groups:timetable_version:{kind}:{key}"
+
+
+def _week_key(kind: str, key, version) -> str:
+    return f"groups:timetable:{kind}:{key}:{version}"
+
+
+def weeks(kind: str, ids) -> dict:
+    """{room or teacher id (str): [Session]}, from the cache where possible."""
+    ids = list(dict.fromkeys(str(key) for key in ids if key))
+    versions = _cache().get_many([_version_key(kind, key) for key in ids])
+    keys = {
+        key: _week_key(kind, key, versions.get(_version_key(kind, key), 0))
+        for key in ids
+    }
+
+    cached = _cache().get_many(list(keys.values()))
+    result = {
+        key: cached[week_key] for key, week_key in keys.items() if week_key in cached
+    }
+
+    missing = [key for key in ids if key not in result]
+    if missing:
+        built = _build(kind, missing)
+        uncommitted = _uncommitted(kind)
+        _cache().set_many(
+            {
+                keys[key]: sessions
+                for key, sessions in built.items()
+                if key not in uncommitted
+            },
+            TIMETABLE_TIMEOUT,
+        )
+        result.update(built)
+
+    return result
+
+
+def invalidate(kind: str, *ids):
+    for key in {key for key in ids if key}:
+        version_key = _version_key(kind, key)
+        try:
+            _cache().incr(version_key)
+        except ValueError:
+            _cache().set(version_key, 1, None)
+
+
+class _Invalidate:
+    """The on-commit bump of the rooms or teachers a save touched."""
+
+    def __init__(self, kind: str, ids):
+        self.kind = kind
+        self.ids = {str(key) for key in ids if key}
+
+    def __call__(self):
+        invalidate(self.kind, *self.ids)
+
+
+def _uncommitted(kind: str) -> set:
+    """Ids of ``kind`` touched by this transaction and not committed yet."""
+    if not connection.in_atomic_block:
+        return set()
+    return {
+        key
+        for _, callback, _ in connection.run_on_commit
+        if isinstance(callback, _Invalidate) and callback.kind == kind
+        for key in callback.ids
+    }
+
+
+def _touch(kind: str, *ids):
+    # now, for reads later in this transaction, and again on commit, so a
+    # week rebuilt from the uncommitted rows by another request is dropped
+    invalidate(kind, *ids)
+    transaction.on_commit(_Invalidate(kind, ids))
+
+
+# ---------- queries ----------
+
+
+def busy(sessions, weekday: int, on: date | None = None) -> list[tuple]:
+    """Merged (start, end) minutes taken on ``weekday`` (and date ``on``)."""
+    return merge_intervals(
+        (session.start, session.end)
+        for session in sessions
+        if session.weekday == weekday and session.runs_on(on)
+    )
+
+
+def clip(intervals, start: int, end: int) -> list[tuple]:
+    return [
+        (max(a, start), min(b, end)) for a, b in intervals if a < end and b > start
+    ]
+
+
+def free_slots(taken, start: int, end: int, duration: int = 1) -> list[tuple]:
+    """Gaps of at least ``duration`` minutes between ``start`` and ``end``."""
+    gaps = []
+    cursor = start
+    for a, b in clip(taken, start, end) + [(end, end)]:
+        if a - cursor >= duration:
+            gaps.append((cursor, a))
+        cursor = max(cursor, b)
+    return gaps
+
+
+def filial_rooms(filial, rooms=None) -> dict:
+    """{room id (str): Room} of the filial, or just ``rooms``."""
+    if rooms:
+        queryset = Room.objects.filter(id__in=rooms)
+    else:
+        queryset = Room.objects.filter(filial_id=filial)
+    return {str(room.id): room for room in queryset.order_by("room_number")}
+
+
+def occupancy(
+    room_ids, weekdays, start: time, end: time, on: date | None = None
+) -> dict:
+    """
+    {room id: {weekday: (taken intervals, group ids)}} between ``start`` and
+    ``end``, for all rooms in one cache read.
+    """
+    start_minute, end_minute = minute(start), minute(end)
+    result = {}
+    for room_id, sessions in weeks(ROOM, room_ids).items():
+        days = result[room_id] = {}
+        for weekday in weekdays:
+            overlapping = [
+                session
+                for session in sessions
+                if session.weekday == weekday
+                and session.runs_on(on)
+                and session.start < end_minute
+                and session.end > start_minute
+            ]
+            days[weekday] = (
+                clip(busy(overlapping, weekday), start_minute, end_minute),
+                {session.group_id for session in overlapping},
+            )
+    return result
+
+
+def conflicts(
+    weekdays,
+    start: time,
+    end: time,
+    room=None,
+    teacher=None,
+    first: date | None = None,
+    last: date | None = None,
+    exclude=None,
+) -> dict:
+    """
+    Group ids whose sessions overlap ``start``-``end`` on any of ``weekdays``
+    between the dates ``first`` and ``last``, in the room and with the
+    teacher: ``{"room": [...], "teacher": [...]}``.
+    """
+    start_minute, end_minute = minute(start), minute(end)
+    weekdays = set(weekdays)
+    exclude = str(exclude) if exclude else None
+
+    def overlapping(kind, key):
+        if not key:
+            return []
+        found = {
+            session.group_id
+            for session in weeks(kind, [key]).get(str(key), [])
+            if session.weekday in weekdays
+            and session.runs_between(first, last)
+            and session.start < end_minute
+            and session.end > start_minute
+            and session.group_id != exclude
+        }
+        return sorted(found)
+
+    return {"room": overlapping(ROOM, room), "teacher": overlapping(TEACHER, teacher)}
+
+
+def weekdays_of(days) -> list[int]:
+    """Weekday numbers of Day objects (or names)."""
+    names = [getattr(day, "name", day) for day in days]
+    return sorted({UZBEK_WEEKDAYS[name] for name in names if name in UZBEK_WEEKDAYS})
+
+
+# ---------- invalidation ----------
+
+
+def _group_rooms_and_teachers(group_ids):
+    rows = Group.objects.filter(pk__in=group_ids).values_list(
+        "room_number_id", "teacher_id"
+    )
+    return [room for room, _ in rows], [teacher for _, teacher in rows]
+
+
+# fields of a saved group that move its sessions
+SCHEDULE_FIELDS = (
+    "room_number",
+    "teacher",
+    "status",
+    "is_archived",
+    "started_at",
+    "ended_at",
+    "start_date",
+    "finish_date",
+)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def on_group_change(sender, instance: Group, **kwargs):
+    if kwargs["signal"] is post_save and not kwargs["created"]:
+        if not any(instance.has_changed(field) for field in SCHEDULE_FIELDS):
+            return
+
+    _touch(ROOM, instance.room_number_id, instance.old_value("room_number"))
+    _touch(TEACHER, instance.teacher_id, instance.old_value("teacher"))
+    if instance.has_changed("status") or instance.has_changed("is_archived"):
+        # the secondary sessions live and die with the main group
+        _touch(
+            TEACHER,
+            *SecondaryGroup.objects.filter(group_id=instance.pk).values_list(
+                "teacher_id", flat=True
+            ),
+        )
+
+
+@receiver(post_save, sender=SecondaryGroup)
+@receiver(post_delete, sender=SecondaryGroup)
+def on_secondary_group_change(sender, instance: SecondaryGroup, **kwargs):
+    rooms, _ = _group_rooms_and_teachers(
+        {instance.group_id, instance.old_value("group")} - {None}
+    )
+    _touch(ROOM, *rooms)
+    _touch(TEACHER, instance.teacher_id, instance.old_value("teacher"))
+
+
+@receiver(m2m_changed, sender=Group.scheduled_day_type.through)
+def on_group_days_change(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # day.group_set.add(...): rare, drop every affected room and teacher
+        rooms, teachers = _group_rooms_and_teachers(kwargs["pk_set"] or [])
+    else:
+        rooms, teachers = [instance.room_number_id], [instance.teacher_id]
+    _touch(ROOM, *rooms)
+    _touch(TEACHER, *teachers)
+
+
+@receiver(m2m_changed, sender=SecondaryGroup.scheduled_day_type.through)
+def on_secondary_group_days_change(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        secondary = SecondaryGroup.objects.filter(pk__in=kwargs["pk_set"] or [])
+    else:
+        secondary = SecondaryGroup.objects.filter(pk=instance.pk)
+    rows = list(secondary.values_list("group__room_number_id", "teacher_id"))
+    _touch(ROOM, *[room for room, _ in rows])
+    _touch(TEACHER, *[teacher for _, teacher in rows])
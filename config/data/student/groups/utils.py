@@ -1,4 +1,4 @@
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING
 
 from django.db.models import QuerySet, Prefetch
@@ -11,18 +11,9 @@ if TYPE_CHECKING:
     from data.student.groups.models import Group
 
 from data.student.subject.models import Theme
+from data.student.groups.lesson_calendar import UZBEK_WEEKDAYS, holiday_dates, plan
 from data.student.groups.models import Group, GroupLesson
 
-UZBEK_WEEKDAYS = [
-    "Dushanba",
-    "Seshanba",
-    "Chorshanba",
-    "Payshanba",
-    "Juma",
-    "Shanba",
-    "Yakshanba",
-]
-
 
 def calculate_finish_date(
     course: "Course",
@@ -31,28 +22,24 @@ def calculate_finish_date(
     start_date: date,
     number_of_repeated_lessons: int = 0,
 ):
+    """Date of the last lesson; same type as ``start_date``."""
 
     themes = Theme.objects.filter(course=course, level=level, is_archived=False)
     total_lessons = themes.count() + number_of_repeated_lessons
 
     scheduled_days = [
-        UZBEK_WEEKDAYS.index(day.name)
-        for day in week_days
-        if day.name in UZBEK_WEEKDAYS
+        UZBEK_WEEKDAYS[day.name] for day in week_days if day.name in UZBEK_WEEKDAYS
     ]
 
     if not scheduled_days:
         return  # Can't calculate finish date without schedule
 
-    finish_date = start_date
-    lessons_scheduled = 0
-
-    while lessons_scheduled < total_lessons:
-        if finish_date.weekday() in scheduled_days:
-            lessons_scheduled += 1
-        finish_date += timedelta(days=1)
+    first = start_date.date() if isinstance(start_date, datetime) else start_date
+    dates = plan(first, scheduled_days, total_lessons, holiday_dates())
+    if not dates:
+        return start_date
 
-    return finish_date
+    return start_date + timedelta(days=(dates[-1] - first).days)
 
 
 def _group_weekdays(group: "Group") -> list[int]:
@@ -13,6 +13,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .cache import day_id
 from .models import Group, Room, SecondaryGroup, Day, GroupSaleStudent
 from .serializers import (
     # CheckRoomTeacherConflictSerializer,
@@ -100,14 +101,10 @@ class StudentGroupsView(ListCreateAPIView):
             queryset = queryset.filter(students__student_id=student)
 
         if day == "1":
-            days = []
-            days.append(Day.objects.filter(name="Dushanba").first())
-            queryset = queryset.filter(scheduled_day_type__in=days)
+            queryset = queryset.filter(scheduled_day_type=day_id("Dushanba"))
 
         if day == "0":
-            days = []
-            days.append(Day.objects.filter(name="Seshanba").first())
-            queryset = queryset.filter(scheduled_day_type__in=days)
+            queryset = queryset.filter(scheduled_day_type=day_id("Seshanba"))
 
         if level:
             queryset = queryset.filter(level_id=level)
@@ -724,11 +721,13 @@ class LessonScheduleWebListApi(ListAPIView):
             }
             weekday_name = uzbek_weekdays.get(weekday_name, weekday_name)
             ic(weekday_name.capitalize())
-            days = Day.objects.get(name=weekday_name.capitalize())
+            day = day_id(weekday_name.capitalize())
+            if day is None:
+                return queryset.none()
 
             ic(weekday_name)
             if weekday_name:
-                queryset = queryset.filter(scheduled_day_type=days)
+                queryset = queryset.filter(scheduled_day_type=day)
         return queryset
 
     def get_paginated_response(self, data):
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('filial', '0001_initial'),
+        ('groups', '0003_initial'),
+        ('lesson', '0001_initial'),
+        ('new_lid', '0001_initial'),
+        ('student', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='extralesson',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='students_extra_lesson', to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='extralesson',
+            name='teacher',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='teachers_extra_lesson', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='extralessongroup',
+            name='creator',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='groups_extra_lesson_creator', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='extralessongroup',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='extralessongroup',
+            name='group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='groups_extra_lesson', to='groups.group'),
+        ),
+        migrations.AddField(
+            model_name='extralessongroup',
+            name='room',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='extra_group_lessons_room', to='groups.room'),
+        ),
+        migrations.AddField(
+            model_name='firstllesson',
+            name='creator',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='firstllesson',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='firstllesson',
+            name='group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='groups_first_lessons', to='groups.group'),
+        ),
+        migrations.AddField(
+            model_name='firstllesson',
+            name='lid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='new_lid.lid'),
+        ),
+        migrations.AddConstraint(
+            model_name='extralesson',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='lesson_extralesson_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='extralessongroup',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='lesson_extralessongroup_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='firstllesson',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='lesson_firstllesson_arch_ts_chk'),
+        ),
+    ]
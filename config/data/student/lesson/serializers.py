@@ -10,6 +10,7 @@ from .models import (
     ExtraLessonGroup,
 )
 
+from data.student.groups import lesson_calendar
 from data.student.groups.lesson_date_calculator import calculate_lessons
 from data.student.groups.models import Group, Room
 from data.student.groups.serializers import GroupSerializer, RoomsSerializer
@@ -120,7 +121,9 @@ class LessonScheduleWebSerializer(serializers.ModelSerializer):
         end_date = start_date + datetime.timedelta(days=5)  # Saturday of the same week
 
         lesson_type = ",".join([day.name for day in schedule_days])
-        holidays = []
+        holidays = [
+            day.isoformat() for day in lesson_calendar.holiday_dates(obj.filial_id)
+        ]
         days_off = ["Yakshanba"]
         ic(start_date)
         ic(end_date)
@@ -319,7 +322,9 @@ class LessonScheduleSerializer(serializers.ModelSerializer):
         )
 
         lesson_type = ",".join([day.name for day in schedule_days])
-        holidays = []
+        holidays = [
+            day.isoformat() for day in lesson_calendar.holiday_dates(obj.filial_id)
+        ]
         days_off = ["Yakshanba"]
 
         # Get the scheduled lesson dates using the calculate_lessons function
@@ -0,0 +1,229 @@
+"""
+Coins and notifications of Mastering rows, many rows at a time.
+
+Saving a Mastering queues ``(id, created)``; after the commit a Celery job
+(data.student.mastering.tasks.award_masterings) passes the batch to
+``award_ids``. Paths that bulk_create masterings call ``award`` themselves.
+
+For a whole batch ``award`` reads the coin settings, themes, homeworks and
+student users once each. It then writes the Coins and Notification rows with
+bulk inserts and Student.coins with one UPDATE. Each Coins row points at its
+Mastering, so a mastering never gets paid twice, however many times its job
+runs.
+"""
+
+import json
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.db import transaction
+
+from data.command.transactions import collect_on_commit
+from data.notifications.models import Notification
+from data.notifications.push import enqueue
+from data.student.homeworks.models import Homework
+from data.student.mastering.models import Mastering
+from data.student.shop.models import Coins, CoinsSettings
+from data.student.shop.utils import COIN_COMMENTS, add_coins, matching_setting
+from data.student.student.models import Student
+from data.student.subject.models import Theme
+
+# choices that earn coins when a mastering is created
+COIN_CHOICES = ("Speaking", "Homework", "Mock", "Unit_Test", "Weekly", "Monthly")
+
+
+class Event(NamedTuple):
+    mastering_id: object
+    student_id: object
+    theme_id: object
+    choice: str | None
+    ball: float
+    created: bool
+
+    @classmethod
+    def of(cls, mastering: Mastering, created: bool) -> "Event":
+        return cls(
+            mastering.pk,
+            mastering.student_id,
+            mastering.theme_id,
+            mastering.choice,
+            mastering.ball,
+            created,
+        )
+
+    @property
+    def earns_coins(self) -> bool:
+        return self.created and self.choice in COIN_CHOICES
+
+    @property
+    def notifies_homework(self) -> bool:
+        return self.choice == "Homework" and self.ball > 0
+
+
+def matters(event: Event) -> bool:
+    return bool(event.student_id) and (event.earns_coins or event.notifies_homework)
+
+
+def _homework_comment(event: Event, homework) -> str:
+    if not event.created:
+        return f"Uy ishini bajarganingiz uchun {event.ball} ball berildi!"
+    state = "bajarildi" if event.ball > 75 else "qayta topshirish uchun qoldi."
+    return (
+        f"{homework['title']} uy ishidan {event.ball} ball oldingiz "
+        f"va uy ishi {state} "
+    )
+
+
+def _homeworks(theme_ids) -> dict:
+    """{theme id: payload of the theme's first homework}"""
+    themes = {
+        row["id"]: row
+        for row in Theme.objects.filter(id__in=theme_ids).values(
+            "id", "subject_id", "course_id", "course__level_id"
+        )
+    }
+    homeworks, online = {}, set()
+    for row in Homework.objects.filter(theme_id__in=theme_ids).values(
+        "id", "theme_id", "title", "choice"
+    ):
+        # default ordering, so the first row of a theme is its .first()
+        homeworks.setdefault(row["theme_id"], row)
+        if row["choice"] == "Online":
+            online.add(row["theme_id"])
+
+    result = {}
+    for theme_id, homework in homeworks.items():
+        theme = themes.get(theme_id)
+        if theme is None:
+            continue
+        level = theme["course__level_id"]
+        homework["payload"] = {
+            "subject": str(theme["subject_id"]),
+            "level": str(level) if level else "None",
+            "course": str(theme["course_id"]),
+            "homework": str(homework["id"]),
+            "is_online": theme_id in online,
+        }
+        result[theme_id] = homework
+    return result
+
+
+def _coins(events) -> list[Coins]:
+    """Unsaved Coins of the events that earn some and were not paid yet."""
+    events = [event for event in events if event.earns_coins]
+    if not events:
+        return []
+
+    settings = defaultdict(list)
+    for setting in CoinsSettings.objects.filter(
+        choice__in={event.choice for event in events}
+    ):
+        settings[setting.choice].append(setting)
+
+    found = {}
+    for event in events:
+        setting = matching_setting(settings[event.choice], float(event.ball))
+        if setting is not None:
+            found[event.mastering_id] = (event, setting)
+    if not found:
+        return []
+
+    paid = set(
+        Coins.objects.filter(mastering_id__in=found).values_list(
+            "mastering_id", flat=True
+        )
+    )
+    return [
+        Coins(
+            student_id=event.student_id,
+            mastering_id=event.mastering_id,
+            choice=event.choice,
+            status="Given",
+            coin=setting.coin,
+            comment=COIN_COMMENTS[event.choice].format(
+                choice=event.choice, coin=setting.coin
+            ),
+        )
+        for mastering_id, (event, setting) in found.items()
+        if mastering_id not in paid
+    ]
+
+
+def award(events) -> dict:
+    """Give the coins and send the notifications of mastering ``events``."""
+    events = [event for event in events if matters(event)]
+    coins = _coins(events)
+    notified = [event for event in events if event.notifies_homework]
+    if not coins and not notified:
+        return {"coins": 0, "notifications": 0}
+
+    users = dict(
+        Student.objects.filter(
+            pk__in={event.student_id for event in notified}
+            | {coin.student_id for coin in coins}
+        ).values_list("id", "user_id")
+    )
+    homeworks = _homeworks({event.theme_id for event in notified})
+
+    notifications = []
+    for event in notified:
+        homework = homeworks.get(event.theme_id)
+        if homework is None or not users.get(event.student_id):
+            continue
+        notifications.append(
+            Notification(
+                user_id=users[event.student_id],
+                comment=_homework_comment(event, homework),
+                choice="Homework",
+                come_from=json.dumps(homework["payload"]),
+            )
+        )
+
+    deltas = defaultdict(int)
+    for coin in coins:
+        deltas[coin.student_id] += coin.coin
+        if users.get(coin.student_id):
+            notifications.append(
+                Notification(
+                    user_id=users[coin.student_id],
+                    choice="Coin",
+                    come_from="",
+                    comment=f"Sizga {coin.coin} miqdorida tangalar qo'shildi!",
+                )
+            )
+
+    with transaction.atomic():
+        # Coins rows skip on_coin_create here; the balances move in one UPDATE
+        Coins.objects.bulk_create(coins)
+        add_coins(deltas)
+        Notification.objects.bulk_create(notifications)
+        enqueue(notifications)
+
+    return {"coins": len(coins), "notifications": len(notifications)}
+
+
+def award_ids(items) -> dict:
+    """``award`` for ``[(mastering id, created), ...]`` as queued by ``queue``."""
+    created = {}
+    for pk, was_created in items:
+        created[str(pk)] = created.get(str(pk), False) or bool(was_created)
+
+    with transaction.atomic():
+        # two jobs with the same mastering wait here instead of paying twice
+        masterings = Mastering.objects.select_for_update().filter(pk__in=created)
+        return award(
+            Event.of(mastering, created[str(mastering.pk)])
+            for mastering in masterings
+        )
+
+
+def _schedule(items):
+    from data.student.mastering.tasks import award_masterings
+
+    award_masterings.delay([[str(pk), created] for pk, created in items])
+
+
+def queue(mastering: Mastering, created: bool):
+    """Award a just saved mastering after the commit, batched per transaction."""
+    if matters(Event.of(mastering, created)):
+        collect_on_commit("mastering.coins", (mastering.pk, created), _schedule)
@@ -0,0 +1,72 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('exam_results', '0003_initial'),
+        ('filial', '0001_initial'),
+        ('mastering', '0001_initial'),
+        ('new_lid', '0002_initial'),
+        ('quiz', '0001_initial'),
+        ('student', '0001_initial'),
+        ('subject', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mastering',
+            name='lid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='new_lid.lid'),
+        ),
+        migrations.AddField(
+            model_name='mastering',
+            name='mock',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mastering_mock', to='exam_results.mockexam'),
+        ),
+        migrations.AddField(
+            model_name='mastering',
+            name='student',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='student.student'),
+        ),
+        migrations.AddField(
+            model_name='mastering',
+            name='test',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='quiz.quiz'),
+        ),
+        migrations.AddField(
+            model_name='mastering',
+            name='theme',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mastering_theme', to='subject.theme'),
+        ),
+        migrations.AddField(
+            model_name='mastering',
+            name='updater',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mastering_updater', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='masteringteachers',
+            name='filial',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial'),
+        ),
+        migrations.AddField(
+            model_name='masteringteachers',
+            name='teacher',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='teacher_mastering', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='mastering',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='mastering_mastering_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='masteringteachers',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='mastering_masteringteachers_arch_ts_chk'),
+        ),
+    ]
@@ -1,94 +1,23 @@
-import json
-
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from icecream import ic
 
 from data.employee.models import EmployeeTransaction
 
+from . import coins
 from .models import Mastering
 from data.student.attendance.models import Attendance
-from data.student.homeworks.models import Homework
 from data.student.lesson.models import FirstLLesson
-from data.student.shop.utils import give_coin
 from data.student.student.models import Student
 # from data.finances.compensation.models import Bonus
 from data.finances.finance.models import KpiFinance, Finance
 from data.lid.new_lid.models import Lid
-from data.notifications.models import Notification
 
 
 @receiver(post_save, sender=Mastering)
 def give_coins(sender, instance: Mastering, created, **kwargs):
-    if created:
-        if instance.ball > 0:
-            is_online = Homework.objects.filter(
-                theme_id=instance.theme.id, choice="Online"
-            ).exists()
-
-            homework = Homework.objects.filter(theme_id=instance.theme.id).first()
-
-            payload = {
-                "subject": str(instance.theme.subject.id),
-                "level": (
-                    str(instance.theme.course.level.id)
-                    if instance.theme.course.level
-                    else "None"
-                ),
-                "course": str(instance.theme.course.id),
-                "homework": str(homework.id),
-                "is_online": is_online,
-            }
-
-            if instance.choice == "Homework":
-                Notification.objects.create(
-                    user=instance.student.user,
-                    comment=f"{homework.title} uy ishidan {instance.ball} ball oldingiz va uy ishi {"bajarildi" if instance.ball >75 else "qayta topshirish uchun qoldi."} ",
-                    choice="Homework",
-                    come_from=json.dumps(payload),
-                )
-
-        if instance.choice in [
-            "Speaking",
-            "Homework",
-            "Mock",
-            "Unit_Test",
-            "Weekly",
-            "Monthly",
-        ]:
-            coins = give_coin(
-                choice=instance.choice,
-                student=instance.student,
-                from_point=instance.ball,
-            )
-
-            if coins:
-                print(coins, "coin obj created")
-    if not created and instance.ball > 0:
-        is_online = Homework.objects.filter(
-            theme_id=instance.theme.id, choice="Online"
-        ).exists()
-
-        homework = Homework.objects.filter(theme_id=instance.theme.id).first()
-
-        payload = {
-            "subject": str(instance.theme.subject.id),
-            "level": (
-                str(instance.theme.course.level.id)
-                if instance.theme.course.level
-                else "None"
-            ),
-            "course": str(instance.theme.course.id),
-            "homework": str(homework.id),
-            "is_online": is_online,
-        }
-        if instance.choice == "Homework":
-            Notification.objects.create(
-                user=instance.student.user,
-                comment=f"Uy ishini bajarganingiz uchun {instance.ball} ball berildi!",
-                choice="Homework",
-                come_from=json.dumps(payload),
-            )
+    # coins and homework notifications go out in a batch after the commit
+    coins.queue(instance, created)
 
 
 # @receiver(post_save, sender=MasteringTeachers)
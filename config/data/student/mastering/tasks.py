@@ -14,6 +14,14 @@ from data.student.studentgroup.models import StudentGroup
 logging.basicConfig(level=logging.INFO)
 
 
+@shared_task
+def award_masterings(items):
+    """Coins and notifications of ``[[mastering id, created], ...]``."""
+    from data.student.mastering.coins import award_ids
+
+    return award_ids(items)
+
+
 @shared_task
 def check_monthly_extra_lessons():
     today = now().date()
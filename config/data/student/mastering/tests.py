@@ -0,0 +1,92 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from data.notifications.models import Notification
+from data.student.mastering.coins import Event, award, award_ids
+from data.student.mastering.models import Mastering
+from data.student.shop.models import Coins, CoinsSettings
+from data.student.shop.utils import coin_mismatches
+from data.student.student.models import Student
+
+
+class MasteringCoinsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        CoinsSettings.objects.create(
+            type="Double", choice="Speaking", from_point=50, to_point=100, coin=5
+        )
+        cls.students = [
+            Student.objects.create(
+                first_name=f"Ali {i}",
+                phone=f"+99890000010{i}",
+                student_stage_type="ACTIVE_STUDENT",
+            )
+            for i in range(3)
+        ]
+
+    def _masterings(self, ball=80):
+        # bulk_create, so the signal does not award them on its own
+        return Mastering.objects.bulk_create(
+            Mastering(student=student, choice="Speaking", ball=ball)
+            for student in self.students
+        )
+
+    def test_award_pays_each_mastering_once(self):
+        masterings = self._masterings()
+        events = [Event.of(mastering, True) for mastering in masterings]
+
+        self.assertEqual(award(events)["coins"], 3)
+        # a redelivered batch
+        self.assertEqual(award(events)["coins"], 0)
+
+        self.assertEqual(Coins.objects.count(), 3)
+        self.assertEqual(
+            set(Student.objects.values_list("coins", flat=True)), {Decimal("5.00")}
+        )
+        self.assertEqual(Notification.objects.filter(choice="Coin").count(), 3)
+        self.assertEqual(list(coin_mismatches()), [])
+
+    def test_no_setting_no_coins(self):
+        masterings = self._masterings(ball=10)
+        award(Event.of(mastering, True) for mastering in masterings)
+        self.assertFalse(Coins.objects.exists())
+
+    def test_batch_queries_do_not_grow_with_its_size(self):
+        small = [Event.of(mastering, True) for mastering in self._masterings()[:1]]
+        with CaptureQueriesContext(connection) as one:
+            award(small)
+        big = [Event.of(mastering, True) for mastering in self._masterings()]
+        with CaptureQueriesContext(connection) as three:
+            award(big)
+        self.assertEqual(len(one), len(three))
+
+    def test_saved_masterings_are_queued_as_one_batch(self):
+        task = "data.student.mastering.tasks.award_masterings.delay"
+        with mock.patch(task) as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                saved = [
+                    Mastering.objects.create(
+                        student=student, choice="Speaking", ball=60
+                    )
+                    for student in self.students
+                ]
+        delay.assert_called_once()
+        (items,) = delay.call_args.args
+        self.assertEqual(items, [[str(mastering.pk), True] for mastering in saved])
+
+        self.assertEqual(award_ids(items)["coins"], 3)
+        self.assertEqual(
+            set(Coins.objects.values_list("mastering_id", flat=True)),
+            {mastering.pk for mastering in saved},
+        )
+
+    def test_mismatch_is_reported(self):
+        Student.objects.filter(pk=self.students[0].pk).update(coins=7)
+        self.assertEqual(
+            list(coin_mismatches()),
+            [(self.students[0].pk, Decimal("7.00"), Decimal("0"))],
+        )
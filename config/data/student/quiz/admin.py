@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from data.student.quiz.models import ExamRegistration
+from data.student.quiz.models import ExamRegistration, QuizImport
 from data.student.student.models import Student
 
 
@@ -10,4 +10,10 @@ from data.student.student.models import Student
 class ExamRegistrationAdmin(admin.ModelAdmin):
     list_display = ('student__first_name',"exam__date","exam__start_time","exam__end_time","mark")
     list_filter = ('student__first_name',)
-    search_fields = ('student__first_name',)
\ No newline at end of file
+    search_fields = ('student__first_name',)
+
+
+@admin.register(QuizImport)
+class QuizImportAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "created_by", "status", "stage", "done", "total")
+    list_filter = ("status",)
@@ -0,0 +1,306 @@
+"""
+Compiled answer keys for quiz grading.
+
+A quiz's answer key holds, for each question, what grading needs: the correct
+answer ids/texts, the pair map, the cloze sequence and the serialized form
+that goes into QuizResult.json_body. It is built once per quiz version and
+kept in the Django cache, so grading a submission is dict/set lookups with no
+serializer pass.
+
+The version is ``Quiz.updated_at``. Any change to a question row or to the
+answers, pairs and gaps behind it bumps ``updated_at`` of the affected
+quizzes with a single UPDATE, so every worker picks up the new key on its
+next read, whatever cache backend is configured.
+"""
+
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from data.student.quiz.models import (
+    Answer,
+    Cloze_Test,
+    ImageObjectiveTest,
+    MatchPairs,
+    ObjectiveTest,
+    Pairs,
+    Question,
+    Quiz,
+    QuizGaps,
+    True_False,
+    Vocabulary,
+)
+from data.student.quiz.serializers import (
+    Cloze_TestSerializer,
+    ImageObjectiveTestSerializer,
+    MatchPairsSerializer,
+    ObjectiveTestSerializer,
+    QuestionSerializer,
+    True_FalseSerializer,
+    VocabularySerializer,
+)
+
+ANSWER_KEY_TIMEOUT = 60 * 60 * 6
+
+# question type -> fields rendered with FileUploadSerializer
+FILE_FIELDS = {
+    "standard": ["file"],
+    "vocabulary": ["photo", "voice"],
+    "match_pair": [],
+    "objective_test": ["file"],
+    "cloze_test": ["file"],
+    "image_objective": ["image", "file"],
+    "true_false": ["file"],
+}
+
+
+def _question_types():
+    return [
+        (
+            "standard",
+            Question.objects.select_related("text", "file").prefetch_related(
+                "answers"
+            ),
+            QuestionSerializer,
+        ),
+        (
+            "vocabulary",
+            Vocabulary.objects.select_related("photo", "voice"),
+            VocabularySerializer,
+        ),
+        (
+            "match_pair",
+            MatchPairs.objects.prefetch_related("pairs"),
+            MatchPairsSerializer,
+        ),
+        (
+            "objective_test",
+            ObjectiveTest.objects.select_related("question", "file").prefetch_related(
+                "answers"
+            ),
+            ObjectiveTestSerializer,
+        ),
+        (
+            "cloze_test",
+            Cloze_Test.objects.select_related("sentence", "file").prefetch_related(
+                "questions"
+            ),
+            Cloze_TestSerializer,
+        ),
+        (
+            "image_objective",
+            ImageObjectiveTest.objects.select_related("answer", "image", "file"),
+            ImageObjectiveTestSerializer,
+        ),
+        (
+            "true_false",
+            True_False.objects.select_related("question", "file"),
+            True_FalseSerializer,
+        ),
+    ]
+
+
+def _plain(data):
+    return json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+
+
+def _grading_fields(qtype: str, item, entry: dict) -> dict:
+    if qtype == "standard":
+        answers = entry.get("answers") or []
+        correct = [a for a in answers if a.get("is_correct")]
+        return {
+            "correct_ids": [a["id"] for a in correct],
+            "correct_answer": correct[0]["text"] if correct else None,
+            "question_text": (entry.get("text") or {}).get("name"),
+        }
+
+    if qtype == "objective_test":
+        correct = next(
+            (
+                a["text"]
+                for a in entry.get("answers") or []
+                if isinstance(a, dict) and a.get("is_correct")
+            ),
+            "",
+        )
+        return {
+            "correct_answer": correct,
+            "question_text": (entry.get("question") or {}).get("name"),
+        }
+
+    if qtype == "cloze_test":
+        return {
+            "correct_sequence": [
+                q.get("name", "") for q in entry.get("questions") or []
+            ][::-1],
+        }
+
+    if qtype == "image_objective":
+        return {
+            "answer_id": str(item.answer_id) if item.answer_id else None,
+            "correct_answer": entry.get("answer") or "",
+        }
+
+    if qtype == "true_false":
+        return {
+            "correct_answer": entry.get("answer") or "",
+            "question_text": (entry.get("question") or {}).get("name"),
+        }
+
+    if qtype == "match_pair":
+        left = {p["key"]: p["id"] for p in entry["pairs"] if p["choice"] == "Left"}
+        right = {p["key"]: p["id"] for p in entry["pairs"] if p["choice"] == "Right"}
+        return {
+            "correct_pairs": [[left[k], right[k]] for k in left if k in right],
+        }
+
+    return {}
+
+
+def compile_answer_key(quiz: Quiz) -> dict:
+    """
+    Build the answer key of ``quiz``:
+    ``{"types": {qtype: {question_id: question}}}``, question being
+    ``{"entry", "files", "comment", ...grading fields}``.
+    """
+    types = {}
+    for qtype, queryset, serializer_class in _question_types():
+        questions = types[qtype] = {}
+        for item in queryset.filter(quiz=quiz):
+            entry = _plain(serializer_class(item).data)
+            entry["type"] = qtype
+
+            files = {}
+            for field in FILE_FIELDS[qtype]:
+                file_id = getattr(item, f"{field}_id")
+                if file_id:
+                    files[field] = str(file_id)
+
+            questions[str(item.id)] = {
+                "entry": entry,
+                "files": files,
+                "comment": entry.get("comment") or "",
+                **_grading_fields(qtype, item, entry),
+            }
+
+    return {"types": types}
+
+
+def _cache_key(quiz: Quiz) -> str:
+    return f"quiz:answer_key:{quiz.pk}:{quiz.updated_at.timestamp()}"
+
+
+def get_answer_key(quiz: Quiz) -> dict:
+    key = _cache_key(quiz)
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = compile_answer_key(quiz)
+        cache.set(key, answer_key, ANSWER_KEY_TIMEOUT)
+    return answer_key
+
+
+def touch_quizzes(condition: Q):
+    """Bump updated_at (the answer key version) of the quizzes matching ``condition``."""
+    Quiz.objects.filter(condition).update(updated_at=timezone.now())
+
+
+# ---------- invalidation ----------
+
+QUESTION_MODELS = [
+    Question,
+    Vocabulary,
+    MatchPairs,
+    ObjectiveTest,
+    Cloze_Test,
+    ImageObjectiveTest,
+    True_False,
+]
+
+
+def _quizzes_of(model, **lookup) -> Q:
+    return Q(id__in=model.objects.filter(**lookup).values("quiz_id"))
+
+
+def _answer_quizzes(pk) -> Q:
+    return (
+        _quizzes_of(Question, answers=pk)
+        | _quizzes_of(ObjectiveTest, answers=pk)
+        | _quizzes_of(Cloze_Test, sentence=pk)
+        | _quizzes_of(ImageObjectiveTest, answer=pk)
+    )
+
+
+def _gap_quizzes(pk) -> Q:
+    return (
+        _quizzes_of(Question, text=pk)
+        | _quizzes_of(ObjectiveTest, question=pk)
+        | _quizzes_of(True_False, question=pk)
+        | _quizzes_of(Cloze_Test, questions=pk)
+    )
+
+
+def _pair_quizzes(pk) -> Q:
+    return _quizzes_of(MatchPairs, pairs=pk)
+
+
+def on_question_change(sender, instance, **kwargs):
+    quiz_ids = {instance.quiz_id, instance.old_value("quiz")}
+    quiz_ids.discard(None)
+    if quiz_ids:
+        touch_quizzes(Q(id__in=quiz_ids))
+
+
+for _model in QUESTION_MODELS:
+    post_save.connect(on_question_change, sender=_model)
+    post_delete.connect(on_question_change, sender=_model)
+
+
+# Answers, pairs and gaps reach their quiz through M2M/FK rows that are gone
+# by post_delete, so deletes are handled before the fact.
+@receiver(post_save, sender=Answer)
+@receiver(pre_delete, sender=Answer)
+def on_answer_change(sender, instance, **kwargs):
+    touch_quizzes(_answer_quizzes(instance.pk))
+
+
+@receiver(post_save, sender=Pairs)
+@receiver(pre_delete, sender=Pairs)
+def on_pairs_change(sender, instance, **kwargs):
+    touch_quizzes(_pair_quizzes(instance.pk))
+
+
+@receiver(post_save, sender=QuizGaps)
+@receiver(pre_delete, sender=QuizGaps)
+def on_gaps_change(sender, instance, **kwargs):
+    touch_quizzes(_gap_quizzes(instance.pk))
+
+
+@receiver(m2m_changed, sender=Question.answers.through)
+@receiver(m2m_changed, sender=ObjectiveTest.answers.through)
+@receiver(m2m_changed, sender=MatchPairs.pairs.through)
+@receiver(m2m_changed, sender=Cloze_Test.questions.through)
+def on_question_relation_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        if instance.quiz_id:
+            touch_quizzes(Q(id=instance.quiz_id))
+        return
+
+    # answer.questions_answers.add(...) and friends: instance is the
+    # answer/pair/gap, pk_set the question ids
+    if action == "pre_clear":
+        related_quizzes = {
+            Answer: _answer_quizzes,
+            Pairs: _pair_quizzes,
+            QuizGaps: _gap_quizzes,
+        }[type(instance)]
+        touch_quizzes(related_quizzes(instance.pk))
+    elif pk_set:
+        touch_quizzes(_quizzes_of(kwargs["model"], pk__in=pk_set))
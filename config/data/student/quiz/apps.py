@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class QuizConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'data.student.quiz'
+
+    def ready(self):
+        import data.student.quiz.answer_keys
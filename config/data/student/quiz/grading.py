@@ -0,0 +1,284 @@
+"""
+Grading of QuizCheckAPIView submissions against a compiled answer key
+(see data.student.quiz.answer_keys).
+
+Submitted answers are indexed by question id once, each question is graded
+with dict/set lookups, and the files referenced by the result are loaded with
+one query at the end.
+"""
+
+from django.db.models import CharField, Value
+
+from data.exam_results.models import QuizResult
+from data.upload.models import File
+from data.upload.serializers import FileUploadSerializer
+
+# question type -> (key in the submitted payload, id field of an answer)
+SUBMISSION_FIELDS = {
+    "standard": ("standard", "question_id"),
+    "vocabulary": ("vocabulary", "question_id"),
+    "match_pair": ("match_pair", "match_id"),
+    "objective_test": ("objective_test", "objective_id"),
+    "cloze_test": ("cloze_test", "cloze_id"),
+    "image_objective": ("image_objective", "image_objective_id"),
+    "true_false": ("true_false", "true_false_id"),
+}
+
+# question type -> QuizResult M2M holding the questions given to the student,
+# in the order QuizResultSerializer lists them
+ASSIGNED_FIELDS = {
+    "match_pair": "match_pair",
+    "true_false": "true_false",
+    "vocabulary": "vocabulary",
+    "objective_test": "objective",
+    "cloze_test": "cloze_test",
+    "image_objective": "image_objective",
+    "standard": "questions",
+}
+
+
+class FileRefs:
+    """Collects (entry, field, file id) references and fills them in with one query."""
+
+    def __init__(self):
+        self.refs = []
+
+    def add(self, entry: dict, field: str, file_id):
+        if file_id:
+            self.refs.append((entry, field, file_id))
+        else:
+            entry[field] = None
+
+    def resolve(self, request):
+        if not self.refs:
+            return
+        files = {
+            str(pk): file
+            for pk, file in File.objects.in_bulk(
+                {file_id for _, _, file_id in self.refs}
+            ).items()
+        }
+        rendered = {}
+        for entry, field, file_id in self.refs:
+            if file_id not in rendered:
+                file = files.get(file_id)
+                rendered[file_id] = (
+                    FileUploadSerializer(file, context={"request": request}).data
+                    if file
+                    else None
+                )
+            entry[field] = rendered[file_id]
+
+
+def _index_submission(data: dict) -> dict[str, dict]:
+    """{qtype: {question id: answer}}; the first answer for a question wins."""
+    submitted = {}
+    for qtype, (payload_key, id_field) in SUBMISSION_FIELDS.items():
+        answers = submitted[qtype] = {}
+        for answer in data.get(payload_key, []) or []:
+            answers.setdefault(str(answer.get(id_field)), answer)
+    return submitted
+
+
+def _check_standard(qid, question, answer, files):
+    user_answer_id = str(answer.get("answer_id"))
+    is_correct = user_answer_id in question["correct_ids"]
+    result = {
+        "id": qid,
+        "question_text": question["question_text"],
+        "correct": is_correct,
+        "user_answer": user_answer_id,
+        "correct_answer": question["correct_answer"],
+        "answers": question["entry"].get("answers", []),
+    }
+    files.add(result, "file", question["files"].get("file"))
+    return is_correct, result
+
+
+def _check_objective_test(qid, question, answer, files):
+    user_answer = answer.get("answer_ids", "")
+    is_correct = (
+        str(user_answer).strip().lower()
+        == str(question["correct_answer"]).strip().lower()
+    )
+    result = {
+        "id": qid,
+        "question_text": question["question_text"],
+        "correct": is_correct,
+        "user_answer": user_answer,
+        "correct_answer": question["correct_answer"],
+    }
+    files.add(result, "file", question["files"].get("file"))
+    return is_correct, result
+
+
+def _check_cloze_test(qid, question, answer, files):
+    user_sequence = list(answer.get("word_sequence", []))
+    is_correct = user_sequence == question["correct_sequence"]
+    result = {
+        "id": qid,
+        "question_text": "",
+        "correct": is_correct,
+        "user_answer": user_sequence,
+        "correct_answer": question["correct_sequence"],
+    }
+    files.add(result, "file", question["files"].get("file"))
+    return is_correct, result
+
+
+def _check_image_objective(qid, question, answer, files):
+    user_answer_id = answer.get("answer", "")
+    is_correct = (
+        question["answer_id"] is not None
+        and str(user_answer_id) == question["answer_id"]
+    )
+    result = {
+        "id": qid,
+        "question_text": None,
+        "correct": is_correct,
+        "user_answer": user_answer_id,
+        "correct_answer": question["correct_answer"],
+        "comment": question["comment"],
+    }
+    files.add(result, "image_url", question["files"].get("file"))
+    return is_correct, result
+
+
+def _check_true_false(qid, question, answer, files):
+    user_choice = answer.get("choice", "")
+    is_correct = user_choice.lower() == question["correct_answer"].lower()
+    result = {
+        "id": qid,
+        "question_text": question["question_text"],
+        "correct": is_correct,
+        "comment": question["comment"],
+        "user_answer": user_choice,
+        "correct_answer": question["correct_answer"],
+    }
+    files.add(result, "file", question["files"].get("file"))
+    return is_correct, result
+
+
+def _check_match_pair(qid, question, answer, files):
+    correct_pairs = {tuple(pair) for pair in question["correct_pairs"]}
+    user_pairs = [
+        (str(pair.get("left_id")), str(pair.get("right_id")))
+        for pair in answer.get("pairs", [])
+    ]
+    result = {
+        "id": qid,
+        "correct": False,
+        "comment": question["comment"],
+        "pairs": question["entry"]["pairs"],
+    }
+
+    if len(user_pairs) != len(correct_pairs):
+        result["error"] = (
+            f"Expected {len(correct_pairs)} pairs, got {len(user_pairs)}"
+        )
+        result["pair_results"] = []
+        return False, result
+
+    matched = correct_pairs.intersection(user_pairs)
+    is_correct = len(matched) == len(correct_pairs) and all(
+        pair in correct_pairs for pair in user_pairs
+    )
+    result["correct"] = is_correct
+    return is_correct, result
+
+
+CHECKERS = {
+    "standard": _check_standard,
+    "objective_test": _check_objective_test,
+    "cloze_test": _check_cloze_test,
+    "image_objective": _check_image_objective,
+    "true_false": _check_true_false,
+    "match_pair": _check_match_pair,
+}
+
+
+def grade_submission(answer_key: dict, data: dict, files: FileRefs) -> dict:
+    """
+    Grade the submitted answers. Returns ``{"details", "summary"}`` with a
+    details list for every question type the quiz has; unanswered questions
+    are left out.
+    """
+    submitted = _index_submission(data)
+    results = {
+        "details": {},
+        "summary": {
+            "total_questions": 0,
+            "correct_count": 0,
+            "wrong_count": 0,
+            "ball": 0.0,
+        },
+    }
+    summary = results["summary"]
+
+    for qtype, questions in answer_key["types"].items():
+        if not questions:
+            continue
+        details = results["details"][qtype] = []
+        answers = submitted.get(qtype, {})
+        checker = CHECKERS.get(qtype)
+
+        for qid, question in questions.items():
+            answer = answers.get(qid)
+            if not answer:
+                continue
+
+            if checker is None:
+                is_correct, result = False, {
+                    "error": f"Unsupported question type: {qtype}",
+                    "id": qid,
+                }
+            else:
+                is_correct, result = checker(qid, question, answer, files)
+
+            summary["correct_count" if is_correct else "wrong_count"] += 1
+            details.append(result)
+
+    return results
+
+
+def assigned_questions(quiz_result: QuizResult) -> list[tuple[str, str]]:
+    """(qtype, question id) of every question given to the student, one query."""
+    parts = []
+    for qtype, field_name in ASSIGNED_FIELDS.items():
+        field = QuizResult._meta.get_field(field_name)
+        parts.append(
+            field.remote_field.through.objects.filter(
+                **{field.m2m_field_name(): quiz_result}
+            )
+            .annotate(qtype=Value(qtype, output_field=CharField()))
+            .values_list(field.m2m_reverse_field_name(), "qtype")
+        )
+
+    rows = parts[0].union(*parts[1:], all=True)
+    return [(qtype, str(question_id)) for question_id, qtype in rows]
+
+
+def merge_details(
+    answer_key: dict, details: dict, assigned: list[tuple[str, str]], files: FileRefs
+) -> dict:
+    """
+    The stored result: every assigned question in its serialized form,
+    overwritten by the graded entry where the student answered it.
+    """
+    merged = {}
+
+    for qtype, qid in assigned:
+        question = answer_key["types"].get(qtype, {}).get(qid)
+        if question is None:
+            continue
+        entry = dict(question["entry"])
+        for field, file_id in question["files"].items():
+            files.add(entry, field, file_id)
+        merged.setdefault(qtype, {})[qid] = entry
+
+    for qtype, entries in details.items():
+        by_id = merged.setdefault(qtype, {})
+        for entry in entries:
+            by_id[entry["id"]] = entry
+
+    return {qtype: list(entries.values()) for qtype, entries in merged.items()}
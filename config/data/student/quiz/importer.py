@@ -0,0 +1,220 @@
+"""
+Streaming import of quiz question banks from Excel.
+
+The sheet has one row per answer: quiz title, question text, answer text,
+is_correct. Rows are streamed with openpyxl's read-only reader and
+deduplicated in memory; existing quizzes, question texts, questions and
+answers are then looked up with a few ``__in`` queries per chunk and the
+missing ones bulk-created, so a 10k row bank costs a few dozen queries
+instead of four or more per row.
+
+Every chunk is committed on its own, so a QuizImport's progress (written on
+the same connection) is visible while the import runs. The import is
+idempotent: a failed run leaves the chunks it wrote, and running the same
+sheet again creates only what is still missing.
+
+Matching follows the old row-by-row importer: quizzes, question texts
+(QuizGaps) and answers are reused by exact text, the newest row winning when
+there are several; a question is the (quiz, question text) pair; an answer's
+is_correct comes from the first row that creates it.
+"""
+
+from itertools import islice
+
+from django.db.models import Q
+from openpyxl.reader.excel import load_workbook
+
+from data.student.quiz.answer_keys import touch_quizzes
+from data.student.quiz.models import Answer, Question, Quiz, QuizGaps
+
+CHUNK_SIZE = 1000
+PROGRESS_EVERY = 1000
+
+TRUE_VALUES = ["true", "1", "yes"]
+
+
+def _chunks(values, size=CHUNK_SIZE):
+    it = iter(values)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def read_rows(file):
+    """Yield (quiz title, question text, answer text, is_correct) per data row."""
+    wb = load_workbook(filename=file, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        for row in ws.iter_rows(min_row=2, max_col=4, values_only=True):
+            yield tuple(row) + (None,) * (4 - len(row))
+    finally:
+        wb.close()
+
+
+class _Bank:
+    """Deduplicated content of a sheet."""
+
+    def __init__(self):
+        self.quizzes = {}  # title -> None, insertion ordered
+        self.gaps = {}  # question text -> None
+        self.questions = {}  # (title, question text) -> None
+        self.answers = {}  # answer text -> is_correct of its first row
+        self.links = {}  # ((title, question text), answer text) -> None
+        self.rows = 0
+
+    def add(self, quiz_title, question_text, answer_text, is_correct):
+        quiz_title, question_text, answer_text = (
+            str(quiz_title),
+            str(question_text),
+            str(answer_text),
+        )
+        question = (quiz_title, question_text)
+
+        self.quizzes.setdefault(quiz_title)
+        self.gaps.setdefault(question_text)
+        self.questions.setdefault(question)
+        self.answers.setdefault(
+            answer_text, str(is_correct).strip().lower() in TRUE_VALUES
+        )
+        self.links.setdefault((question, answer_text))
+        self.rows += 1
+
+
+def _existing(model, field: str, values) -> dict:
+    """{value: pk} of existing rows; the newest row wins, like .first()."""
+    found = {}
+    for chunk in _chunks(values):
+        rows = (
+            model.objects.filter(**{f"{field}__in": chunk})
+            .order_by("created_at")
+            .values_list(field, "pk")
+        )
+        found.update(rows)
+    return found
+
+
+def _ensure(
+    model, field: str, values, progress, stage, defaults=None
+) -> tuple[dict, int]:
+    """{value: pk} for every value, bulk-creating the missing rows."""
+    pks = _existing(model, field, values)
+    missing = [value for value in values if value not in pks]
+
+    done = 0
+    for chunk in _chunks(missing):
+        objs = [
+            model(**{field: value}, **(defaults(value) if defaults else {}))
+            for value in chunk
+        ]
+        model.objects.bulk_create(objs, batch_size=CHUNK_SIZE)
+        pks.update((getattr(obj, field), obj.pk) for obj in objs)
+        done += len(objs)
+        progress(stage, done, len(missing))
+
+    return pks, len(missing)
+
+
+def import_bank(bank: _Bank, progress) -> dict:
+    quiz_pks, quizzes_created = _ensure(
+        Quiz, "title", list(bank.quizzes), progress, "quizzes"
+    )
+    gap_pks, gaps_created = _ensure(
+        QuizGaps, "name", list(bank.gaps), progress, "question_texts"
+    )
+    answer_pks, answers_created = _ensure(
+        Answer,
+        "text",
+        list(bank.answers),
+        progress,
+        "answers",
+        defaults=lambda text: {"is_correct": bank.answers[text]},
+    )
+
+    quiz_ids = list(quiz_pks.values())
+    try:
+        questions_created = _import_questions(
+            bank, progress, quiz_pks, gap_pks, answer_pks
+        )
+    finally:
+        # bulk_create skips the signals that version the compiled answer
+        # keys; bump them even if only some chunks were written
+        touch_quizzes(Q(id__in=quiz_ids))
+
+    return {
+        "new_quizzes": quizzes_created,
+        "new_question_texts": gaps_created,
+        "new_questions": questions_created,
+        "new_answers": answers_created,
+    }
+
+
+def _import_questions(bank: _Bank, progress, quiz_pks, gap_pks, answer_pks) -> int:
+    """Bulk-create the missing questions and answer links; returns the count."""
+    wanted = {
+        (quiz_pks[title], gap_pks[text]): (title, text)
+        for title, text in bank.questions
+    }
+    quiz_ids = list(quiz_pks.values())
+    question_pks = {}
+    for chunk in _chunks(gap_pks.values()):
+        for quiz_id, text_id, pk in (
+            Question.objects.filter(quiz_id__in=quiz_ids, text_id__in=chunk)
+            .order_by("created_at")
+            .values_list("quiz_id", "text_id", "pk")
+        ):
+            if (quiz_id, text_id) in wanted:
+                question_pks[wanted[(quiz_id, text_id)]] = pk
+
+    missing = [key for key in wanted.values() if key not in question_pks]
+    done = 0
+    for chunk in _chunks(missing):
+        objs = [
+            Question(quiz_id=quiz_pks[title], text_id=gap_pks[text])
+            for title, text in chunk
+        ]
+        Question.objects.bulk_create(objs, batch_size=CHUNK_SIZE)
+        question_pks.update(zip(chunk, (obj.pk for obj in objs)))
+        done += len(objs)
+        progress("questions", done, len(missing))
+
+    Through = Question.answers.through
+    done = 0
+    for chunk in _chunks(bank.links):
+        Through.objects.bulk_create(
+            [
+                Through(question_id=question_pks[question], answer_id=answer_pks[answer])
+                for question, answer in chunk
+            ],
+            batch_size=CHUNK_SIZE,
+            ignore_conflicts=True,
+        )
+        done += len(chunk)
+        progress("answer_links", done, len(bank.links))
+
+    return len(missing)
+
+
+def import_quiz_workbook(file, progress=None) -> dict:
+    """
+    Import a question bank workbook. ``progress(stage, done, total)`` is
+    called while rows are read (total is None) and after every written chunk,
+    which is committed by then unless the caller holds a transaction.
+    """
+    progress = progress or (lambda stage, done, total: None)
+
+    bank = _Bank()
+    for quiz_title, question_text, answer_text, is_correct in read_rows(file):
+        if not all([quiz_title, question_text, answer_text]):
+            continue
+        bank.add(quiz_title, question_text, answer_text, is_correct)
+        if bank.rows % PROGRESS_EVERY == 0:
+            progress("reading", bank.rows, None)
+    progress("reading", bank.rows, None)
+    progress("writing", 0, len(bank.links))
+
+    summary = import_bank(bank, progress)
+
+    return {
+        "quizzes": len(bank.quizzes),
+        "questions_processed": bank.rows,
+        **summary,
+    }
@@ -0,0 +1,164 @@
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+from data.student.quiz.answer_keys import _cache_key, compile_answer_key, get_answer_key
+from data.student.quiz.grading import FileRefs, grade_submission, merge_details
+from data.student.quiz.models import Quiz
+
+
+def _fake_submission(answer_key: dict, correct_rate: float) -> dict:
+    """A QuizCheckSerializer-shaped payload answering every question."""
+    data = {}
+    for qtype, questions in answer_key["types"].items():
+        for qid, question in questions.items():
+            right = random.random() < correct_rate
+            if qtype == "standard":
+                ids = [a["id"] for a in question["entry"].get("answers", [])]
+                answer = {
+                    "question_id": qid,
+                    "answer_id": (
+                        question["correct_ids"][0]
+                        if right and question["correct_ids"]
+                        else random.choice(ids or [qid])
+                    ),
+                }
+            elif qtype == "objective_test":
+                answer = {
+                    "objective_id": qid,
+                    "answer_ids": question["correct_answer"] if right else "-",
+                }
+            elif qtype == "cloze_test":
+                sequence = list(question["correct_sequence"])
+                if not right:
+                    random.shuffle(sequence)
+                answer = {"cloze_id": qid, "word_sequence": sequence}
+            elif qtype == "image_objective":
+                answer = {
+                    "image_objective_id": qid,
+                    "answer": question["answer_id"] if right else "-",
+                }
+            elif qtype == "true_false":
+                answer = {
+                    "true_false_id": qid,
+                    "choice": question["correct_answer"] if right else "Not Given",
+                }
+            elif qtype == "match_pair":
+                pairs = [list(pair) for pair in question["correct_pairs"]]
+                if not right and len(pairs) > 1:
+                    pairs[0][1], pairs[1][1] = pairs[1][1], pairs[0][1]
+                answer = {
+                    "match_id": qid,
+                    "pairs": [{"left_id": l, "right_id": r} for l, r in pairs],
+                }
+            else:
+                continue
+            data.setdefault(qtype, []).append(answer)
+    return data
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate concurrent QuizCheckAPIView submissions against the compiled "
+        "answer key (grading only, nothing is written)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--quiz", help="Quiz id (default: the largest quiz)")
+        parser.add_argument("--submissions", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--correct-rate", type=float, default=0.7)
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="Drop the cached key before every submission (the old per-request cost)",
+        )
+
+    def handle(self, *args, **options):
+        quiz = self._quiz(options["quiz"])
+        submissions = options["submissions"]
+        concurrency = options["concurrency"]
+
+        with CaptureQueriesContext(connection) as compile_queries:
+            started = time.perf_counter()
+            answer_key = compile_answer_key(quiz)
+            compile_ms = (time.perf_counter() - started) * 1e3
+
+        size = sum(len(questions) for questions in answer_key["types"].values())
+        self.stdout.write(
+            f"Quiz {quiz.title!r} ({quiz.pk}): {size} questions, "
+            f"compile {compile_ms:.1f} ms / {len(compile_queries)} queries"
+        )
+
+        payloads = [
+            _fake_submission(answer_key, options["correct_rate"])
+            for _ in range(submissions)
+        ]
+
+        get_answer_key(quiz)
+        with CaptureQueriesContext(connection) as grade_queries:
+            self._grade(quiz, payloads[0], options["cold"])
+        self.stdout.write(f"Queries per submission: {len(grade_queries)}")
+
+        def worker(chunk):
+            timings = []
+            try:
+                for payload in chunk:
+                    started = time.perf_counter()
+                    self._grade(quiz, payload, options["cold"])
+                    timings.append(time.perf_counter() - started)
+            finally:
+                connections.close_all()
+            return timings
+
+        chunks = [payloads[i::concurrency] for i in range(concurrency)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            timings = [t for chunk in pool.map(worker, chunks) for t in chunk]
+        wall = time.perf_counter() - started
+
+        timings.sort()
+        ms = [t * 1e3 for t in timings]
+        self.stdout.write(
+            f"{submissions} submissions, {concurrency} concurrent"
+            f"{' (cold key)' if options['cold'] else ''}: "
+            f"{submissions / wall:.0f}/s, p50 {statistics.median(ms):.2f} ms, "
+            f"p95 {ms[int(len(ms) * 0.95) - 1]:.2f} ms, max {ms[-1]:.2f} ms"
+        )
+
+    def _quiz(self, quiz_id):
+        if quiz_id:
+            quiz = Quiz.objects.filter(pk=quiz_id).first()
+        else:
+            quiz = (
+                Quiz.objects.annotate(size=Count("question"))
+                .order_by("-size")
+                .first()
+            )
+        if quiz is None:
+            raise CommandError("No quiz to benchmark.")
+        return quiz
+
+    def _grade(self, quiz, payload, cold):
+        if cold:
+            cache.delete(_cache_key(quiz))
+        answer_key = get_answer_key(quiz)
+        files = FileRefs()
+        results = grade_submission(answer_key, payload, files)
+        assigned = [
+            (qtype, qid)
+            for qtype, questions in answer_key["types"].items()
+            for qid in questions
+        ]
+        results["details"] = merge_details(
+            answer_key, results["details"], assigned, files
+        )
+        files.resolve(None)
+        return results
@@ -390,6 +390,43 @@ class True_False(BaseModel):
     #     return f"{self.quiz.title}  {self.answer}"
 
 
+class QuizImport(BaseModel):
+    """A question bank workbook imported in the background (see importer.py)."""
+
+    file: "File" = models.ForeignKey(
+        "upload.File",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="quiz_imports",
+    )
+    created_by = models.ForeignKey(
+        "account.CustomUser",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="quiz_imports",
+    )
+    status = models.CharField(
+        choices=[
+            ("Pending", "Pending"),
+            ("Running", "Running"),
+            ("Done", "Done"),
+            ("Failed", "Failed"),
+        ],
+        default="Pending",
+        max_length=20,
+    )
+    stage = models.CharField(max_length=30, null=True, blank=True)
+    done = models.IntegerField(default=0)
+    total = models.IntegerField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+
+    def __str__(self):
+        return f"QuizImport({self.status}, {self.stage} {self.done}/{self.total})"
+
+
 class ExamSubject(BaseModel):
     subject: "Subject" = models.ForeignKey(
         "subject.Subject",
@@ -25,6 +25,7 @@ from .models import (
     ImageObjectiveTest,
     ExamCertificate,
     ExamSubject,
+    QuizImport,
 )
 from data.student.groups.models import Group
 from data.student.homeworks.models import Homework
@@ -34,7 +35,8 @@ from data.student.subject.models import Subject, Theme
 from data.student.subject.serializers import SubjectSerializer, ThemeSerializer
 from data.account.models import CustomUser
 from data.exam_results.models import QuizResult
-from data.finances.finance.models import Finance, Kind
+from data.finances.finance.cache import get_kind
+from data.finances.finance.models import Finance
 from data.notifications.models import Notification
 from data.parents.models import Relatives
 from data.upload.models import File
@@ -851,7 +853,7 @@ class ExamRegistrationSerializer(serializers.ModelSerializer):
                     come_from="",
                 )
 
-            kind = Kind.objects.get(kind=FinanceKindTypeChoices.MONEY_BACK)
+            kind = get_kind(FinanceKindTypeChoices.MONEY_BACK, True)
 
             Finance.objects.create(
                 action="EXPENSE",
@@ -946,3 +948,19 @@ class ExamCertificateSerializer(serializers.ModelSerializer):
             instance.student, include_only=["id", "first_name", "last_name"]
         ).data
         return rep
+
+
+class QuizImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = QuizImport
+        fields = [
+            "id",
+            "status",
+            "stage",
+            "done",
+            "total",
+            "result",
+            "error",
+            "created_at",
+            "updated_at",
+        ]
@@ -1,9 +1,12 @@
+import logging
 from datetime import datetime, timedelta
 
 from celery import shared_task
+from django.utils import timezone
 
 from data.notifications.models import Notification
-from data.student.quiz.models import Exam
+from data.student.quiz.importer import import_quiz_workbook
+from data.student.quiz.models import Exam, QuizImport
 
 @shared_task
 def handle_task_creation(exam_id):
@@ -15,4 +18,29 @@ def handle_task_creation(exam_id):
         # If less than 12 hours remain before the exam starts
         if exam_start_datetime - now <= timedelta(hours=12):
             exam.status = "Inactive"
-            exam.save()
\ No newline at end of file
+            exam.save()
+
+
+@shared_task
+def import_quiz_bank(import_id):
+    """Run a QuizImport uploaded through ExcelQuizUploadAPIView."""
+    quiz_import = QuizImport.objects.select_related("file").filter(id=import_id).first()
+    if not quiz_import or not quiz_import.file:
+        return
+
+    imports = QuizImport.objects.filter(id=import_id)
+
+    def progress(stage, done, total):
+        imports.update(stage=stage, done=done, total=total, updated_at=timezone.now())
+
+    imports.update(status="Running", updated_at=timezone.now())
+    try:
+        with quiz_import.file.file.open("rb") as workbook:
+            result = import_quiz_workbook(workbook, progress)
+    except Exception as e:
+        logging.exception(f"Quiz import {import_id} failed")
+        imports.update(status="Failed", error=str(e), updated_at=timezone.now())
+        return
+
+    imports.update(status="Done", result=result, updated_at=timezone.now())
+    return result
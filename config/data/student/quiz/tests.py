@@ -1,3 +1,163 @@
+from io import BytesIO
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+
+from data.account.models import CustomUser
+
+from data.student.quiz.answer_keys import get_answer_key
+from data.student.quiz.grading import FileRefs, grade_submission
+from data.student.quiz.importer import import_quiz_workbook
+from data.student.quiz.models import (
+    Answer,
+    MatchPairs,
+    Pairs,
+    Question,
+    Quiz,
+    QuizGaps,
+    True_False,
+)
+
+
+class AnswerKeyGradingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.quiz = Quiz.objects.create(title="Quiz")
+
+        cls.right = Answer.objects.create(text="4", is_correct=True)
+        cls.wrong = Answer.objects.create(text="5")
+        cls.question = Question.objects.create(
+            quiz=cls.quiz, text=QuizGaps.objects.create(name="2 + 2")
+        )
+        cls.question.answers.set([cls.right, cls.wrong])
+
+        cls.true_false = True_False.objects.create(
+            quiz=cls.quiz,
+            question=QuizGaps.objects.create(name="Sky is blue"),
+            answer="True",
+        )
+
+        cls.left = Pairs.objects.create(pair="cat", choice="Left", key="1")
+        cls.right_pair = Pairs.objects.create(pair="mushuk", choice="Right", key="1")
+        cls.match = MatchPairs.objects.create(quiz=cls.quiz)
+        cls.match.pairs.set([cls.left, cls.right_pair])
+
+    def _grade(self, data):
+        self.quiz.refresh_from_db()
+        return grade_submission(get_answer_key(self.quiz), data, FileRefs())
+
+    def test_grading(self):
+        results = self._grade(
+            {
+                "standard": [
+                    {"question_id": self.question.id, "answer_id": self.right.id}
+                ],
+                "true_false": [{"true_false_id": self.true_false.id, "choice": "false"}],
+                "match_pair": [
+                    {
+                        "match_id": self.match.id,
+                        "pairs": [
+                            {"left_id": self.left.id, "right_id": self.right_pair.id}
+                        ],
+                    }
+                ],
+            }
+        )
+
+        self.assertEqual(results["summary"]["correct_count"], 2)
+        self.assertEqual(results["summary"]["wrong_count"], 1)
+        self.assertEqual(results["details"]["standard"][0]["correct_answer"], "4")
+        self.assertFalse(results["details"]["true_false"][0]["correct"])
+        self.assertTrue(results["details"]["match_pair"][0]["correct"])
+
+    def test_grading_runs_no_queries_once_compiled(self):
+        self.quiz.refresh_from_db()
+        answer_key = get_answer_key(self.quiz)
+        with self.assertNumQueries(0):
+            grade_submission(
+                answer_key,
+                {"true_false": [{"true_false_id": self.true_false.id, "choice": "True"}]},
+                FileRefs(),
+            )
+
+    def test_answer_change_invalidates_key(self):
+        self.quiz.refresh_from_db()
+        get_answer_key(self.quiz)
+
+        self.wrong.is_correct = True
+        self.wrong.save()
+        self.right.is_correct = False
+        self.right.save()
+
+        results = self._grade(
+            {"standard": [{"question_id": self.question.id, "answer_id": self.wrong.id}]}
+        )
+        self.assertEqual(results["summary"]["correct_count"], 1)
+
+
+class QuizImportTest(TestCase):
+    def _workbook(self, rows):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["Quiz", "Question", "Answer", "Correct"])
+        for row in rows:
+            ws.append(row)
+        buffer = BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+    def test_import_dedupes_and_reuses_rows(self):
+        existing = Answer.objects.create(text="Paris", is_correct=True)
+        rows = [
+            ["Geo", "Capital of France?", "Paris", "true"],
+            ["Geo", "Capital of France?", "Rome", "false"],
+            ["Geo", "Capital of France?", "Rome", "false"],
+            ["Geo", "Capital of Italy?", "Rome", "true"],
+            ["Geo", None, "Skipped", "true"],
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            result = import_quiz_workbook(self._workbook(rows))
+        # two per table (lookup + bulk insert), links, version bump
+        self.assertLessEqual(len(queries), 12)
+
+        self.assertEqual(result["questions_processed"], 4)
+        self.assertEqual(result["new_questions"], 2)
+        self.assertEqual(result["new_answers"], 1)
+
+        question = Question.objects.get(text__name="Capital of France?")
+        self.assertEqual(
+            set(question.answers.values_list("text", flat=True)), {"Paris", "Rome"}
+        )
+        self.assertIn(existing, question.answers.all())
+        self.assertFalse(Answer.objects.get(text="Rome").is_correct)
+
+        # importing the same sheet again creates nothing new
+        result = import_quiz_workbook(self._workbook(rows))
+        self.assertEqual(result["new_questions"], 0)
+        self.assertEqual(Question.objects.count(), 2)
+
+    def test_failed_upload_leaves_nothing_behind(self):
+        client = APIClient()
+        client.force_authenticate(
+            CustomUser.objects.create(phone="+998900000041", role="DIRECTOR")
+        )
+        workbook = self._workbook([["Geo", "Capital of France?", "Paris", "true"]])
+        workbook.name = "bank.xlsx"
+
+        # fails after the quizzes, texts and answers are written
+        with mock.patch(
+            "data.student.quiz.importer._import_questions", side_effect=ValueError
+        ):
+            response = client.post(
+                "/quizzes/import-quiz/", {"file": workbook}, format="multipart"
+            )
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Quiz.objects.filter(title="Geo").exists())
+        self.assertFalse(Answer.objects.filter(text="Paris").exists())
@@ -10,7 +10,7 @@ from .views import (
     ObjectiveTestView, Cloze_TestView, ImageCloze_TestView, ExamRegisteredStudentAPIView, QuizListPgView,
     True_False_TestView, True_False_TestRetriveView, Cloze_TestUpdate, ExamCertificateAPIView, ExamSubjectListCreate,
     ExamSubjectDetail, ExamOptionCreate, ExamRegistrationNoPgAPIView, ExamRegistrationUpdate, ExamCertificateUpdate,
-    ExamRegisteredStudentListAPIView, MonthlyExam
+    ExamRegisteredStudentListAPIView, MonthlyExam, QuizImportRetrieveAPIView
 )
 
 urlpatterns = [
@@ -54,6 +54,7 @@ urlpatterns = [
     path("check/", QuizCheckAPIView.as_view(), name='check'),
 
     path("import-quiz/", ExcelQuizUploadAPIView.as_view(), name='import-quiz'),
+    path("import-quiz/<uuid:pk>/", QuizImportRetrieveAPIView.as_view(), name='import-quiz-status'),
 
     path("exam-registration/", ExamRegistrationListCreateAPIView.as_view(), name='exam-registration'),
     path("registration/no-pg/", ExamRegistrationNoPgAPIView.as_view(), name='registration'),
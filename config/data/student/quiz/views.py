@@ -1,17 +1,13 @@
-import uuid
 from datetime import datetime, timedelta, date
 
-import uuid
 from datetime import datetime, timedelta, date
 
 import openpyxl
 import pandas as pd
 from django.db import transaction
-from django.dispatch.dispatcher import logger
 from django.http import HttpResponse
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from openpyxl.reader.excel import load_workbook
 from openpyxl.styles import PatternFill
 from openpyxl.utils import get_column_letter
 from rest_framework import status
@@ -20,13 +16,17 @@ from rest_framework.generics import (
     RetrieveUpdateDestroyAPIView,
     get_object_or_404,
     ListAPIView,
+    RetrieveAPIView,
 )
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .answer_keys import get_answer_key
 from .check_serializers import QuizCheckSerializer
+from .grading import FileRefs, assigned_questions, grade_submission, merge_details
+from .importer import import_quiz_workbook
 from .models import (
     Fill_gaps,
     Vocabulary,
@@ -42,6 +42,7 @@ from .models import (
     True_False,
     ExamCertificate,
     ExamSubject,
+    QuizImport,
 )
 from .models import Quiz, Question
 from .serializers import (
@@ -60,10 +61,11 @@ from .serializers import (
     ImageObjectiveTestSerializer,
     True_FalseSerializer,
     ExamCertificateSerializer,
-    QuizCheckingSerializer,
     ExamSubjectSerializer,
     ExamMonthlySerializer,
+    QuizImportSerializer,
 )
+from .tasks import import_quiz_bank
 from data.student.groups.models import Group
 from data.student.homeworks.models import Homework, Homework_history
 from data.student.mastering.models import Mastering
@@ -73,10 +75,8 @@ from data.student.student.models import Student
 from data.student.subject.models import Theme, Subject
 from data.account.models import CustomUser
 from data.exam_results.models import QuizResult
-from data.exam_results.serializers import QuizResultSerializer
 from data.notifications.models import Notification
 from data.upload.models import File
-from data.upload.serializers import FileUploadSerializer
 
 
 class QuizCheckAPIView(APIView):
@@ -101,562 +101,40 @@ class QuizCheckAPIView(APIView):
         student = Student.objects.filter(user__id=data.get("student")).first()
         theme = get_object_or_404(Theme, id=data.get("theme"))
 
-        results = {
-            "details": {},
-            "summary": {
-                "total_questions": 0,
-                "correct_count": 0,
-                "wrong_count": 0,
-                "ball": 0.0,
-            },
-        }
-
-        quiz_questions = QuizCheckingSerializer(quiz).data["questions"]
-
-        for question in quiz_questions:
-            qtype = question["type"]
-            qid = question["id"]
-
-            user_answer = self._find_user_answer(data, qtype, qid)
-
-            if qtype not in results["details"]:
-                results["details"][qtype] = []
-
-            if not user_answer:
-                continue
-
-            is_correct, result_data = self._check_answer(question, user_answer)
-
-            if is_correct:
-                results["summary"]["correct_count"] += 1
-            else:
-                results["summary"]["wrong_count"] += 1
-
-            results["details"][qtype].append(result_data)
+        answer_key = get_answer_key(quiz)
+        files = FileRefs()
+        results = grade_submission(answer_key, data, files)
 
-        context = {
-            "request": request,
-            "user": request.user,
-            "custom_data": "some_value",
-        }
+        quiz_result = QuizResult.objects.filter(quiz=quiz, student=student).first()
+        if quiz_result:
+            assigned = assigned_questions(quiz_result)
+            total = len(assigned)
+        else:
+            assigned = []
+            total = sum(len(questions) for questions in answer_key["types"].values())
 
-        existing_results = QuizResult.objects.filter(quiz=quiz, student=student).first()
-        existing_data = (
-            QuizResultSerializer(existing_results, context=context).data
-            if existing_results
-            else None
+        results["details"] = merge_details(
+            answer_key, results["details"], assigned, files
         )
+        files.resolve(request)
 
-        data_length = existing_data.get("total_question_count")
-
-        # print(data_length)
-
-        RESULT_FIELDS_MAP = {
-            "match_pair_result": "match_pair",
-            "true_false_result": "true_false",
-            "vocabulary_result": "vocabulary",
-            "objective_result": "objective_test",
-            "cloze_test_result": "cloze_test",
-            "image_objective_result": "image_objective",
-            "standard": "standard",
-        }
-
-        merged_details = {}
-
-        # Add existing results first
-        if existing_data:
-
-            for field, qtype in RESULT_FIELDS_MAP.items():
-
-                entries = existing_data.get(field)
-                if entries:
-                    merged_details[qtype] = {entry["id"]: entry for entry in entries}
-
-        # Merge with new incoming answers (overwrite duplicates)
-        for qtype, entries in results["details"].items():
-
-            if qtype not in merged_details:
-                merged_details[qtype] = {}
-            for entry in entries:
-                merged_details[qtype][entry["id"]] = entry
-
-        # Final merged details to be returned
-        results["details"] = {k: list(v.values()) for k, v in merged_details.items()}
-
-        total = data_length
-
-        results["summary"]["total_questions"] = total
-        results["summary"]["wrong_count"] = total - results["summary"]["correct_count"]
-        results["summary"]["ball"] = (
-            round((results["summary"]["correct_count"] / total * 100), 2)
-            if total > 0
-            else 0.0
+        summary = results["summary"]
+        summary["total_questions"] = total
+        summary["wrong_count"] = total - summary["correct_count"]
+        summary["ball"] = (
+            round((summary["correct_count"] / total * 100), 2) if total > 0 else 0.0
         )
 
-        self._create_mastering_record(theme, student, quiz, results["summary"]["ball"])
+        self._create_mastering_record(theme, student, quiz, summary["ball"])
 
-        def make_json_serializable(obj):
-            if isinstance(obj, dict):
-                return {k: make_json_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [make_json_serializable(i) for i in obj]
-            elif isinstance(obj, uuid.UUID):
-                return str(obj)
-            else:
-                return obj
-
-        # Before saving
-        serializable_results = make_json_serializable(results)
-        existing_results.json_body = serializable_results
-        existing_results.save()
+        if quiz_result:
+            quiz_result.json_body = results
+            quiz_result.save()
+        elif student:
+            QuizResult.objects.create(quiz=quiz, student=student, json_body=results)
 
         return Response(results)
 
-    def _prepare_question_data(self, question):
-        qtype = question["type"]
-        handler = getattr(self, f"_prepare_{qtype}", None)
-        return handler(question) if handler else {"id": question["id"], "type": qtype}
-
-    def _prepare_standard(self, question):
-        return {
-            "id": question["id"],
-            "type": "standard",
-            "text": question.get("text", {}).get("name")
-            or question.get("question", {}).get("name"),
-            "answers": [
-                {"id": a["id"], "text": a.get("text")}
-                for a in question.get("answers", [])
-            ],
-            "correct_answer": next(
-                (a["id"] for a in question.get("answers", []) if a.get("is_correct")),
-                None,
-            ),
-        }
-
-    def _prepare_true_false(self, question):
-        return {
-            "id": question["id"],
-            "type": "true_false",
-            "question_text": question.get("question", {}).get("name"),
-            "correct_answer": question.get("answer", ""),
-        }
-
-    def _prepare_match_pair(self, question):
-        left_items = [p for p in question.get("pairs", []) if p.get("choice") == "Left"]
-        right_items = [
-            p for p in question.get("pairs", []) if p.get("choice") == "Right"
-        ]
-
-        pairs = []
-        for left in left_items:
-            right = next((r for r in right_items if r["key"] == left["key"]), None)
-            if right:
-                pairs.append(
-                    {
-                        "left_id": left["id"],
-                        "left_text": left.get("pair"),
-                        "right_id": right["id"],
-                        "right_text": right.get("pair"),
-                    }
-                )
-
-        return {"id": question["id"], "type": "match_pair", "pairs": pairs}
-
-    def _prepare_cloze_test(self, question):
-        return {
-            "id": question["id"],
-            "type": "cloze_test",
-            "correct_sequence": [q["name"] for q in question.get("questions", [])],
-        }
-
-    def _find_user_answer(self, data, qtype, qid):
-        id_fields = {
-            "standard": "question_id",
-            "match_pair": "match_id",
-            "objective_test": "objective_id",
-            "cloze_test": "cloze_id",
-            "image_objective": "image_objective_id",
-            "true_false": "true_false_id",
-        }
-
-        id_field = id_fields.get(qtype, "question_id")
-        return next(
-            (a for a in data.get(qtype, []) if str(a.get(id_field)) == str(qid)), None
-        )
-
-    def _check_answer(self, question, user_answer):
-        qtype = question["type"]
-
-        # Handle any type aliases
-        if qtype in ["image_objective", "image_objective_test"]:
-            qtype = "image_objective"  # Standardize to one type
-
-        if qtype in ["objective_test", "objective", "objective_result"]:
-            qtype = "objective_test"
-
-        checker = getattr(self, f"check_{qtype}", None)
-
-        if not checker:
-            return False, {
-                "error": f"Unsupported question type: {qtype}",
-                "id": question["id"],
-            }
-
-        try:
-            return checker(question, user_answer)
-        except Exception as e:
-            logger.error(f"Error in {qtype} checker: {str(e)}")
-            return False, {"error": str(e), "id": question["id"]}
-
-    def check_objective_test(self, question, user_answer):
-        try:
-            correct_answer = question.get("answer", "")
-            if not correct_answer and "answers" in question:
-                correct_answer = next(
-                    (a["text"] for a in question["answers"] if a.get("is_correct")), ""
-                )
-
-            user_answer_text = user_answer.get("answer_ids", "")
-            is_correct = (
-                str(user_answer_text).strip().lower()
-                == str(correct_answer).strip().lower()
-            )
-
-            id = (
-                question.get("file", {}).get("id", "")
-                if question.get("file", {}).get("id")
-                else None
-            )
-            if id:
-                file = File.objects.filter(id=id).first()
-                file = (
-                    FileUploadSerializer(file, context={"request": self.request}).data
-                    if file
-                    else None
-                )
-            else:
-                file = None
-            return is_correct, {
-                "id": question["id"],
-                "file": file if file else None,
-                "question_text": question.get("question", {}).get("name"),
-                "correct": is_correct,
-                "user_answer": user_answer_text,
-                "correct_answer": correct_answer,
-            }
-        except Exception as e:
-            logger.error(f"Error processing objective test: {str(e)}")
-            id = (
-                question.get("file", {}).get("id", "")
-                if question.get("file", {}).get("id")
-                else None
-            )
-            if id:
-                file = File.objects.filter(id=id).first()
-                file = (
-                    FileUploadSerializer(file, context={"request": self.request}).data
-                    if file
-                    else None
-                )
-            else:
-                file = None
-            return False, {
-                "id": question["id"],
-                "file": file if file else None,
-                "correct": False,
-                "error": str(e),
-                "question_text": question.get("question", {}).get("name"),
-                "user_answer": user_answer.get("answer_ids", ""),
-                "correct_answer": "Error processing correct answer",
-            }
-
-    def check_cloze_test(self, question, user_answer):
-        try:
-            if not isinstance(question, dict) or not isinstance(user_answer, dict):
-                raise ValueError(
-                    "Invalid input: 'question' or 'user_answer' is not a dictionary"
-                )
-
-            correct_sequence = [
-                q.get("name", "") for q in question.get("questions", [])
-            ][::-1]
-            user_sequence = user_answer.get("word_sequence", [])
-
-            print(user_sequence)
-            print(correct_sequence)
-
-            is_correct = user_sequence == correct_sequence
-
-            print(question)
-
-            # Safe file handling
-            file_data_raw = question.get("file")
-            file_id = (
-                file_data_raw.get("id") if isinstance(file_data_raw, dict) else None
-            )
-            file = File.objects.filter(id=file_id).first() if file_id else None
-
-            # Get question name
-            question_name = ""
-            if isinstance(question.get("question"), dict):
-                question_name = question["question"].get("name", "")
-            elif isinstance(question.get("sentence"), dict):
-                question_name = question["sentence"].get("text", "")
-
-            print(question_name)
-
-            file_data = (
-                FileUploadSerializer(file, context={"request": self.request}).data
-                if file
-                else None
-            )
-
-            return is_correct, {
-                "id": question.get("id"),
-                "file": file_data,
-                "question_text": question_name,
-                "correct": is_correct,
-                "user_answer": user_sequence,
-                "correct_answer": correct_sequence,
-            }
-
-        except Exception as e:
-            logger.error(f"Error processing cloze test: {str(e)}")
-
-            file_data_raw = question.get("file") if isinstance(question, dict) else None
-            file_id = (
-                file_data_raw.get("id") if isinstance(file_data_raw, dict) else None
-            )
-            file = File.objects.filter(id=file_id).first() if file_id else None
-            file_data = (
-                FileUploadSerializer(file, context={"request": self.request}).data
-                if file
-                else None
-            )
-
-            return False, {
-                "id": question.get("id") if isinstance(question, dict) else None,
-                "correct": False,
-                "file": file_data,
-                "error": str(e),
-                "user_answer": (
-                    user_answer.get("word_sequence", [])
-                    if isinstance(user_answer, dict)
-                    else []
-                ),
-                "correct_answer": "Error processing correct sequence",
-            }
-
-    def check_image_objective(self, question, user_answer):
-        try:
-            correct_answer_id = question.get("answer", "")
-            user_answer_id = user_answer.get("answer", "")
-
-            correct_answer = Answer.objects.filter(text=correct_answer_id).first()
-            is_correct = str(user_answer_id) == str(correct_answer.id)
-
-            context = {
-                "request": self.request,
-                "user": self.request.user,
-                "custom_data": "some_value",
-            }
-
-            id = (
-                question.get("file", {}).get("id", "")
-                if question.get("file", {}).get("id")
-                else None
-            )
-            if id:
-                file = File.objects.filter(id=id).first()
-                url = (
-                    FileUploadSerializer(file, context={"request": self.request}).data
-                    if file
-                    else None
-                )
-            else:
-                url = None
-            correct_answer = Answer.objects.filter(text=correct_answer_id).first().text
-            return is_correct, {
-                "id": question["id"],
-                "question_text": question.get("question", {}).get("name"),
-                "correct": is_correct,
-                "user_answer": user_answer_id,
-                "correct_answer": correct_answer,
-                "comment": question.get("comment", ""),
-                "image_url": url or None,
-            }
-        except Exception as e:
-            logger.error(f"Error processing image objective: {str(e)}")
-
-            context = {
-                "request": self.request,
-                "user": self.request.user,
-                "custom_data": "some_value",
-            }
-
-            id = (
-                question.get("file", {}).get("id", "")
-                if question.get("file", {}).get("id")
-                else None
-            )
-            if id:
-                file = File.objects.filter(id=id).first()
-                url = (
-                    FileUploadSerializer(file, context={"request": self.request}).data
-                    if file
-                    else None
-                )
-            else:
-                url = None
-            correct_answer_id = question.get("answer", "")
-            correct_answer = Answer.objects.filter(id=correct_answer_id).first().text
-
-            return False, {
-                "id": question["id"],
-                "correct": False,
-                "error": str(e),
-                "image_url": url or None,
-                "user_answer": user_answer.get("answer", ""),
-                "correct_answer": correct_answer,
-            }
-
-    def check_standard(self, question, user_answer):
-
-        correct_answer_id = next(
-            (a["id"] for a in question.get("answers", []) if a.get("is_correct")), None
-        )
-
-        user_answer_id = user_answer.get("answer_id")
-        is_correct = str(user_answer_id) == str(correct_answer_id)
-
-        correct_answer = next(
-            (a["text"] for a in question.get("answers", []) if a.get("is_correct")),
-            None,
-        )
-        user_answer = Answer.objects.filter(id=user_answer_id).first().text
-
-        id = (
-            question.get("file", {}).get("id", "")
-            if question.get("file", {}).get("id")
-            else None
-        )
-        if id:
-            file = File.objects.filter(id=id).first()
-            file = (
-                FileUploadSerializer(file, context={"request": self.request}).data
-                if file
-                else None
-            )
-        else:
-            file = None
-
-        return is_correct, {
-            "id": question["id"],
-            "file": file if file else None,
-            "question_text": (question.get("text") or {}).get("name"),
-            "correct": is_correct,
-            "user_answer": user_answer_id,
-            "correct_answer": correct_answer,
-            "answers": question.get("answers", []),
-        }
-
-    def check_true_false(self, question, user_answer):
-        correct_answer = question.get("answer", "").lower()
-        user_choice = user_answer.get("choice", "").lower()
-        is_correct = user_choice == correct_answer
-
-        id = (
-            question.get("file", {}).get("id", "")
-            if question.get("file", {}).get("id")
-            else None
-        )
-        if id:
-            file = File.objects.filter(id=id).first()
-            file = (
-                FileUploadSerializer(file, context={"request": self.request}).data
-                if file
-                else None
-            )
-        else:
-            file = None
-
-        print(file)
-        return is_correct, {
-            "id": question["id"],
-            "file": file if file else None,
-            "question_text": (question.get("question") or {}).get("name"),
-            "correct": is_correct,
-            "comment": question.get("comment", ""),
-            "user_answer": user_answer.get("choice", ""),
-            "correct_answer": question.get("answer", ""),
-        }
-
-    def check_match_pair(self, question, user_answer):
-        # Extract correct left/right items from the question definition
-        left_items = {
-            p["key"]: p["id"]
-            for p in question.get("pairs", [])
-            if p.get("choice") == "Left"
-        }
-        right_items = {
-            p["key"]: p["id"]
-            for p in question.get("pairs", [])
-            if p.get("choice") == "Right"
-        }
-
-        # Build correct mapping by matching keys
-        correct_mapping = {
-            key: (left_items[key], right_items[key])
-            for key in left_items
-            if key in right_items
-        }
-
-        user_pairs = user_answer.get("pairs", [])
-
-        # ✅ Correct way: use filter + many=True
-        pair_qs = MatchPairs.objects.filter(id=question["id"])
-        pairs_serialized = MatchPairsSerializer(pair_qs, many=True).data
-
-        expected_pairs_count = len(correct_mapping)
-
-        if len(user_pairs) != expected_pairs_count:
-            return False, {
-                "id": question["id"],
-                "correct": False,
-                "error": f"Expected {expected_pairs_count} pairs, got {len(user_pairs)}",
-                "pair_results": [],
-                "pairs": pairs_serialized[0]["pairs"],
-                "comment": pairs_serialized[0]["comment"],
-            }
-
-        all_correct = True
-        matched_correct_pairs = set()
-
-        for pair in user_pairs:
-            left_id = str(pair.get("left_id"))
-            right_id = str(pair.get("right_id"))
-
-            is_correct = False
-            for key, (correct_left, correct_right) in correct_mapping.items():
-                if str(correct_left) == left_id and str(correct_right) == right_id:
-                    is_correct = True
-                    matched_correct_pairs.add(key)
-                    break
-
-            if not is_correct:
-                all_correct = False
-
-        # Check if all correct pairs were matched
-        if len(matched_correct_pairs) != len(correct_mapping):
-            all_correct = False
-
-        return all_correct, {
-            "id": question["id"],
-            "correct": all_correct,
-            "comment": pairs_serialized[0]["comment"],
-            "pairs": pairs_serialized[0]["pairs"],
-        }
-
     def _create_mastering_record(self, theme, student, quiz, ball):
         if not student:
             return
@@ -1068,9 +546,19 @@ class ExcelQuizUploadAPIView(APIView):
                 type=openapi.TYPE_FILE,
                 required=True,
                 description="Excel file (.xlsx) with a 'Questions' sheet",
-            )
+            ),
+            openapi.Parameter(
+                name="background",
+                in_=openapi.IN_FORM,
+                type=openapi.TYPE_BOOLEAN,
+                required=False,
+                description="Import in a Celery task; poll import-quiz/<id>/ for progress",
+            ),
         ],
-        responses={200: openapi.Response(description="Import result summary")},
+        responses={
+            200: openapi.Response(description="Import result summary"),
+            202: QuizImportSerializer,
+        },
     )
     def post(self, request):
         file_obj = request.FILES.get("file")
@@ -1079,60 +567,42 @@ class ExcelQuizUploadAPIView(APIView):
                 {"error": "No file uploaded."}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            wb = load_workbook(filename=file_obj)
-            ws = wb.active
-
-            created_questions = 0
-            quiz_map = {}
-
-            with transaction.atomic():
-                for row in ws.iter_rows(min_row=2, values_only=True):  # Skip header
-                    quiz_title, question_text, answer_text, is_correct = row
-
-                    if not all([quiz_title, question_text, answer_text]):
-                        continue
-
-                    # Get or create quiz
-                    quiz = quiz_map.get(quiz_title)
-                    if not quiz:
-                        quiz, _ = Quiz.objects.get_or_create(title=quiz_title)
-                        quiz_map[quiz_title] = quiz
-
-                    # Get or create QuizGaps for question text
-                    gap, _ = QuizGaps.objects.get_or_create(name=question_text)
-
-                    # Get or create Question
-                    question = Question.objects.filter(text=gap, quiz=quiz).first()
-                    if not question:
-                        question = Question.objects.create(text=gap, quiz=quiz)
-
-                    # Get or create Answer
-                    answer, created = Answer.objects.get_or_create(text=answer_text)
-                    if created:
-                        answer.is_correct = str(is_correct).strip().lower() in [
-                            "true",
-                            "1",
-                            "yes",
-                        ]
-                        answer.save()
-
-                    # Add answer to question
-                    question.answers.add(answer)
-
-                    created_questions += 1
-
+        background = request.data.get("background") or request.query_params.get(
+            "background"
+        )
+        if str(background).lower() in ["true", "1", "yes"]:
+            quiz_import = QuizImport.objects.create(
+                file=File.objects.create(file=file_obj),
+                created_by=request.user,
+            )
+            transaction.on_commit(lambda: import_quiz_bank.delay(str(quiz_import.id)))
             return Response(
-                {
-                    "message": "Quiz imported successfully",
-                    "quizzes_created": len(quiz_map),
-                    "questions_processed": created_questions,
-                }
+                QuizImportSerializer(quiz_import).data,
+                status=status.HTTP_202_ACCEPTED,
             )
 
+        try:
+            # one savepoint: a failed upload leaves nothing behind; only the
+            # background task commits chunk by chunk
+            with transaction.atomic():
+                result = import_quiz_workbook(file_obj)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+        return Response(
+            {
+                "message": "Quiz imported successfully",
+                "quizzes_created": result.pop("quizzes"),
+                **result,
+            }
+        )
+
+
+class QuizImportRetrieveAPIView(RetrieveAPIView):
+    queryset = QuizImport.objects.all()
+    serializer_class = QuizImportSerializer
+    permission_classes = [IsAuthenticated]
+
 
 class ExamRegistrationListCreateAPIView(ListCreateAPIView):
     queryset = ExamRegistration.objects.all()
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from data.student.shop.utils import coin_mismatches
+from data.student.student.models import Student
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify Student.coins against the Coins history (given - taken); with "
+        "--fix, set the mismatching balances to the history value"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Write the history values instead of only reporting mismatches",
+        )
+        parser.add_argument(
+            "--show",
+            type=int,
+            default=20,
+            help="How many mismatching students to list",
+        )
+
+    def handle(self, *args, **options):
+        mismatches = list(coin_mismatches())
+        for student_id, coins, expected in mismatches[: options["show"]]:
+            self.stdout.write(f"  {student_id}: coins {coins}, history {expected}")
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All coins match the history."))
+            return
+
+        if not options["fix"]:
+            self.stdout.write(
+                self.style.WARNING(f"{len(mismatches)} students do not match.")
+            )
+            return
+
+        with transaction.atomic():
+            for student_id, _, expected in mismatches:
+                Student.objects.filter(pk=student_id).update(coins=expected)
+        self.stdout.write(self.style.SUCCESS(f"Fixed {len(mismatches)} students."))
@@ -95,6 +95,15 @@ class Coins(BaseModel):
         related_name="coins_of_student",
     )
 
+    # the mastering these coins were given for (data.student.mastering.coins)
+    mastering: "Mastering | None" = models.ForeignKey(
+        "mastering.Mastering",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="coins",
+    )
+
     choice = models.CharField(
         choices=[
             ("Speaking", "Speaking"),
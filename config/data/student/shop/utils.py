@@ -1,5 +1,19 @@
+from decimal import Decimal
+
+from django.db.models import Case, DecimalField, F, Q, Sum, Value, When
+
 from .models import Coins, CoinsSettings
 from data.notifications.models import Notification
+from data.student.student.models import Student
+
+COIN_COMMENTS = {
+    "Speaking": "Siz {choice} topshirig'ini bajarganingiz uchun {coin} coinlar berildi.",
+    "Homework": "Siz Uy ishini bajarganingiz uchun {coin} coinlar berildi.",
+    "Mock": "Siz Mock imtihonida qatnashganingiz uchun {coin} coinlar berildi.",
+    "Unit_Test": "Siz Unit imtihonida qatnashganingiz uchun {coin} coinlar berildi.",
+    "Weekly": "Siz Haftalik imtihonida qatnashganingiz uchun {coin} coinlar berildi.",
+    "Monthly": "Siz Oylik imtihonida qatnashganingiz uchun {coin} coinlar berildi.",
+}
 
 
 def give_coin(choice, student, from_point, result_type=None):
@@ -7,14 +21,7 @@ def give_coin(choice, student, from_point, result_type=None):
     Assign coins to a student based on task and performance.
     """
 
-    valid_choices = {
-        "Speaking": "Siz {choice} topshirig'ini bajarganingiz uchun {coin} coinlar berildi.",
-        "Homework": "Siz Uy ishini bajarganingiz uchun {coin} coinlar berildi.",
-        "Mock": "Siz Mock imtihonida qatnashganingiz uchun {coin} coinlar berildi.",
-        "Unit_Test": "Siz Unit imtihonida qatnashganingiz uchun {coin} coinlar berildi.",
-        "Weekly": "Siz Haftalik imtihonida qatnashganingiz uchun {coin} coinlar berildi.",
-        "Monthly": "Siz Oylik imtihonida qatnashganingiz uchun {coin} coinlar berildi.",
-    }
+    valid_choices = COIN_COMMENTS
 
     print(choice, student, from_point)
 
@@ -50,3 +57,70 @@ def give_coin(choice, student, from_point, result_type=None):
             come_from="",
             comment=f"Sizga {coin_setting.coin} miqdorida tangalar qo'shildi!",
         )
+
+
+def matching_setting(settings, from_point: float):
+    """
+    give_coin()'s CoinsSettings for ``from_point`` among ``settings`` (of one
+    choice, in the default order): an exact Single one, else a Double range.
+    """
+    for setting in settings:
+        if setting.type == "Single" and setting.from_point == from_point:
+            return setting
+    for setting in settings:
+        if (
+            setting.type == "Double"
+            and setting.from_point is not None
+            and setting.to_point is not None
+            and setting.from_point <= from_point <= setting.to_point
+        ):
+            return setting
+    return None
+
+
+def add_coins(deltas: dict) -> int:
+    """Add ``{student id: coins}`` to Student.coins in one UPDATE."""
+    deltas = {pk: delta for pk, delta in deltas.items() if pk and delta}
+    if not deltas:
+        return 0
+    return Student.objects.filter(pk__in=deltas).update(
+        coins=Case(
+            *[
+                When(pk=pk, then=F("coins") + Value(Decimal(delta)))
+                for pk, delta in deltas.items()
+            ],
+            default=F("coins"),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        )
+    )
+
+
+def coins_from_history(student_ids=None) -> dict:
+    """{student id: given - taken} from the Coins rows, like on_coin_create."""
+    rows = Coins.objects.filter(student__isnull=False)
+    if student_ids is not None:
+        rows = rows.filter(student_id__in=student_ids)
+    totals = (
+        rows.values("student_id")
+        .annotate(
+            given=Sum("coin", filter=Q(status="Given")),
+            taken=Sum("coin", filter=Q(status="Taken")),
+        )
+        .order_by()
+    )
+    return {
+        row["student_id"]: (row["given"] or Decimal(0)) - (row["taken"] or Decimal(0))
+        for row in totals
+    }
+
+
+def coin_mismatches(student_ids=None):
+    """(student id, Student.coins, coins from history) where they differ."""
+    history = coins_from_history(student_ids)
+    students = Student.objects.all()
+    if student_ids is not None:
+        students = students.filter(pk__in=student_ids)
+    for pk, coins in students.values_list("id", "coins").order_by("id").iterator():
+        expected = history.get(pk, Decimal(0))
+        if coins != expected:
+            yield pk, coins, expected
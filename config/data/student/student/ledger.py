@@ -0,0 +1,263 @@
+"""
+Student balance journal.
+
+Every change of ``Student.balance`` goes through ``post_entry``, which locks
+the student row, appends a StudentLedgerEntry with the signed amount and the
+running balance, and saves the new balance on the student. Reading the
+current balance stays a plain column read; the journal answers "what was
+the balance on <date>" with one lookup on the (student, created_at) index.
+
+``rebuild_running_balances`` and ``ledger_mismatches`` back the
+``rebuild_student_ledger`` command and work on whole tables with window
+functions and grouped sums instead of walking students one by one.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Window
+
+from data.finances.finance.choices import FinanceKindTypeChoices
+from data.student.student.models import Student, StudentLedgerEntry
+
+CENT = Decimal("0.01")
+
+BATCH_SIZE = 1000
+
+OPENING_COMMENT = "Jurnal ochilishidagi balans"
+
+
+def to_amount(value) -> Decimal:
+    """Decimal rounded to tiyin; floats go through str() to avoid binary noise."""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return value.quantize(CENT)
+
+
+def post_entry(
+    student: Student,
+    amount,
+    reason: str,
+    *,
+    finance=None,
+    attendance=None,
+    comment: str | None = None,
+) -> StudentLedgerEntry:
+    """
+    Apply a signed ``amount`` to the student's balance and journal it.
+
+    The student row is locked for the rest of the transaction so concurrent
+    payments and charges serialize instead of overwriting each other.
+    ``student.balance`` is updated in place and saved, so the balance status
+    signals keep running as before. A student's first entry is preceded by
+    an OPENING entry for the balance they had before the journal.
+    """
+    amount = to_amount(amount)
+
+    with transaction.atomic():
+        balance = (
+            Student.objects.select_for_update()
+            .values_list("balance", flat=True)
+            .get(pk=student.pk)
+        )
+        balance_after = balance + amount
+
+        if balance and not StudentLedgerEntry.objects.filter(student=student).exists():
+            StudentLedgerEntry.objects.create(
+                student=student,
+                reason=StudentLedgerEntry.OPENING,
+                amount=balance,
+                balance_after=balance,
+                comment=OPENING_COMMENT,
+            )
+
+        entry = StudentLedgerEntry.objects.create(
+            student=student,
+            reason=reason,
+            amount=amount,
+            balance_after=balance_after,
+            finance=finance,
+            attendance=attendance,
+            comment=comment,
+        )
+
+        student.balance = balance_after
+        student.save(update_fields=["balance", "updated_at"])
+
+    return entry
+
+
+def finance_entry_reason(finance) -> str | None:
+    """
+    Ledger reason of a student Finance row, or None when it does not touch
+    the balance (lesson payments, and voucher expenses which are booked by
+    the VoucherStudent signal instead).
+    """
+    kind = finance.kind.kind if finance.kind else None
+
+    if kind == FinanceKindTypeChoices.LESSON_PAYMENT:
+        return None
+
+    if finance.action == "INCOME":
+        return StudentLedgerEntry.PAYMENT
+
+    if kind == FinanceKindTypeChoices.VOUCHER:
+        return None
+
+    if kind == FinanceKindTypeChoices.MONEY_BACK:
+        return StudentLedgerEntry.REFUND
+
+    if finance.attendance_id:
+        return StudentLedgerEntry.ATTENDANCE_CHARGE
+
+    return StudentLedgerEntry.CHARGE
+
+
+def current_balance(student: Student) -> Decimal:
+    """The balance as of now; ``Student.balance`` is the head of the journal."""
+    return student.balance
+
+
+def balance_at(student: Student, when) -> Decimal:
+    """The student's balance right after the last entry at or before ``when``."""
+    balance = (
+        StudentLedgerEntry.objects.filter(student=student, created_at__lte=when)
+        .order_by("-created_at", "-id")
+        .values_list("balance_after", flat=True)
+        .first()
+    )
+    return balance if balance is not None else Decimal("0.00")
+
+
+def balances_at(student_ids, when) -> dict:
+    """{student id: balance at ``when``} for many students, one query."""
+    rows = (
+        StudentLedgerEntry.objects.filter(
+            student_id__in=student_ids, created_at__lte=when
+        )
+        .order_by("student_id", "-created_at", "-id")
+        .distinct("student_id")
+        .values_list("student_id", "balance_after")
+    )
+    balances = dict.fromkeys(student_ids, Decimal("0.00"))
+    balances.update(rows)
+    return balances
+
+
+# ---------- bulk maintenance ----------
+
+
+def open_missing_journals() -> int:
+    """
+    Give every student without a journal an OPENING entry for the balance
+    they already have, so the journal and ``Student.balance`` agree from
+    here on.
+    """
+    students = Student.objects.filter(ledger__isnull=True).values_list(
+        "id", "balance"
+    )
+    created = 0
+    batch = []
+    for student_id, balance in students.iterator(chunk_size=BATCH_SIZE):
+        batch.append(
+            StudentLedgerEntry(
+                student_id=student_id,
+                reason=StudentLedgerEntry.OPENING,
+                amount=balance,
+                balance_after=balance,
+                comment=OPENING_COMMENT,
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            StudentLedgerEntry.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    if batch:
+        StudentLedgerEntry.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def rebuild_running_balances() -> int:
+    """
+    Recompute ``balance_after`` of every entry as the running sum of
+    ``amount`` per student and rewrite the rows that disagree. Returns the
+    number of rows fixed.
+    """
+    entries = (
+        StudentLedgerEntry.objects.annotate(
+            running=Window(
+                Sum("amount"),
+                partition_by=[F("student_id")],
+                order_by=[F("created_at").asc(), F("id").asc()],
+            )
+        )
+        .values_list("id", "balance_after", "running")
+        .order_by()
+    )
+
+    fixed = 0
+    batch = []
+    for entry_id, balance_after, running in entries.iterator(chunk_size=BATCH_SIZE):
+        if balance_after != running:
+            batch.append(StudentLedgerEntry(id=entry_id, balance_after=running))
+        if len(batch) >= BATCH_SIZE:
+            StudentLedgerEntry.objects.bulk_update(batch, ["balance_after"])
+            fixed += len(batch)
+            batch = []
+    if batch:
+        StudentLedgerEntry.objects.bulk_update(batch, ["balance_after"])
+        fixed += len(batch)
+    return fixed
+
+
+def ledger_mismatches():
+    """
+    Students whose ``balance`` differs from their journal, as
+    ``(id, balance, journal total, last balance_after)`` rows. Students
+    without a journal are left out (see ``open_missing_journals``).
+    """
+    last_entry = StudentLedgerEntry.objects.filter(student=OuterRef("pk")).order_by(
+        "-created_at", "-id"
+    )
+    return (
+        Student.objects.annotate(
+            journal_total=Sum("ledger__amount"),
+            last_balance=Subquery(last_entry.values("balance_after")[:1]),
+        )
+        .filter(journal_total__isnull=False)
+        .exclude(balance=F("journal_total"), last_balance=F("journal_total"))
+        .values_list("id", "balance", "journal_total", "last_balance")
+        .order_by()
+    )
+
+
+def adjust_to_journal(student_ids) -> int:
+    """
+    Append an ADJUSTMENT entry that brings the journal total in line with
+    ``Student.balance`` for each given student. ``Student.balance`` is kept
+    as the source of truth since it is what payments were accepted against.
+    """
+    totals = dict(
+        StudentLedgerEntry.objects.filter(student_id__in=student_ids)
+        .values("student_id")
+        .annotate(total=Sum("amount"))
+        .values_list("student_id", "total")
+    )
+    balances = dict(
+        Student.objects.filter(id__in=student_ids).values_list("id", "balance")
+    )
+
+    entries = [
+        StudentLedgerEntry(
+            student_id=student_id,
+            reason=StudentLedgerEntry.ADJUSTMENT,
+            amount=balance - totals.get(student_id, Decimal("0.00")),
+            balance_after=balance,
+            comment="Jurnal va balans farqi tuzatildi",
+        )
+        for student_id, balance in balances.items()
+        if balance != totals.get(student_id, Decimal("0.00"))
+    ]
+    StudentLedgerEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+    return len(entries)
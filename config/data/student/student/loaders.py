@@ -0,0 +1,189 @@
+"""
+Batch loaders of StudentSerializer (see data.command.batch): one grouped
+query per loader for the whole page, ``{student id: value}``.
+"""
+
+import datetime
+from collections import defaultdict
+
+from django.db.models import Avg, Count
+
+from data.finances.finance.models import SaleStudent, VoucherStudent
+from data.parents.models import Relatives
+from data.student.attendance.models import Attendance
+from data.student.groups import lesson_calendar
+from data.student.groups.lesson_date_calculator import calculate_lessons
+from data.student.groups.models import Group
+from data.student.homeworks.models import Homework_history
+from data.student.mastering.models import Mastering
+from data.student.studentgroup.models import SecondaryStudentGroup, StudentGroup
+
+
+def _first_order(model) -> list:
+    # the order .first() picks a row in
+    return list(model._meta.ordering) or ["pk"]
+
+
+def vouchers(ids, context) -> dict:
+    result = defaultdict(list)
+    for row in VoucherStudent.objects.filter(student_id__in=ids).select_related(
+        "voucher"
+    ):
+        result[row.student_id].append(
+            {
+                "id": row.voucher.id,
+                "amount": row.voucher.amount,
+                "is_expired": row.voucher.is_expired,
+                "created_at": row.created_at,
+            }
+        )
+    return result
+
+
+def sales(ids, context) -> dict:
+    result = defaultdict(list)
+    for row in SaleStudent.objects.filter(student_id__in=ids).select_related("sale"):
+        result[row.student_id].append(
+            {
+                "id": row.sale.id,
+                "amount": row.sale.amount,
+                "sale_status": row.sale.status,
+                "date": (
+                    row.expire_date.strftime("%Y-%m-%d")
+                    if row.expire_date
+                    else "Unlimited"
+                ),
+            }
+        )
+    return result
+
+
+def student_groups(ids, context) -> dict:
+    """The StudentGroup rows of each student, newest first."""
+    result = defaultdict(list)
+    for row in (
+        StudentGroup.objects.filter(student_id__in=ids)
+        .select_related("group__teacher", "group__course__level")
+        .order_by(*_first_order(StudentGroup))
+    ):
+        result[row.student_id].append(row)
+    return result
+
+
+def secondary_groups(ids, context) -> dict:
+    """The SecondaryStudentGroup row .first() picks for each student."""
+    result = {}
+    for row in (
+        SecondaryStudentGroup.objects.filter(student_id__in=ids)
+        .select_related("group__teacher")
+        .order_by(*_first_order(SecondaryStudentGroup))
+    ):
+        result.setdefault(row.student_id, row)
+    return result
+
+
+def learning(ids, context) -> dict:
+    """{student id: average Mastering ball}"""
+    return dict(
+        Mastering.objects.filter(student_id__in=ids)
+        .values("student_id")
+        .annotate(avg_ball=Avg("ball"))
+        .order_by()
+        .values_list("student_id", "avg_ball")
+    )
+
+
+def attending(ids, context) -> dict:
+    """
+    {student id: True} for students with a group that has a lesson in the
+    next 30 days; each group's calendar is computed once.
+    """
+    rows = list(
+        StudentGroup.objects.filter(student_id__in=ids, group__isnull=False)
+        .values_list("student_id", "group_id", "group__filial_id")
+    )
+
+    days = defaultdict(list)
+    for group_id, name in Group.scheduled_day_type.through.objects.filter(
+        group_id__in={group_id for _, group_id, _ in rows}
+    ).values_list("group_id", "day__name"):
+        days[group_id].append(name)
+
+    today = datetime.date.today()
+    start = today.strftime("%Y-%m-%d")
+    end = (today + datetime.timedelta(days=30)).strftime("%Y-%m-%d")
+
+    has_lessons = {}
+    result = {}
+    for student_id, group_id, filial_id in rows:
+        if not days[group_id]:
+            continue
+        if group_id not in has_lessons:
+            has_lessons[group_id] = bool(
+                calculate_lessons(
+                    start_date=start,
+                    end_date=end,
+                    lesson_type=",".join(days[group_id]),
+                    holidays=[
+                        day.isoformat()
+                        for day in lesson_calendar.holiday_dates(filial_id)
+                    ],
+                    days_off=["Yakshanba"],
+                )
+            )
+        if has_lessons[group_id]:
+            result[student_id] = True
+    return result
+
+
+def relatives(ids, context) -> dict:
+    result = defaultdict(list)
+    for row in Relatives.objects.filter(student_id__in=ids).values(
+        "student_id", "name", "phone", "who"
+    ):
+        result[row.pop("student_id")].append(row)
+    return result
+
+
+def attendance_counts(ids, context) -> dict:
+    """{student id: IS_PRESENT attendances}"""
+    return dict(
+        Attendance.objects.filter(student_id__in=ids, status="IS_PRESENT")
+        .values("student_id")
+        .annotate(n=Count("pk"))
+        .order_by()
+        .values_list("student_id", "n")
+    )
+
+
+def passed(ids, context) -> dict:
+    """
+    {student id: True} when the ``homework`` of the request has a Passed
+    history row with a mark of 75 or more; the created_at window is the one
+    the per-row check used.
+    """
+    request = context.get("request")
+    homework_id = request.query_params.get("homework") if request else None
+    if not homework_id:
+        return {}
+
+    today = datetime.datetime.today()
+    first = {}
+    for student_id, mark in (
+        Homework_history.objects.filter(
+            homework__id=homework_id,
+            student_id__in=ids,
+            status="Passed",
+            is_active=True,
+            created_at__gt=today,
+            created_at__lte=today + datetime.timedelta(days=2),
+        )
+        .order_by(*_first_order(Homework_history))
+        .values_list("student_id", "mark")
+    ):
+        first.setdefault(student_id, mark)
+    return {
+        student_id: True
+        for student_id, mark in first.items()
+        if mark is not None and mark >= 75
+    }
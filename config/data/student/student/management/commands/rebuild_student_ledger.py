@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from data.student.student.ledger import (
+    adjust_to_journal,
+    ledger_mismatches,
+    open_missing_journals,
+    rebuild_running_balances,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify Student.balance against the ledger journal; with --fix, open "
+        "missing journals, recompute running balances and book adjustments"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Write the fixes instead of only reporting mismatches",
+        )
+        parser.add_argument(
+            "--show",
+            type=int,
+            default=20,
+            help="How many mismatching students to list",
+        )
+
+    def handle(self, *args, **options):
+        if options["fix"]:
+            with transaction.atomic():
+                opened = open_missing_journals()
+                rewritten = rebuild_running_balances()
+            self.stdout.write(
+                f"Opened {opened} journals, rewrote {rewritten} running balances"
+            )
+
+        mismatches = list(ledger_mismatches())
+        for student_id, balance, total, last in mismatches[: options["show"]]:
+            self.stdout.write(
+                f"  {student_id}: balance {balance}, journal total {total}, "
+                f"last entry {last}"
+            )
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All balances match the journal."))
+            return
+
+        if not options["fix"]:
+            self.stdout.write(
+                self.style.WARNING(f"{len(mismatches)} students do not match.")
+            )
+            return
+
+        with transaction.atomic():
+            adjusted = adjust_to_journal([row[0] for row in mismatches])
+        self.stdout.write(self.style.SUCCESS(f"Booked {adjusted} adjustments."))
@@ -0,0 +1,166 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.contrib.postgres.constraints
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('attendance', '0003_initial'),
+        ('employee', '0003_initial'),
+        ('filial', '0001_initial'),
+        ('finance', '0001_initial'),
+        ('groups', '0002_initial'),
+        ('marketing_channel', '0001_initial'),
+        ('new_lid', '0001_initial'),
+        ('subject', '0001_initial'),
+        ('upload', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Student',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('middle_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('phone', models.CharField(max_length=100)),
+                ('date_of_birth', models.DateField(default=django.utils.timezone.now)),
+                ('password', models.CharField(blank=True, max_length=100, null=True)),
+                ('education_lang', models.CharField(choices=[('ENG', 'ENG'), ('RU', 'RU'), ('UZB', 'UZB')], default='UZB', max_length=100)),
+                ('student_type', models.CharField(default='student', max_length=100)),
+                ('edu_class', models.CharField(choices=[('SCHOOL', 'School'), ('UNIVERSITY', 'University'), ('MATURE', 'Mature'), ('NONE', 'None')], default='NONE', help_text='Education level at school if student studies at school', max_length=100)),
+                ('edu_organization', models.CharField(blank=True, help_text='Education organization, school or university or work.', max_length=255, null=True)),
+                ('edu_level', models.CharField(blank=True, max_length=100, null=True)),
+                ('ball', models.IntegerField(blank=True, default=0, help_text='Earned ball at competition', null=True)),
+                ('student_stage_type', models.CharField(choices=[('NEW_STUDENT', 'NEW_STUDENT'), ('ACTIVE_STUDENT', 'ACTIVE_STUDENT')], default='NEW_STUDENT', help_text="Student yangi o'quvchimi yoki aktiv o'quvchimi?", max_length=100)),
+                ('balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('balance_status', models.CharField(choices=[('ACTIVE', 'ACTIVE'), ('INACTIVE', 'INACTIVE')], default='INACTIVE', help_text='Balance status', max_length=100)),
+                ('frozen_from_date', models.DateField(blank=True, help_text='This field defines when student was frozen', null=True)),
+                ('frozen_till_date', models.DateField(blank=True, help_text='This field defines when student becomes active after freeze period is finished', null=True)),
+                ('new_student_date', models.DateTimeField(blank=True, null=True)),
+                ('active_date', models.DateTimeField(blank=True, null=True)),
+                ('coins', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('points', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('call_operator', models.ForeignKey(blank=True, help_text='Call operator', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='student_call_operator', to=settings.AUTH_USER_MODEL)),
+                ('file', models.ManyToManyField(blank=True, help_text='File for this student', related_name='student_files', to='upload.file')),
+                ('filial', models.ForeignKey(blank=True, help_text='Filial for this student', null=True, on_delete=django.db.models.deletion.CASCADE, to='filial.filial')),
+                ('marketing_channel', models.ForeignKey(blank=True, help_text='Marketing channel for this student', null=True, on_delete=django.db.models.deletion.CASCADE, to='marketing_channel.marketingchannel')),
+                ('photo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='students_photo', to='upload.file')),
+                ('sales_manager', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='employee.employee')),
+                ('service_manager', models.ForeignKey(blank=True, help_text='service_manager for this student', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='svm_students', to='employee.employee')),
+                ('subject', models.ForeignKey(blank=True, help_text='Subject that student won at competition', null=True, on_delete=django.db.models.deletion.SET_NULL, to='subject.subject')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='students_user', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentFrozenAction',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('from_date', models.DateField(blank=True, help_text='This field defines when student was frozen', null=True)),
+                ('till_date', models.DateField(blank=True, help_text='This field defines when student becomes active after freeze period is finished', null=True)),
+                ('reason', models.TextField(help_text='The reason why student has been frozen')),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+                ('student', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='frozen_actions', to='student.student')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('reason', models.CharField(choices=[('PAYMENT', "To'lov"), ('ATTENDANCE_CHARGE', 'Dars uchun yechib olindi'), ('CHARGE', 'Yechib olindi'), ('VOUCHER', 'Voucher'), ('SALE_DISCOUNT', 'Chegirma'), ('REFUND', 'Qaytarildi'), ('LEAD_TRANSFER', "Lid balansidan o'tkazildi"), ('ADJUSTMENT', 'Tuzatish'), ('OPENING', "Boshlang'ich balans")], max_length=32)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('balance_after', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('attendance', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='student_ledger', to='attendance.attendance')),
+                ('finance', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='student_ledger', to='finance.finance')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger', to='student.student')),
+            ],
+            options={
+                'ordering': ('created_at', 'id'),
+            },
+        ),
+        migrations.CreateModel(
+            name='FistLesson_data',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('lesson_date', models.DateTimeField(blank=True, null=True)),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='groups.group')),
+                ('level', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='subject.level')),
+                ('lid', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='new_lid.lid')),
+                ('teacher', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Fist Lesson data',
+                'verbose_name_plural': 'Fist Lesson data',
+                'ordering': ['-created_at'],
+                'abstract': False,
+                'constraints': [models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='student_fistlesson_data_arch_ts_chk')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='student',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='student_student_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentfrozenaction',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='student_studentfrozenaction_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentfrozenaction',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_archived', False)), fields=('student',), name='unique_active_freeze_per_student'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentfrozenaction',
+            constraint=models.CheckConstraint(condition=models.Q(('from_date__lt', models.F('till_date'))), name='check_valid_freeze_dates'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentfrozenaction',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('is_archived', False)), expressions=[(models.Func(models.F('from_date'), models.F('till_date'), models.Value('[)'), function='daterange'), '&&'), ('student', '=')], name='exclude_overlapping_freezes'),
+        ),
+        migrations.AddIndex(
+            model_name='studentledgerentry',
+            index=models.Index(fields=['student', 'created_at'], name='student_ledger_at_idx'),
+        ),
+    ]
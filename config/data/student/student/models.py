@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING, Literal
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from django.contrib import admin
 from django.db import models
 from django.utils import timezone
 from django.db.models import Q, F, Func
@@ -24,6 +25,8 @@ if TYPE_CHECKING:
     from data.parents.models import Relatives
     from data.account.models import CustomUser
     from data.employee.models import Employee
+    from data.finances.finance.models import Finance
+    from data.student.attendance.models import Attendance
 
 
 class Student(BaseModel):
@@ -390,3 +393,104 @@ class StudentFrozenAction(BaseModel):
 
             ),
         ]
+
+
+class StudentLedgerEntry(models.Model):
+    """
+    Append-only journal of everything that moves ``Student.balance``.
+
+    ``amount`` is signed (payments are positive, charges negative) and
+    ``balance_after`` is the running balance, so ``Student.balance`` always
+    equals the ``balance_after`` of the student's last entry. Rows are only
+    written through ``data.student.student.ledger.post_entry``.
+    """
+
+    PAYMENT = "PAYMENT"
+    ATTENDANCE_CHARGE = "ATTENDANCE_CHARGE"
+    CHARGE = "CHARGE"
+    VOUCHER = "VOUCHER"
+    SALE_DISCOUNT = "SALE_DISCOUNT"
+    REFUND = "REFUND"
+    LEAD_TRANSFER = "LEAD_TRANSFER"
+    ADJUSTMENT = "ADJUSTMENT"
+    OPENING = "OPENING"
+
+    id = models.BigAutoField(primary_key=True)
+
+    student: "Student" = models.ForeignKey(
+        "student.Student",
+        on_delete=models.CASCADE,
+        related_name="ledger",
+    )
+
+    reason = models.CharField(
+        max_length=32,
+        choices=[
+            (PAYMENT, "To'lov"),
+            (ATTENDANCE_CHARGE, "Dars uchun yechib olindi"),
+            (CHARGE, "Yechib olindi"),
+            (VOUCHER, "Voucher"),
+            (SALE_DISCOUNT, "Chegirma"),
+            (REFUND, "Qaytarildi"),
+            (LEAD_TRANSFER, "Lid balansidan o'tkazildi"),
+            (ADJUSTMENT, "Tuzatish"),
+            (OPENING, "Boshlang'ich balans"),
+        ],
+    )
+
+    amount = models.DecimalField(max_digits=14, decimal_places=2)
+
+    balance_after = models.DecimalField(max_digits=14, decimal_places=2)
+
+    finance: "Finance | None" = models.ForeignKey(
+        "finance.Finance",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="student_ledger",
+    )
+
+    attendance: "Attendance | None" = models.ForeignKey(
+        "attendance.Attendance",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="student_ledger",
+    )
+
+    comment = models.TextField(null=True, blank=True)
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ("created_at", "id")
+        indexes = [
+            models.Index(
+                fields=["student", "created_at"],
+                name="student_ledger_at_idx",
+            ),
+        ]
+
+    class Admin(admin.ModelAdmin):
+
+        list_display = ["student", "reason", "amount", "balance_after", "created_at"]
+
+        list_filter = ["reason"]
+
+        readonly_fields = [
+            "student",
+            "reason",
+            "amount",
+            "balance_after",
+            "finance",
+            "attendance",
+            "created_at",
+        ]
+
+    def __str__(self):
+        return f"{self.reason} {self.amount} -> {self.balance_after}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Ledger entries are append-only.")
+        super().save(*args, **kwargs)
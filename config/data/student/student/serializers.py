@@ -1,33 +1,28 @@
-import datetime
 import hashlib
 from time import timezone
 from django.utils import timezone as django_timezone
 
-from django.db.models import Avg
 from django.utils.module_loading import import_string
 from rest_framework import serializers
 
 from data.student.attendance.models import Attendance
-from data.student.groups.lesson_date_calculator import calculate_lessons
 from data.student.groups.models import Group
-from data.student.homeworks.models import Homework_history
-from data.student.mastering.models import Mastering
-from data.student.studentgroup.models import StudentGroup, SecondaryStudentGroup
 from data.student.subject.models import Level
 from data.account.models import CustomUser
 from data.account.serializers import UserSerializer
+from data.command.batch import BatchFieldsMixin, BatchListSerializer
 from data.department.filial.models import Filial
 from data.department.filial.serializers import FilialSerializer
 from data.department.marketing_channel.models import MarketingChannel
 from data.department.marketing_channel.serializers import MarketingChannelSerializer
-from data.finances.finance.models import SaleStudent, VoucherStudent
 from data.upload.models import File
 from data.upload.serializers import FileUploadSerializer
 
+from . import loaders
 from .models import Student, FistLesson_data
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(BatchFieldsMixin, serializers.ModelSerializer):
 
     photo = serializers.PrimaryKeyRelatedField(
         queryset=File.objects.all(),
@@ -61,6 +56,19 @@ class StudentSerializer(serializers.ModelSerializer):
     is_passed = serializers.SerializerMethodField()
     is_frozen = serializers.SerializerMethodField()
 
+    # one query per loader for a whole page, see data.command.batch
+    loaders = {
+        "passed": loaders.passed,
+        "vouchers": loaders.vouchers,
+        "sales": loaders.sales,
+        "groups": loaders.student_groups,
+        "secondary_groups": loaders.secondary_groups,
+        "learning": loaders.learning,
+        "attending": loaders.attending,
+        "relatives": loaders.relatives,
+        "attendance_counts": loaders.attendance_counts,
+    }
+
     def __init__(self, *args, **kwargs):
         fields_to_remove: list | None = kwargs.pop("remove_fields", None)
         include_only: list | None = kwargs.pop("include_only", None)
@@ -132,62 +140,23 @@ class StudentSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+        list_serializer_class = BatchListSerializer
 
     def get_is_passed(self, obj):
         request = self.context.get("request")
-        if not request:
-            return False
-
-        homework_id = request.query_params.get("homework")
-        if not homework_id:
+        if not request or not request.query_params.get("homework"):
             return False
-
-        homeworks = Homework_history.objects.filter(
-            homework__id=homework_id,
-            student=obj,
-            status="Passed",
-            is_active=True,
-            created_at__gt=datetime.datetime.today(),
-            created_at__lte=datetime.datetime.today() + datetime.timedelta(days=2),
-        )
-        if homeworks and homeworks.first().mark >= 75:
-            return homeworks.exists()
+        return self.resolve("passed", obj)
 
     def get_voucher(self, obj):
-        voucher = VoucherStudent.objects.filter(student=obj)
-        if voucher:
-            return [
-                {
-                    "id": voucher.voucher.id,
-                    "amount": voucher.voucher.amount,
-                    "is_expired": voucher.voucher.is_expired,
-                    "created_at": voucher.created_at,
-                }
-                for voucher in voucher
-            ]
+        return self.resolve("vouchers", obj) or None
 
     def get_sales(self, obj):
-        sales = SaleStudent.objects.filter(student__id=obj.id)
-        return [
-            {
-                "id": sale.sale.id,
-                "amount": sale.sale.amount,
-                "sale_status": sale.sale.status,
-                "date": (
-                    sale.expire_date.strftime("%Y-%m-%d")
-                    if sale.expire_date
-                    else "Unlimited"
-                ),
-            }
-            for sale in sales
-        ]
+        return self.resolve("sales", obj, [])
 
     def get_teacher(self, obj):
-        group = (
-            StudentGroup.objects.filter(student=obj)
-            .select_related("group__teacher")
-            .first()
-        )
+        groups = self.resolve("groups", obj, [])
+        group = groups[0] if groups else None
 
         if group and group.group and group.group.teacher:
             teacher = group.group.teacher
@@ -196,16 +165,14 @@ class StudentSerializer(serializers.ModelSerializer):
         return None
 
     def get_learning(self, obj):
-        mastering_qs = Mastering.objects.filter(student=obj)
+        average_score = self.resolve("learning", obj)
 
-        if not mastering_qs.exists():
+        if average_score is None:
             return {
                 "score": 1,
                 "learning": 0,
             }
 
-        average_score = mastering_qs.aggregate(avg_ball=Avg("ball"))["avg_ball"] or 0
-
         score_scaled = min(max(round(average_score / 20), 1), 5)
 
         percentage_scaled = min(max(round((average_score / 100) * 100), 0), 100)
@@ -213,53 +180,10 @@ class StudentSerializer(serializers.ModelSerializer):
         return {"score": score_scaled, "learning": percentage_scaled}
 
     def get_is_attendance(self, obj):
-        groups = (
-            StudentGroup.objects.filter(student=obj)
-            .select_related("group")  # ensures group exists
-            .prefetch_related("group__scheduled_day_type")
-        )
-
-        today = datetime.date.today()
-        end_date = today + datetime.timedelta(days=30)
-
-        start_date_str = today.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-
-        for group in groups:
-            group_obj = getattr(group, "group", None)
-            if not group_obj:
-                continue
-
-            # Get lesson days
-            scheduled_days = getattr(group_obj, "scheduled_day_type", None)
-            if not scheduled_days:
-                continue
-
-            lesson_days = [day.name for day in scheduled_days.all()]
-            if not lesson_days:
-                continue
-
-            # Calculate lesson dates
-            lesson_dates = calculate_lessons(
-                start_date=start_date_str,
-                end_date=end_date_str,
-                lesson_type=",".join(lesson_days),
-                holidays=[""],
-                days_off=["Yakshanba"],
-            )
-
-            if lesson_dates:
-                return True
-
-        return False
+        return self.resolve("attending", obj, False)
 
     def get_secondary_group(self, obj):
-        group = (
-            SecondaryStudentGroup.objects.filter(student=obj)
-            .select_related("group")
-            .only("id", "group__name")
-            .first()
-        )
+        group = self.resolve("secondary_groups", obj)
 
         if group and group.group:
             return {"id": group.group.id, "name": group.group.name}
@@ -267,11 +191,7 @@ class StudentSerializer(serializers.ModelSerializer):
         return None
 
     def get_secondary_teacher(self, obj):
-        group = (
-            SecondaryStudentGroup.objects.filter(student=obj)
-            .select_related("group__teacher")
-            .first()
-        )
+        group = self.resolve("secondary_groups", obj)
 
         if group and group.group and group.group.teacher:
             teacher = group.group.teacher
@@ -284,27 +204,39 @@ class StudentSerializer(serializers.ModelSerializer):
         return None
 
     def get_course(self, obj):
-        courses = StudentGroup.objects.filter(student=obj).values(
-            "group__course__name", "group__course__level__name"
-        )
-        return list(courses)
+        courses = []
+        for row in self.resolve("groups", obj, []):
+            course = row.group.course if row.group else None
+            level = course.level if course else None
+            courses.append(
+                {
+                    "group__course__name": course.name if course else None,
+                    "group__course__level__name": level.name if level else None,
+                }
+            )
+        return courses
 
     def get_group(self, obj: Student):
+        courses = []
+        for row in self.resolve("groups", obj, []):
+            group = row.group
+            teacher = group.teacher if group else None
+            course = {
+                "group__id": group.id if group else None,
+                "group__name": group.name if group else None,
+                "group__status": group.status if group else None,
+                "group__started_at": group.started_at if group else None,
+                "group__ended_at": group.ended_at if group else None,
+                "group__teacher__first_name": teacher.first_name if teacher else None,
+                "group__teacher__last_name": teacher.last_name if teacher else None,
+            }
+            if course not in courses:
+                courses.append(course)
 
-        courses = obj.groups.values(
-            "group__id",
-            "group__name",
-            "group__status",
-            "group__started_at",
-            "group__ended_at",
-            "group__teacher__first_name",
-            "group__teacher__last_name",
-        ).distinct()
-
-        return list(courses)
+        return courses
 
     def get_relatives(self, obj: Student):
-        return list(obj.relatives.values("name", "phone", "who"))
+        return self.resolve("relatives", obj, [])
 
     def get_attendance_count(self, obj):
         count = getattr(obj, "attendance_count", None)
@@ -312,8 +244,8 @@ class StudentSerializer(serializers.ModelSerializer):
         if count is not None:
             return count + 1
 
-        return Attendance.objects.filter(student=obj, status="IS_PRESENT").count() + 1
-    
+        return self.resolve("attendance_counts", obj, 0) + 1
+
     def get_is_frozen(self, obj: Student):
         today = django_timezone.now().date()
 
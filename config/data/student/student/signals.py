@@ -2,85 +2,85 @@ from datetime import datetime
 
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
+from data.command.pipeline import (
+    UPDATE,
+    derive,
+    derived_fields,
+    once_per_transaction,
+)
 from .models import Student, StudentFrozenAction
 from data.account.models import CustomUser
 from data.logs.models import Log
 from data.notifications.models import Notification
 
-# Define a flag to prevent recursion
-_signal_active = False
+ACTIVATION_BALANCE = 100000
+
+
+@derive(Student, "new_student_date", on=UPDATE)
+def new_student_date(instance: Student):
+    if (
+        instance.new_student_date is None
+        and instance.student_stage_type == "NEW_STUDENT"
+    ):
+        instance.new_student_date = datetime.now()
+
+
+@derive(Student, "balance_status", "student_stage_type", "active_date", on=UPDATE)
+def balance_stage(instance: Student):
+    """Debt deactivates a student; a paying new student becomes active."""
+    if instance.balance <= 0:
+        if instance.balance_status == "ACTIVE":
+            instance.balance_status = "INACTIVE"
+
+    elif (
+        instance.student_stage_type == "NEW_STUDENT"
+        and instance.balance >= ACTIVATION_BALANCE
+    ):
+        instance.balance_status = "ACTIVE"
+        instance.student_stage_type = "ACTIVE_STUDENT"
+        instance.active_date = datetime.now()
+
+
+def _remind_about_balance(instance: Student):
+    Notification.objects.create(
+        user=instance.call_operator,
+        comment=f"{instance.first_name} {instance.last_name} ning balance miqdori {instance.balance} sum,"
+        f" to'lov amalga oshirishi haqida eslating!",
+        come_from=instance.id,
+        choice="Tasks",
+    )
 
 
 @receiver(post_save, sender=Student)
 def on_create(sender, instance: Student, created, **kwargs):
-    global _signal_active
-
-    if _signal_active:
+    if created:
         return
 
-    if not created:
-        _signal_active = True  # Set the flag to prevent recursion
+    if instance.balance <= 0:
+        # one reminder however many times the student was saved
+        once_per_transaction(
+            "student_balance_reminder", instance, _remind_about_balance
+        )
+
+    if "student_stage_type" in derived_fields(instance):
+        Log.objects.create(
+            object="STUDENT",
+            action="STUDENT_ACTIVATED",
+            student=instance,
+            comment="O'quvchi active holatiga o'tqazildi.",
+        )
+
         if (
-            instance.new_student_date == None
-            and instance.student_stage_type == "NEW_STUDENT"
+            instance.sales_manager
+            and instance.sales_manager.f_sm_bonus_new_active_student > 0
         ):
-            instance.new_student_date = datetime.now()
-
-        if instance.balance <= 0:
-            Notification.objects.create(
-                user=instance.call_operator,
-                comment=f"{instance.first_name} {instance.last_name} ning balance miqdori {instance.balance} sum,"
-                f" to'lov amalga oshirishi haqida eslating!",
-                come_from=instance.id,
-                choice="Tasks",
-            )
-            if instance.balance_status == "ACTIVE":
-                instance.balance_status = "INACTIVE"
-                instance.save(
-                    update_fields=["balance_status"]
-                )  # Save only the specific field
-
-        elif (
-            instance.student_stage_type == "NEW_STUDENT" and instance.balance >= 100000
-        ):
-            instance.balance_status = "ACTIVE"
-            instance.student_stage_type = "ACTIVE_STUDENT"
-            instance.active_date = datetime.now()
-            instance.new_student_stages = None
-            instance.save(
-                update_fields=[
-                    "balance_status",
-                    "student_stage_type",
-                    # "new_student_stages",
-                    "active_date",
-                ]
-            )  # Save only the specific field
-
-            Log.objects.create(
-                object="STUDENT",
-                action="STUDENT_ACTIVATED",
+            instance.sales_manager.transactions.create(
+                reason="BONUS_FOR_NEW_ACTIVE_STUDENT",
                 student=instance,
-                comment="O'quvchi active holatiga o'tqazildi.",
+                amount=instance.sales_manager.f_sm_bonus_new_active_student,
+                comment=f"O'quvchi aktiv holatiga o'tgani uchun bonus. O'quvchi: {instance.first_name} {instance.last_name} {instance.middle_name}",
             )
 
-            print(
-                instance.sales_manager,
-                instance.sales_manager.f_sm_bonus_new_active_student,
-                instance.sales_manager.f_sm_bonus_new_active_student > 0,
-            )
-            if (
-                instance.sales_manager
-                and instance.sales_manager.f_sm_bonus_new_active_student > 0
-            ):
-                instance.sales_manager.transactions.create(
-                    reason="BONUS_FOR_NEW_ACTIVE_STUDENT",
-                    student=instance,
-                    amount=instance.sales_manager.f_sm_bonus_new_active_student,
-                    comment=f"O'quvchi aktiv holatiga o'tgani uchun bonus. O'quvchi: {instance.first_name} {instance.last_name} {instance.middle_name}",
-                )
-
-        _signal_active = False
-
 
 @receiver(post_save, sender=Student)
 def on_create_user(sender, instance: Student, created, **kwargs):
@@ -122,6 +122,14 @@ def on_save_user(sender, instance: Student, created, **kwargs):
         )
 
 
+@receiver(post_save, sender=Student)
+def on_funnel_change(sender, instance: Student, created, **kwargs):
+    """Rebuild this student's day in the dashboard funnel rollup after commit."""
+    from data.dashboard.funnel import mark_dirty
+
+    mark_dirty(instance)
+
+
 @receiver(post_save, sender=StudentFrozenAction)
 def update_student_frozen_data_on_create(sender, instance, created, **kwargs):
     if not created:
@@ -1,3 +1,234 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from data.command.testing import QueryBudgetMixin
+from data.employee.models import Employee
+from data.finances.finance.choices import FinanceKindTypeChoices
+from data.finances.finance.models import Finance, Kind
+from data.logs.models import Log
+from data.notifications.models import Notification
+
+from data.student.student.ledger import (
+    adjust_to_journal,
+    balance_at,
+    finance_entry_reason,
+    ledger_mismatches,
+    open_missing_journals,
+    post_entry,
+)
+from data.parents.models import Relatives
+from data.student.course.models import Course
+from data.student.groups.models import Group, Room
+from data.student.mastering.models import Mastering
+from data.student.student.models import Student, StudentLedgerEntry
+from data.student.student.serializers import StudentSerializer
+from data.student.studentgroup.models import StudentGroup
+from data.student.subject.models import Subject
+
+
+class StudentLedgerTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = Student.objects.create(
+            first_name="Ali",
+            phone="+998900000000",
+            student_stage_type="ACTIVE_STUDENT",
+        )
+
+    def test_entries_keep_a_running_balance(self):
+        post_entry(self.student, 50000.10, StudentLedgerEntry.PAYMENT)
+        charge = post_entry(self.student, Decimal("-20000"), StudentLedgerEntry.CHARGE)
+
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.balance, Decimal("30000.10"))
+        self.assertEqual(charge.balance_after, Decimal("30000.10"))
+        self.assertEqual(
+            list(self.student.ledger.values_list("amount", flat=True)),
+            [Decimal("50000.10"), Decimal("-20000.00")],
+        )
+
+        self.assertEqual(
+            balance_at(self.student, charge.created_at - timedelta(microseconds=1)),
+            Decimal("50000.10"),
+        )
+        self.assertEqual(
+            balance_at(self.student, timezone.now() - timedelta(days=1)),
+            Decimal("0.00"),
+        )
+
+    def test_first_entry_opens_the_journal_with_the_old_balance(self):
+        Student.objects.filter(pk=self.student.pk).update(balance=Decimal("700"))
+
+        payment = post_entry(self.student, 100, StudentLedgerEntry.PAYMENT)
+
+        self.assertEqual(
+            list(self.student.ledger.values_list("reason", "amount", "balance_after")),
+            [
+                (StudentLedgerEntry.OPENING, Decimal("700.00"), Decimal("700.00")),
+                (StudentLedgerEntry.PAYMENT, Decimal("100.00"), Decimal("800.00")),
+            ],
+        )
+        self.assertEqual(
+            balance_at(self.student, payment.created_at - timedelta(microseconds=1)),
+            Decimal("700.00"),
+        )
+        self.assertFalse(ledger_mismatches().exists())
+
+    def test_money_back_is_a_refund(self):
+        finance = Finance(
+            action="EXPENSE", kind=Kind(kind=FinanceKindTypeChoices.MONEY_BACK)
+        )
+        self.assertEqual(finance_entry_reason(finance), StudentLedgerEntry.REFUND)
+
+    def test_entries_are_append_only(self):
+        entry = post_entry(self.student, 100, StudentLedgerEntry.PAYMENT)
+        entry.amount = 200
+        with self.assertRaises(ValueError):
+            entry.save()
+
+    def test_verify_and_adjust(self):
+        Student.objects.filter(pk=self.student.pk).update(balance=Decimal("700"))
+        self.assertEqual(open_missing_journals(), 1)
+        self.assertFalse(ledger_mismatches().exists())
+
+        # a balance written around the journal shows up and gets adjusted
+        Student.objects.filter(pk=self.student.pk).update(balance=Decimal("1000"))
+        mismatches = list(ledger_mismatches())
+        self.assertEqual(
+            mismatches,
+            [(self.student.pk, Decimal("1000.00"), Decimal("700.00"), Decimal("700.00"))],
+        )
+
+        self.assertEqual(adjust_to_journal([self.student.pk]), 1)
+        self.assertFalse(ledger_mismatches().exists())
+
+
+class StudentSavePipelineTest(TestCase):
+    def _updates(self, queries):
+        table = f'UPDATE "{Student._meta.db_table}"'
+        return [q for q in queries.captured_queries if q["sql"].startswith(table)]
+
+    def test_activation_is_written_with_the_balance(self):
+        student = Student.objects.create(
+            first_name="Ali", phone="+998900000031", student_stage_type="NEW_STUDENT"
+        )
+        student.balance = Decimal("150000")
+
+        with CaptureQueriesContext(connection) as queries:
+            student.save(update_fields=["balance"])
+
+        self.assertEqual(len(self._updates(queries)), 1)
+        student.refresh_from_db()
+        self.assertEqual(student.student_stage_type, "ACTIVE_STUDENT")
+        self.assertEqual(student.balance_status, "ACTIVE")
+        self.assertIsNotNone(student.active_date)
+        self.assertEqual(
+            Log.objects.filter(student=student, action="STUDENT_ACTIVATED").count(), 1
+        )
+
+        # already active: nothing is derived, no second activation
+        student.save()
+        self.assertEqual(
+            Log.objects.filter(student=student, action="STUDENT_ACTIVATED").count(), 1
+        )
+
+    def test_debt_reminder_is_sent_once_per_transaction(self):
+        student = Student.objects.create(
+            first_name="Ali",
+            phone="+998900000032",
+            student_stage_type="ACTIVE_STUDENT",
+            balance_status="ACTIVE",
+            balance=50000,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            student.balance = Decimal("-1000")
+            with CaptureQueriesContext(connection) as queries:
+                student.save()
+            student.save()
+            student.save()
+
+        self.assertEqual(len(self._updates(queries)), 1)
+        student.refresh_from_db()
+        self.assertEqual(student.balance_status, "INACTIVE")
+        self.assertEqual(
+            Notification.objects.filter(come_from=student.id, choice="Tasks").count(),
+            1,
+        )
+
+
+class StudentQueryBudgetTest(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Student.objects.bulk_create(
+            Student(
+                first_name=f"Student {i}",
+                phone=f"+99890000020{i}",
+                student_stage_type=("NEW_STUDENT", "ACTIVE_STUDENT")[i % 2],
+                balance=Decimal(i * 1000 - 3000),
+            )
+            for i in range(6)
+        )
+
+    def test_statistics(self):
+        # one count or sum per figure, none per student
+        self.assertQueryBudget(10, "/students/statistics/")
+
+
+class StudentSerializerBatchTest(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher = Employee.objects.create(
+            phone="+998900000300", first_name="Olim", last_name="Aliyev", role="TEACHER"
+        )
+        course = Course.objects.create(
+            name="Math 1", subject=Subject.objects.create(name="Math")
+        )
+        room = Room.objects.create(room_number="1")
+        groups = Group.objects.bulk_create(
+            Group(name=f"G{i}", course=course, room_number=room, teacher=teacher)
+            for i in range(2)
+        )
+        cls.students = Student.objects.bulk_create(
+            Student(
+                first_name=f"Student {i}",
+                phone=f"+99890000030{i:02}",
+                student_stage_type="ACTIVE_STUDENT",
+            )
+            for i in range(12)
+        )
+        StudentGroup.objects.bulk_create(
+            StudentGroup(group=groups[i % 2], student=student)
+            for i, student in enumerate(cls.students)
+        )
+        Mastering.objects.bulk_create(
+            Mastering(student=student, choice="Test", ball=ball)
+            for student in cls.students[:6]
+            for ball in (40, 90)
+        )
+        Relatives.objects.bulk_create(
+            Relatives(student=student, name="Ona", who="mother")
+            for student in cls.students[::3]
+        )
+
+    def test_list_matches_one_by_one(self):
+        students = Student.objects.order_by("phone")
+        batched = StudentSerializer(students, many=True).data
+        for student, row in zip(students, batched):
+            self.assertEqual(row, StudentSerializer(student).data)
+
+        self.assertEqual(batched[0]["learning"], {"score": 3, "learning": 65})
+        self.assertEqual(batched[0]["teacher"]["full_name"], "Olim Aliyev")
+        self.assertEqual(batched[0]["relatives"][0]["who"], "mother")
+        self.assertEqual(batched[11]["learning"], {"score": 1, "learning": 0})
+        self.assertEqual(batched[11]["attendance_count"], 1)
 
-# Create your tests here.
+    def test_query_budgets(self):
+        # count + page + the loaders of the listed fields
+        self.assertQueryBudget(6, "/students/")
+        self.assertQueryBudget(16, "/students/no-pg/")
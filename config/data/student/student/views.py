@@ -222,7 +222,9 @@ class StudentListNoPG(FilialRestrictedQuerySetMixin, ListAPIView):
 
     def get_queryset(self):
         filial_id = self.request.GET.get("filial")
-        queryset = Student.objects.all()
+        queryset = Student.objects.select_related(
+            "photo", "filial", "marketing_channel", "sales_manager", "service_manager"
+        ).prefetch_related("file")
         if filial_id:
             queryset = queryset.filter(filial__id=filial_id, is_archived=False)
 
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from data.student.studentgroup.streaks import refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute StudentGroup.current_absence_streak of every row from the "
+        "attendance history; run once after adding the field"
+    )
+
+    def handle(self, *args, **options):
+        written = refresh()
+        self.stdout.write(self.style.SUCCESS(f"Done, {written} streaks updated."))
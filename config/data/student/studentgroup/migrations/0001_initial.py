@@ -0,0 +1,133 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:48
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('employee', '0003_initial'),
+        ('filial', '0001_initial'),
+        ('firstlesson', '0002_initial'),
+        ('groups', '0002_initial'),
+        ('new_lid', '0001_initial'),
+        ('student', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentGroup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('price', models.IntegerField(default=0)),
+                ('price_comment', models.TextField(blank=True, null=True)),
+                ('homework_type', models.CharField(blank=True, choices=[('Online', 'Online'), ('Offline', 'Offline')], default='Offline', max_length=20, null=True)),
+                ('current_absence_streak', models.PositiveIntegerField(default=0)),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+                ('first_lesson', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='groups', to='firstlesson.firstlesson')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='students', to='groups.group')),
+                ('lid', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='groups', to='new_lid.lid')),
+                ('student', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='groups', to='student.student')),
+            ],
+            options={
+                'verbose_name': 'Student Group',
+                'verbose_name_plural': 'Student Groups',
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentGroupPrice',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('amount', models.IntegerField()),
+                ('comment', models.TextField()),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='student_group_prices', to='employee.employee')),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+                ('student_group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prices', to='studentgroup.studentgroup')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SecondaryStudentGroup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('create_context', models.JSONField(blank=True, null=True)),
+                ('update_context', models.JSONField(blank=True, null=True)),
+                ('filial', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='filial.filial')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='groups.secondarygroup')),
+                ('lid', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='secondary_groups', to='new_lid.lid')),
+                ('student', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='secondary_groups', to='student.student')),
+            ],
+            options={
+                'verbose_name': 'Secondary Add group',
+                'verbose_name_plural': 'Secondary Add group',
+                'ordering': ['-created_at'],
+                'abstract': False,
+                'constraints': [models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='studentgroup_secondarystudentgroup_arch_ts_chk'), models.UniqueConstraint(condition=models.Q(('is_archived', False), ('student__isnull', False)), fields=('group', 'student'), name='uniq_active_student_in_secondary_group'), models.UniqueConstraint(condition=models.Q(('is_archived', False), ('lid__isnull', False)), fields=('group', 'lid'), name='uniq_active_lid_in_secondary_group')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='studentgroup',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['student'], name='sg_live_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentgroup',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['group'], name='sg_live_group_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentgroup',
+            index=models.Index(condition=models.Q(('current_absence_streak__gte', 3), ('is_archived', False)), fields=['current_absence_streak'], name='sg_live_absence_streak_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentgroup',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='studentgroup_studentgroup_arch_ts_chk'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentgroup',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_archived', False), ('student__isnull', False)), fields=('group', 'student'), name='uniq_active_student_in_group'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentgroup',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_archived', False), ('lid__isnull', False)), fields=('group', 'lid'), name='uniq_active_lid_in_group'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentgroup',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', True), ('lid__isnull', True), ('first_lesson__isnull', False), _connector='OR'), name='lead_requires_first_lesson_when_active'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentgroup',
+            constraint=models.CheckConstraint(condition=models.Q(('student__isnull', False), ('lid__isnull', False), _connector='OR'), name='student_or_lid_required'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentgroupprice',
+            constraint=models.CheckConstraint(condition=models.Q(('is_archived', False), ('archived_at__isnull', False), _connector='OR'), name='studentgroup_studentgroupprice_arch_ts_chk'),
+        ),
+    ]
@@ -62,12 +62,36 @@ class StudentGroup(BaseModel):
         max_length=20,
     )
 
+    # attendances since the last one that was not an absence; kept by
+    # data.student.studentgroup.streaks when attendance is written
+    current_absence_streak = models.PositiveIntegerField(default=0)
+
     class Meta(BaseModel.Meta):
         verbose_name = "Student Group"
         verbose_name_plural = "Student Groups"
 
         ordering = ["-created_at"]
 
+        # (group, student) of live rows is covered by uniq_active_student_in_group
+        indexes = [
+            models.Index(
+                fields=["student"],
+                condition=Q(is_archived=False),
+                name="sg_live_student_idx",
+            ),
+            models.Index(
+                fields=["group"],
+                condition=Q(is_archived=False),
+                name="sg_live_group_idx",
+            ),
+            # the nightly kick: live rows with a streak worth looking at
+            models.Index(
+                fields=["current_absence_streak"],
+                condition=Q(is_archived=False, current_absence_streak__gte=3),
+                name="sg_live_absence_streak_idx",
+            ),
+        ]
+
         constraints = [
             *BaseModel.Meta.constraints,
             # No duplicate active student in the same group
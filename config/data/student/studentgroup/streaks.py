@@ -0,0 +1,130 @@
+"""
+Absence streaks of StudentGroup rows.
+
+``StudentGroup.current_absence_streak`` is what ``current_streak`` in
+data/student/attendance/utils.py returns for the row's group and student
+(or lead): the number of their attendances in the group dated after the
+last one that was neither UNREASONED nor REASONED.
+
+Writing attendance queues its (group, student, lead) key with ``touched``;
+after the commit the streaks of the queued keys are recomputed from one
+window-function query (the last breaking date per key) and the rows that
+changed are bulk-updated. ``refresh()`` without keys does the same for every
+row and backfills the counter.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Case, F, Max, Q, UUIDField, When, Window
+
+from data.command.transactions import collect_on_commit
+from data.student.attendance.models import Attendance
+from data.student.attendance.utils import ABSENCE_NEUTRAL
+from data.student.studentgroup.models import StudentGroup
+
+BATCH_SIZE = 1000
+
+# (group id, student id, lead id); one of the last two is None
+Key = tuple
+
+
+def _filter(keys, student: str, lead: str) -> Q:
+    by_group = defaultdict(lambda: (set(), set()))
+    for group_id, student_id, lead_id in keys:
+        students, leads = by_group[group_id]
+        if student_id is not None:
+            students.add(student_id)
+        if lead_id is not None:
+            leads.add(lead_id)
+
+    condition = Q(pk__in=[])
+    for group_id, (students, leads) in by_group.items():
+        condition |= Q(group_id=group_id) & (
+            Q(**{f"{student}__in": students}) | Q(**{f"{lead}__in": leads})
+        )
+    return condition
+
+
+def streaks(keys=None) -> dict[Key, int]:
+    """{key: streak} of every key with attendances, ``keys`` or all."""
+    attendances = Attendance.objects.all()
+    if keys is not None:
+        attendances = attendances.filter(_filter(keys, "student_id", "lead_id"))
+
+    rows = (
+        attendances.annotate(
+            # a student's rows are theirs whatever lead they came from
+            lead_key=Case(
+                When(student_id__isnull=True, then=F("lead_id")),
+                output_field=UUIDField(),
+            )
+        )
+        .annotate(
+            last_break=Window(
+                Max("date", filter=~Q(status__in=ABSENCE_NEUTRAL)),
+                partition_by=[F("group_id"), F("student_id"), F("lead_key")],
+            )
+        )
+        .values_list("group_id", "student_id", "lead_key", "date", "last_break")
+        .order_by()
+    )
+
+    result = {}
+    for group_id, student_id, lead_id, date, last_break in rows.iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        key = (group_id, student_id, lead_id)
+        result[key] = result.get(key, 0) + (last_break is None or date > last_break)
+    return result
+
+
+def refresh(keys=None) -> int:
+    """
+    Recompute the streaks of the rows of ``keys`` (every row when ``None``)
+    and write the ones that changed. Returns the number of rows written.
+    """
+    if keys is not None:
+        keys = set(keys)
+        if not keys:
+            return 0
+    current = streaks(keys)
+
+    student_groups = StudentGroup.objects.all()
+    if keys is not None:
+        student_groups = student_groups.filter(_filter(keys, "student_id", "lid_id"))
+
+    fixed = 0
+    batch = []
+    for pk, group_id, student_id, lid_id, streak in (
+        student_groups.values_list(
+            "pk", "group_id", "student_id", "lid_id", "current_absence_streak"
+        )
+        .order_by()
+        .iterator(chunk_size=BATCH_SIZE)
+    ):
+        # a row of both a student and a lead counts the student's, like streak()
+        key = (group_id, student_id, None if student_id else lid_id)
+        if keys is not None and key not in keys:
+            continue
+        value = current.get(key, 0)
+        if value != streak:
+            batch.append(StudentGroup(pk=pk, current_absence_streak=value))
+        if len(batch) >= BATCH_SIZE:
+            StudentGroup.objects.bulk_update(batch, ["current_absence_streak"])
+            fixed += len(batch)
+            batch = []
+    if batch:
+        StudentGroup.objects.bulk_update(batch, ["current_absence_streak"])
+        fixed += len(batch)
+    return fixed
+
+
+def touched(group_id, student_id=None, lead_id=None):
+    """Recompute the streak of the key after the current transaction."""
+    if group_id is None or (student_id is None and lead_id is None):
+        return
+    collect_on_commit(
+        "studentgroup.absence_streaks",
+        (group_id, student_id, None if student_id else lead_id),
+        refresh,
+    )
@@ -1,72 +1,90 @@
 from celery import shared_task
 
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, Q
 
 from data.student.studentgroup.models import StudentGroup
+from data.student.student.models import Student
 from data.logs.models import Log
 
 from django.db import transaction
 
+# absences in a row that get a student out of the group
+STREAK_LIMITS = {
+    "NEW_STUDENT": 3,
+    "ACTIVE_STUDENT": 5,
+}
 
-@shared_task
-def check_for_streak_students():
 
+def streak_offenders():
+    """Live student rows whose absence streak reached their stage's limit."""
     today = timezone.now().date()
 
-    with transaction.atomic():
-
-        students = StudentGroup.objects.filter(
-            is_archived=False, student__isnull=False
-        ).exclude(  # skip groups without student
-            Q(student__is_frozen=True) & Q(student__frozen_days__gte=today)
+    limits = Q(pk__in=[])
+    for stage, limit in STREAK_LIMITS.items():
+        limits |= Q(
+            student__student_stage_type=stage, current_absence_streak__gte=limit
         )
 
-        for sg in students:
-
-            streak = sg.streak()
-
-            print(f"{sg.student.first_name} {sg.student.last_name} - {streak}")
-
-            if (sg.student.status == "NEW_STUDENT" and streak >= 3) or (
-                sg.student.status == "ACTIVE_STUDENT" and streak >= 5
-            ):
-
-                sg.archive(
-                    f"O'quvchi {streak} kun darslarga kelmagani uchun, guruhdan chetlashtirildi."
-                )
-
-                # sg.is_archived = True
-                # sg.save()
-
-                # print(
-                #     f"Kicket {sg.student.first_name} {sg.student.last_name} from group:{sg.group.name}, streak is: {streak}"
-                # )
-
-                # Log.objects.create(
-                #     object="STUDENT",
-                #     action="STUDENT_GROUP_ARCHIVED",
-                #     comment=f"O'quvchi {streak} kun darslarga kelmagani uchun, guruhdan chetlashtirildi.",
-                #     student=sg.student,
-                #     student_group=sg,
-                # )
+    return (
+        StudentGroup.objects.filter(
+            is_archived=False,
+            student__isnull=False,
+            # the partial index sg_live_absence_streak_idx
+            current_absence_streak__gte=min(STREAK_LIMITS.values()),
+        )
+        .filter(limits)
+        # Student.is_frozen, as a column lookup
+        .exclude(student__frozen_till_date__gte=today)
+    )
 
-                if sg.student.groups.filter(is_archived=False).count() == 1:
-                    # sg.student.is_archived = True
-                    # sg.student.save()
 
-                    sg.student.archive(
-                        f"O'quvchi {streak} kun darslarga kelmagani uchun, archivelandi."
-                    )
+@shared_task
+def check_for_streak_students():
+    """
+    Archive the student groups of students who missed too many lessons in a
+    row (see data.student.studentgroup.streaks), and the students left
+    without a live group.
+    """
+    with transaction.atomic():
+        offenders = list(
+            streak_offenders()
+            .select_for_update(of=("self",))
+            .values_list("pk", "student_id", "current_absence_streak")
+        )
+        if not offenders:
+            return {"groups": 0, "students": 0}
 
-                    # Log.objects.create(
-                    #     object="STUDENT",
-                    #     action="STUDENT_ARCHIVED",
-                    #     comment=f"O'quvchi {streak} kun darslarga kelmagani uchun, archivelandi.",
-                    #     student=sg.student,
-                    #     student_group=sg,
-                    # )
+        now = timezone.now()
+        StudentGroup.objects.filter(pk__in=[pk for pk, _, _ in offenders]).update(
+            is_archived=True, archived_at=now, updated_at=now
+        )
+        Log.objects.bulk_create(
+            Log(
+                object="STUDENT",
+                action="ARCHIVE_STUDENT_GROUP",
+                student_id=student_id,
+                student_group_id=pk,
+                comment=(
+                    "O'quvchi guruhi archivelandi. Comment: O'quvchi "
+                    f"{streak} kun darslarga kelmagani uchun, guruhdan "
+                    "chetlashtirildi."
+                ),
+            )
+            for pk, student_id, streak in offenders
+        )
 
-                    print(
-                        f"Archived student: {sg.student.first_name} {sg.student.last_name}"
-                    )
+        # students with no live group left; one Archive row and fine each
+        streak_of = {student_id: streak for _, student_id, streak in offenders}
+        students = Student.objects.filter(
+            pk__in=streak_of, is_archived=False
+        ).annotate(live=Count("groups", filter=Q(groups__is_archived=False)))
+        archived = 0
+        for student in students.filter(live=0):
+            student.archive(
+                f"O'quvchi {streak_of[student.pk]} kun darslarga kelmagani "
+                "uchun, archivelandi."
+            )
+            archived += 1
+
+    return {"groups": len(offenders), "students": archived}
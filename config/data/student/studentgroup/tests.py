@@ -1,3 +1,143 @@
+from datetime import date, timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from data.account.models import CustomUser
+from data.logs.models import Log
+from data.student.attendance.models import Attendance
+from data.student.course.models import Course
+from data.student.groups.models import Group, Room
+from data.student.student.models import Student
+from data.student.studentgroup.models import StudentGroup
+from data.student.studentgroup.streaks import refresh
+from data.student.studentgroup.tasks import check_for_streak_students
+from data.student.subject.models import Subject
+
+
+class AbsenceStreakTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        subject = Subject.objects.create(name="English", is_language=True)
+        course = Course.objects.create(name="English 1", subject=subject)
+        room = Room.objects.create(room_number="1")
+        teacher = CustomUser.objects.create(phone="+998900000031", role="TEACHER")
+        cls.group, cls.other_group = [
+            Group.objects.create(
+                name=name, course=course, teacher=teacher, room_number=room
+            )
+            for name in ["A", "B"]
+        ]
+        # bulk_create: no Student signals
+        cls.new, cls.active = Student.objects.bulk_create(
+            [
+                Student(
+                    first_name="New",
+                    phone="+998910000001",
+                    student_stage_type="NEW_STUDENT",
+                ),
+                Student(
+                    first_name="Active",
+                    phone="+998910000002",
+                    student_stage_type="ACTIVE_STUDENT",
+                ),
+            ]
+        )
+
+    def _student_group(self, student, group=None):
+        return StudentGroup.objects.bulk_create(
+            [StudentGroup(group=group or self.group, student=student)]
+        )[0]
+
+    def _attend(self, student_group, *statuses):
+        with self.captureOnCommitCallbacks(execute=True):
+            for day, status in enumerate(statuses, start=1):
+                Attendance.objects.create(
+                    group=student_group.group,
+                    student=student_group.student,
+                    student_group=student_group,
+                    date=date(2026, 3, day),
+                    status=status,
+                )
+
+    def _streak(self, student_group):
+        student_group.refresh_from_db()
+        return student_group.current_absence_streak
+
+    def test_follows_attendance_writes(self):
+        student_group = self._student_group(self.new)
+
+        self._attend(student_group, "UNREASONED", "IS_PRESENT", "UNREASONED")
+        self.assertEqual(self._streak(student_group), 1)
+        self.assertEqual(self._streak(student_group), student_group.streak())
+
+        present = Attendance.objects.get(date=date(2026, 3, 2))
+        with self.captureOnCommitCallbacks(execute=True):
+            present.status = "REASONED"
+            present.save()
+        self.assertEqual(self._streak(student_group), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            present.delete()
+        self.assertEqual(self._streak(student_group), 2)
+
+    def test_refresh_backfills_only_stale_rows(self):
+        student_group = self._student_group(self.new)
+        untouched = self._student_group(self.active)
+        self._attend(student_group, "UNREASONED", "UNREASONED")
+        StudentGroup.objects.update(current_absence_streak=0)
+
+        self.assertEqual(refresh(), 1)
+        self.assertEqual(self._streak(student_group), 2)
+        self.assertEqual(self._streak(untouched), 0)
+        self.assertEqual(refresh(), 0)
+
+    def test_frozen_students_are_not_kicked(self):
+        # on the instance: the attendance signals save it again
+        self.new.frozen_till_date = timezone.now().date() + timedelta(days=7)
+        Student.objects.filter(pk=self.new.pk).update(
+            frozen_till_date=self.new.frozen_till_date
+        )
+        frozen = self._student_group(self.new)
+        self._attend(frozen, "UNREASONED", "UNREASONED", "UNREASONED")
+
+        self.assertEqual(check_for_streak_students(), {"groups": 0, "students": 0})
+        frozen.refresh_from_db()
+        self.assertFalse(frozen.is_archived)
+
+    def test_nightly_task_archives_by_stage_limit(self):
+        kicked = self._student_group(self.new)
+        kept = self._student_group(self.active)
+        other = self._student_group(self.active, self.other_group)
+        self._attend(kicked, "UNREASONED", "UNREASONED", "UNREASONED")
+        self._attend(kept, "UNREASONED", "UNREASONED", "UNREASONED")
+
+        self.assertEqual(check_for_streak_students(), {"groups": 1, "students": 1})
+        kicked.refresh_from_db()
+        kept.refresh_from_db()
+        self.assertTrue(kicked.is_archived)
+        self.assertFalse(kept.is_archived)
+        self.assertTrue(
+            Log.objects.filter(
+                action="ARCHIVE_STUDENT_GROUP", student_group=kicked
+            ).exists()
+        )
+
+        self.new.refresh_from_db()
+        self.assertTrue(self.new.is_archived)
 
-# Create your tests here.
+        # two more absences: out of group A, but still studying in group B
+        with self.captureOnCommitCallbacks(execute=True):
+            for day in [4, 5]:
+                Attendance.objects.create(
+                    group=self.group,
+                    student=self.active,
+                    student_group=kept,
+                    date=date(2026, 3, day),
+                    status="UNREASONED",
+                )
+        self.assertEqual(check_for_streak_students(), {"groups": 1, "students": 0})
+        other.refresh_from_db()
+        self.assertFalse(other.is_archived)
+        self.active.refresh_from_db()
+        self.assertFalse(self.active.is_archived)
@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from data.upload.models import ExportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ["kind", "status", "done", "total", "created_by", "created_at"]
+    list_filter = ["kind", "status"]
+    readonly_fields = ["params", "file", "error", "finished_at"]
@@ -0,0 +1,306 @@
+"""
+Excel exports.
+
+An export describes its workbook as sheets of lazily produced rows; the
+writer puts them into an openpyxl write-only workbook, which keeps each row
+in memory only until it is written to a temporary file. Exports read their
+rows with ``newest_first(queryset, *fields)``: plain tuples, no per-row
+foreign key queries, and one query per CHUNK_SIZE rows that starts below
+the last row of the previous one. ``.iterator()`` would not do: server-side
+cursors are disabled, so it fetches the whole result at once.
+
+    @register
+    class FinanceExport(Export):
+        name = "finance"
+        filename = "finance_report.xlsx"
+
+        def sheets(self):
+            yield Sheet("Finance Report", [Column("Miqdor", 16)], rows)
+
+An export view calls ``respond(request, "finance")``: the whole file is
+written to disk inside the request and then sent back, or, with
+``background=true`` or more than STREAM_LIMIT rows, an ExportJob is created
+and the ``run_export`` Celery task writes the file while the client polls
+``upload/exports/<id>/`` and then downloads ``upload/exports/<id>/download/``.
+
+Exports are registered from the ``exports`` module of each app.
+"""
+
+import logging
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Iterable, NamedTuple, Sequence
+
+from django.core.files import File as DjangoFile
+from django.db import transaction
+from django.db.models import Q
+from django.http import FileResponse
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+from rest_framework import status
+from rest_framework.response import Response
+
+from data.upload.models import ExportJob, File
+from data.upload.serializers import ExportJobSerializer
+
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+CHUNK_SIZE = 2000
+PROGRESS_EVERY = 1000
+
+# rows above which an export runs as an ExportJob even without background=true
+STREAM_LIMIT = 50_000
+
+HEADER_FONT = Font(bold=True, size=12)
+CENTER = Alignment(horizontal="center", vertical="center")
+
+TRUE_VALUES = ["true", "1", "yes"]
+
+_registry: dict[str, type["Export"]] = {}
+
+
+class Column(NamedTuple):
+    title: str
+    width: float | None = None
+    number_format: str | None = None
+    align: str | None = None
+
+
+class Cell(NamedTuple):
+    """A value with its own style; plain values take their column's."""
+
+    value: object
+    font: Font | None = None
+    fill: PatternFill | None = None
+    number_format: str | None = None
+    alignment: Alignment | None = None
+
+
+@dataclass
+class Sheet:
+    title: str
+    columns: Sequence[Column]
+    rows: Iterable[Sequence]
+    # a merged title row above the headers
+    banner: Cell | None = None
+    # style of the header cells; ``None`` leaves them plain
+    header: Cell | None = Cell(None, font=HEADER_FONT, alignment=CENTER)
+    # header cells to leave plain, counted from the left
+    plain_headers: int = 0
+    # rows after the data rows, such as totals; called once ``rows`` is
+    # exhausted and not counted as data
+    footer: Callable[[], Iterable[Sequence]] | None = None
+
+
+class Export:
+    name: str
+    filename: str
+
+    def __init__(self, params: dict):
+        self.params = params
+
+    def param(self, name: str, default=None):
+        return self.params.get(name) or default
+
+    def count(self) -> int | None:
+        """Rows the export will write, for progress; ``None`` if unknown."""
+        return None
+
+    def sheets(self) -> Iterable[Sheet]:
+        raise NotImplementedError
+
+
+def register(cls: type[Export]) -> type[Export]:
+    _registry[cls.name] = cls
+    return cls
+
+
+def get_export(name: str) -> type[Export]:
+    if name not in _registry:
+        autodiscover_modules("exports")
+    return _registry[name]
+
+
+def newest_first(queryset, *fields, chunk_size: int = CHUNK_SIZE):
+    """
+    ``queryset.values_list(*fields)`` by ``-created_at``, read ``chunk_size``
+    rows per query. Each query continues below the (created_at, id) of the
+    previous chunk's last row, so memory stays at one chunk.
+    """
+    queryset = queryset.order_by("-created_at", "-pk")
+    last = None
+    while True:
+        page = queryset
+        if last is not None:
+            created_at, pk = last
+            page = page.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+            )
+        rows = list(page.values_list("created_at", "pk", *fields)[:chunk_size])
+        for row in rows:
+            yield row[2:]
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1][:2]
+
+
+def _cell(ws, value, column: Column | None = None) -> WriteOnlyCell:
+    style = value if isinstance(value, Cell) else Cell(value)
+    cell = WriteOnlyCell(ws, value=style.value)
+
+    number_format = style.number_format or (column and column.number_format)
+    if number_format and style.value not in (None, ""):
+        cell.number_format = number_format
+    align = column and column.align
+    if style.alignment is not None:
+        cell.alignment = style.alignment
+    elif align:
+        cell.alignment = Alignment(horizontal=align)
+    if style.font is not None:
+        cell.font = style.font
+    if style.fill is not None:
+        cell.fill = style.fill
+    return cell
+
+
+def _header(ws, sheet: Sheet) -> list:
+    cells = []
+    for i, column in enumerate(sheet.columns):
+        if sheet.header is None or i < sheet.plain_headers:
+            cells.append(column.title)
+        else:
+            cells.append(_cell(ws, sheet.header._replace(value=column.title)))
+    return cells
+
+
+def _append(ws, row: Sequence, columns: list[Column]):
+    ws.append(
+        [
+            _cell(ws, value, columns[i] if i < len(columns) else None)
+            for i, value in enumerate(row)
+        ]
+    )
+
+
+def write(
+    export: Export, file, progress: Callable[[int, int | None], None] | None = None
+) -> int:
+    """Write ``export`` as xlsx to ``file``; returns the data rows written."""
+    total = export.count()
+    done = 0
+
+    wb = Workbook(write_only=True)
+    for sheet in export.sheets():
+        ws = wb.create_sheet(title=sheet.title)
+        for i, column in enumerate(sheet.columns, 1):
+            if column.width:
+                ws.column_dimensions[get_column_letter(i)].width = column.width
+
+        if sheet.banner is not None:
+            last = get_column_letter(len(sheet.columns))
+            ws.merged_cells.add(f"A1:{last}1")
+            ws.append([_cell(ws, sheet.banner)])
+        ws.append(_header(ws, sheet))
+
+        columns = list(sheet.columns)
+        for row in sheet.rows:
+            _append(ws, row, columns)
+            done += 1
+            if progress is not None and done % PROGRESS_EVERY == 0:
+                progress(done, total)
+        if sheet.footer is not None:
+            for row in sheet.footer():
+                _append(ws, row, columns)
+
+    wb.save(file)
+    if progress is not None:
+        progress(done, total)
+    return done
+
+
+def stream(export: Export) -> FileResponse:
+    """
+    The export written to a temporary file, then sent from there: nothing
+    goes out before the last row is written, so big exports belong in an
+    ExportJob.
+    """
+    file = tempfile.TemporaryFile()
+    try:
+        write(export, file)
+    except BaseException:
+        file.close()
+        raise
+    file.seek(0)
+    # FileResponse closes the file once it is sent
+    return FileResponse(
+        file, as_attachment=True, filename=export.filename, content_type=XLSX
+    )
+
+
+def params_of(request) -> dict:
+    return {name: value for name, value in request.query_params.items()}
+
+
+def respond(request, name: str):
+    """
+    The response of an export view: the file, or with ``background=true``
+    or more than STREAM_LIMIT rows a 202 with the ExportJob that will
+    produce it.
+    """
+    # the task module imports this one
+    from data.upload.tasks import run_export
+
+    params = params_of(request)
+    background = str(params.pop("background", "")).lower() in TRUE_VALUES
+    export = get_export(name)(params)
+
+    if not background:
+        rows = export.count()
+        if rows is None or rows <= STREAM_LIMIT:
+            return stream(export)
+
+    job = ExportJob.objects.create(
+        kind=name,
+        params=params,
+        filename=export.filename,
+        created_by=request.user if request.user.is_authenticated else None,
+    )
+    transaction.on_commit(lambda: run_export.delay(str(job.id)))
+    return Response(
+        ExportJobSerializer(job, context={"request": request}).data,
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+def run(job) -> int | None:
+    """Write the file of an ExportJob, keeping its progress up to date."""
+    jobs = ExportJob.objects.filter(id=job.id)
+
+    def progress(done, total):
+        jobs.update(done=done, total=total, updated_at=timezone.now())
+
+    jobs.update(status=ExportJob.RUNNING, updated_at=timezone.now())
+    export = get_export(job.kind)(job.params or {})
+    try:
+        with tempfile.TemporaryFile() as tmp:
+            rows = write(export, tmp, progress)
+            tmp.seek(0)
+            file = File.objects.create(file=DjangoFile(tmp, name=export.filename))
+    except Exception as e:
+        logging.exception(f"Export {job.id} ({job.kind}) failed")
+        jobs.update(status=ExportJob.FAILED, error=str(e), updated_at=timezone.now())
+        return None
+
+    jobs.update(
+        status=ExportJob.DONE,
+        file=file,
+        done=rows,
+        total=rows,
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    return rows
@@ -23,3 +23,48 @@ class File(BaseModel):
 
 class Contract(BaseModel):
     file = models.FileField(upload_to="files/", null=True, blank=True)
+
+
+class ExportJob(BaseModel):
+    """An Excel export written in the background (see exports.py)."""
+
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)
+    filename = models.CharField(max_length=255)
+
+    created_by = models.ForeignKey(
+        "account.CustomUser",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="export_jobs",
+    )
+    status = models.CharField(
+        choices=[
+            (PENDING, "Pending"),
+            (RUNNING, "Running"),
+            (DONE, "Done"),
+            (FAILED, "Failed"),
+        ],
+        default=PENDING,
+        max_length=20,
+    )
+    done = models.IntegerField(default=0)
+    total = models.IntegerField(null=True, blank=True)
+    file: "File | None" = models.ForeignKey(
+        "upload.File",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="export_jobs",
+    )
+    error = models.TextField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"ExportJob({self.kind}, {self.status} {self.done}/{self.total})"
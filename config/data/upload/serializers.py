@@ -1,6 +1,8 @@
 from rest_framework import serializers
 
-from .models import File, Contract
+from django.urls import reverse
+
+from .models import File, Contract, ExportJob
 
 
 class FileUploadSerializer(serializers.ModelSerializer):
@@ -37,3 +39,30 @@ class ContractUploadSerializer(serializers.ModelSerializer):
         if request:
             representation["file"] = request.build_absolute_uri(instance.file.url)
         return representation
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    download = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            "id",
+            "kind",
+            "params",
+            "filename",
+            "status",
+            "done",
+            "total",
+            "error",
+            "download",
+            "created_at",
+            "finished_at",
+        ]
+
+    def get_download(self, obj):
+        if obj.status != ExportJob.DONE or not obj.file_id:
+            return None
+        url = reverse("export-download", kwargs={"pk": obj.pk})
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,37 @@
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from data.upload.exports import run
+from data.upload.models import ExportJob
+
+# days an export file is kept for download
+KEEP_DAYS = 7
+
+
+@shared_task
+def run_export(job_id):
+    """Write the file of an ExportJob created by an export view."""
+    job = ExportJob.objects.filter(id=job_id, status=ExportJob.PENDING).first()
+    if job is None:
+        return
+    return run(job)
+
+
+@shared_task
+def drop_old_exports():
+    """Delete export files older than KEEP_DAYS, keeping the job rows."""
+    jobs = ExportJob.objects.filter(
+        file__isnull=False,
+        created_at__lt=timezone.now() - timedelta(days=KEEP_DAYS),
+    ).select_related("file")
+
+    dropped = 0
+    for job in jobs.iterator():
+        job.file.file.delete(save=False)
+        job.file.delete()
+        dropped += 1
+    logging.info(f"Dropped {dropped} export files")
+    return dropped
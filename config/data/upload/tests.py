@@ -1,3 +1,103 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from openpyxl import load_workbook
+from rest_framework.test import APIClient
+
+from data.account.models import CustomUser
+from data.finances.finance.models import Finance
+from data.upload.exports import newest_first
+from data.upload.models import ExportJob
+from data.upload.tasks import run_export
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def _workbook(response):
+    content = b"".join(response.streaming_content)
+    return load_workbook(io.BytesIO(content))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class FinanceExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(phone="+998900001111", role="DIRECTOR")
+        # bulk_create: the finance signals are not what is tested here
+        Finance.objects.bulk_create(
+            [
+                Finance(action="INCOME", amount=100, payment_method="Cash"),
+                Finance(action="INCOME", amount=50, payment_method="Card"),
+                Finance(action="EXPENSE", amount=30, payment_method="Cash"),
+            ]
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_streams_rows_and_totals(self):
+        response = self.client.get("/finance/excel/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("finance_report.xlsx", response["Content-Disposition"])
+        rows = list(_workbook(response)["Finance Report"].values)
+        self.assertEqual(rows[0][0], "Kassa egasi")
+        self.assertEqual(len(rows), 1 + 3 + 1 + 3)
+        self.assertEqual(
+            [row[3:5] for row in rows[-3:]],
+            [("Jami Kirim:", 150), ("Jami Chiqim:", -30), ("JAMI:", 120)],
+        )
+
+    def test_rows_are_read_one_chunk_per_query(self):
+        with self.assertNumQueries(2):
+            rows = list(newest_first(Finance.objects.all(), "amount", chunk_size=2))
+        self.assertEqual(sorted(amount for amount, in rows), [30, 50, 100])
+
+    def test_big_exports_become_jobs(self):
+        with mock.patch("data.upload.exports.STREAM_LIMIT", 2):
+            with self.captureOnCommitCallbacks():
+                response = self.client.get("/finance/excel/")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(ExportJob.objects.get(id=response.data["id"]).params, {})
+
+    def test_background_export_is_downloaded_by_its_creator(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.get(
+                "/finance/excel/", {"background": "true", "action": "INCOME"}
+            )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(len(callbacks), 1)
+
+        job = ExportJob.objects.get(id=response.data["id"])
+        self.assertEqual(job.params, {"action": "INCOME"})
+        self.assertEqual(job.status, ExportJob.PENDING)
+
+        self.assertEqual(run_export(str(job.id)), 2)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.DONE)
+        self.assertEqual((job.done, job.total), (2, 2))
+
+        status = self.client.get(f"/upload/exports/{job.id}/")
+        self.assertTrue(status.data["download"].endswith(f"{job.id}/download/"))
+
+        download = self.client.get(f"/upload/exports/{job.id}/download/")
+        self.assertEqual(download.status_code, 200)
+        rows = list(_workbook(download)["Finance Report"].values)
+        self.assertEqual(len(rows), 1 + 2 + 1 + 3)
+
+        other = APIClient()
+        other.force_authenticate(
+            CustomUser.objects.create(phone="+998900002222", role="DIRECTOR")
+        )
+        self.assertEqual(
+            other.get(f"/upload/exports/{job.id}/download/").status_code, 404
+        )
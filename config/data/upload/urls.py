@@ -6,4 +6,8 @@ urlpatterns = [
     path('<uuid:pk>/',UploadDestroyAPIView.as_view()),
 
     path('contract',ContratListAPIView.as_view()),
+
+    path('exports/', ExportJobListAPIView.as_view(), name='export-list'),
+    path('exports/<uuid:pk>/', ExportJobRetrieveAPIView.as_view(), name='export-status'),
+    path('exports/<uuid:pk>/download/', ExportJobDownloadAPIView.as_view(), name='export-download'),
 ]
\ No newline at end of file
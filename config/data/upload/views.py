@@ -1,8 +1,19 @@
-from rest_framework.generics import ListCreateAPIView, DestroyAPIView
+from django.http import FileResponse, Http404
+from rest_framework.generics import (
+    DestroyAPIView,
+    ListAPIView,
+    ListCreateAPIView,
+    RetrieveAPIView,
+)
 from rest_framework.permissions import IsAuthenticated
 
-from .models import File, Contract
-from .serializers import FileUploadSerializer, ContractUploadSerializer
+from .exports import XLSX
+from .models import File, Contract, ExportJob
+from .serializers import (
+    ContractUploadSerializer,
+    ExportJobSerializer,
+    FileUploadSerializer,
+)
 
 
 class UploadFileAPIView(ListCreateAPIView):
@@ -21,4 +32,33 @@ class UploadDestroyAPIView(DestroyAPIView):
 class ContratListAPIView(ListCreateAPIView):
     serializer_class = ContractUploadSerializer
     permission_classes = [IsAuthenticated]
-    queryset = Contract.objects.all()
\ No newline at end of file
+    queryset = Contract.objects.all()
+
+
+class ExportJobMixin:
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return ExportJob.objects.filter(created_by=self.request.user)
+
+
+class ExportJobListAPIView(ExportJobMixin, ListAPIView):
+    pass
+
+
+class ExportJobRetrieveAPIView(ExportJobMixin, RetrieveAPIView):
+    pass
+
+
+class ExportJobDownloadAPIView(ExportJobMixin, RetrieveAPIView):
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status != ExportJob.DONE or job.file is None or not job.file.file:
+            raise Http404
+        return FileResponse(
+            job.file.file.open("rb"),
+            as_attachment=True,
+            filename=job.filename,
+            content_type=XLSX,
+        )
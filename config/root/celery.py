@@ -54,7 +54,7 @@ app.conf.beat_schedule = {
     #     "schedule": crontab(day_of_month=28, hour=0, minute=0),
     # },
     "check_monthly_asos5": {
-        "task": "data.finance.compensation.tasks.check_monthly_student_catching_monitoring",
+        "task": "data.finances.compensation.tasks.check_monthly_student_catching_monitoring",
         "schedule": crontab(day_of_month=28, hour=0, minute=0),
     },
     # KPI Checks (Runs on the 1st of the month)
@@ -82,10 +82,37 @@ app.conf.beat_schedule = {
         "task": "data.student.studentgroup.tasks.check_for_streak_students",
         "schedule": crontab(hour=0, minute=1),  # every day at 00:01
     },
+    "reconcile_funnel_rollup": {
+        "task": "data.dashboard.tasks.reconcile_funnel_rollup",
+        "schedule": crontab(hour=1, minute=30),
+    },
+    "reconcile_casher_totals": {
+        "task": "data.finances.finance.tasks.reconcile_casher_totals",
+        "schedule": crontab(hour=1, minute=45),
+    },
     "bonuses_for_each_active_student": {
         "task": "data.employee.tasks.bonuses_for_each_active_student",
         "schedule": crontab(day_of_month=1, hour=0, minute=1),
     },
+    # reports drift only; run with fix=True by hand after looking at it
+    "reconcile_employee_balances": {
+        "task": "data.employee.tasks.reconcile_employee_balances",
+        "schedule": crontab(hour=2, minute=0),
+    },
+    "drop_old_exports": {
+        "task": "data.upload.tasks.drop_old_exports",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    # pushes are sent right after commit; this picks up retries and leftovers
+    "deliver_push_outbox": {
+        "task": "data.notifications.tasks.deliver_push_outbox",
+        "schedule": crontab(minute="*"),
+    },
+    # result rewards run right after commit; this picks up lost jobs
+    "apply_pending_result_transitions": {
+        "task": "data.results.tasks.apply_pending_result_transitions",
+        "schedule": crontab(minute="*/5"),
+    },
 }
 
 
@@ -2,7 +2,7 @@ from datetime import timedelta
 from pathlib import Path
 
 
-from decouple import config
+from decouple import Csv, config
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -95,6 +95,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "data.command.query_budget.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -289,9 +290,55 @@ CELERY_BROKER_URL = "redis://redis:6379/0"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
+# version stamps of data/command/reference.py; shared by the web and Celery
+# processes through Redis when a URL is given, e.g. redis://redis:6379/1
+REFERENCE_CACHE_URL = config("REFERENCE_CACHE_URL", default="")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "reference": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REFERENCE_CACHE_URL,
+        }
+        if REFERENCE_CACHE_URL
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "reference",
+        }
+    ),
+}
+
 
 CORS_PREFLIGHT_MAX_AGE = 86400
 
+# BaseModel.save() call-site capture, see data/command/context.py
+MODEL_CONTEXT_CAPTURE = {
+    "MODE": config("MODEL_CONTEXT_MODE", default="bounded"),
+    "SAMPLE_RATE": config("MODEL_CONTEXT_SAMPLE_RATE", default=5, cast=float),
+    "MAX_FRAMES": config("MODEL_CONTEXT_MAX_FRAMES", default=15, cast=int),
+    "FULL_MODELS": config("MODEL_CONTEXT_FULL_MODELS", default="", cast=Csv()),
+    "STORAGE": config("MODEL_CONTEXT_STORAGE", default="spool"),
+}
+
+# per-request query counts and N+1 reports, see data/command/query_budget.py
+QUERY_BUDGET = {
+    "ENABLED": config("QUERY_BUDGET_ENABLED", default=True, cast=bool),
+    "N_PLUS_ONE": config("QUERY_BUDGET_N_PLUS_ONE", default=10, cast=int),
+    "LOG_ALL": config("QUERY_BUDGET_LOG_ALL", default=False, cast=bool),
+    "METRICS_TOKEN": config("QUERY_BUDGET_METRICS_TOKEN", default=""),
+    "BUDGETS": {
+        "dashboard/admin/": 5,
+        "dashboard/funnel/": 1,
+        "finance/kind/": 2,
+        "students/": 6,
+        "students/no-pg/": 16,
+        "students/statistics/": 10,
+    },
+}
+
 INTERNAL_IPS = type(str("c"), (), {"__contains__": lambda self, item: True})()
 
 
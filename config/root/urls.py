@@ -25,6 +25,8 @@ from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
+from data.command.query_budget import metrics_view
+
 schema_view = get_schema_view(
     openapi.Info(
         title="Fitrat ERP API",
@@ -77,6 +79,7 @@ urlpatterns = [
     path("upload/", include("data.upload.urls")),
     path("dashboard/", include("data.dashboard.urls")),
     path("quiz-results/", include("data.exam_results.urls")),
+    path("metrics/queries", metrics_view, name="query-metrics"),
     path("docs<format>/", schema_view.without_ui(cache_timeout=0), name="schema-json"),
     path(
         "swagger/",